@@ -12,13 +12,44 @@ Provides:
 import os
 import re
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Editor pass: polish results cached per (brand voice, field text) so
+# re-finalising a campaign only sends copy that actually changed.
+POLISH_CACHE_SIZE = int(os.getenv("EDITOR_POLISH_CACHE_SIZE", "2048"))
+_polish_cache: "OrderedDict[Tuple[str, str], Tuple[str, int]]" = OrderedDict()
+_polish_cache_lock = threading.Lock()
+
+
+def _voice_key(brand_voice: Dict[str, Any]) -> str:
+    """Stable hash of the brand-voice fields that shape the editor prompt."""
+    voice = {k: brand_voice.get(k) for k in ('personality', 'do', 'dont')}
+    return hashlib.sha256(json.dumps(voice, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _cached_polish(key: Tuple[str, str]) -> Optional[Tuple[str, int]]:
+    with _polish_cache_lock:
+        hit = _polish_cache.get(key)
+        if hit is not None:
+            _polish_cache.move_to_end(key)
+        return hit
+
+
+def _store_polish(key: Tuple[str, str], result: Tuple[str, int]) -> None:
+    with _polish_cache_lock:
+        _polish_cache[key] = result
+        _polish_cache.move_to_end(key)
+        while len(_polish_cache) > POLISH_CACHE_SIZE:
+            _polish_cache.popitem(last=False)
+
 
 class RubricDimension(str, Enum):
     """Rubric dimensions for tutorial evaluation."""
@@ -623,6 +654,112 @@ class CriticAgent:
             logger.warning(f"⚠️ Proofreading failed: {e}, returning original text")
             return copy_text, 100
 
+    async def polish_fields(
+        self,
+        fields: Dict[str, str],
+        brand_voice: Dict[str, Any]
+    ) -> Dict[str, Tuple[str, int]]:
+        """
+        Phase 1: The Editor - proofread several copy fields in one request.
+
+        Fields already polished for this brand voice are served from cache;
+        the rest go out in a single structured call under the shared LLM budget.
+
+        Args:
+            fields: Field key -> copy text (e.g. {"headline": ..., "body": ...})
+            brand_voice: Brand voice dictionary with personality, do's, don'ts
+
+        Returns:
+            Field key -> (corrected_text, quality_score 0-100). Fields the
+            model skipped or failed on come back unchanged with score 100.
+        """
+        voice = _voice_key(brand_voice)
+        results: Dict[str, Tuple[str, int]] = {}
+        pending: Dict[str, List[str]] = {}  # text -> field keys sharing it
+
+        for key, text in fields.items():
+            if not text or not text.strip():
+                results[key] = (text, 100)
+                continue
+            cached = _cached_polish((voice, text))
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending.setdefault(text, []).append(key)
+
+        if not pending:
+            return results
+
+        # Deduplicated texts are sent under positional ids
+        texts = list(pending)
+        copy_block = json.dumps({f"f{i}": text for i, text in enumerate(texts)}, indent=2)
+
+        personality = brand_voice.get('personality', 'Professional and approachable')
+        do_list = brand_voice.get('do', [])
+        dont_list = brand_voice.get('dont', [])
+
+        prompt = f"""
+        You are a Senior Editor reviewing marketing copy for a brand.
+
+        BRAND VOICE:
+        - Personality: {personality}
+        - DO: {', '.join(do_list) if do_list else 'Be professional and clear'}
+        - DON'T: {', '.join(dont_list) if dont_list else 'Avoid jargon and exaggeration'}
+
+        COPY TO REVIEW (JSON object of field id -> text):
+        {copy_block}
+
+        TASK (for EACH field independently):
+        1. Fix any grammar or spelling errors
+        2. Ensure the tone matches the brand personality
+        3. Remove or rephrase any content that violates the DON'T list
+        4. Apply the DO list guidelines
+        5. Rate the ORIGINAL copy quality from 0-100 (before your fixes)
+
+        IMPORTANT:
+        - Make minimal changes - preserve the original meaning
+        - If a field is already good, return it unchanged with a high score
+        - Only rewrite if there are actual issues
+
+        Return ONLY a JSON object with the same field ids:
+        {{
+            "f0": {{"corrected_text": "the polished copy", "score": 85}}
+        }}
+        """
+
+        parsed: Dict[str, Any] = {}
+        try:
+            from app.services.llm_factory import get_model, llm_slot
+            model = get_model(intent='complex')
+            async with llm_slot():
+                response = await model.generate_content_async(prompt)
+
+            raw_text = response.text.strip()
+            raw_text = re.sub(r'^```json\s*', '', raw_text)
+            raw_text = re.sub(r'\s*```$', '', raw_text)
+            parsed = json.loads(raw_text)
+            if not isinstance(parsed, dict):
+                raise ValueError("editor response is not a JSON object")
+        except Exception as e:
+            logger.warning(f"⚠️ Proofreading failed: {e}, returning original text")
+            parsed = {}
+
+        for i, text in enumerate(texts):
+            item = parsed.get(f"f{i}")
+            result = (text, 100)
+            if isinstance(item, dict) and isinstance(item.get('corrected_text'), str):
+                try:
+                    result = (item['corrected_text'], int(item.get('score', 100)))
+                    _store_polish((voice, text), result)
+                    # Re-finalising an already polished blueprint sends the corrected copy
+                    _store_polish((voice, result[0]), (result[0], 100))
+                except (TypeError, ValueError):
+                    pass
+            for key in pending[text]:
+                results[key] = result
+
+        return results
+
 
 # Singleton
 _critic_agent: Optional[CriticAgent] = None
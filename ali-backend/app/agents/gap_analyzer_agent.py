@@ -64,10 +64,16 @@ class GapAnalyzerAgent:
                 pass
         return self._bq_service
 
-    def analyze_user_gaps(self, user_id: str) -> Dict[str, Any]:
+    def analyze_user_gaps(self, user_id: str, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Comprehensive gap analysis for a user.
         
+        Args:
+            user_id: User to analyze
+            summary: Incrementally maintained learning summary (optional).
+                     When given, quiz gaps come from its open struggles
+                     instead of streaming the user's tutorials.
+        
         Returns:
         - gaps: List of identified learning gaps
         - recommendations: Suggested tutorials to generate
@@ -78,7 +84,10 @@ class GapAnalyzerAgent:
             recommendations = []
             
             # 1. Analyze quiz failures
-            quiz_gaps = self._analyze_quiz_failures(user_id)
+            if summary is not None:
+                quiz_gaps = self._quiz_gaps_from_summary(summary)
+            else:
+                quiz_gaps = self._analyze_quiz_failures(user_id)
             gaps.extend(quiz_gaps)
             
             # 2. Analyze skill matrix
@@ -166,6 +175,33 @@ class GapAnalyzerAgent:
         
         return gaps
 
+    def _quiz_gaps_from_summary(self, summary: Dict[str, Any]) -> List[Dict]:
+        """Build quiz failure gaps from a learning summary's open struggles."""
+        gaps = []
+        for struggle in (summary.get("struggles") or {}).values():
+            score = struggle.get("score", 100)
+            if score >= 75:
+                continue
+            if score < 60:
+                severity = self.SEVERITY["CRITICAL"] if score < 40 else self.SEVERITY["HIGH"]
+                evidence = f"Score: {score}% (below 60% threshold)"
+            else:
+                severity = self.SEVERITY["MEDIUM"]
+                evidence = f"Score: {score}% (below 75% passing threshold)"
+            gaps.append({
+                "gap_id": str(uuid.uuid4()),
+                "type": "quiz_failure",
+                "topic": struggle.get("section") or struggle.get("tutorial") or "Unknown",
+                "source_tutorial_id": struggle.get("tutorial_id"),
+                "source_tutorial_title": struggle.get("tutorial"),
+                "severity": severity,
+                "evidence": evidence,
+                "score": score,
+                "trigger_type": self.TRIGGER_TYPES["quiz_failure"],
+                "auto_approve": True
+            })
+        return gaps
+
     def _analyze_skill_matrix(self, user_id: str) -> List[Dict]:
         """Analyze skill matrix to find underdeveloped areas."""
         gaps = []
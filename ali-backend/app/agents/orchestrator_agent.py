@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 import base64
 import json
@@ -12,6 +13,7 @@ from app.services.qc_rubric import evaluate_copy
 from app.core.security import db
 from app.core.templates import get_motion_template, get_template_for_tone, get_random_template, get_optimized_template, MOTION_TEMPLATES, FONT_MAP, TEMPLATE_COMPLEXITY
 from app.services.governance import run_qc_rubric, verify_claims_for_blueprint
+from app.services.progress_reporter import get_progress_reporter
 from firebase_admin import firestore
 
 logger = logging.getLogger("ali_platform.agents.orchestrator_agent")
@@ -19,6 +21,13 @@ logger = logging.getLogger("ali_platform.agents.orchestrator_agent")
 # V4.0 Configuration
 IMAGE_GENERATION_TIMEOUT = 120  # Seconds per image
 
+# V9.0: Per-stage limits for the streaming asset pipeline (generate → brand → render → save)
+GENERATE_CONCURRENCY = 3  # Vertex AI image quota is burst limited
+BRANDING_CONCURRENCY = 4  # PIL compositing in worker threads
+RENDER_CONCURRENCY = 2    # Headless browser / Veo renders are memory heavy
+SAVE_CONCURRENCY = 4      # Draft + checkpoint writes
+PIPELINE_STAGES = ("generate", "brand", "render", "save")
+
 # V7.0: Enable Veo Video Pipeline
 # When True, uses Google Veo for AI-generated video backgrounds
 # with HTML text overlays. Falls back to HTML animations if Veo fails.
@@ -376,23 +385,26 @@ class OrchestratorAgent(BaseAgent):
         try:
             cache_key = f"{channel}_{format_label}"
             checkpoint_ref = self.db.collection('generation_checkpoints').document(campaign_id)
+            # Nested map: set() doesn't expand dotted keys, merge=True keeps sibling entries
             checkpoint_ref.set({
-                f"aiImageCache.{cache_key}": image_url,
+                "aiImageCache": {cache_key: image_url},
                 "updatedAt": firestore.SERVER_TIMESTAMP
             }, merge=True)
             logger.debug(f"💾 Cached AI image for {cache_key}")
         except Exception as e:
             logger.warning(f"⚠️ Failed to cache AI image: {e}")
     
-    def _get_cached_ai_image(self, campaign_id: str, channel: str, format_label: str) -> str:
+    def _get_cached_ai_image(self, campaign_id: str, channel: str, format_label: str, checkpoint: Optional[dict] = None) -> str:
         """
         Retrieve cached AI image URL if available.
         Returns None if no cache exists.
+        
+        Pass an already-loaded `checkpoint` to avoid re-reading the document
+        once per format.
         """
         try:
-            checkpoint_doc = self.db.collection('generation_checkpoints').document(campaign_id).get()
-            if checkpoint_doc.exists:
-                data = checkpoint_doc.to_dict()
+            data = checkpoint if checkpoint is not None else self._load_checkpoint(campaign_id)
+            if data:
                 cache_key = f"{channel}_{format_label}"
                 cached_url = data.get("aiImageCache", {}).get(cache_key)
                 if cached_url:
@@ -527,66 +539,55 @@ class OrchestratorAgent(BaseAgent):
         
         If score < 90, auto-rewrite without user intervention.
         This ensures all generated copy is grammatically correct and on-brand.
+        Each channel's fields go out in one structured editor call; channels run
+        concurrently under the shared LLM budget and unchanged copy hits the
+        critic's polish cache instead of the model.
         """
         from app.agents.critic_agent import get_critic_agent
         critic = get_critic_agent()
         
         polished_blueprint = blueprint.copy()
-        total_polished = 0
-        
-        for channel in target_channels:
+
+        async def polish_channel(channel: str) -> int:
             channel_data = polished_blueprint.get(channel, {})
             if not isinstance(channel_data, dict):
-                continue
-            
-            # Polish headline (singular)
-            if channel_data.get('headline') and isinstance(channel_data['headline'], str):
-                corrected, score = await critic.proofread_and_polish(
-                    channel_data['headline'], brand_voice
-                )
-                if score < 90:
-                    logger.info(f"📝 Editor polished {channel} headline (score: {score})")
-                    channel_data['headline'] = corrected
-                    total_polished += 1
-            
-            # Polish headlines (list)
-            if channel_data.get('headlines') and isinstance(channel_data['headlines'], list):
-                polished_headlines = []
-                for headline in channel_data['headlines']:
+                return 0
+
+            # Collect headline, headlines[i], caption and body
+            fields = {}
+            for name in ('headline', 'caption', 'body'):
+                if channel_data.get(name) and isinstance(channel_data[name], str):
+                    fields[name] = channel_data[name]
+            headlines = channel_data.get('headlines')
+            if headlines and isinstance(headlines, list):
+                for i, headline in enumerate(headlines):
                     if isinstance(headline, str):
-                        corrected, score = await critic.proofread_and_polish(
-                            headline, brand_voice
-                        )
-                        if score < 90:
-                            polished_headlines.append(corrected)
-                            total_polished += 1
-                        else:
-                            polished_headlines.append(headline)
-                    else:
-                        polished_headlines.append(headline)
-                channel_data['headlines'] = polished_headlines
-            
-            # Polish caption
-            if channel_data.get('caption') and isinstance(channel_data['caption'], str):
-                corrected, score = await critic.proofread_and_polish(
-                    channel_data['caption'], brand_voice
-                )
-                if score < 90:
-                    logger.info(f"📝 Editor polished {channel} caption (score: {score})")
-                    channel_data['caption'] = corrected
-                    total_polished += 1
-            
-            # Polish body
-            if channel_data.get('body') and isinstance(channel_data['body'], str):
-                corrected, score = await critic.proofread_and_polish(
-                    channel_data['body'], brand_voice
-                )
-                if score < 90:
-                    logger.info(f"📝 Editor polished {channel} body (score: {score})")
-                    channel_data['body'] = corrected
-                    total_polished += 1
+                        fields[f'headlines.{i}'] = headline
+            if not fields:
+                return 0
+
+            results = await critic.polish_fields(fields, brand_voice)
+
+            polished = 0
+            if isinstance(headlines, list):
+                headlines = list(headlines)
+            for key, (corrected, score) in results.items():
+                if score >= 90:
+                    continue
+                if key.startswith('headlines.'):
+                    headlines[int(key.split('.', 1)[1])] = corrected
+                else:
+                    logger.info(f"📝 Editor polished {channel} {key} (score: {score})")
+                    channel_data[key] = corrected
+                polished += 1
+            if isinstance(headlines, list):
+                channel_data['headlines'] = headlines
             
             polished_blueprint[channel] = channel_data
+            return polished
+
+        counts = await asyncio.gather(*(polish_channel(channel) for channel in target_channels))
+        total_polished = sum(counts)
         
         logger.info(f"✅ Editor Loop complete: {total_polished} items polished")
         return polished_blueprint
@@ -680,11 +681,13 @@ class OrchestratorAgent(BaseAgent):
                 spec = CHANNEL_SPECS.get(channel, {})
                 qc_reports[channel] = evaluate_copy(channel, extract_primary_copy(channel_data), brand_dna, spec)
 
-            # 3. Channel-Aware Asset Generation Loop
+            # 3. Channel-Aware Asset Generation
             image_agent = ImageAgent()
+
+            # V6.2: Read the checkpoint once; resumed formats reuse their cached AI image
+            checkpoint = self._load_checkpoint(campaign_id)
             
-            tasks = []
-            task_metadata = []  # Track (channel, format_type, specs) for each task
+            jobs = []  # {"meta": ..., "generate": coroutine factory, "cached_url": optional}
             
             for channel in target_channels:
                 spec = CHANNEL_SPECS.get(channel)
@@ -753,156 +756,155 @@ class OrchestratorAgent(BaseAgent):
                         # We create a sub-loop of tasks
                         for i in range(1, 4):
                             slide_prompt = f"{enhanced_prompt}. Slide {i} of 3. Ensure visual continuity."
-                            task = asyncio.to_thread(
-                                image_agent.generate_image, 
-                                slide_prompt, 
-                                brand_dna=dna_str, 
-                                folder=f"campaigns/{channel}/slide_{i}"
-                            )
-                            tasks.append(task)
-                            task_metadata.append({
-                                "channel": channel,
-                                "format_type": "carousel",  # Mark as carousel
-                                "slide_index": i,
-                                "size": primary_format["size"],
-                                "tone": tone
+                            jobs.append({
+                                "generate": functools.partial(
+                                    asyncio.to_thread,
+                                    image_agent.generate_image,
+                                    slide_prompt,
+                                    brand_dna=dna_str,
+                                    folder=f"campaigns/{channel}/slide_{i}"
+                                ),
+                                "meta": {
+                                    "channel": channel,
+                                    "format_type": "carousel",  # Mark as carousel
+                                    "slide_index": i,
+                                    "size": primary_format["size"],
+                                    "tone": tone
+                                }
                             })
 
                     else:
                         # Standard Single Image (may be upgraded to Motion later)
                         
-                        # V6.2: Check for cached AI image (from interrupted generation)
-                        cached_url = self._get_cached_ai_image(campaign_id, channel, format_label)
-                        if cached_url:
-                            # Use cached image - skip expensive AI call!
-                            async def return_cached(url):
-                                return {"url": url}
-                            task = return_cached(cached_url)
-                        else:
-                            # No cache - generate new image
-                            task = asyncio.to_thread(
-                                image_agent.generate_image, 
-                                enhanced_prompt, 
-                                brand_dna=dna_str, 
+                        # V6.2: Cached AI image (from interrupted generation) skips the expensive AI call
+                        jobs.append({
+                            "cached_url": self._get_cached_ai_image(campaign_id, channel, format_label, checkpoint),
+                            "generate": functools.partial(
+                                asyncio.to_thread,
+                                image_agent.generate_image,
+                                enhanced_prompt,
+                                brand_dna=dna_str,
                                 folder=f"campaigns/{channel}"
-                            )
-                        
-                        tasks.append(task)
-                        task_metadata.append({
-                            "channel": channel,
-                            "format_type": "motion" if motion_supported else primary_format["type"],
-                            "format_label": format_label,
-                            "motion_enabled": motion_supported,
-                            "size": primary_format["size"],
-                            "tone": tone
+                            ),
+                            "meta": {
+                                "channel": channel,
+                                "format_type": "motion" if motion_supported else primary_format["type"],
+                                "format_label": format_label,
+                                "motion_enabled": motion_supported,
+                                "size": primary_format["size"],
+                                "tone": tone
+                            }
                         })
 
-            
-            self._update_progress(uid, campaign_id, f"Generating {len(tasks)} Channel Assets...", 40)
-            
-            # Execute all tasks concurrently with Semaphore (V4.0 Stability Fix)
-            # Limit concurrent image generations to Avoid Quota Errors (Vertex AI limit ~60/min but burst limited)
-            semaphore = asyncio.Semaphore(3)  # Max 3 concurrent requests
+            self._update_progress(uid, campaign_id, f"Generating {len(jobs)} Channel Assets...", 40)
 
-            async def semaphore_task(t, task_meta):
-                """V4.0: Enhanced task wrapper with timeout and error isolation."""
-                async with semaphore:
-                    try:
-                        result = await asyncio.wait_for(t, timeout=IMAGE_GENERATION_TIMEOUT)
-                        return result
-                    except asyncio.TimeoutError:
-                        logger.error(f"⏰ Timeout generating asset for {task_meta.get('channel')}")
-                        return {"error": "timeout", "channel": task_meta.get("channel")}
-                    except Exception as e:
-                        logger.error(f"❌ Generate task failed for {task_meta.get('channel')}: {e}")
-                        return {"error": str(e), "channel": task_meta.get("channel")}
-
-            # Wrap tasks with metadata for error context
-            safe_tasks = [semaphore_task(t, task_metadata[i]) for i, t in enumerate(tasks)]
-            
-            # Process in batches to update progress more frequently
-            results = []
-            batch_size = 3
-            for batch_start in range(0, len(safe_tasks), batch_size):
-                batch_end = min(batch_start + batch_size, len(safe_tasks))
-                batch = safe_tasks[batch_start:batch_end]
-                batch_results = await asyncio.gather(*batch, return_exceptions=True)
-                results.extend(batch_results)
-                
-                # Update progress after each batch
-                percent = 40 + int((len(results) / len(safe_tasks)) * 45)  # 40-85%
-                self._update_progress(uid, campaign_id, f"Generated {len(results)}/{len(tasks)} assets...", percent)
-            
-            # Map results back to structured assets
+            # V9.0: Streaming asset pipeline - each asset flows generate → brand → render → save
+            # on its own, so one slow image never holds back assets whose next stage has a free
+            # slot. Each stage has its own concurrency limit (image quota, CPU, browser, Firestore).
             from app.services.asset_processor import get_asset_processor
             asset_processor = get_asset_processor()
-            
+
+            generate_slots = asyncio.Semaphore(GENERATE_CONCURRENCY)
+            brand_slots = asyncio.Semaphore(BRANDING_CONCURRENCY)
+            render_slots = asyncio.Semaphore(RENDER_CONCURRENCY)
+            save_slots = asyncio.Semaphore(SAVE_CONCURRENCY)
+
             assets = {}
             temp_carousel_storage = {} # Store slides: {channel: {index: url}}
             assets_metadata = {}
 
-            for i, result in enumerate(results):
-                meta = task_metadata[i]
+            stage_total = max(1, len(jobs) * len(PIPELINE_STAGES))
+            progress = {"units": 0, "percent": 40, **{stage: 0 for stage in PIPELINE_STAGES}}
+
+            def advance(units: int = 1):
+                """Move progress (40-85%) forward by finished or skipped stage units."""
+                progress["units"] += units
+                percent = 40 + int(progress["units"] / stage_total * 45)
+                if percent > progress["percent"]:
+                    progress["percent"] = percent
+                    self._update_progress(
+                        uid, campaign_id,
+                        f"Generated {progress['generate']}/{len(jobs)} images, {progress['save']} assets saved...",
+                        percent
+                    )
+
+            def report_stage(stage: str):
+                progress[stage] += 1
+                advance()
+
+            def mark_failed(meta, error):
+                assets_metadata[meta["channel"]] = {**meta, "error": error, "status": "FAILED"}
+
+            async def generate_stage(job) -> Optional[str]:
+                """Stage 1: AI image (or the checkpointed one). Returns the raw URL or None."""
+                meta = job["meta"]
                 channel = meta["channel"]
-                
-                # V4.0: Enhanced error detection
-                if isinstance(result, Exception):
-                    logger.error(f"❌ Exception generating asset for {channel}: {result}")
-                    assets_metadata[channel] = {**meta, "error": str(result), "status": "FAILED"}
-                    continue
-                
+                if job.get("cached_url"):
+                    return job["cached_url"]
+
+                async with generate_slots:
+                    try:
+                        result = await asyncio.wait_for(job["generate"](), timeout=IMAGE_GENERATION_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        logger.error(f"⏰ Timeout generating asset for {channel}")
+                        mark_failed(meta, "timeout")
+                        return None
+                    except Exception as e:
+                        logger.error(f"❌ Generate task failed for {channel}: {e}")
+                        mark_failed(meta, str(e))
+                        return None
+
                 # Check for error dict from our enhanced ImageAgent
                 if isinstance(result, dict) and "error" in result:
                     logger.warning(f"⚠️ Asset error for {channel}: {result.get('error')} - {result.get('message')}")
-                    assets_metadata[channel] = {**meta, "error": result.get('message'), "status": "FAILED"}
-                    continue
-                    
+                    mark_failed(meta, result.get('message'))
+                    return None
+
                 # Extract URL if dict (new format), else use result (legacy string)
                 raw_url = result.get('url') if isinstance(result, dict) else result
-                
                 if not raw_url:
                     logger.warning(f"⚠️ No URL returned for {channel}")
-                    assets_metadata[channel] = {**meta, "error": "No URL generated", "status": "FAILED"}
-                    continue
-                
-                # V6.2: CACHE AI IMAGE URL before rendering
-                # This is the expensive step (15s) - cache it so resume can skip AI
-                format_label = meta.get("format_label", "primary")
-                self._save_ai_image_cache(campaign_id, channel, format_label, raw_url)
-                
-                # FIX 1: Apply Advanced Branding
-                # Use the new apply_advanced_branding with layout styles
-                if channel not in ['blog', 'email']:
-                    try:
+                    mark_failed(meta, "No URL generated")
+                    return None
 
-                        # Apply advanced branding with layout styles
-                        final_url = await asyncio.to_thread(
-                            asset_processor.apply_advanced_branding,
-                            raw_url,
-                            brand_dna
-                        )
+                # V6.2: CACHE AI IMAGE URL before rendering so resume can skip the AI call
+                if meta.get("format_type") != "carousel":
+                    await asyncio.to_thread(
+                        self._save_ai_image_cache, campaign_id, channel, meta.get("format_label", "primary"), raw_url
+                    )
+                return raw_url
+
+            async def brand_stage(meta, raw_url: str) -> str:
+                """Stage 2: Advanced branding with layout styles (skipped for blog/email)."""
+                channel = meta["channel"]
+                if channel in ['blog', 'email']:
+                    return raw_url
+                async with brand_slots:
+                    try:
+                        return await asyncio.to_thread(asset_processor.apply_advanced_branding, raw_url, brand_dna)
                     except Exception as e:
                         logger.warning(f"⚠️ Advanced branding skipped for {channel}: {e}")
-                        final_url = raw_url
-                else:
-                    final_url = raw_url
-
-                # HANDLE CAROUSEL
-                if meta.get("format_type") == "carousel":
-                    if channel not in temp_carousel_storage:
-                        temp_carousel_storage[channel] = {}
-                    temp_carousel_storage[channel][meta["slide_index"]] = final_url
-                    # We don't set assets[channel] yet, we wait until loop end
-                    
-                # HANDLE MOTION - Use Template Library
-                elif meta.get("motion_enabled"):
+                        return raw_url
+
+            async def render_stage(meta, final_url: str):
+                """Stage 3: Motion template render (image/video), or pass the branded image through."""
+                channel = meta["channel"]
+                format_label = meta.get("format_label", "primary")
+                asset_key = f"{channel}_{format_label}" if format_label != 'primary' else channel
+
+                if not meta.get("motion_enabled"):
+                    assets[asset_key] = final_url
+                    meta["format_type"] = "image"
+                    return
+
+                async with render_slots:
                     # Get brand details for motion
                     logo_url = brand_dna.get('logo_url', '')
                     primary_color = brand_dna.get('color_palette', {}).get('primary', '#000000')
                     
                     # V3.0: Analyze luminance for intelligent contrast
                     try:
-                        luminance_mode = asset_processor.analyze_luminance_from_url(final_url)
+                        luminance_mode = await asyncio.to_thread(asset_processor.analyze_luminance_from_url, final_url)
                         logger.info(f"🔍 Luminance mode for {channel}: {luminance_mode}")
                     except Exception as lum_err:
                         logger.warning(f"⚠️ Luminance analysis failed, defaulting to 'dark': {lum_err}")
@@ -935,10 +937,6 @@ class OrchestratorAgent(BaseAgent):
                     # Generate motion HTML from template library with luminance mode and layout variant
                     html_content = get_motion_template(template_name, final_url, logo_url, primary_color, copy_text, luminance_mode, layout_variant)
                     
-                    # Store with format label for multi-format support
-                    format_label = meta.get("format_label", "primary")
-                    asset_key = f"{channel}_{format_label}" if format_label != 'primary' else channel
-                    
                     # ============================================================
                     # V8.0 PHASE 1: RESPECT STRATEGIST'S RECOMMENDED FORMAT
                     # Read recommended_format from CampaignAgent, with TikTok override
@@ -1046,48 +1044,88 @@ class OrchestratorAgent(BaseAgent):
                             encoded = base64.b64encode(html_content.encode('utf-8')).decode('utf-8')
                             assets[asset_key] = f"data:text/html;charset=utf-8;base64,{encoded}"
                             meta["format_type"] = "html"
-                    
-                    assets_metadata[channel] = meta
-                    
-                # STANDARD IMAGE (non-motion channels)
-                else:
-                    # Store with format label for multi-format support
-                    format_label = meta.get("format_label", "primary")
-                    asset_key = f"{channel}_{format_label}" if format_label != 'primary' else channel
-                    assets[asset_key] = final_url
-                    meta["format_type"] = "image"
-                
-                # Save metadata (overwrite is fine for carousel as base props are same)
-                assets_metadata[channel] = meta
-                
-                # V5.1: Progressive draft saving - save immediately after processing
-                # This ensures the draft is persisted even if SIGTERM interrupts the generation
-                if meta.get("format_type") != "carousel":  # Carousel handled separately
-                    asset_key = f"{channel}_{meta.get('format_label', 'primary')}" if meta.get('format_label') not in [None, 'primary', 'feed'] else channel
-                    meta["intent"] = intent_object
-                    meta["claims_report"] = claims_reports.get(channel)
-                    meta["qc_report"] = qc_reports.get(channel)
-                    draft_saved = self._save_draft_immediately(
+
+            async def save_stage(meta):
+                """Stage 4: V5.1 progressive draft save + V6.1 resume checkpoint."""
+                channel = meta["channel"]
+                asset_key = f"{channel}_{meta.get('format_label', 'primary')}" if meta.get('format_label') not in [None, 'primary', 'feed'] else channel
+                meta["intent"] = intent_object
+                meta["claims_report"] = claims_reports.get(channel)
+                meta["qc_report"] = qc_reports.get(channel)
+                async with save_slots:
+                    draft_saved = await asyncio.to_thread(
+                        self._save_draft_immediately,
                         uid, campaign_id, goal, channel,
                         assets.get(asset_key) or assets.get(channel),
                         meta, blueprint, intent_object, claims_reports.get(channel), qc_reports.get(channel)
                     )
-                    # V6.1: Mark channel as complete for resume capability
                     if draft_saved:
-                        self._mark_channel_complete(campaign_id, channel, meta.get("format_label", "primary"))
+                        await asyncio.to_thread(
+                            self._mark_channel_complete, campaign_id, channel, meta.get("format_label", "primary")
+                        )
+
+            async def run_asset(job):
+                """Drive one asset through every stage, isolating its failures from the others."""
+                meta = job["meta"]
+                channel = meta["channel"]
+                remaining = len(PIPELINE_STAGES)
+                try:
+                    raw_url = await generate_stage(job)
+                    if not raw_url:
+                        return
+                    report_stage("generate")
+                    remaining -= 1
+
+                    final_url = await brand_stage(meta, raw_url)
+                    if meta.get("format_type") == "carousel":
+                        # Slides are collected and saved as one draft after the run
+                        temp_carousel_storage.setdefault(channel, {})[meta["slide_index"]] = final_url
+                        assets_metadata[channel] = meta
+                        report_stage("brand")
+                        remaining -= 1
+                        return
+                    report_stage("brand")
+                    remaining -= 1
+
+                    await render_stage(meta, final_url)
+                    # Save metadata (overwrite is fine for multi-format: base props are same)
+                    assets_metadata[channel] = meta
+                    report_stage("render")
+                    remaining -= 1
+
+                    await save_stage(meta)
+                    report_stage("save")
+                    remaining -= 1
+                except asyncio.CancelledError:
+                    remaining = 0
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Asset pipeline failed for {channel}: {e}")
+                    mark_failed(meta, str(e))
+                finally:
+                    # Failed or skipped stages still count toward overall progress
+                    if remaining:
+                        advance(remaining)
+
+            pipelines = [asyncio.create_task(run_asset(job)) for job in jobs]
+            for finished in asyncio.as_completed(pipelines):
+                await finished
 
-                
                 # V5.1: Check for graceful shutdown between assets
                 if is_shutdown_requested():
-                    logger.warning(f"⚠️ Shutdown requested after processing {channel} - saving progress...")
+                    for pipeline in pipelines:
+                        pipeline.cancel()
+                    await asyncio.gather(*pipelines, return_exceptions=True)
+
+                    logger.warning(f"⚠️ Shutdown requested - saving progress for {len(assets)} assets...")
                     self._update_progress(uid, campaign_id, f"Generation paused - {len(assets)} assets saved", 90)
                     # Save campaign with partial results
                     partial_data = {
                         "status": "interrupted",
                         "blueprint": blueprint,
                         "creative_intent": intent_object,
-                        "claims_report": claims_reports.get(channel),
-                        "qc_report": qc_reports.get(channel),
+                        "claims_report": claims_reports,
+                        "qc_report": qc_reports,
                         "assets": assets,
                         "assets_metadata": assets_metadata,
                         "selected_channels": target_channels,
@@ -1183,9 +1221,20 @@ class OrchestratorAgent(BaseAgent):
         except Exception as e:
             self.handle_error(e)
             self._update_progress(uid, campaign_id, "Error in generation.", 0, failed=True)
+        finally:
+            # V9.0: Progress ticks are coalesced in the background - land the last one
+            await asyncio.to_thread(get_progress_reporter().flush, self._progress_key(uid, campaign_id))
+
+    @staticmethod
+    def _progress_key(uid, campaign_id):
+        return f"users/{uid}/notifications/{campaign_id}"
 
     def _update_progress(self, uid, campaign_id, message, percent, failed=False):
-        """V4.0: Enhanced notifications with title, link, and proper timestamps."""
+        """
+        V4.0: Enhanced notifications with title, link, and proper timestamps.
+        V9.0: Written through the progress reporter - intermediate ticks are
+        coalesced, completion/failure is written immediately.
+        """
         # Determine status and title
         status = "error" if failed else ("completed" if percent == 100 else "processing")
         
@@ -1197,7 +1246,7 @@ class OrchestratorAgent(BaseAgent):
             title = "⚙️ Generating Campaign"
         
         notif_ref = self.db.collection('users').document(uid).collection('notifications').document(campaign_id)
-        notif_ref.set({
+        get_progress_reporter().report(self._progress_key(uid, campaign_id), notif_ref.set, {
             "title": title,
             "message": message,
             "progress": percent,
@@ -1207,7 +1256,7 @@ class OrchestratorAgent(BaseAgent):
             "link": f"/campaign-center/{campaign_id}" if percent == 100 else None,  # Navigate to campaign results when complete
             "created_at": firestore.SERVER_TIMESTAMP,
             "timestamp": firestore.SERVER_TIMESTAMP
-        })
+        }, urgent=failed or percent == 100)
 
     def _get_motion_template(self, style_name: str) -> dict:
         """
@@ -10,7 +10,7 @@ Provides:
 5. Audit trail for admin visibility
 """
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -342,49 +342,60 @@ class PerformanceAnalyzerAgent:
 
         return recommendations, triggers
 
-    def get_all_users_summary(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_all_users_summary(self, limit: int = 50, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         ADMIN: Get performance summary for all users.
         Used for admin dashboard overview.
+        
+        One page of users (after `cursor`, a user id); see
+        get_users_summary_page for the cursor of the following page.
+        """
+        return self.get_users_summary_page(limit, cursor)[0]
+
+    def get_users_summary_page(
+        self, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        ADMIN: One page of user performance summaries.
+
+        Users after `cursor` (a user id) joined with their user_summaries
+        docs in a single batched read.
+
+        Returns:
+            (summaries, cursor for the next page or None)
         """
         if not self.db:
-            return []
+            return [], None
 
         try:
-            users = list(self.db.collection('users').limit(limit).stream())
+            from app.services.user_summary_service import UserSummaryService
+            summary_service = UserSummaryService(db=self.db)
+            users, next_cursor = summary_service.list_users_page(limit, cursor)
+            counts = summary_service.get_summaries([u.id for u in users])
             summaries = []
 
             for user_doc in users:
                 user_id = user_doc.id
-                user_data = user_doc.to_dict()
-                
-                # Quick tutorial count
-                tutorials = list(
-                    self.db.collection('users').document(user_id)
-                    .collection('tutorials').limit(100).stream()
-                )
-                
-                completed = len([t for t in tutorials if t.to_dict().get('is_completed')])
-                in_progress = len(tutorials) - completed
-                
-                # Get last activity
+                user_data = user_doc.to_dict() or {}
+                summary = counts.get(user_id, {})
                 profile = user_data.get('profile', {})
                 
                 summaries.append({
                     "user_id": user_id,
                     "email": user_data.get("email", ""),
                     "display_name": profile.get("displayName", user_data.get("displayName", "Unknown")),
-                    "tutorials_completed": completed,
-                    "tutorials_in_progress": in_progress,
+                    "tutorials_completed": summary.get("tutorials_completed", 0),
+                    "tutorials_in_progress": summary.get("tutorials_in_progress", 0),
                     "skill_level": profile.get("marketing_knowledge", "NOVICE"),
-                    "last_updated": user_data.get("last_updated")
+                    "last_updated": user_data.get("last_updated"),
+                    "last_activity_at": summary.get("last_activity_at")
                 })
 
-            return summaries
+            return summaries, next_cursor
 
         except Exception as e:
             logger.error(f"❌ Failed to get users summary: {e}")
-            return []
+            return [], None
 
     def get_tutorial_generation_audit(
         self, 
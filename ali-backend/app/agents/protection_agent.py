@@ -14,8 +14,9 @@ from app.services.llm_factory import get_model
 from app.types.evidence_models import (
     EvidenceSource, EvidenceItem, EvidenceReport, EvidenceExportBundle,
     CollectionMethod, EvidenceType,
-    compute_source_hash, compute_item_hash, compute_report_hash,
-    verify_chain_integrity, redact_pii
+    MerkleTree, MERKLE_HASH_ALGORITHM,
+    compute_source_hash, compute_item_hash,
+    verify_chain_integrity, verify_item_integrity, redact_pii
 )
 
 logger = logging.getLogger(__name__)
@@ -330,7 +331,7 @@ class ProtectionAgent(BaseAgent):
         
         This enhanced version provides:
         - Full source traceability for every claim
-        - SHA-256 hash chain (source -> item -> report)
+        - SHA-256 hash chain (source -> item -> Merkle root)
         - PII redaction for privacy compliance
         - Chain integrity verification
         
@@ -349,103 +350,21 @@ class ProtectionAgent(BaseAgent):
         report_id = f"RPT-{hashlib.sha256(f'{brand_name}-{datetime.utcnow().isoformat()}'.encode()).hexdigest()[:10].upper()}"
         now = datetime.utcnow()
         
-        # Build evidence items with sources
+        # Build evidence items with sources, appending each to the Merkle tree
         evidence_items = []
         legacy_evidence_items = []  # For backward compatibility
+        tree = MerkleTree()
         
         for i, mention in enumerate(mentions):
-            item_id = str(uuid.uuid4())
-            
-            # Create source from the mention
-            collected_at = now.isoformat()
-            raw_snippet = mention.get('content_snippet', '') or mention.get('description', '') or ''
-            url = mention.get('url', '')
-            
-            # Check for and fetch deepfake analysis if linked
-            deepfake_analysis_id = mention.get('deepfake_analysis_id')
-            deepfake_analysis = None
-            
-            if deepfake_analysis_id and user_id:
-                try:
-                    deepfake_analysis = await self._fetch_deepfake_summary(user_id, deepfake_analysis_id)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch deepfake analysis {deepfake_analysis_id}: {e}")
-            
-            # Compute source hash (includes stable deepfake fields if present)
-            source_hash = compute_source_hash(
-                raw_snippet, url, collected_at,
-                deepfake_summary=deepfake_analysis
+            evidence_item, legacy_item = await self._build_evidence_item(
+                mention, i, report_id, user_id, now.isoformat()
             )
-            
-            # Create the evidence source
-            source = {
-                "id": str(uuid.uuid4()),
-                "item_id": item_id,
-                "platform": mention.get('source_platform', mention.get('source_type', 'web')),
-                "url": url,
-                "collected_at": collected_at,
-                "raw_snippet": raw_snippet[:500] if raw_snippet else "",
-                "redacted_snippet": redact_pii(raw_snippet[:500]) if raw_snippet else "",
-                "media_refs": [],
-                "screenshot_ref": None,
-                "method": "automated_scan",
-                "source_hash": source_hash,
-                "deepfake_analysis_id": deepfake_analysis_id,
-                "deepfake_analysis": deepfake_analysis
-            }
-            
-            # Determine evidence type from mention characteristics
-            sentiment = mention.get('sentiment', 'neutral')
-            severity = mention.get('severity', 5)
-            title_lower = mention.get('title', '').lower()
-            
-            if 'deepfake' in title_lower or 'fake video' in title_lower:
-                evidence_type = "deepfake"
-            elif 'impersona' in title_lower:
-                evidence_type = "impersonation"
-            elif severity >= 7 and sentiment == 'negative':
-                evidence_type = "defamation"
-            elif sentiment == 'negative':
-                evidence_type = "violation"
-            else:
-                evidence_type = "mention"
-            
-            # Build claim text
-            claim_text = mention.get('ai_summary', '') or mention.get('title', '') or f"Evidence item #{i+1}"
-            
-            # Compute item hash
-            source_hashes = [source_hash]
-            item_hash = compute_item_hash(claim_text, source_hashes)
-            
-            # Create evidence item
-            evidence_item = {
-                "id": item_id,
-                "report_id": report_id,
-                "type": evidence_type,
-                "claim_text": claim_text,
-                "severity": severity if isinstance(severity, int) else 5,
-                "sources": [source],
-                "item_hash": item_hash
-            }
+            tree.append(evidence_item['item_hash'])
             evidence_items.append(evidence_item)
-            
-            # Legacy format for backward compatibility
-            legacy_evidence_items.append({
-                "exhibit_number": f"EX-{i+1:03d}",
-                "title": mention.get('title', 'Untitled'),
-                "url": url,
-                "source": mention.get('source_type', 'Unknown'),
-                "platform": mention.get('source_platform', 'Unknown'),
-                "published_date": mention.get('published_at', 'Unknown'),
-                "captured_date": collected_at,
-                "sentiment": sentiment,
-                "severity": severity,
-                "content_excerpt": (raw_snippet[:300] + '...') if raw_snippet else 'N/A'
-            })
+            legacy_evidence_items.append(legacy_item)
         
-        # Compute report hash from all item hashes
-        item_hashes = [item['item_hash'] for item in evidence_items]
-        report_hash = compute_report_hash(item_hashes)
+        # Report hash is the Merkle root over item hashes (in item order)
+        report_hash = tree.root()
         
         # Use AI to generate analysis
         prompt = f"""Generate a professional evidence report summary for potential legal/police filing.
@@ -529,7 +448,8 @@ invalidate the corresponding hashes, allowing detection of tampering."""
             
             # Integrity (NEW)
             "report_hash": report_hash,
-            "hash_algorithm": "SHA-256",
+            "hash_algorithm": MERKLE_HASH_ALGORITHM,
+            "merkle_state": tree.to_state(),
             
             # Legacy format for backward compatibility
             "analysis": analysis,
@@ -575,6 +495,169 @@ invalidate the corresponding hashes, allowing detection of tampering."""
         
         return report
 
+    async def append_evidence_items(
+        self,
+        report: Dict[str, Any],
+        mentions: List[Dict[str, Any]],
+        user_id: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Append new evidence to an existing report without rehashing it.
+        
+        Restores the Merkle tree from the persisted frontier and appends the
+        new item hashes, so the cost is O(k log n) for k new items. Legacy
+        flat-hash reports are upgraded to a Merkle tree on first append.
+        
+        Args:
+            report: Previously generated EvidenceReport dictionary (mutated in place)
+            mentions: New mention dictionaries to add as evidence
+            user_id: The user amending the report (for deepfake lookups)
+        
+        Returns:
+            The updated report with new report_hash, merkle_state and version
+        """
+        self.log_task(f"Appending {len(mentions)} items to evidence report {report.get('id')}")
+        
+        items = report.setdefault('items', [])
+        state = report.get('merkle_state')
+        
+        if report.get('hash_algorithm') == MERKLE_HASH_ALGORITHM and state:
+            tree = MerkleTree.from_state(state)
+        else:
+            # One-time upgrade from the legacy flat hash
+            tree = MerkleTree([item.get('item_hash', '') for item in items])
+        
+        collected_at = datetime.utcnow().isoformat()
+        offset = len(items)
+        new_items = []
+        
+        for i, mention in enumerate(mentions):
+            evidence_item, legacy_item = await self._build_evidence_item(
+                mention, offset + i, report.get('id', ''), user_id, collected_at
+            )
+            tree.append(evidence_item['item_hash'])
+            new_items.append(evidence_item)
+            report.setdefault('evidence_items', []).append(legacy_item)
+        
+        items.extend(new_items)
+        
+        # Only the new items need checking; the existing ones are covered by the root
+        errors = [err for item in new_items for err in verify_item_integrity(item)]
+        
+        report['report_hash'] = tree.root()
+        report['hash_algorithm'] = MERKLE_HASH_ALGORITHM
+        report['merkle_state'] = tree.to_state()
+        report['total_incidents'] = len(items)
+        report['version'] = report.get('version', 1) + 1
+        report['chain_valid'] = report.get('chain_valid', True) and not errors
+        report['chain_verified_at'] = datetime.utcnow().isoformat()
+        
+        if errors:
+            logger.warning(f"⚠️ Chain integrity issues on append: {errors}")
+        
+        return report
+    
+    async def _build_evidence_item(
+        self,
+        mention: Dict[str, Any],
+        index: int,
+        report_id: str,
+        user_id: str,
+        collected_at: str
+    ) -> tuple:
+        """
+        Build one hashed evidence item (plus its legacy exhibit) from a mention.
+        
+        Returns:
+            (evidence_item, legacy_evidence_item)
+        """
+        item_id = str(uuid.uuid4())
+        
+        # Create source from the mention
+        raw_snippet = mention.get('content_snippet', '') or mention.get('description', '') or ''
+        url = mention.get('url', '')
+        
+        # Check for and fetch deepfake analysis if linked
+        deepfake_analysis_id = mention.get('deepfake_analysis_id')
+        deepfake_analysis = None
+        
+        if deepfake_analysis_id and user_id:
+            try:
+                deepfake_analysis = await self._fetch_deepfake_summary(user_id, deepfake_analysis_id)
+            except Exception as e:
+                logger.warning(f"Failed to fetch deepfake analysis {deepfake_analysis_id}: {e}")
+        
+        # Compute source hash (includes stable deepfake fields if present)
+        source_hash = compute_source_hash(
+            raw_snippet, url, collected_at,
+            deepfake_summary=deepfake_analysis
+        )
+        
+        # Create the evidence source
+        source = {
+            "id": str(uuid.uuid4()),
+            "item_id": item_id,
+            "platform": mention.get('source_platform', mention.get('source_type', 'web')),
+            "url": url,
+            "collected_at": collected_at,
+            "raw_snippet": raw_snippet[:500] if raw_snippet else "",
+            "redacted_snippet": redact_pii(raw_snippet[:500]) if raw_snippet else "",
+            "media_refs": [],
+            "screenshot_ref": None,
+            "method": "automated_scan",
+            "source_hash": source_hash,
+            "deepfake_analysis_id": deepfake_analysis_id,
+            "deepfake_analysis": deepfake_analysis
+        }
+        
+        # Determine evidence type from mention characteristics
+        sentiment = mention.get('sentiment', 'neutral')
+        severity = mention.get('severity', 5)
+        title_lower = mention.get('title', '').lower()
+        
+        if 'deepfake' in title_lower or 'fake video' in title_lower:
+            evidence_type = "deepfake"
+        elif 'impersona' in title_lower:
+            evidence_type = "impersonation"
+        elif severity >= 7 and sentiment == 'negative':
+            evidence_type = "defamation"
+        elif sentiment == 'negative':
+            evidence_type = "violation"
+        else:
+            evidence_type = "mention"
+        
+        # Build claim text
+        claim_text = mention.get('ai_summary', '') or mention.get('title', '') or f"Evidence item #{index+1}"
+        
+        # Compute item hash
+        item_hash = compute_item_hash(claim_text, [source_hash])
+        
+        evidence_item = {
+            "id": item_id,
+            "report_id": report_id,
+            "type": evidence_type,
+            "claim_text": claim_text,
+            "severity": severity if isinstance(severity, int) else 5,
+            "sources": [source],
+            "item_hash": item_hash
+        }
+        
+        # Legacy format for backward compatibility
+        legacy_item = {
+            "exhibit_number": f"EX-{index+1:03d}",
+            "title": mention.get('title', 'Untitled'),
+            "url": url,
+            "source": mention.get('source_type', 'Unknown'),
+            "platform": mention.get('source_platform', 'Unknown'),
+            "published_date": mention.get('published_at', 'Unknown'),
+            "captured_date": collected_at,
+            "sentiment": sentiment,
+            "severity": severity,
+            "content_excerpt": (raw_snippet[:300] + '...') if raw_snippet else 'N/A'
+        }
+        
+        return evidence_item, legacy_item
+
     async def _fetch_deepfake_summary(self, user_id: str, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Fetch deepfake analysis and extract stable summary fields for embedding.
@@ -4,15 +4,17 @@ AI-powered competitor event classification, theme extraction, and insight genera
 """
 import uuid
 import json
+import asyncio
 import logging
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from collections import defaultdict
 
 from .base_agent import BaseAgent
+from app.core.security import db
 from app.services.llm_factory import get_model
-from app.services.firestore_service import get_firestore_client
 from app.services.bigquery_service import get_bigquery_service
+from app.utils.keyword_automaton import KeywordAutomaton
 from app.types.competitor_models import (
     Competitor,
     CompetitorEvent,
@@ -25,6 +27,16 @@ from app.types.competitor_models import (
 
 logger = logging.getLogger(__name__)
 
+# Mentions per classification prompt, and prompts in flight at once
+CLASSIFICATION_BATCH_SIZE = 10
+CLASSIFICATION_CONCURRENCY = 3
+
+# Firestore caps a write batch at 500 operations
+FIRESTORE_BATCH_LIMIT = 400
+
+# Compiled once: one pass over the text finds every theme keyword
+THEME_MATCHER = KeywordAutomaton(THEME_KEYWORDS)
+
 
 class RadarAgent(BaseAgent):
     """
@@ -60,6 +72,30 @@ class RadarAgent(BaseAgent):
   "confidence": 0.9,
   "summary": "Competitor launched an AI copilot feature targeting enterprise customers, signaling a major product strategy shift."
 }}
+"""
+
+    BATCH_CLASSIFICATION_PROMPT = """You are a competitive intelligence analyst. Analyze each of these news items about competitor "{competitor_name}".
+
+{mentions}
+
+**Instructions (for EACH item):**
+1. Classify the event type from: pricing, product, messaging, partnership, incident, hiring, funding, legal
+2. Extract 1-3 relevant themes/keywords (e.g., "AI features", "enterprise pricing", "security breach")
+3. Rate the business impact (1-10): How significant is this for the market?
+4. Rate your confidence (0.0-1.0): How certain is this classification?
+5. Write a 1-2 sentence summary of the event's significance
+
+**Return ONLY a JSON array with {count} objects, one per item, in the same order:**
+[
+  {{
+    "mention_index": 0,
+    "type": "product",
+    "themes": ["AI copilot", "enterprise features"],
+    "impact_score": 8,
+    "confidence": 0.9,
+    "summary": "Competitor launched an AI copilot feature targeting enterprise customers."
+  }}
+]
 """
 
     AI_INSIGHT_PROMPT = """You are a strategic advisor analyzing competitor activity for a brand.
@@ -115,13 +151,6 @@ class RadarAgent(BaseAgent):
         title = raw_mention.get("title", "")
         content = raw_mention.get("content", raw_mention.get("snippet", ""))
         source_url = raw_mention.get("source_url", raw_mention.get("url", ""))
-        detected_at = raw_mention.get("detected_at", datetime.utcnow())
-        
-        if isinstance(detected_at, str):
-            try:
-                detected_at = datetime.fromisoformat(detected_at.replace("Z", "+00:00"))
-            except:
-                detected_at = datetime.utcnow()
         
         prompt = self.CLASSIFICATION_PROMPT.format(
             competitor_name=competitor.name,
@@ -141,65 +170,152 @@ class RadarAgent(BaseAgent):
                 self.log_task(f"⚠️ Failed to parse classification for: {title[:50]}")
                 return None
             
-            # Validate and normalize event type
-            event_type_str = result.get("type", "product").lower()
-            try:
-                event_type = EventType(event_type_str)
-            except ValueError:
-                event_type = EventType.PRODUCT  # Default fallback
-            
-            # Compute hash
-            detected_at_str = detected_at.isoformat() if isinstance(detected_at, datetime) else str(detected_at)
-            event_hash = compute_event_hash(title, source_url, detected_at_str)
-            
-            # Create event
-            event = CompetitorEvent(
-                id=str(uuid.uuid4()),
-                competitor_id=competitor.id,
-                competitor_name=competitor.name,
-                user_id=competitor.user_id,
-                type=event_type,
-                themes=result.get("themes", []),
-                detected_at=detected_at,
-                source_url=source_url,
-                source_type=SourceType(raw_mention.get("source_type", "news")),
-                title=title,
-                summary=result.get("summary", ""),
-                raw_snippet=content[:500],
-                impact_score=min(10, max(1, result.get("impact_score", 5))),
-                confidence=min(1.0, max(0.0, result.get("confidence", 0.7))),
-                event_hash=event_hash,
-                region=raw_mention.get("country"),
-                is_processed=True
-            )
-            
-            self.log_task(f"✅ Classified event: {title[:40]}... (type={event_type}, impact={event.impact_score})")
+            event = self._build_event(raw_mention, competitor, result)
+            self.log_task(f"✅ Classified event: {title[:40]}... (type={event.type}, impact={event.impact_score})")
             return event
         
         except Exception as e:
             self.log_task(f"❌ Classification error: {e}")
             return None
     
+    def _build_event(
+        self,
+        raw_mention: Dict[str, Any],
+        competitor: Competitor,
+        result: Dict[str, Any]
+    ) -> CompetitorEvent:
+        """
+        Build a CompetitorEvent from a raw mention and its LLM classification.
+        
+        Args:
+            raw_mention: Dictionary with title, content, source_url, detected_at
+            competitor: The Competitor this mention is about
+            result: Parsed classification (type, themes, impact_score, confidence, summary)
+        
+        Returns:
+            CompetitorEvent
+        """
+        title = raw_mention.get("title", "")
+        content = raw_mention.get("content", raw_mention.get("snippet", ""))
+        source_url = raw_mention.get("source_url", raw_mention.get("url", ""))
+        detected_at = raw_mention.get("detected_at", datetime.utcnow())
+        
+        if isinstance(detected_at, str):
+            try:
+                detected_at = datetime.fromisoformat(detected_at.replace("Z", "+00:00"))
+            except:
+                detected_at = datetime.utcnow()
+        
+        # Validate and normalize event type
+        event_type_str = str(result.get("type", "product")).lower()
+        try:
+            event_type = EventType(event_type_str)
+        except ValueError:
+            event_type = EventType.PRODUCT  # Default fallback
+        
+        # Compute hash
+        detected_at_str = detected_at.isoformat() if isinstance(detected_at, datetime) else str(detected_at)
+        event_hash = compute_event_hash(title, source_url, detected_at_str)
+        
+        return CompetitorEvent(
+            id=str(uuid.uuid4()),
+            competitor_id=competitor.id,
+            competitor_name=competitor.name,
+            user_id=competitor.user_id,
+            type=event_type,
+            themes=result.get("themes", []),
+            detected_at=detected_at,
+            source_url=source_url,
+            source_type=SourceType(raw_mention.get("source_type", "news")),
+            title=title,
+            summary=result.get("summary", ""),
+            raw_snippet=content[:500],
+            impact_score=min(10, max(1, result.get("impact_score", 5))),
+            confidence=min(1.0, max(0.0, result.get("confidence", 0.7))),
+            event_hash=event_hash,
+            region=raw_mention.get("country"),
+            is_processed=True
+        )
+    
     async def classify_events_batch(
         self, 
         raw_mentions: List[Dict[str, Any]], 
-        competitor: Competitor
+        competitor: Competitor,
+        batch_size: int = CLASSIFICATION_BATCH_SIZE
     ) -> List[CompetitorEvent]:
         """
-        Classify multiple mentions in sequence.
+        Classify mentions with one LLM call per batch, running batches concurrently.
+        
+        Mentions a batch response omits (or a batch that fails to parse) fall
+        back to single-mention classification.
         
         Args:
             raw_mentions: List of raw mention dictionaries
             competitor: The Competitor these mentions are about
+            batch_size: Mentions per prompt
         
         Returns:
-            List of successfully classified CompetitorEvents
+            List of successfully classified CompetitorEvents, in input order
         """
-        events = []
-        for mention in raw_mentions:
-            event = await self.classify_event(mention, competitor)
-            if event:
-                events.append(event)
+        if not raw_mentions:
+            return []
+        
+        self._ensure_model()
+        semaphore = asyncio.Semaphore(CLASSIFICATION_CONCURRENCY)
+        
+        async def run_batch(batch: List[Dict[str, Any]]) -> List[Optional[CompetitorEvent]]:
+            async with semaphore:
+                return await self._classify_batch(batch, competitor)
+        
+        batches = [raw_mentions[i:i + batch_size] for i in range(0, len(raw_mentions), batch_size)]
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        events = [event for batch_events in results for event in batch_events if event]
+        self.log_task(f"✅ Classified {len(events)}/{len(raw_mentions)} mentions in {len(batches)} batch(es)")
+        return events
+    
+    async def _classify_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        competitor: Competitor
+    ) -> List[Optional[CompetitorEvent]]:
+        """Classify one batch of mentions in a single prompt."""
+        mentions_text = []
+        for idx, mention in enumerate(batch):
+            content = mention.get("content", mention.get("snippet", ""))
+            mentions_text.append(
+                f"**Item {idx}:**\n"
+                f"Title: {mention.get('title', '')}\n"
+                f"Content: {content[:1000]}\n"
+                f"Source URL: {mention.get('source_url', mention.get('url', ''))}\n"
+            )
+        
+        prompt = self.BATCH_CLASSIFICATION_PROMPT.format(
+            competitor_name=competitor.name,
+            mentions="\n".join(mentions_text),
+            count=len(batch)
+        )
+        
+        results_by_index: Dict[int, Dict[str, Any]] = {}
+        try:
+            response = await self.model.generate_content_async(prompt)
+            for position, result in enumerate(self._parse_json_array(response.text.strip())):
+                if isinstance(result, dict):
+                    results_by_index[result.get("mention_index", position)] = result
+        except Exception as e:
+            self.log_task(f"⚠️ Batch classification failed, falling back per mention: {e}")
+        
+        events: List[Optional[CompetitorEvent]] = []
+        for idx, mention in enumerate(batch):
+            result = results_by_index.get(idx)
+            if result is None:
+                events.append(await self.classify_event(mention, competitor))
+                continue
+            try:
+                events.append(self._build_event(mention, competitor, result))
+            except Exception as e:
+                self.log_task(f"❌ Classification error: {e}")
+                events.append(None)
         return events
     
     async def generate_ai_insight(
@@ -282,15 +398,24 @@ class RadarAgent(BaseAgent):
             event: The CompetitorEvent to match
         
         Returns:
-            Theme name (string)
+            Theme name (string) - the first theme in THEME_KEYWORDS order with a hit
         """
-        event_text = f"{event.title} {' '.join(event.themes)}".lower()
+        themes = self.match_event_themes(event)
+        return themes[0] if themes else "Other"
+    
+    def match_event_themes(self, event: CompetitorEvent) -> List[str]:
+        """
+        Find every theme whose keywords occur in the event, in a single scan.
         
-        for theme_name, keywords in THEME_KEYWORDS.items():
-            if any(kw in event_text for kw in keywords):
-                return theme_name
+        Args:
+            event: The CompetitorEvent to match
         
-        return "Other"
+        Returns:
+            Matching theme names in THEME_KEYWORDS order (empty if none)
+        """
+        event_text = f"{event.title} {' '.join(event.themes)}"
+        hits = THEME_MATCHER.find_labels(event_text)
+        return [theme for theme in THEME_KEYWORDS if theme in hits]
     
     def group_events_by_theme(self, events: List[CompetitorEvent]) -> Dict[str, List[CompetitorEvent]]:
         """
@@ -361,32 +486,7 @@ class RadarAgent(BaseAgent):
         
         # Save to database
         if save_to_db:
-            db = get_firestore_client()
-            bq = get_bigquery_service()
-            
-            for event in events:
-                # Firestore
-                db.collection("competitor_events").document(event.id).set(event.dict())
-                
-                # BigQuery
-                bq.insert_competitor_event({
-                    "event_id": event.id,
-                    "competitor_id": event.competitor_id,
-                    "competitor_name": event.competitor_name,
-                    "user_id": event.user_id,
-                    "event_type": event.type.value,
-                    "themes": event.themes,
-                    "detected_at": event.detected_at.isoformat(),
-                    "source_url": event.source_url,
-                    "source_type": event.source_type.value,
-                    "title": event.title,
-                    "summary": event.summary,
-                    "impact_score": event.impact_score,
-                    "confidence": event.confidence,
-                    "region": event.region,
-                    "event_hash": event.event_hash,
-                })
-            
+            self._save_events(events)
             self.log_task(f"✅ Saved {len(events)} events to database")
         
         return {
@@ -396,6 +496,73 @@ class RadarAgent(BaseAgent):
             "high_impact_count": sum(1 for e in events if e.impact_score >= 7)
         }
     
+    def _save_events(self, events: List[CompetitorEvent]) -> None:
+        """
+        Persist events with chunked Firestore batches and one BigQuery insert.
+        
+        Args:
+            events: Classified CompetitorEvents
+        """
+        batch = db.batch()
+        pending = 0
+        for event in events:
+            batch.set(db.collection("competitor_events").document(event.id), event.dict())
+            pending += 1
+            if pending == FIRESTORE_BATCH_LIMIT:
+                batch.commit()
+                batch = db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+        
+        bq = get_bigquery_service()
+        bq.insert_competitor_events_batch([
+            {
+                "event_id": event.id,
+                "competitor_id": event.competitor_id,
+                "competitor_name": event.competitor_name,
+                "user_id": event.user_id,
+                "event_type": event.type,
+                "themes": event.themes,
+                "detected_at": event.detected_at.isoformat(),
+                "source_url": event.source_url,
+                "source_type": event.source_type,
+                "title": event.title,
+                "summary": event.summary,
+                "impact_score": event.impact_score,
+                "confidence": event.confidence,
+                "region": event.region,
+                "event_hash": event.event_hash,
+            }
+            for event in events
+        ])
+    
+    def _parse_json_array(self, text: str) -> List[Any]:
+        """
+        Parse a JSON array from an LLM response, handling markdown code blocks.
+        
+        Args:
+            text: Raw LLM response text
+        
+        Returns:
+            Parsed list (empty if parsing fails)
+        """
+        if "```json" in text:
+            text = text.split("```json")[1].split("```")[0]
+        elif "```" in text:
+            text = text.split("```")[1].split("```")[0]
+        
+        text = text.strip()
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end <= start:
+            return []
+        
+        try:
+            parsed = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return []
+        return parsed if isinstance(parsed, list) else []
+    
     def _parse_json_response(self, text: str) -> Optional[Dict[str, Any]]:
         """
         Parse JSON from LLM response, handling markdown code blocks.
@@ -58,27 +58,40 @@ class TroubleshootingAgent:
         """ 
         The Watchdog Eye: Fetches Backend Logs, Frontend Logs, and Admin Alerts.
         Defaults to last 1 hour for high-frequency monitoring.
+        
+        For the 1-hour sweep, fresh count() aggregations for client_logs
+        errors and pending failure tasks (see system_health) let it skip
+        Firestore sources that currently have nothing to report.
         """
         combined = []
         # Use timezone-aware UTC
         cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=hours)
         
+        counters = {}
+        if hours == 1:
+            try:
+                from app.services.system_health import compute_watchdog_counters
+                counters = compute_watchdog_counters(db)
+            except Exception as e:
+                logger.warning(f"⚠️ Watchdog: Health counters unavailable: {e}")
+        
         # 1. Frontend Logs (client_logs)
-        try:
-            logs_ref = db.collection("client_logs")\
-                         .where(filter=FieldFilter("timestamp", ">=", cutoff.isoformat()))\
-                         .where(filter=FieldFilter("level", "==", "error"))\
-                         .limit(limit).stream()
-            for doc in logs_ref:
-                d = doc.to_dict()
-                combined.append({
-                    "timestamp": d.get("timestamp"),
-                    "payload": f"📱 [FRONTEND] {d.get('message')} @ {d.get('component')}\nStack: {d.get('stack_trace')[:200]}",
-                    "source": "frontend",
-                    "signature": f"client_{doc.id}"
-                })
-        except Exception as e:
-            logger.warning(f"⚠️ Watchdog: Frontend log fetch failed: {e}")
+        if counters.get("frontend_errors_1h") != 0:
+            try:
+                logs_ref = db.collection("client_logs")\
+                             .where(filter=FieldFilter("timestamp", ">=", cutoff.isoformat()))\
+                             .where(filter=FieldFilter("level", "==", "error"))\
+                             .limit(limit).stream()
+                for doc in logs_ref:
+                    d = doc.to_dict()
+                    combined.append({
+                        "timestamp": d.get("timestamp"),
+                        "payload": f"📱 [FRONTEND] {d.get('message')} @ {d.get('component')}\nStack: {d.get('stack_trace')[:200]}",
+                        "source": "frontend",
+                        "signature": f"client_{doc.id}"
+                    })
+            except Exception as e:
+                logger.warning(f"⚠️ Watchdog: Frontend log fetch failed: {e}")
 
         # 2. Admin Alerts - DEPRECATED / REMOVED
         # Integration errors are now logged to standard backend logs and picked up there.
@@ -87,7 +100,10 @@ class TroubleshootingAgent:
         # These are created by tutorial_agent.py when failures occur
         try:
             failure_types = ['system_failure', 'generation_blocked', 'content_alert']
+            pending_counts = counters.get("pending_failure_tasks", {})
             for failure_type in failure_types:
+                if pending_counts.get(failure_type) == 0:
+                    continue
                 tasks_ref = db.collection("admin_tasks")\
                               .where(filter=FieldFilter("type", "==", failure_type))\
                               .where(filter=FieldFilter("status", "==", "pending"))\
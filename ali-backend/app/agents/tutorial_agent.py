@@ -1013,6 +1013,8 @@ def generate_tutorial(
         # Save to User's Private Collection
         doc_ref = db.collection("users").document(user_id).collection("tutorials").add(tutorial_data)
         tutorial_data["id"] = doc_ref[1].id
+        from app.services.user_summary_service import get_user_summary_service
+        get_user_summary_service().record_tutorial_created(user_id)
         
         # Save to Global Index
         try:
@@ -4,7 +4,12 @@ Master Motion Templates Library v2.0
 
 Templates: luxury, cyber, editorial, minimal
 Each template includes: Film grain overlay, GSAP animations, advanced CSS effects
+
+Templates are compiled once (see compile_motion_template) and renders only
+substitute the per-asset slots into the cached static HTML.
 """
+import re
+from functools import lru_cache
 
 # CDN Links
 GSAP_CDN = "https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/gsap.min.js"
@@ -293,7 +298,8 @@ GLOBAL_FAILSAFE_CSS = '''
         visibility: visible !important;
     }
     
-    /* Marker class for screenshot capture timing */
+    /* Marker class for screenshot capture timing: templates that time their own
+       reveal set data-render-signal on <body> and add this class when done */
     body.animation-complete {
         /* No visual change - this class signals GSAP animations are done */
     }
@@ -339,6 +345,66 @@ def _get_pattern_overlay_html(pattern_svg: str) -> str:
 
 
 
+# ============================================================================
+# COMPILED RENDERERS
+# Each template is formatted once with slot markers in place of the per-asset
+# values; a render then just joins the cached static chunks with the values.
+# ============================================================================
+
+# Letters/underscores only, so markers survive the pattern overlay's URL-encoding
+_SLOT_MARKER = "__aliSlot{}__"
+_SLOT_RE = re.compile(r"__aliSlot([A-Za-z]+)_*__")
+HUGE_TEXT_LIMIT = 30  # Mirrors the `len(text) < 30` text-huge rule in each template
+_LUMINANCE_TEMPLATES = {"aurora", "gridlock"}  # Only these read luminance_mode
+_COLOR_BAKED_TEMPLATES = {"aurora"}  # Derives blob colours from the hex value itself
+
+
+class CompiledTemplate:
+    """A motion template split into static chunks around its slots."""
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, html: str):
+        # Static chunks at even indices, slot names at odd ones
+        self.parts = _SLOT_RE.split(html)
+        self.slots = tuple(enumerate(self.parts[1::2]))
+
+    def render(self, values: dict) -> str:
+        parts = self.parts[:]
+        for i, slot in self.slots:
+            parts[2 * i + 1] = values[slot]
+        return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_motion_template(
+    template_name: str,
+    luminance_mode: str = 'dark',
+    huge_text: bool = True,
+    has_pattern: bool = False,
+    baked_color: str = None
+) -> CompiledTemplate:
+    """
+    Format a template once with slot markers. Inputs that change the markup
+    beyond plain substitution (text length class, luminance, pattern layer,
+    aurora's derived colours) are part of the cache key instead.
+    """
+    text_marker = _SLOT_MARKER.format("Text")
+    if not huge_text:
+        text_marker = text_marker[:-2] + "_" * (HUGE_TEXT_LIMIT - len(text_marker)) + "__"
+
+    html = _build_motion_template(
+        template_name,
+        _SLOT_MARKER.format("Image"),
+        _SLOT_MARKER.format("Logo"),
+        baked_color if baked_color is not None else _SLOT_MARKER.format("Color"),
+        text_marker,
+        luminance_mode,
+        _SLOT_MARKER.format("Variant"),
+        _SLOT_MARKER.format("Pattern") if has_pattern else None,
+    )
+    return CompiledTemplate(html)
+
+
 def get_motion_template(template_name: str, image_url: str, logo_url: str, color: str, text: str, luminance_mode: str = 'dark', layout_variant: str = 'hero-center', pattern_svg: str = None) -> str:
     """
     Returns complete HTML5 motion asset for the given template.
@@ -363,7 +429,28 @@ def get_motion_template(template_name: str, image_url: str, logo_url: str, color
     Returns:
         Complete HTML string ready for base64 encoding
     """
+    if template_name not in MOTION_TEMPLATES:
+        template_name = "minimal"
+
+    compiled = compile_motion_template(
+        template_name,
+        luminance_mode if template_name in _LUMINANCE_TEMPLATES else 'dark',
+        len(text) < HUGE_TEXT_LIMIT,
+        bool(pattern_svg),
+        str(color) if template_name in _COLOR_BAKED_TEMPLATES else None,
+    )
+    return compiled.render({
+        "Image": str(image_url),
+        "Logo": str(logo_url),
+        "Color": str(color),
+        "Text": str(text),
+        "Variant": str(layout_variant),
+        "Pattern": _encode_pattern_svg(pattern_svg),
+    })
+
 
+def _build_motion_template(template_name: str, image_url: str, logo_url: str, color: str, text: str, luminance_mode: str = 'dark', layout_variant: str = 'hero-center', pattern_svg: str = None) -> str:
+    """Format a template from scratch (the compile step; see get_motion_template)."""
     if template_name == "luxury":
         return _luxury_template(image_url, logo_url, color, text, layout_variant, pattern_svg)
     elif template_name == "cyber":
@@ -134,7 +134,8 @@ async def lifespan(app: FastAPI):
     
     # V6.0: Cleanup BrowserPool on shutdown
     try:
-        from app.services.asset_processor import BrowserPool
+        from app.services.asset_processor import BrowserPool, MermaidRenderer
+        await MermaidRenderer.shutdown()
         await BrowserPool.shutdown()
     except Exception as e:
         logger.warning(f"⚠️ BrowserPool shutdown error: {e}")
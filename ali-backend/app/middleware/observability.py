@@ -18,6 +18,7 @@ Usage:
 import uuid
 import time
 import logging
+import threading
 from typing import Optional
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
@@ -318,6 +319,51 @@ class MetricsCollector:
 metrics_collector = MetricsCollector()
 
 
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram, one series per label.
+    Cheap enough to record on every render; thread-safe.
+    """
+    
+    DEFAULT_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 3000, 5000, 10000)
+    
+    def __init__(self, buckets_ms: tuple = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._series: dict = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, latency_ms: float, label: str = "default") -> None:
+        """Record one sample under `label`."""
+        index = next((i for i, bound in enumerate(self.buckets_ms) if latency_ms <= bound), len(self.buckets_ms))
+        with self._lock:
+            series = self._series.setdefault(label, {"counts": [0] * (len(self.buckets_ms) + 1), "sum_ms": 0.0})
+            series["counts"][index] += 1
+            series["sum_ms"] += latency_ms
+    
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            {
+                "buckets_ms": [50, 100, ...],  # Upper bounds; counts has one extra overflow slot
+                "series": {label: {"counts": [...], "count": int, "mean_ms": float}}
+            }
+        """
+        with self._lock:
+            series = {
+                label: {
+                    "counts": list(s["counts"]),
+                    "count": sum(s["counts"]),
+                    "mean_ms": round(s["sum_ms"] / sum(s["counts"]), 2)
+                }
+                for label, s in self._series.items()
+            }
+        return {"buckets_ms": list(self.buckets_ms), "series": series}
+
+
+# HTML → image render latency, labelled by how readiness was reached
+render_latency_histogram = LatencyHistogram()
+
+
 class MetricsMiddleware(BaseHTTPMiddleware):
     """
     Middleware to collect request metrics for the System Health dashboard.
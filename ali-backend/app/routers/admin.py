@@ -2,6 +2,7 @@
 from app.core.security import verify_token, db
 from app.services.metricool_client import MetricoolClient
 from app.services.performance_logger import run_nightly_performance_log
+from app.services.user_summary_service import get_user_summary_service
 from typing import Dict, Optional, List
 from datetime import datetime
 from google.cloud import firestore
@@ -68,6 +69,7 @@ def admin_link_metricool(payload: Dict[str, str] = Body(...), admin: dict = Depe
             "metricool_blog_id": blog_id,
             "linked_at": datetime.utcnow().isoformat()
         }, merge=True)
+        get_user_summary_service().refresh_integrations(target_uid)
 
         # 2. 🔔 Send "Success" Notification to the User's secure feed
         notification_ref = db.collection("users").document(target_uid).collection("notifications").document("integration_success")
@@ -124,6 +126,7 @@ def verify_user_channels(target_uid: str, admin: dict = Depends(verify_admin)):
                 db.collection("users").document(target_uid).collection("user_integrations").document("metricool").update({
                     "connected_providers": info.get("connected")
                 })
+                get_user_summary_service().refresh_integrations(target_uid)
             
             # Handle case where get_account_info returns None or error dict
             if not info or "error" in info:
@@ -149,59 +152,32 @@ def get_performance_logs(target_user_id: Optional[str] = None, admin: dict = Dep
 # /integration-alerts endpoint removed
 
 @router.get("/research/users")
-def get_research_users(admin: dict = Depends(verify_admin)):
+def get_research_users(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    admin: dict = Depends(verify_admin)
+):
     """
     Aggregates user statistics for the Research Admin Dashboard.
     Returns: List of users with Profile, Integrations, and Performance Stats.
+
+    One page of users plus one batched read of their user_summaries docs
+    (maintained on write); pass `next_cursor` back as `cursor` for more.
+    Campaign stats are all-time totals over campaign_performance.
     """
-    users_ref = db.collection("users").limit(100) # Increased limit for better visibility
-    users = users_ref.stream()
+    summary_service = get_user_summary_service()
+    users, next_cursor = summary_service.list_users_page(limit, cursor)
+    summaries = summary_service.get_summaries([u.id for u in users])
     
     results = []
     for user_doc in users:
         uid = user_doc.id
-        data = user_doc.to_dict()
+        data = user_doc.to_dict() or {}
         profile = data.get("profile", {})
-        
-        # 1. Integrations
-        integrations = []
-        int_docs = db.collection("users").document(uid).collection("user_integrations").stream()
-        for d in int_docs:
-            i_data = d.to_dict()
-            if i_data.get("status") == "active" or i_data.get("metricool_blog_id"):
-                integrations.append(i_data.get("platform", "unknown"))
-        
-        # 2. Performance (Quick Aggregation)
-        # Note: In a real app, this should be pre-calculated. Here we scan the last 20 logs.
-        perf_docs = db.collection("users").document(uid).collection("campaign_performance").limit(20).stream()
-        total_spend = 0.0
-        total_clicks = 0
-        count = 0
-        
-        # New: Get Active Channels directly from Integration Status if available
-        active_channels = set()
-        
-        # Check metricool integration doc for cached connection data
-        metricool_doc = db.collection("users").document(uid).collection("user_integrations").document("metricool").get()
-        if metricool_doc.exists:
-            m_data = metricool_doc.to_dict()
-            if m_data.get("status") == "active":
-                for provider in m_data.get("connected_providers", []):
-                    active_channels.add(provider)
-        
-        for p in perf_docs:
-            p_data = p.to_dict()
-            total_spend += float(p_data.get("spend", 0))
-            total_clicks += int(p_data.get("clicks", 0))
-            count += 1
-            
-        avg_ctr = 0
-        if count > 0:
-            # Simple average of CTRs might be misleading, but sufficient for "at a glance"
-            # Better: Total Clicks / Total Impressions (if we had impressions)
-            pass 
+        summary = summaries.get(uid, {})
+        campaign_stats = summary.get("campaign_stats", {})
 
-        # 3. Get ads_generated from root-level stats (Atomic Counter)
+        # ads_generated from root-level stats (Atomic Counter)
         user_stats = data.get("stats", {})
         ads_generated = user_stats.get("ads_generated", 0)
         
@@ -211,17 +187,18 @@ def get_research_users(admin: dict = Depends(verify_admin)):
             "name": data.get("name", "Anonymous"),
             "learning_style": profile.get("cognitive_style", "Not Assessed"),
             "marketing_level": profile.get("marketing_knowledge", "N/A"),
-            "connected_platforms": integrations,
-            "active_channels": list(active_channels),
+            "connected_platforms": summary.get("connected_platforms", []),
+            "active_channels": summary.get("active_channels", []),
             "stats": {
-                "total_spend": round(total_spend, 2),
-                "total_clicks": total_clicks,
-                "data_points": count,
+                "total_spend": round(campaign_stats.get("total_spend", 0.0), 2),
+                "total_clicks": campaign_stats.get("total_clicks", 0),
+                "data_points": campaign_stats.get("data_points", 0),
                 "ads_generated": ads_generated
-            }
+            },
+            "last_activity_at": summary.get("last_activity_at")
         })
         
-    return {"users": results}
+    return {"users": results, "next_cursor": next_cursor}
 
 # PRESERVED: Original Nightly Job Trigger
 @router.post("/jobs/trigger-nightly-log")
@@ -270,25 +247,21 @@ def get_all_tutorials(admin: dict = Depends(verify_admin)):
     try:
         # Fetch all global tutorials
         tutorials_ref = db.collection("tutorials").order_by("timestamp", direction=firestore.Query.DESCENDING).limit(100)
-        tutorials = tutorials_ref.stream()
-        
-        results = []
-        user_cache = {} # Cache user emails to reduce reads
+        tutorials = [(doc, doc.to_dict()) for doc in tutorials_ref.stream()]
 
-        for doc in tutorials:
-            data = doc.to_dict()
+        # Resolve owner emails with one batched read
+        owner_ids = list(dict.fromkeys(data.get("owner_id") for _, data in tutorials if data.get("owner_id")))
+        user_emails = {}
+        if owner_ids:
+            owner_refs = [db.collection("users").document(uid) for uid in owner_ids]
+            for user_doc in db.get_all(owner_refs):
+                if user_doc.exists:
+                    user_emails[user_doc.id] = (user_doc.to_dict() or {}).get("email", "Unknown")
+
+        results = []
+        for doc, data in tutorials:
             owner_id = data.get("owner_id")
-            
-            # Resolve User Email
-            user_email = "Unknown"
-            if owner_id:
-                if owner_id in user_cache:
-                    user_email = user_cache[owner_id]
-                else:
-                    user_doc = db.collection("users").document(owner_id).get()
-                    if user_doc.exists:
-                        user_email = user_doc.to_dict().get("email", "Unknown")
-                        user_cache[owner_id] = user_email
+            user_email = user_emails.get(owner_id, "Unknown")
             
             results.append({
                 "id": doc.id,
@@ -477,7 +450,15 @@ def delete_tutorial(tutorial_id: str, admin: dict = Depends(verify_admin)):
         # 3. Delete Private (if owner exists)
         if owner_id:
             private_ref = db.collection("users").document(owner_id).collection("tutorials").document(tutorial_id)
-            private_ref.delete()
+            private_doc = private_ref.get()
+            if private_doc.exists:
+                private_data = private_doc.to_dict() or {}
+                private_ref.delete()
+                get_user_summary_service().record_tutorial_deleted(
+                    owner_id,
+                    was_completed=bool(private_data.get("is_completed")),
+                    score=private_data.get("completion_score", 0)
+                )
             
         return {"status": "success", "message": "Tutorial deleted successfully"}
         
@@ -955,11 +936,8 @@ def trigger_request_generation(request_id: str, admin: dict = Depends(verify_adm
                 # --- SAGA MAP: Update Module's tutorialIds ---
                 if saga_map_data.get("moduleId"):
                     try:
-                        module_ref = db.collection("modules").document(saga_map_data["moduleId"])
-                        module_ref.update({
-                            "tutorialIds": firestore.ArrayUnion([tutorial_id]),
-                            "updatedAt": datetime.utcnow().isoformat()
-                        })
+                        from app.services.saga_map_service import get_saga_map_service
+                        get_saga_map_service().add_tutorial_to_module(saga_map_data["moduleId"], tutorial_id)
                         logger.info(f"🗺️ Saga Map: Added tutorial {tutorial_id} to module {saga_map_data['moduleId']}")
                     except Exception as module_err:
                         logger.warning(f"⚠️ Failed to update module tutorialIds: {module_err}")
@@ -1380,6 +1358,7 @@ def acknowledge_research_alert(alert_id: str, admin: dict = Depends(verify_admin
 # SYSTEM HEALTH OBSERVABILITY (Enterprise-Grade Monitoring)
 # ============================================================================
 
+import asyncio
 import os
 import sys
 import time
@@ -1417,7 +1396,7 @@ async def get_system_health(admin: dict = Depends(verify_system_admin)):
     - Endpoint health checks
     """
     try:
-        from app.middleware.observability import metrics_collector
+        from app.middleware.observability import metrics_collector, render_latency_histogram
         
         # === 1. API Latency Metrics ===
         latency_metrics = metrics_collector.get_latency_percentiles(window_seconds=3600)
@@ -1432,22 +1411,12 @@ async def get_system_health(admin: dict = Depends(verify_system_admin)):
         }
         
         # === 3. Queue Depths (Firestore-based job queues) ===
-        queued_deepfake_jobs = 0
-        queued_scan_jobs = 0
-        
-        try:
-            # Count deepfake jobs across all users
-            deepfake_query = db.collection_group('deepfake_jobs').where('status', '==', 'queued').limit(100)
-            queued_deepfake_jobs = len(list(deepfake_query.stream()))
-        except Exception as e:
-            logger.warning(f"⚠️ Could not query deepfake jobs: {e}")
-        
-        try:
-            # Count pending scan jobs
-            scan_query = db.collection('scheduled_scans').where('status', '==', 'pending').limit(100)
-            queued_scan_jobs = len(list(scan_query.stream()))
-        except Exception as e:
-            logger.warning(f"⚠️ Could not query scan jobs: {e}")
+        # count() aggregations, cached briefly and shared with the watchdog
+        from app.services.system_health import get_health_counters
+        counters = await asyncio.to_thread(get_health_counters, db)
+
+        queued_deepfake_jobs = counters["queued_deepfake_jobs"] or 0
+        queued_scan_jobs = counters["pending_scan_jobs"] or 0
         
         queue_depths = {
             "deepfake_analysis": queued_deepfake_jobs,
@@ -1458,49 +1427,20 @@ async def get_system_health(admin: dict = Depends(verify_system_admin)):
         # === 4. Scanner Status ===
         scanner_status = {
             "last_scan_time": None,
-            "last_successful_scan": None,
-            "scanner_job_failures_24h": 0,
+            "last_successful_scan": counters["last_successful_scan"],
+            "scanner_job_failures_24h": counters["scan_failures_24h"] or 0,
             "scanner_active": True
         }
         
         try:
             from app.services.brand_monitoring_scanner import get_scanner
             scanner = get_scanner()
-            if hasattr(scanner, 'last_scan') and scanner.last_scan:
-                # Get system-level last scan
-                last_scan_val = scanner.last_scan.get("system")
-                if last_scan_val:
-                    scanner_status["last_scan_time"] = last_scan_val.isoformat() if hasattr(last_scan_val, 'isoformat') else str(last_scan_val)
+            # System-level last hourly run on this instance
+            if scanner.last_run_at:
+                scanner_status["last_scan_time"] = scanner.last_run_at.isoformat()
         except Exception as e:
             logger.warning(f"⚠️ Could not get scanner status: {e}")
         
-        try:
-            # Find last successful scan
-            last_scan_docs = list(
-                db.collection('scheduled_scans')
-                  .where('status', '==', 'completed')
-                  .order_by('completed_at', direction=firestore.Query.DESCENDING)
-                  .limit(1)
-                  .stream()
-            )
-            if last_scan_docs:
-                last_completed = last_scan_docs[0].to_dict().get('completed_at')
-                if last_completed:
-                    scanner_status["last_successful_scan"] = last_completed.isoformat() if hasattr(last_completed, 'isoformat') else str(last_completed)
-            
-            # Count scanner failures in last 24h
-            yesterday = datetime.utcnow() - timedelta(hours=24)
-            failed_scans = list(
-                db.collection('scheduled_scans')
-                  .where('status', '==', 'failed')
-                  .where('created_at', '>=', yesterday)
-                  .limit(100)
-                  .stream()
-            )
-            scanner_status["scanner_job_failures_24h"] = len(failed_scans)
-        except Exception as e:
-            logger.warning(f"⚠️ Could not query scan history: {e}")
-        
         # === 5. Endpoint Health Checks ===
         health_checks = [
             {
@@ -1569,7 +1509,9 @@ async def get_system_health(admin: dict = Depends(verify_system_admin)):
                 "failure_rate": failure_metrics,
                 "queue_depths": queue_depths,
                 "scanner": scanner_status,
-                "health_checks": health_checks
+                "health_checks": health_checks,
+                "render_latency": render_latency_histogram.snapshot(),
+                "counters_computed_at": counters["computed_at"]
             }
         }
         
@@ -1678,21 +1620,24 @@ async def export_diagnostics(admin: dict = Depends(verify_system_admin)):
 @router.get("/learning-analytics/users")
 def get_all_users_learning_summary(
     limit: int = 50,
+    cursor: Optional[str] = None,
     admin: dict = Depends(verify_admin)
 ):
     """
     ADMIN: Get learning performance summary for all users.
     Used for admin dashboard overview of academic performance.
+    Paginated: pass `next_cursor` back as `cursor` for the next page.
     """
     try:
         from app.agents.performance_analyzer_agent import get_performance_analyzer
         
         analyzer = get_performance_analyzer()
-        summaries = analyzer.get_all_users_summary(limit)
+        summaries, next_cursor = analyzer.get_users_summary_page(limit, cursor=cursor)
         
         return {
             "users": summaries,
-            "total": len(summaries)
+            "total": len(summaries),
+            "next_cursor": next_cursor
         }
     except Exception as e:
         logger.error(f"❌ Learning analytics users error: {e}")
@@ -3,7 +3,8 @@ Brand Monitoring Router
 API endpoints for brand reputation monitoring, crisis management,
 competitor tracking, and PR content generation.
 """
-from fastapi import APIRouter, Depends, HTTPException, Response, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import logging
@@ -406,7 +407,11 @@ async def update_monitoring_settings(
             "user_id": user_id
         }
         
-        db.collection('user_integrations').document(f"{user_id}_brand_monitoring").set(settings_data)
+        from app.services.brand_monitoring_scanner import scan_schedule_fields
+        db.collection('user_integrations').document(f"{user_id}_brand_monitoring").set({
+            **settings_data,
+            **scan_schedule_fields(request.auto_monitor is not False)
+        })
         
         logger.info(f"✅ Updated monitoring settings for user: {user_id}")
         return {"status": "success", "settings": settings_data}
@@ -508,14 +513,19 @@ async def update_entity_config(
     user_id = user['uid']
     
     try:
+        from app.services.brand_monitoring_scanner import scan_schedule_fields
+        
         doc_ref = db.collection('user_integrations').document(f"{user_id}_brand_monitoring")
+        existing = doc_ref.get()
+        auto_monitor = (existing.to_dict() or {}).get("auto_monitor", True) if existing.exists else True
         
         doc_ref.set({
             "monitoring_mode": request.monitoring_mode,
             "company_name": request.company_name,
             "personal_name": request.personal_name,
             "strategic_agendas": request.strategic_agendas or [],
-            "user_id": user_id
+            "user_id": user_id,
+            **scan_schedule_fields(auto_monitor is not False)
         }, merge=True)
         
         logger.info(f"✅ Updated entity config for user: {user_id}")
@@ -1486,7 +1496,7 @@ async def export_evidence_report(
     
     try:
         from app.types.evidence_models import verify_chain_integrity
-        from app.utils.zip_builder import build_evidence_package_zip, get_export_filename
+        from app.utils.zip_builder import stream_evidence_package_zip, get_export_filename
         
         # Fetch the report
         report_ref = db.collection('users').document(user_id).collection('evidence_reports').document(report_id)
@@ -1505,20 +1515,17 @@ async def export_evidence_report(
         if not verification['valid']:
             logger.warning(f"⚠️ Exporting report {report_id} with chain integrity issues: {verification['errors']}")
         
-        # Build the ZIP package
-        zip_bytes = build_evidence_package_zip(
-            report=report,
-            user_id=user_id,
-            request_id=request_id
-        )
-        
         filename = get_export_filename(report)
         
-        logger.info(f"📦 Evidence package exported: {filename}, {len(zip_bytes)} bytes, request_id={request_id}")
+        logger.info(f"📦 Evidence package export started: {filename}, request_id={request_id}")
         
-        # Return as downloadable attachment
-        return Response(
-            content=zip_bytes,
+        # Stream the ZIP package as a downloadable attachment
+        return StreamingResponse(
+            stream_evidence_package_zip(
+                report=report,
+                user_id=user_id,
+                request_id=request_id
+            ),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"',
@@ -1601,6 +1608,108 @@ async def verify_evidence_report(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/evidence-report/{report_id}/items")
+async def append_evidence_report_items(
+    report_id: str,
+    request: Dict[str, Any],
+    user: dict = Depends(verify_token)
+):
+    """
+    Append new evidence to a saved report.
+
+    The report's Merkle tree is extended from its persisted frontier, so
+    existing items are not rehashed. Legacy flat-hash reports are upgraded.
+
+    Request body:
+        mentions: List[Dict] - New evidence items to add
+
+    Response:
+        report_hash: str - New Merkle root
+        version: int - Incremented report version
+        added: int - Number of items appended
+    """
+    user_id = user['uid']
+    mentions = request.get('mentions', [])
+
+    if not mentions:
+        raise HTTPException(status_code=400, detail="Mentions required for append")
+
+    try:
+        report_ref = db.collection('users').document(user_id).collection('evidence_reports').document(report_id)
+        doc = report_ref.get()
+
+        if not doc.exists:
+            raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+
+        protection_agent = ProtectionAgent()
+        report = await protection_agent.append_evidence_items(
+            report=doc.to_dict(),
+            mentions=mentions,
+            user_id=user_id
+        )
+        report_ref.set(report)
+
+        logger.info(f"✅ Appended {len(mentions)} items to evidence report {report_id}")
+
+        return {
+            "status": "success",
+            "report_id": report_id,
+            "report_hash": report['report_hash'],
+            "version": report['version'],
+            "added": len(mentions),
+            "chain_valid": report.get('chain_valid', False)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Append evidence items error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/evidence-report/{report_id}/items/{item_id}/proof")
+async def get_evidence_inclusion_proof(
+    report_id: str,
+    item_id: str,
+    user: dict = Depends(verify_token)
+):
+    """
+    Get an O(log n) Merkle inclusion proof for a single evidence item.
+
+    The proof can be verified offline with tools/verify_evidence_package.py
+    (--proof) against the report hash, without sharing any other item.
+
+    Response:
+        proof: {item_id, item_hash, leaf_index, tree_size, proof, root, algorithm}
+    """
+    user_id = user['uid']
+
+    try:
+        from app.types.evidence_models import build_inclusion_proof
+
+        report_ref = db.collection('users').document(user_id).collection('evidence_reports').document(report_id)
+        doc = report_ref.get()
+
+        if not doc.exists:
+            raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+
+        try:
+            proof = build_inclusion_proof(doc.to_dict(), item_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "status": "success",
+            "proof": proof
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Inclusion proof error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/evidence-reports")
 async def list_evidence_reports(
     limit: int = 20,
@@ -1778,26 +1887,24 @@ async def get_scan_status(
     user_id = user['uid']
     
     try:
-        from app.services.brand_monitoring_scanner import get_scanner
-        from datetime import timedelta
-        
-        scanner = get_scanner()
-        last_scan = scanner.last_scan.get(user_id)
+        settings_doc = db.collection('user_integrations').document(f"{user_id}_brand_monitoring").get()
+        settings = settings_doc.to_dict() if settings_doc.exists else {}
+        last_scan = settings.get("last_scan_at")
+        next_scan = settings.get("next_scan_at")
         
         if last_scan:
-            next_scan = last_scan + timedelta(hours=1)
             return {
                 "status": "success",
                 "last_scan": last_scan.isoformat(),
-                "next_scan": next_scan.isoformat(),
-                "scanner_active": True
+                "next_scan": next_scan.isoformat() if next_scan else None,
+                "scanner_active": settings.get("brand_monitoring_enabled", False)
             }
         else:
             return {
                 "status": "success",
                 "last_scan": None,
                 "next_scan": "Will run on next hourly cycle",
-                "scanner_active": True
+                "scanner_active": settings.get("brand_monitoring_enabled", False)
             }
         
     except Exception as e:
@@ -3,9 +3,10 @@ Creative drafts endpoints for authenticated users.
 """
 import base64
 import io
-import zipfile
 import logging
-from typing import List, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import unquote, urlparse
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -15,9 +16,14 @@ from google.cloud.firestore_v1.base_query import FieldFilter
 
 from app.core.security import db, get_current_user_id
 from app.services.gcs_service import GCSService
+from app.utils.zip_builder import stream_zip
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
+
+# Max concurrent asset downloads per ZIP export; also bounds how many fetched
+# assets are held in memory while waiting to be written in order.
+EXPORT_FETCH_CONCURRENCY = 4
 KNOWN_CHANNELS = [
     "linkedin",
     "instagram",
@@ -320,6 +326,43 @@ def download_asset(draft_id: str, user_id: str = Depends(get_current_user_id)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _fetch_in_order(
+    items: Iterable[dict],
+    fetch: Callable[[dict], Tuple[bytes, str, str]],
+    max_workers: int = EXPORT_FETCH_CONCURRENCY
+) -> Iterator[Tuple[dict, Optional[Tuple[bytes, str, str]]]]:
+    """
+    Fetch items concurrently but yield results in input order.
+
+    Uses a sliding window of max_workers futures, so at most that many
+    payloads are in flight or buffered at once. Failed fetches yield None.
+    """
+    items_iter = iter(items)
+    window = deque()
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        def submit_next() -> None:
+            item = next(items_iter, None)
+            if item is not None:
+                window.append((item, executor.submit(fetch, item)))
+
+        for _ in range(max_workers):
+            submit_next()
+
+        while window:
+            item, future = window.popleft()
+            submit_next()
+            try:
+                yield item, future.result()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not fetch asset for {item.get('id', 'unknown')}: {e}")
+                yield item, None
+    finally:
+        # Client disconnects close the generator early; drop queued downloads
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 @router.post("/{campaign_id}/export-zip")
 def export_campaign_zip(
     campaign_id: str,
@@ -347,16 +390,19 @@ def export_campaign_zip(
                 resolve_timestamp(asset.get("createdAt"))
             )
 
-        def build_unique_filename(zip_file: zipfile.ZipFile, filename: str) -> str:
+        used_filenames = set()
+
+        def build_unique_filename(filename: str) -> str:
             base_name = filename
             counter = 1
-            while filename in {info.filename for info in zip_file.infolist()}:
+            while filename in used_filenames:
                 if "." in base_name:
                     name, extension = base_name.rsplit(".", 1)
                     filename = f"{name}_{counter}.{extension}"
                 else:
                     filename = f"{base_name}_{counter}"
                 counter += 1
+            used_filenames.add(filename)
             return filename
 
         def fetch_asset_bytes(asset_url: str) -> Tuple[bytes, str, str]:
@@ -421,47 +467,43 @@ def export_campaign_zip(
             if asset_key not in latest_assets or candidate["_recency"] > latest_assets[asset_key]["_recency"]:
                 latest_assets[asset_key] = candidate
 
-        # Create ZIP in memory
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for asset in latest_assets.values():
-                asset_url = asset.get("asset_url") or asset.get("url") or asset.get("assetPayload")
-                if not asset_url:
-                    continue
-
-                try:
-                    payload, content_type, ext = fetch_asset_bytes(asset_url)
-
-                    asset_channel = asset.get("channel", "asset")
-                    format_label = asset.get("formatLabel", "primary")
-                    filename = f"{asset_channel}_{format_label}.{ext}"
-                    filename = build_unique_filename(zip_file, filename)
-
-                    zip_file.writestr(filename, payload)
-                    logger.info(f"📦 Added {filename} to ZIP")
+        # Deterministic member order regardless of Firestore stream order
+        export_assets = [
+            latest_assets[key] for key in sorted(latest_assets)
+            if latest_assets[key].get("asset_url") or latest_assets[key].get("url") or latest_assets[key].get("assetPayload")
+        ]
 
-                    text_copy = asset.get("textCopy")
-                    if text_copy:
-                        copy_filename = f"{asset_channel}_{format_label}_copy.txt"
-                        copy_filename = build_unique_filename(zip_file, copy_filename)
-                        zip_file.writestr(copy_filename, text_copy)
-                        logger.info(f"📝 Added {copy_filename} to ZIP")
+        def fetch_asset(asset: dict) -> Tuple[bytes, str, str]:
+            return fetch_asset_bytes(asset.get("asset_url") or asset.get("url") or asset.get("assetPayload"))
 
-                except Exception as e:
-                    logger.warning(f"⚠️ Could not fetch asset {asset_url}: {e}")
+        def iter_members() -> Iterator[Tuple[str, List[bytes]]]:
+            added = 0
+            for asset, fetched in _fetch_in_order(export_assets, fetch_asset):
+                if fetched is None:
                     continue
+                payload, content_type, ext = fetched
+
+                asset_channel = asset.get("channel", "asset")
+                format_label = asset.get("formatLabel", "primary")
+                filename = build_unique_filename(f"{asset_channel}_{format_label}.{ext}")
+                yield filename, [payload]
+                logger.info(f"📦 Added {filename} to ZIP")
+                added += 1
 
-        zip_buffer.seek(0)
+                text_copy = asset.get("textCopy")
+                if text_copy:
+                    copy_filename = build_unique_filename(f"{asset_channel}_{format_label}_copy.txt")
+                    yield copy_filename, [text_copy.encode("utf-8")]
+                    logger.info(f"📝 Added {copy_filename} to ZIP")
 
-        logger.info(f"✅ Created ZIP with {len(latest_assets)} assets for campaign {campaign_id}")
+            logger.info(f"✅ Streamed ZIP with {added} assets for campaign {campaign_id}")
 
         filename = f"campaign_{campaign_id}_assets.zip"
         if channel:
             filename = f"campaign_{campaign_id}_{channel}_assets.zip"
 
         return StreamingResponse(
-            zip_buffer,
+            stream_zip(iter_members()),
             media_type="application/zip",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
@@ -1,6 +1,7 @@
 ﻿from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from app.core.security import verify_token, db
 from app.services.metricool_client import MetricoolClient
+from app.services.user_summary_service import get_user_summary_service
 import logging
 from datetime import datetime, timedelta
 
@@ -62,6 +63,7 @@ def request_metricool_access(user: dict = Depends(verify_token)):
                         "connected_providers": [], # Will be re-fetched by next status call
                         "reconnected_at": datetime.utcnow().isoformat()
                     }, merge=True)
+                    get_user_summary_service().refresh_integrations(user_id)
                     return {"status": "restored", "message": "Access restored successfully."}
             except Exception as e:
                 logger.warning(f"Smart reconnect failed for {user_id}: {e}")
@@ -72,6 +74,7 @@ def request_metricool_access(user: dict = Depends(verify_token)):
         "user_id": user_id, "platform": "metricool", "status": "pending", 
         "requested_at": datetime.utcnow().isoformat()
     }, merge=True)
+    get_user_summary_service().refresh_integrations(user_id)
     
     # 4. 🔔 SIGNAL ADMIN: Create task in global collection
     db.collection("admin_tasks").document(f"connect_{user_id}").set({
@@ -89,6 +92,7 @@ def disconnect_platform(platform: str, user: dict = Depends(verify_token)):
     db.collection("users").document(user['uid']).collection("user_integrations").document(platform).update({
         "status": "disconnected"
     })
+    get_user_summary_service().refresh_integrations(user['uid'])
     return {"status": "disconnected"}
 
 @router.get("/connect/metricool/status")
@@ -132,6 +136,8 @@ def get_metricool_status(user: dict = Depends(verify_token)):
                 "connected_providers": connected,
                 "connected_providers_synced_at": datetime.utcnow().isoformat()
             })
+            if sorted(connected) != sorted(cached_providers):
+                get_user_summary_service().refresh_integrations(user_id)
             
             return {
                 "status": "active", 
@@ -40,24 +40,19 @@ async def list_courses(
         # Get all courses (optionally filtered by status)
         courses = service.list_courses(status=status)
         
+        # User's completion state is read once for all courses
+        completed = service.get_completed_tutorials(user_id)
+        
         # Enrich with modules and user progress
         result = []
         for course in courses:
-            course_id = course.get("id")
-            
-            # Get modules for this course
-            modules = service.list_modules_for_course(course_id)
+            snapshot = service.get_course_snapshot(user_id, course=course, completed=completed)
             
             # Enrich each module with unlock status and progress
             enriched_modules = []
-            for module in modules:
-                module_id = module.get("id")
-                
-                # Check unlock status
-                unlock_status = service.check_unlock_conditions(user_id, module_id)
-                
-                # Calculate progress
-                progress = service.calculate_module_progress(user_id, module_id)
+            for module in snapshot["modules"]:
+                unlock_status = snapshot["moduleUnlock"][module["id"]]
+                progress = snapshot["moduleProgress"][module["id"]]
                 
                 completed_ids = progress.get("completedTutorialIds", [])
                 enriched_modules.append({
@@ -69,8 +64,7 @@ async def list_courses(
                     "total_tutorials": progress.get("totalTutorials", 0)
                 })
             
-            # Calculate course-level progress
-            course_progress = service.calculate_course_progress(user_id, course_id)
+            # Course-level progress
             completed_modules = sum(
                 1 for module in enriched_modules if module.get("progress_percent", 0) >= 100
             )
@@ -78,7 +72,7 @@ async def list_courses(
             result.append({
                 **course,
                 "modules": enriched_modules,
-                "progress_percent": course_progress.get("percentComplete", 0),
+                "progress_percent": snapshot["courseProgress"].get("percentComplete", 0),
                 "completed_modules": completed_modules,
                 "total_modules": len(enriched_modules)
             })
@@ -104,17 +98,14 @@ async def get_course(
     try:
         service = get_saga_map_service()
         
-        course = service.get_course(course_id)
-        if not course:
+        snapshot = service.get_course_snapshot(user_id, course_id)
+        if not snapshot:
             raise HTTPException(status_code=404, detail="Course not found")
         
-        modules = service.list_modules_for_course(course_id)
-        
         enriched_modules = []
-        for module in modules:
-            module_id = module.get("id")
-            unlock_status = service.check_unlock_conditions(user_id, module_id)
-            progress = service.calculate_module_progress(user_id, module_id)
+        for module in snapshot["modules"]:
+            unlock_status = snapshot["moduleUnlock"][module["id"]]
+            progress = snapshot["moduleProgress"][module["id"]]
             
             enriched_modules.append({
                 **module,
@@ -123,12 +114,10 @@ async def get_course(
                 "progress_percent": progress.get("percentComplete", 0)
             })
         
-        course_progress = service.calculate_course_progress(user_id, course_id)
-        
         return {
-            **course,
+            **snapshot["course"],
             "modules": enriched_modules,
-            "progress_percent": course_progress.get("percentComplete", 0)
+            "progress_percent": snapshot["courseProgress"].get("percentComplete", 0)
         }
         
     except HTTPException:
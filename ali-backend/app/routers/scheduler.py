@@ -4,6 +4,7 @@ These endpoints are called by GCP Cloud Scheduler and verified via OIDC tokens.
 """
 from fastapi import APIRouter, Request, HTTPException, Header
 from typing import Optional
+import asyncio
 import logging
 import os
 
@@ -283,7 +284,7 @@ async def scheduled_ate_nightly_analysis(
 ):
     """
     Endpoint called by Cloud Scheduler to run nightly learning gap analysis.
-    Analyzes all active users, detects gaps, and queues tutorials.
+    Analyzes users with new learning activity, detects gaps, and queues tutorials.
     
     Cloud Scheduler Config:
     - Frequency: 0 3 * * * (every day at 3 AM UTC)
@@ -304,7 +305,7 @@ async def scheduled_ate_nightly_analysis(
         from app.services.adaptive_tutorial_orchestrator import get_adaptive_orchestrator
         
         orchestrator = get_adaptive_orchestrator()
-        result = orchestrator.run_nightly_analysis()
+        result = await asyncio.to_thread(orchestrator.run_nightly_analysis)
         
         logger.info(
             f"✅ ATE Nightly Analysis Complete: {result.get('users_analyzed', 0)} users, "
@@ -215,12 +215,19 @@ def start_tutorial_job(
         if not db:
             raise HTTPException(status_code=503, detail="Database not initialized")
 
+        use_cloud_worker = os.getenv("USE_CLOUD_RUN_WORKER", "false").lower() == "true"
+        # Pool mode: the worker claims queued jobs itself instead of one execution per job
+        use_worker_pool = use_cloud_worker and os.getenv("CLOUD_RUN_WORKER_MODE", "single").lower() == "pool"
+
         job_ref = db.collection("jobs").document()
         job_id = job_ref.id
-        job_ref.set({
+        job_data = {
             "id": job_id, "user_id": user['uid'], "type": "tutorial_generation",
             "topic": topic.strip(), "status": "queued", "created_at": firestore.SERVER_TIMESTAMP
-        })
+        }
+        if use_worker_pool:
+            job_data.update({"dispatch": "pool", "notification_id": job_id})
+        job_ref.set(job_data)
 
         # Immediately create a notification so the UI updates instantly
         notification_ref = db.collection("users").document(user['uid']).collection("notifications").document(job_id)
@@ -239,7 +246,6 @@ def start_tutorial_job(
         # Option 1: Use Cloud Run Job (if explicitly configured)
         # Option 2: Use local BackgroundTasks (default fallback)
         
-        use_cloud_worker = os.getenv("USE_CLOUD_RUN_WORKER", "false").lower() == "true"
         worker_dispatched = False
         
         if use_cloud_worker:
@@ -261,20 +267,23 @@ def start_tutorial_job(
                     logger.warning(f"⚠️ Cloud Run Job '{job_name}' not found: {get_err}")
                     raise Exception(f"Job not found: {job_name}")
                 
-                overrides = {
-                    "container_overrides": [
-                        {
-                            "env": [
-                                {"name": "JOB_ID", "value": job_id},
-                                {"name": "USER_ID", "value": user['uid']},
-                                {"name": "TOPIC", "value": topic.strip()},
-                                {"name": "NOTIFICATION_ID", "value": notification_ref.id}
-                            ]
-                        }
-                    ]
-                }
-
-                request = run_v2.RunJobRequest(name=name, overrides=overrides)
+                if use_worker_pool:
+                    # The execution drains the queue, including this job
+                    request = run_v2.RunJobRequest(name=name)
+                else:
+                    overrides = {
+                        "container_overrides": [
+                            {
+                                "env": [
+                                    {"name": "JOB_ID", "value": job_id},
+                                    {"name": "USER_ID", "value": user['uid']},
+                                    {"name": "TOPIC", "value": topic.strip()},
+                                    {"name": "NOTIFICATION_ID", "value": notification_ref.id}
+                                ]
+                            }
+                        ]
+                    }
+                    request = run_v2.RunJobRequest(name=name, overrides=overrides)
                 operation = client.run_job(request=request)
                 logger.info(f"🚀 Dispatched Cloud Run Job: {operation.operation.name}")
                 worker_dispatched = True
@@ -290,8 +299,19 @@ def start_tutorial_job(
             if process_tutorial_job is None:
                 from app.services.job_runner import process_tutorial_job as _process
                 process_tutorial_job = _process
+
+            lease_owner = None
+            if use_worker_pool:
+                # An already-running pool worker may claim the job first; run it only if we win the lease
+                from app.services.job_runner import claim_job
+                lease_owner = f"api-{os.getpid()}"
+                if not claim_job(job_id, lease_owner):
+                    logger.info(f"✅ Job {job_id} already claimed by a pool worker")
+                    return {"status": "queued", "job_id": job_id, "notification_id": notification_ref.id}
                 
-            background_tasks.add_task(process_tutorial_job, job_id, user['uid'], topic.strip(), notification_ref.id)
+            background_tasks.add_task(
+                process_tutorial_job, job_id, user['uid'], topic.strip(), notification_ref.id, lease_owner
+            )
             logger.info(f"✅ Background task scheduled for job {job_id}")
 
         return {"status": "queued", "job_id": job_id, "notification_id": notification_ref.id}
@@ -650,6 +670,7 @@ def mark_complete(tutorial_id: str, payload: CompletionRequest, user: dict = Dep
         # SENIOR DEV FIX: Check User Subcollection FIRST (Private), then Global (Public)
         tut_ref = user_ref.collection('tutorials').document(tutorial_id)
         tut_doc = tut_ref.get()
+        is_private_copy = tut_doc.exists
         
         if not tut_doc.exists:
             # Fallback to global
@@ -660,6 +681,7 @@ def mark_complete(tutorial_id: str, payload: CompletionRequest, user: dict = Dep
         if not tut_doc.exists: return {"status": "error", "message": "Tutorial not found"}
         
         tut_data = tut_doc.to_dict()
+        already_completed = bool(tut_data.get("is_completed"))
         category = tut_data.get("category", "general") # e.g., "paid_ads"
         difficulty = tut_data.get("difficulty", "NOVICE")
 
@@ -681,6 +703,18 @@ def mark_complete(tutorial_id: str, payload: CompletionRequest, user: dict = Dep
             "rank_score": firestore.Increment(100) 
         })
 
+        if not already_completed:
+            from app.services.user_summary_service import get_user_summary_service
+            get_user_summary_service().record_tutorial_completed(
+                user['uid'], payload.score, was_in_progress=is_private_copy
+            )
+
+            # Keep the incremental learning summary (nightly gap analysis input) current
+            from app.services.learning_analytics_service import get_learning_analytics_service
+            get_learning_analytics_service().record_quiz_results(
+                user['uid'], tutorial_id, tut_data, payload.quiz_results
+            )
+
         # --- AUTO-LEVELING LOGIC ---
         if payload.score >= 95: # High bar for promotion
             logger.info(f"🚀 Promoting User in skill: {category} (Current: {difficulty})")
@@ -1015,17 +1049,29 @@ def admin_delete_tutorial(tutorial_id: str, confirm: bool = False, user: dict =
 
         # 4. Delete ALL User Copies (Collection Group Query)
         # We want to remove it from every user's private collection
+        from app.services.user_summary_service import get_user_summary_service
+        summary_service = get_user_summary_service()
         instances = db.collection_group('tutorials').where(filter=FieldFilter('id', '==', tutorial_id)).stream()
         batch = db.batch()
-        count = 0
+        deleted = []
+
+        def commit_deleted():
+            batch.commit()
+            # Only private copies (users/{uid}/tutorials) count towards user summaries
+            for owner, data in deleted:
+                if owner is not None:
+                    summary_service.record_tutorial_deleted(
+                        owner.id, bool(data.get("is_completed")), data.get("completion_score", 0))
+
         for instance in instances:
             batch.delete(instance.reference)
-            count += 1
-            if count > 400: 
-                batch.commit()
+            deleted.append((instance.reference.parent.parent, instance.to_dict() or {}))
+            if len(deleted) > 400: 
+                commit_deleted()
                 batch = db.batch()
-                count = 0
-        if count > 0: batch.commit()
+                deleted = []
+        if deleted:
+            commit_deleted()
         
         # 5. Clean Admin Tasks
         tasks = db.collection("admin_tasks").where(filter=FieldFilter("tutorial_id", "==", tutorial_id)).stream()
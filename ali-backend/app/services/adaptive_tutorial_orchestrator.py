@@ -10,12 +10,17 @@ Responsibilities:
 5. Track system metrics and health
 """
 import logging
-from typing import Dict, Any, Optional, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Users analyzed side by side during the nightly run
+NIGHTLY_CONCURRENCY = int(os.getenv("ATE_NIGHTLY_CONCURRENCY", "8"))
+
 
 class AdaptiveTutorialOrchestrator:
     """
@@ -24,7 +29,6 @@ class AdaptiveTutorialOrchestrator:
     """
 
     # Processing limits per run
-    MAX_USERS_PER_RUN = 50
     MAX_QUEUE_PROCESS = 10
     
     # Thresholds for alerts
@@ -101,12 +105,12 @@ class AdaptiveTutorialOrchestrator:
 
     def run_nightly_analysis(self) -> Dict[str, Any]:
         """
-        Run nightly gap analysis for all active users.
+        Run nightly gap analysis for users with new learning activity.
         Called by GCP Cloud Scheduler.
         
         Workflow:
-        1. Get all active users (completed at least 1 tutorial)
-        2. Analyze gaps for each user
+        1. Get users whose learning summary changed since their last analysis
+        2. Analyze gaps for each user (NIGHTLY_CONCURRENCY at a time)
         3. Generate recommendations
         4. Queue high-priority tutorials for auto-generation
         5. Create admin tasks for items needing approval
@@ -129,22 +133,23 @@ class AdaptiveTutorialOrchestrator:
         try:
             logger.info("🌙 Starting nightly gap analysis run")
 
-            # 1. Get active users
-            active_users = self._get_active_users()
-            results["total_active_users"] = len(active_users)
-
-            # 2. Process each user
-            for user_id in active_users[:self.MAX_USERS_PER_RUN]:
-                try:
-                    user_result = self._analyze_user(user_id)
-                    results["users_analyzed"] += 1
-                    results["gaps_detected"] += user_result.get("gaps_count", 0)
-                    results["recommendations_created"] += user_result.get("recommendations_count", 0)
-                    results["tutorials_queued"] += user_result.get("queued_count", 0)
-                    results["admin_tasks_created"] += user_result.get("admin_tasks_count", 0)
-                except Exception as e:
-                    logger.error(f"❌ Error analyzing user {user_id}: {e}")
-                    results["errors"].append({"user_id": user_id, "error": str(e)})
+            # 1. Get users with learning events since their last analysis
+            pending = self.analytics.get_summaries_needing_analysis() if self.analytics else []
+            results["total_active_users"] = len(pending)
+
+            # 2. Process users concurrently; summaries are already up to date
+            with ThreadPoolExecutor(max_workers=max(1, NIGHTLY_CONCURRENCY)) as pool:
+                outcomes = list(pool.map(self._analyze_pending_user, pending))
+
+            for snapshot, (user_result, error) in zip(pending, outcomes):
+                if error:
+                    results["errors"].append({"user_id": snapshot.id, "error": error})
+                    continue
+                results["users_analyzed"] += 1
+                results["gaps_detected"] += user_result.get("gaps_count", 0)
+                results["recommendations_created"] += user_result.get("recommendations_count", 0)
+                results["tutorials_queued"] += user_result.get("queued_count", 0)
+                results["admin_tasks_created"] += user_result.get("admin_tasks_count", 0)
 
             # 3. Log run results
             results["completed_at"] = datetime.utcnow().isoformat()
@@ -163,36 +168,23 @@ class AdaptiveTutorialOrchestrator:
             results["completed_at"] = datetime.utcnow().isoformat()
             return results
 
-    def _get_active_users(self) -> List[str]:
-        """Get list of active users (have completed at least 1 tutorial)."""
-        if not self.db:
-            return []
-
+    def _analyze_pending_user(self, snapshot):
+        """
+        Analyze one flagged user and advance their watermark.
+        Returns (user_result, error); failed users stay flagged for the next run.
+        """
+        user_id = snapshot.id
         try:
-            # Get users who have tutorial completion records
-            users = self.db.collection("users").limit(200).stream()
-            active_user_ids = []
-
-            for user in users:
-                user_id = user.id
-                # Check if user has any completed tutorials
-                completed = list(
-                    self.db.collection("users").document(user_id)
-                    .collection("tutorials")
-                    .where("is_completed", "==", True)
-                    .limit(1)
-                    .stream()
-                )
-                if completed:
-                    active_user_ids.append(user_id)
-
-            return active_user_ids
-
+            user_result = self._analyze_user(user_id, snapshot.to_dict() or {})
+            if user_result.get("error"):
+                return None, user_result["error"]
+            self.analytics.mark_summary_analyzed(snapshot)
+            return user_result, None
         except Exception as e:
-            logger.error(f"Error getting active users: {e}")
-            return []
+            logger.error(f"❌ Error analyzing user {user_id}: {e}")
+            return None, str(e)
 
-    def _analyze_user(self, user_id: str) -> Dict[str, Any]:
+    def _analyze_user(self, user_id: str, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze a single user for gaps and create recommendations."""
         result = {
             "user_id": user_id,
@@ -205,13 +197,17 @@ class AdaptiveTutorialOrchestrator:
         try:
             # 1. Detect gaps
             if self.gap_analyzer:
-                gap_result = self.gap_analyzer.analyze_user_gaps(user_id)
+                gap_result = self.gap_analyzer.analyze_user_gaps(user_id, summary=summary)
+                if gap_result.get("error"):
+                    result["error"] = gap_result["error"]
+                    return result
                 gaps = gap_result.get("gaps", [])
                 result["gaps_count"] = len(gaps)
 
-                # 2. Process each gap
+                # 2. Process each gap (user's scoring inputs loaded once)
+                context = self.scorer.build_scoring_context(user_id) if self.scorer and gaps else None
                 for gap in gaps[:5]:  # Top 5 gaps per user
-                    recommendation = self._process_gap(user_id, gap)
+                    recommendation = self._process_gap(user_id, gap, context)
                     if recommendation:
                         result["recommendations_count"] += 1
                         if recommendation.get("queued"):
@@ -223,9 +219,10 @@ class AdaptiveTutorialOrchestrator:
 
         except Exception as e:
             logger.error(f"Error analyzing user {user_id}: {e}")
+            result["error"] = str(e)
             return result
 
-    def _process_gap(self, user_id: str, gap: Dict) -> Optional[Dict]:
+    def _process_gap(self, user_id: str, gap: Dict, context=None) -> Optional[Dict]:
         """Process a single gap and create recommendation/queue item."""
         try:
             topic = gap.get("topic")
@@ -238,7 +235,8 @@ class AdaptiveTutorialOrchestrator:
                 eligibility = self.scorer.score_recommendation(
                     user_id=user_id,
                     topic=topic,
-                    gap_data=gap
+                    gap_data=gap,
+                    context=context
                 )
 
             result = {
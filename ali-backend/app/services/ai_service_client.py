@@ -67,19 +67,28 @@ def generate_tutorial(
         )
 
 
+def _fallback_scout_sources(topic: str) -> Dict[str, Any]:
+    from app.services import research_service
+    return {"sources": research_service.scout_sources(topic)}
+
+
 def scout_sources(topic: str) -> Dict[str, Any]:
     if not AI_SERVICE_URL:
-        logger.warning("AI_SERVICE_URL not set. Scout not available.")
-        return {"sources": []}
+        logger.warning("AI_SERVICE_URL not set. Falling back to local source discovery.")
+        return _fallback_scout_sources(topic)
     headers = {"X-AI-Token": AI_SERVICE_TOKEN} if AI_SERVICE_TOKEN else {}
-    with httpx.Client(timeout=30.0) as client:
-        response = client.post(
-            f"{AI_SERVICE_URL}/ai/research/scout",
-            json={"topic": topic},
-            headers=headers
-        )
-        response.raise_for_status()
-        return response.json()
+    try:
+        with httpx.Client(timeout=30.0) as client:
+            response = client.post(
+                f"{AI_SERVICE_URL}/ai/research/scout",
+                json={"topic": topic},
+                headers=headers
+            )
+            response.raise_for_status()
+            return response.json()
+    except Exception as e:
+        logger.error(f"AI service scout failed: {e}. Falling back to local source discovery.")
+        return _fallback_scout_sources(topic)
 
 
 def deep_dive(urls: list[str]) -> Dict[str, Any]:
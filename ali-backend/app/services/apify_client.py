@@ -12,9 +12,11 @@ Pricing (approximate):
 Free tier: $5/month in credits
 """
 import os
+import time
+import asyncio
 import logging
 import aiohttp
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,15 @@ logger = logging.getLogger(__name__)
 APIFY_API_TOKEN = os.getenv("APIFY_API_TOKEN")
 APIFY_BASE_URL = "https://api.apify.com/v2"
 
+# Run completion: server-side long-poll (waitForFinish, max 60s per request)
+# within an overall deadline; backoff only applies when the server returns early.
+APIFY_RUN_TIMEOUT_SEC = int(os.getenv("APIFY_RUN_TIMEOUT_SEC", "180"))
+APIFY_WAIT_FOR_FINISH_SEC = 60
+APIFY_POLL_BACKOFF_SEC = (0.5, 8.0)  # (initial, max)
+APIFY_DATASET_PAGE_SIZE = 50
+
+TERMINAL_RUN_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+
 # Pre-built Apify actor IDs for social media scraping
 APIFY_ACTORS = {
     "facebook": {
@@ -68,18 +79,26 @@ class ApifyClient:
     3. Set APIFY_API_TOKEN environment variable
     """
     
-    def __init__(self):
-        self.api_token = APIFY_API_TOKEN
-        self.base_url = APIFY_BASE_URL
+    def __init__(self, api_token: Optional[str] = None, base_url: Optional[str] = None):
+        self.api_token = api_token or APIFY_API_TOKEN
+        self.base_url = (base_url or APIFY_BASE_URL).rstrip("/")
         
         if not self.api_token:
             logger.warning("⚠️ APIFY_API_TOKEN not set - Apify scraping disabled")
+
+    @staticmethod
+    def _new_session() -> aiohttp.ClientSession:
+        # Long-polls hold a request open for up to APIFY_WAIT_FOR_FINISH_SEC
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=APIFY_WAIT_FOR_FINISH_SEC + 30)
+        )
     
     async def search_platform(
         self,
         platform: str,
         search_query: str,
-        max_results: int = 20
+        max_results: int = 20,
+        session: Optional[aiohttp.ClientSession] = None
     ) -> List[Dict[str, Any]]:
         """
         Search a social media platform for mentions.
@@ -88,88 +107,168 @@ class ApifyClient:
             platform: Platform ID (facebook, instagram, linkedin, twitter, tiktok)
             search_query: Brand name or keyword to search
             max_results: Maximum results to return
+            session: Shared aiohttp session (one is opened if omitted)
             
         Returns:
             List of post/mention objects
         """
+        results = []
+        async for batch in self.stream_platform(platform, search_query, max_results, session=session):
+            results.extend(batch)
+        return results
+
+    async def stream_platform(
+        self,
+        platform: str,
+        search_query: str,
+        max_results: int = 20,
+        session: Optional[aiohttp.ClientSession] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Run a platform's actor and yield normalized results page by page.
+        Errors are logged and end the stream; they never raise.
+        """
         if not self.api_token:
             logger.warning("Apify API token not configured")
-            return []
+            return
         
         if platform not in APIFY_ACTORS:
             logger.warning(f"Unknown platform: {platform}")
-            return []
+            return
         
         actor_config = APIFY_ACTORS[platform]
+        own_session = session is None
+        if own_session:
+            session = self._new_session()
         
         try:
             logger.info(f"🔍 Searching {actor_config['name']} via Apify for: {search_query}")
             
-            # Run the actor
-            run_url = f"{self.base_url}/acts/{actor_config['actor_id']}/runs"
+            deadline = time.monotonic() + APIFY_RUN_TIMEOUT_SEC
+            run = await self._start_run(session, platform, search_query, max_results, deadline)
+            if not run:
+                return
             
-            # Build input based on actor requirements
-            actor_input = self._build_actor_input(platform, search_query, max_results)
+            run = await self._wait_for_run(session, run, deadline)
+            status = run.get("status")
+            if status in ("FAILED", "ABORTED", "TIMED-OUT"):
+                logger.error(f"Apify run failed with status: {status}")
+                return
+            if status != "SUCCEEDED":
+                # Deadline hit: hand back whatever the actor has stored so far
+                logger.warning(
+                    f"⏰ Apify {platform} run {run.get('id')} still {status} after "
+                    f"{APIFY_RUN_TIMEOUT_SEC}s - returning partial results"
+                )
             
-            async with aiohttp.ClientSession() as session:
-                # Start the actor run
-                async with session.post(
-                    run_url,
-                    params={"token": self.api_token},
-                    json=actor_input
-                ) as response:
-                    if response.status != 201:
-                        error = await response.text()
-                        logger.error(f"Apify actor start failed: {error}")
-                        return []
-                    
-                    run_data = await response.json()
-                    run_id = run_data.get("data", {}).get("id")
-                
-                if not run_id:
-                    logger.error("No run ID returned from Apify")
-                    return []
-                
-                # Wait for run to complete (with timeout)
-                import asyncio
-                for _ in range(30):  # Max 30 attempts (30 seconds)
-                    await asyncio.sleep(1)
-                    
-                    status_url = f"{self.base_url}/actor-runs/{run_id}"
-                    async with session.get(
-                        status_url,
-                        params={"token": self.api_token}
-                    ) as status_response:
-                        status_data = await status_response.json()
-                        status = status_data.get("data", {}).get("status")
-                        
-                        if status == "SUCCEEDED":
-                            break
-                        elif status in ["FAILED", "ABORTED", "TIMED-OUT"]:
-                            logger.error(f"Apify run failed with status: {status}")
-                            return []
-                
-                # Get results from dataset
-                dataset_id = status_data.get("data", {}).get("defaultDatasetId")
-                if not dataset_id:
-                    return []
-                
-                dataset_url = f"{self.base_url}/datasets/{dataset_id}/items"
-                async with session.get(
-                    dataset_url,
-                    params={"token": self.api_token, "limit": max_results}
-                ) as dataset_response:
-                    items = await dataset_response.json()
+            dataset_id = run.get("defaultDatasetId")
+            if not dataset_id:
+                return
             
-            # Normalize results
-            results = self._normalize_results(platform, items, actor_config)
+            total = 0
+            async for items in self._iter_dataset(session, dataset_id, max_results):
+                results = self._normalize_results(platform, items, actor_config)
+                total += len(results)
+                yield results
             
-            logger.info(f"✅ Found {len(results)} results on {actor_config['name']}")
-            return results
+            logger.info(f"✅ Found {total} results on {actor_config['name']}")
             
         except Exception as e:
             logger.error(f"❌ Apify {platform} search failed: {e}")
-            return []
+        finally:
+            if own_session:
+                await session.close()
+
+    async def _start_run(
+        self,
+        session: aiohttp.ClientSession,
+        platform: str,
+        search_query: str,
+        max_results: int,
+        deadline: float
+    ) -> Optional[Dict[str, Any]]:
+        """Start the actor run; short actors may already be finished on return."""
+        actor_id = APIFY_ACTORS[platform]["actor_id"].replace("/", "~")  # API path form
+        run_url = f"{self.base_url}/acts/{actor_id}/runs"
+        
+        # Build input based on actor requirements
+        actor_input = self._build_actor_input(platform, search_query, max_results)
+        
+        async with session.post(
+            run_url,
+            params={"token": self.api_token, "waitForFinish": str(self._wait_budget(deadline))},
+            json=actor_input
+        ) as response:
+            if response.status != 201:
+                error = await response.text()
+                logger.error(f"Apify actor start failed: {error}")
+                return None
+            run = (await response.json()).get("data", {})
+        
+        if not run.get("id"):
+            logger.error("No run ID returned from Apify")
+            return None
+        return run
+
+    @staticmethod
+    def _wait_budget(deadline: float) -> int:
+        """Seconds to ask the server to hold a request, bounded by the run deadline."""
+        return int(min(APIFY_WAIT_FOR_FINISH_SEC, max(1, deadline - time.monotonic())))
+
+    async def _wait_for_run(self, session: aiohttp.ClientSession, run: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        """
+        Long-poll the run until it reaches a terminal status or the deadline.
+        Each request asks the server to hold it until the run finishes
+        (waitForFinish); if the server answers early anyway, back off
+        exponentially before asking again.
+        """
+        backoff, max_backoff = APIFY_POLL_BACKOFF_SEC
+        status_url = f"{self.base_url}/actor-runs/{run['id']}"
+        
+        while run.get("status") not in TERMINAL_RUN_STATUSES:
+            if deadline - time.monotonic() <= 0:
+                break
+            wait = self._wait_budget(deadline)
+            
+            started = time.monotonic()
+            async with session.get(
+                status_url,
+                params={"token": self.api_token, "waitForFinish": str(wait)}
+            ) as status_response:
+                run = (await status_response.json()).get("data", {}) or run
+            
+            if run.get("status") in TERMINAL_RUN_STATUSES:
+                break
+            if time.monotonic() - started < wait / 2:
+                await asyncio.sleep(min(backoff, max(0, deadline - time.monotonic())))
+                backoff = min(backoff * 2, max_backoff)
+            else:
+                backoff = APIFY_POLL_BACKOFF_SEC[0]
+        
+        return run
+
+    async def _iter_dataset(
+        self,
+        session: aiohttp.ClientSession,
+        dataset_id: str,
+        max_results: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield dataset items in pages of APIFY_DATASET_PAGE_SIZE, up to max_results."""
+        dataset_url = f"{self.base_url}/datasets/{dataset_id}/items"
+        offset = 0
+        while offset < max_results:
+            limit = min(APIFY_DATASET_PAGE_SIZE, max_results - offset)
+            async with session.get(
+                dataset_url,
+                params={"token": self.api_token, "offset": str(offset), "limit": str(limit), "clean": "true"}
+            ) as dataset_response:
+                items = await dataset_response.json()
+            if not isinstance(items, list) or not items:
+                return
+            yield items
+            offset += len(items)
+            if len(items) < limit:
+                return
     
     def _build_actor_input(
         self,
@@ -245,6 +344,47 @@ class ApifyClient:
         
         return results
     
+    async def stream_all_platforms(
+        self,
+        search_query: str,
+        platforms: Optional[List[str]] = None,
+        max_results_per_platform: int = 10
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Search platforms in parallel over one shared session, yielding
+        (platform, normalized results) as each dataset page arrives, so fast
+        platforms are usable before slow actors finish.
+        """
+        if platforms is None:
+            platforms = list(APIFY_ACTORS.keys())
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        async def pump(platform: str, session: aiohttp.ClientSession):
+            try:
+                async for batch in self.stream_platform(platform, search_query, max_results_per_platform, session=session):
+                    await queue.put((platform, batch))
+            except Exception as e:
+                logger.error(f"Platform search failed: {e}")
+            finally:
+                await queue.put(done)
+        
+        async with self._new_session() as session:
+            tasks = [asyncio.create_task(pump(platform, session)) for platform in platforms]
+            try:
+                pending = len(tasks)
+                while pending:
+                    item = await queue.get()
+                    if item is done:
+                        pending -= 1
+                    else:
+                        yield item
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def search_all_platforms(
         self,
         search_query: str,
@@ -262,25 +402,9 @@ class ApifyClient:
         Returns:
             Combined list of mentions from all platforms
         """
-        if platforms is None:
-            platforms = list(APIFY_ACTORS.keys())
-        
-        import asyncio
-        
-        # Run searches in parallel
-        tasks = [
-            self.search_platform(platform, search_query, max_results_per_platform)
-            for platform in platforms
-        ]
-        
-        results_lists = await asyncio.gather(*tasks, return_exceptions=True)
-        
         all_results = []
-        for result in results_lists:
-            if isinstance(result, list):
-                all_results.extend(result)
-            elif isinstance(result, Exception):
-                logger.error(f"Platform search failed: {result}")
+        async for _, batch in self.stream_all_platforms(search_query, platforms, max_results_per_platform):
+            all_results.extend(batch)
         
         logger.info(f"📊 Total Apify results: {len(all_results)}")
         return all_results
@@ -10,11 +10,17 @@ Provides:
 """
 import os
 import io
+import re
+import json
+import time
+import hashlib
 import logging
+import threading
 from typing import Dict, Any, Optional, List, Tuple, Union
 import subprocess
 import shutil
 import tempfile
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
 
@@ -94,6 +100,35 @@ def map_font_to_google_font(font_name: str) -> str:
     return GOOGLE_FONT_MAPPING.get(normalized, font_name)
 
 
+# ============================================================================
+# Content-Addressed Render Cache
+# Rendered outputs are stored in GCS under a hash of everything that decides
+# their pixels (resolved HTML / source image, dimensions, format, renderer
+# version), so a resumed, regenerated or recycled campaign never re-launches
+# Chromium or ffmpeg for an identical render. Degraded renders (logo failed
+# to load, readiness timed out, WebM fallback) are uploaded outside the cache
+# so the next identical request renders again.
+# ============================================================================
+RENDERER_VERSION = "3"  # Bump when render output changes for identical inputs
+RENDER_CACHE_PREFIX = "render-cache"
+DEGRADED_RENDER_PREFIX = "renders/degraded"
+ENABLE_RENDER_CACHE = os.getenv("ENABLE_RENDER_CACHE", "true").lower() == "true"
+RENDER_CACHE_MEMO_SIZE = 1024  # In-process key -> URL memo, skips the GCS existence check
+
+
+def render_cache_key(kind: str, content: str, **params) -> str:
+    """
+    Stable cache key for a render.
+
+    Args:
+        kind: Render type ('image', 'video', 'branding')
+        content: Fully resolved source (HTML document or source image URL)
+        **params: Output parameters (width, height, format, duration, ...)
+    """
+    header = json.dumps({"kind": kind, "renderer": RENDERER_VERSION, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(f"{header}\n{content}".encode("utf-8")).hexdigest()
+
+
 # ============================================================================
 # V6.0: Browser Pool Pattern - Pre-warmed Chromium instances for faster rendering
 # Eliminates cold-start overhead of ~1-2s per asset
@@ -214,6 +249,650 @@ class BrowserPool:
             logger.info("🛑 BrowserPool shutdown complete")
 
 
+# ============================================================================
+# Render Asset Cache
+# Motion templates load GSAP and Google Fonts by CDN URL (the same HTML is
+# shipped to the frontend preview). Inside the render browser those requests
+# are answered from process memory: seeded from RENDER_ASSET_DIR (see
+# scripts/seed_render_assets.py) or fetched once on first use, so renders
+# don't wait on CDN round trips.
+# ============================================================================
+RENDER_ASSET_DIR = os.getenv("RENDER_ASSET_DIR", "")
+RENDER_ASSET_HOSTS = ("cdnjs.cloudflare.com", "cdn.jsdelivr.net", "fonts.googleapis.com", "fonts.gstatic.com")
+RENDER_ASSET_MAX_BYTES = 64 * 1024 * 1024
+RENDER_ASSET_URL_RE = re.compile(
+    r"^https://(?:" + "|".join(re.escape(host) for host in RENDER_ASSET_HOSTS) + r")/"
+)
+
+
+class RenderAssetCache:
+    """
+    Process-wide store of static render assets, keyed by URL.
+
+    Usage:
+        context = await browser.new_context(...)
+        await RenderAssetCache.install(context)
+    """
+    _assets: Dict[str, Tuple[str, bytes]] = {}
+    _size = 0
+    _seed_loaded = False
+
+    @classmethod
+    def seed(cls, url: str, content_type: str, body: bytes) -> bool:
+        """Store an asset. Returns False once the memory budget is spent."""
+        if url in cls._assets:
+            return True
+        if cls._size + len(body) > RENDER_ASSET_MAX_BYTES:
+            return False
+        cls._assets[url] = (content_type, body)
+        cls._size += len(body)
+        return True
+
+    @classmethod
+    def load_seed_dir(cls, path: Optional[str] = None) -> int:
+        """
+        Load assets listed in `<path>/manifest.json`
+        ({url: {"file": ..., "content_type": ...}}). Returns the count loaded.
+        """
+        path = path or RENDER_ASSET_DIR
+        cls._seed_loaded = True
+        if not path:
+            return 0
+        try:
+            with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Render asset manifest unavailable in {path}: {e}")
+            return 0
+
+        loaded = 0
+        for url, entry in manifest.items():
+            try:
+                with open(os.path.join(path, entry["file"]), "rb") as f:
+                    body = f.read()
+            except (OSError, KeyError) as e:
+                logger.warning(f"⚠️ Skipping seeded render asset {url}: {e}")
+                continue
+            if cls.seed(url, entry.get("content_type", "application/octet-stream"), body):
+                loaded += 1
+        logger.info(f"📦 Loaded {loaded} seeded render assets from {path}")
+        return loaded
+
+    @classmethod
+    async def install(cls, target) -> None:
+        """Route CDN asset requests of a Playwright context or page through the cache."""
+        if not cls._seed_loaded:
+            cls.load_seed_dir()
+        await target.route(RENDER_ASSET_URL_RE, cls._handle)
+
+    @classmethod
+    async def _handle(cls, route) -> None:
+        url = route.request.url
+        cached = cls._assets.get(url)
+        if cached is None:
+            try:
+                response = await route.fetch()
+            except Exception as e:
+                # Let the template's onerror fallback take over
+                logger.warning(f"⚠️ Render asset fetch failed for {url}: {e}")
+                await route.abort()
+                return
+            if response.status != 200:
+                await route.fulfill(response=response)
+                return
+            content_type = response.headers.get("content-type", "application/octet-stream")
+            cached = (content_type, await response.body())
+            cls.seed(url, *cached)
+
+        content_type, body = cached
+        await route.fulfill(
+            status=200,
+            body=body,
+            content_type=content_type,
+            # Web fonts are loaded cross-origin from about:blank documents
+            headers={"Access-Control-Allow-Origin": "*"},
+        )
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._assets = {}
+        cls._size = 0
+        cls._seed_loaded = False
+
+
+# ============================================================================
+# Remote Asset Cache
+# Logos and source images are fetched once per process tree: bytes live in a
+# local disk cache keyed by URL (revalidated with ETag / Last-Modified after
+# REMOTE_ASSET_REVALIDATE_SEC), decoded images in an in-memory LRU keyed by
+# (URL, version, target width). SVGs are rasterised once per output width.
+# ============================================================================
+REMOTE_ASSET_CACHE_DIR = os.getenv(
+    "REMOTE_ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ali-remote-assets")
+)
+REMOTE_ASSET_DISK_MB = int(os.getenv("REMOTE_ASSET_DISK_MB", "256"))
+REMOTE_ASSET_MEMORY_ITEMS = int(os.getenv("REMOTE_ASSET_MEMORY_ITEMS", "64"))
+REMOTE_ASSET_REVALIDATE_SEC = int(os.getenv("REMOTE_ASSET_REVALIDATE_SEC", "600"))
+
+
+@dataclass
+class RemoteAsset:
+    """Downloaded (or cached) bytes of a remote asset."""
+    url: str
+    content: bytes
+    content_type: str
+    version: str  # ETag, else content hash; changes whenever the bytes do
+
+    @property
+    def is_svg(self) -> bool:
+        return "image/svg" in self.content_type.lower()
+
+
+class RemoteAssetCache:
+    """
+    Two-tier cache for remote images used by the branding paths.
+    Thread-safe; disk writes are atomic so concurrent workers can share a directory.
+    """
+
+    def __init__(
+        self,
+        directory: str = REMOTE_ASSET_CACHE_DIR,
+        max_disk_bytes: int = REMOTE_ASSET_DISK_MB * 1024 * 1024,
+        memory_items: int = REMOTE_ASSET_MEMORY_ITEMS,
+        revalidate_sec: int = REMOTE_ASSET_REVALIDATE_SEC
+    ):
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_items = memory_items
+        self.revalidate_sec = revalidate_sec
+        self._images: "OrderedDict[Tuple[str, str, Optional[int]], Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # --- Disk tier ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _read_disk(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        path = self._path(key)
+        try:
+            with open(f"{path}.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _write_disk(self, key: str, meta: Dict[str, Any], body: Optional[bytes]):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            if body is not None:
+                self._write_atomic(path, body)
+            self._write_atomic(f"{path}.json", json.dumps(meta).encode("utf-8"))
+            if body is not None:
+                self._prune_disk()
+        except OSError as e:
+            logger.warning(f"⚠️ Remote asset cache write failed for {key}: {e}")
+
+    def _prune_disk(self):
+        """Drop least recently written entries once over the disk budget."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or entry.name.endswith(".json"):
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            for stale in (path, f"{path}.json"):
+                try:
+                    os.unlink(stale)
+                except OSError:
+                    pass
+            total -= size
+
+    def seed(self, url: str, content: bytes, content_type: str):
+        """Record bytes we produced ourselves (e.g. a render we just uploaded)."""
+        self._write_disk(url, {
+            "content_type": content_type,
+            "version": hashlib.sha256(content).hexdigest()[:16],
+            "etag": None,
+            "last_modified": None,
+            "stored_at": time.time(),
+        }, content)
+
+    def fetch(self, url: str, timeout: float = 15) -> RemoteAsset:
+        """
+        Bytes for `url`: from disk while fresh, revalidated once stale.
+        Raises on download errors when there is no cached copy to fall back to.
+        """
+        import requests
+
+        cached = self._read_disk(url)
+        if cached:
+            meta, body = cached
+            asset = RemoteAsset(url, body, meta.get("content_type") or "", meta["version"])
+            if time.time() - meta.get("stored_at", 0) < self.revalidate_sec:
+                return asset
+
+        headers = {}
+        if cached:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = requests.get(url, timeout=timeout, headers=headers)
+            if cached and response.status_code == 304:
+                meta["stored_at"] = time.time()
+                self._write_disk(url, meta, None)
+                return asset
+            response.raise_for_status()
+        except Exception as e:
+            if cached:
+                logger.warning(f"⚠️ Revalidation failed for {url}, using cached copy: {e}")
+                return asset
+            raise
+
+        body = response.content
+        etag = response.headers.get("ETag")
+        meta = {
+            "content_type": response.headers.get("Content-Type") or "",
+            "version": etag or hashlib.sha256(body).hexdigest()[:16],
+            "etag": etag,
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        self._write_disk(url, meta, body)
+        return RemoteAsset(url, body, meta["content_type"], meta["version"])
+
+    # --- Memory tier ---
+
+    def decode(self, asset: RemoteAsset, width: Optional[int] = None) -> "Image.Image":
+        """
+        Decoded RGBA image, resized (or for SVG, rasterised) to `width` keeping
+        the aspect ratio. The returned image is shared: copy before mutating.
+        Raises on undecodable content.
+        """
+        key = (asset.url, asset.version, width)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+
+        if asset.is_svg:
+            png = self._rasterise_svg(asset, width)
+            image = Image.open(io.BytesIO(png)).convert("RGBA")
+        else:
+            stream = io.BytesIO(asset.content)
+            Image.open(stream).verify()
+            stream.seek(0)
+            image = Image.open(stream).convert("RGBA")
+            if width:
+                height = int(width * image.height / image.width)
+                image = image.resize((width, height), Image.Resampling.LANCZOS)
+
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.memory_items:
+                self._images.popitem(last=False)
+        return image
+
+    def _rasterise_svg(self, asset: RemoteAsset, width: Optional[int]) -> bytes:
+        """PNG for an SVG at `width`, from the disk tier when already rasterised."""
+        from cairosvg import svg2png
+
+        key = f"{asset.url}#svg@{width or 'natural'}"
+        cached = self._read_disk(key)
+        if cached and cached[0].get("version") == asset.version:
+            return cached[1]
+
+        png = svg2png(bytestring=asset.content, output_width=width) if width else svg2png(bytestring=asset.content)
+        self._write_disk(key, {"content_type": "image/png", "version": asset.version, "stored_at": time.time()}, png)
+        return png
+
+
+# Singleton instance
+_remote_asset_cache: Optional[RemoteAssetCache] = None
+
+
+def get_remote_asset_cache() -> RemoteAssetCache:
+    """Get or create singleton RemoteAssetCache."""
+    global _remote_asset_cache
+    if _remote_asset_cache is None:
+        _remote_asset_cache = RemoteAssetCache()
+    return _remote_asset_cache
+
+
+# ============================================================================
+# Render Readiness
+# Screenshots are taken as soon as the page is provably ready instead of
+# after a fixed sleep: web fonts loaded, <img> and CSS background images
+# decoded, then either the template's own signal (body[data-render-signal]
+# gains .animation-complete) or GSAP tweens seeked to their end state.
+# The caller's delay survives only as a ceiling.
+# ============================================================================
+IMAGE_READY_CEILING_SEC = float(os.getenv("IMAGE_READY_CEILING_SEC", "5.0"))
+
+_RENDER_READY_JS = """
+async () => {
+    await document.fonts.ready;
+
+    const sources = new Set([...document.images].map(img => img.currentSrc || img.src).filter(Boolean));
+    for (const el of document.querySelectorAll('*')) {
+        for (const m of getComputedStyle(el).backgroundImage.matchAll(/url\\(["']?(.*?)["']?\\)/g)) {
+            sources.add(m[1]);
+        }
+    }
+    await Promise.all([...sources].map(src => {
+        const img = new Image();
+        img.src = src;
+        return img.decode().catch(() => {});
+    }));
+
+    let outcome = 'static';
+    const body = document.body;
+    if (body.hasAttribute('data-render-signal')) {
+        await new Promise(resolve => {
+            if (body.classList.contains('animation-complete')) return resolve();
+            new MutationObserver((_, observer) => {
+                if (body.classList.contains('animation-complete')) { observer.disconnect(); resolve(); }
+            }).observe(body, {attributes: true, attributeFilter: ['class']});
+        });
+        outcome = 'signal';
+    } else if (typeof gsap !== 'undefined' && gsap.globalTimeline) {
+        // Entrance tweens jump to their final frame; ambient loops just freeze
+        for (const child of gsap.globalTimeline.getChildren(false, true, true)) {
+            if (child.repeat() !== -1) child.progress(1);
+        }
+        gsap.globalTimeline.pause();
+        outcome = 'gsap';
+    }
+
+    // Let the final state paint before the screenshot
+    await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    return outcome;
+}
+"""
+
+
+async def wait_for_render_ready(page, ceiling: float) -> str:
+    """
+    Wait until `page` is ready to capture, for at most `ceiling` seconds.
+    
+    Returns:
+        How readiness was reached: 'signal', 'gsap', 'static' or 'timeout'
+    """
+    import asyncio
+    
+    if ceiling <= 0:
+        return "timeout"
+    try:
+        outcome = await asyncio.wait_for(page.evaluate(_RENDER_READY_JS), timeout=ceiling)
+        return outcome or "static"
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ Render readiness not reached within {ceiling}s, capturing anyway")
+        return "timeout"
+    except Exception as e:
+        logger.warning(f"⚠️ Render readiness check failed: {e}")
+        return "timeout"
+
+
+_GSAP_SNAP_JS = """
+() => {
+    if (typeof gsap !== 'undefined' && gsap.globalTimeline) {
+        gsap.globalTimeline.progress(1).pause();
+    }
+}
+"""
+
+
+async def snap_gsap_to_end(page) -> None:
+    """Seek every GSAP tween to its final frame (fallback when readiness timed out)."""
+    try:
+        await page.evaluate(_GSAP_SNAP_JS)
+    except Exception as e:
+        logger.warning(f"⚠️ GSAP snap failed: {e}")
+
+
+def _record_render_latency(started: float, outcome: str) -> None:
+    try:
+        from app.middleware.observability import render_latency_histogram
+        render_latency_histogram.observe((time.perf_counter() - started) * 1000, outcome)
+    except Exception:
+        pass
+
+
+# ============================================================================
+# Mermaid Renderer
+# One warm page with Mermaid preloaded from the vendored bundle (fetched at
+# image build time, see Dockerfile). Diagrams are rendered by an in-page
+# mermaid.render() call, many per round trip, and cached by hash of
+# (source, theme) so repeated diagrams never reach the browser.
+# ============================================================================
+MERMAID_VERSION = "10.9.1"
+MERMAID_BUNDLE_PATH = os.getenv(
+    "MERMAID_BUNDLE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "vendor", "mermaid.min.js")
+)
+# Only used when the vendored bundle is missing (local dev); routed via RenderAssetCache
+MERMAID_CDN = f"https://cdn.jsdelivr.net/npm/mermaid@{MERMAID_VERSION}/dist/mermaid.min.js"
+MERMAID_CACHE_SIZE = int(os.getenv("MERMAID_CACHE_SIZE", "256"))
+
+_MERMAID_PAGE = """<!DOCTYPE html>
+<html>
+<head><style>body {margin:20px;background:#fff;} #stage {display:inline-flex;justify-content:center;}</style></head>
+<body><div id="stage"></div></body>
+</html>"""
+
+# Renders every source in one call; failures come back per diagram
+_MERMAID_RENDER_JS = """
+async ({sources, theme}) => {
+    mermaid.initialize({startOnLoad: false, theme});
+    const results = [];
+    for (const code of sources) {
+        const id = `mmd${window.__mermaidSeq = (window.__mermaidSeq || 0) + 1}`;
+        try {
+            const {svg} = await mermaid.render(id, code);
+            results.push({svg});
+        } catch (e) {
+            results.push({error: String((e && e.message) || e)});
+        } finally {
+            document.getElementById('d' + id)?.remove();
+        }
+    }
+    return results;
+}
+"""
+
+
+def mermaid_cache_key(source: str, theme: str) -> str:
+    return hashlib.sha256(f"{MERMAID_VERSION}\n{theme}\n{source.strip()}".encode("utf-8")).hexdigest()
+
+
+class MermaidRenderer:
+    """
+    Singleton warm-page Mermaid renderer.
+
+    Usage:
+        svgs = await MermaidRenderer.render_svgs([code_a, code_b], theme="dark")
+        images = await MermaidRenderer.render_images([code_a, code_b], output_format="png")
+    """
+    _browser = None
+    _page = None
+    _loop = None
+    _lock = None
+    _svgs: "OrderedDict[str, str]" = OrderedDict()
+    _images: "OrderedDict[Tuple[str, int, str], bytes]" = OrderedDict()
+
+    @classmethod
+    def _remember(cls, cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > MERMAID_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    @classmethod
+    def _ensure_loop(cls):
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if cls._loop is not loop:
+            # Playwright objects are bound to the loop that created them
+            cls._browser = cls._page = None
+            cls._lock = asyncio.Lock()
+            cls._loop = loop
+
+    @classmethod
+    async def _ensure_page(cls):
+        """Open (or reopen) the warm page. Caller holds the lock."""
+        if cls._page is not None and not cls._page.is_closed():
+            return cls._page
+
+        if cls._browser is None or not cls._browser.is_connected():
+            cls._browser = await BrowserPool.acquire()
+            if cls._browser is None:
+                return None
+
+        page = await cls._browser.new_page()
+        await page.set_content(_MERMAID_PAGE)
+        if os.path.exists(MERMAID_BUNDLE_PATH):
+            await page.add_script_tag(path=MERMAID_BUNDLE_PATH)
+        else:
+            logger.warning(f"⚠️ Vendored Mermaid bundle missing at {MERMAID_BUNDLE_PATH}, loading from CDN")
+            await RenderAssetCache.install(page)
+            await page.add_script_tag(url=MERMAID_CDN)
+        cls._page = page
+        logger.info(f"🧜 Mermaid renderer page ready (v{MERMAID_VERSION})")
+        return page
+
+    @classmethod
+    async def _reset(cls):
+        page, cls._page = cls._page, None
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    @classmethod
+    async def _render_svgs_locked(cls, sources: List[str], theme: str) -> List[Optional[str]]:
+        keys = [mermaid_cache_key(source, theme) for source in sources]
+        missing = list(dict.fromkeys(k for k in keys if k not in cls._svgs))
+
+        if missing:
+            page = await cls._ensure_page()
+            if page is None:
+                logger.warning("⚠️ No browser available for Mermaid rendering")
+                return [cls._svgs.get(k) for k in keys]
+
+            by_key = dict(zip(keys, sources))
+            try:
+                results = await page.evaluate(
+                    _MERMAID_RENDER_JS,
+                    {"sources": [by_key[k] for k in missing], "theme": theme}
+                )
+            except Exception as e:
+                logger.error(f"❌ Mermaid render failed: {e}")
+                await cls._reset()
+                results = []
+
+            for key, result in zip(missing, results):
+                if result.get("svg"):
+                    cls._remember(cls._svgs, key, result["svg"])
+                else:
+                    logger.warning(f"⚠️ Mermaid diagram failed to render: {result.get('error')}")
+
+        svgs = []
+        for key in keys:
+            svg = cls._svgs.get(key)
+            if svg is not None:
+                cls._svgs.move_to_end(key)
+            svgs.append(svg)
+        return svgs
+
+    @classmethod
+    async def render_svgs(cls, sources: List[str], theme: str = "default") -> List[Optional[str]]:
+        """Render diagram sources to SVG markup (None for diagrams that fail)."""
+        if not PLAYWRIGHT_AVAILABLE:
+            return [None] * len(sources)
+        cls._ensure_loop()
+        async with cls._lock:
+            return await cls._render_svgs_locked(sources, theme)
+
+    @classmethod
+    async def render_images(
+        cls,
+        sources: List[str],
+        theme: str = "default",
+        width: int = 1200,
+        output_format: str = "png"
+    ) -> List[bytes]:
+        """Render diagram sources to raster images (b"" for diagrams that fail)."""
+        if not PLAYWRIGHT_AVAILABLE:
+            return [b""] * len(sources)
+        cls._ensure_loop()
+        async with cls._lock:
+            svgs = await cls._render_svgs_locked(sources, theme)
+            images = []
+            for source, svg in zip(sources, svgs):
+                if svg is None:
+                    images.append(b"")
+                    continue
+                image_key = (mermaid_cache_key(source, theme), width, output_format)
+                image = cls._images.get(image_key)
+                if image is None:
+                    try:
+                        image = await cls._screenshot(svg, width, output_format)
+                    except Exception as e:
+                        logger.error(f"❌ Mermaid screenshot failed: {e}")
+                        await cls._reset()
+                        images.append(b"")
+                        continue
+                    cls._remember(cls._images, image_key, image)
+                images.append(image)
+            return images
+
+    @classmethod
+    async def _screenshot(cls, svg: str, width: int, output_format: str) -> bytes:
+        page = await cls._ensure_page()
+        await page.set_viewport_size({"width": width, "height": 800})
+        await page.evaluate("svg => { document.getElementById('stage').innerHTML = svg; }", svg)
+        stage = await page.query_selector("#stage")
+        return await stage.screenshot(type=output_format, omit_background=output_format == "png")
+
+    @classmethod
+    async def shutdown(cls):
+        """Close the warm page and hand its browser back to the pool."""
+        if cls._lock is None:
+            return
+        cls._ensure_loop()
+        async with cls._lock:
+            await cls._reset()
+            browser, cls._browser = cls._browser, None
+            if browser is not None:
+                await BrowserPool.release(browser)
+
+
 class AssetType(str, Enum):
     """Supported asset types."""
     IMAGE = "image"
@@ -272,6 +951,7 @@ class AssetProcessor:
         
         self.storage_client = None
         self.vision_client = None
+        self._render_urls: Dict[str, str] = {}
         
         if GCS_AVAILABLE:
             try:
@@ -285,22 +965,24 @@ class AssetProcessor:
             except Exception as e:
                 logger.warning(f"⚠️ Vision client init failed: {e}")
 
-    def _load_logo_image(self, logo_url: str, context: str) -> Optional["Image.Image"]:
+    def _load_logo_image(self, logo_url: str, context: str, width: Optional[int] = None) -> Optional["Image.Image"]:
+        """
+        Logo as an RGBA image, scaled to `width` (aspect kept) when given.
+        Served from the remote asset cache; SVGs are rasterised once per width.
+        """
         if not logo_url or not PIL_AVAILABLE:
             return None
 
-        import requests
         import importlib.util
 
+        cache = get_remote_asset_cache()
         try:
-            logo_response = requests.get(logo_url, timeout=15)
-            logo_response.raise_for_status()
+            asset = cache.fetch(logo_url, timeout=15)
         except Exception as err:
             logger.warning(f"⚠️ Logo download failed for {context}: {err}")
             return None
 
-        content_type = (logo_response.headers.get("Content-Type") or "").lower()
-        is_svg = "image/svg" in content_type
+        content_type = asset.content_type.lower()
         if content_type and not content_type.startswith("image/"):
             logger.warning(
                 "⚠️ Invalid logo file for %s: expected image content type, got %s",
@@ -309,31 +991,21 @@ class AssetProcessor:
             )
             return None
 
-        logo_bytes = logo_response.content
-        if is_svg:
-            if importlib.util.find_spec("cairosvg") is None:
-                logger.warning(
-                    "⚠️ SVG logo provided for %s but cairosvg is unavailable for conversion.",
-                    context
-                )
-                return None
-            from cairosvg import svg2png
-            try:
-                logo_bytes = svg2png(bytestring=logo_bytes)
-            except Exception as err:
-                logger.warning(f"⚠️ Failed to convert SVG logo for {context}: {err}")
-                return None
-
-        logo_stream = io.BytesIO(logo_bytes)
-        logo_stream.seek(0)
+        if asset.is_svg and importlib.util.find_spec("cairosvg") is None:
+            logger.warning(
+                "⚠️ SVG logo provided for %s but cairosvg is unavailable for conversion.",
+                context
+            )
+            return None
 
         try:
-            logo_img = Image.open(logo_stream)
-            logo_img.verify()
-            logo_stream.seek(0)
-            return Image.open(logo_stream).convert("RGBA")
+            # Cached images are shared between callers
+            return cache.decode(asset, width).copy()
         except Exception as err:
-            logger.warning(f"⚠️ Invalid logo file for {context}: {err}")
+            if asset.is_svg:
+                logger.warning(f"⚠️ Failed to convert SVG logo for {context}: {err}")
+            else:
+                logger.warning(f"⚠️ Invalid logo file for {context}: {err}")
             return None
     
     def extract_dominant_colors(self, image_bytes: bytes, num_colors: int = 5) -> List[str]:
@@ -422,7 +1094,7 @@ class AssetProcessor:
     def analyze_luminance_from_url(self, image_url: str) -> str:
         """
         Analyze luminance from an image URL.
-        Downloads the image and delegates to analyze_luminance.
+        Fetches the image through the remote asset cache and delegates to analyze_luminance.
         
         Args:
             image_url: URL of the image to analyze
@@ -431,10 +1103,9 @@ class AssetProcessor:
             'dark' or 'light' mode string
         """
         try:
-            import requests
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            return self.analyze_luminance(response.content)
+            # Usually a render we just stored, so this is a local cache read
+            asset = get_remote_asset_cache().fetch(image_url, timeout=10)
+            return self.analyze_luminance(asset.content)
         except Exception as e:
             logger.warning(f"⚠️ Failed to fetch image for luminance analysis: {e}")
             return 'dark'  # Default
@@ -634,6 +1305,50 @@ class AssetProcessor:
             logger.error(f"❌ GCS upload failed: {e}")
             return None
     
+    def get_cached_render(self, key: str, extensions: Tuple[str, ...]) -> Optional[str]:
+        """Public URL of a stored render for `key` (first matching extension), or None."""
+        if not ENABLE_RENDER_CACHE or not self.storage_client:
+            return None
+        if key in self._render_urls:
+            return self._render_urls[key]
+        try:
+            bucket = self.storage_client.bucket(self.bucket_name)
+            for ext in extensions:
+                blob = bucket.blob(f"{RENDER_CACHE_PREFIX}/{key}.{ext}")
+                if blob.exists():
+                    logger.info(f"♻️ Render cache hit {key[:12]}.{ext} (skipping render)")
+                    self._remember_render(key, blob.public_url)
+                    return blob.public_url
+        except Exception as e:
+            logger.warning(f"⚠️ Render cache lookup failed: {e}")
+        return None
+
+    def store_render(
+        self, key: str, ext: str, data: bytes, content_type: str, degraded: bool = False
+    ) -> Optional[str]:
+        """
+        Upload a render and return the public URL.
+        Complete renders go under their content-addressed path; `degraded` ones
+        get a one-off path and are never returned by get_cached_render.
+        """
+        if degraded:
+            path = f"{DEGRADED_RENDER_PREFIX}/{key}-{int(time.time() * 1000)}.{ext}"
+            logger.info(f"⚠️ Degraded render {key[:12]}.{ext} stored outside the render cache")
+        else:
+            path = f"{RENDER_CACHE_PREFIX}/{key}.{ext}"
+        url = self.upload_to_gcs(data, path, content_type)
+        if url:
+            if not degraded:
+                self._remember_render(key, url)
+            # Later pipeline stages (luminance, branding) read it back locally
+            get_remote_asset_cache().seed(url, data, content_type)
+        return url
+
+    def _remember_render(self, key: str, url: str):
+        if len(self._render_urls) >= RENDER_CACHE_MEMO_SIZE:
+            self._render_urls.pop(next(iter(self._render_urls)))
+        self._render_urls[key] = url
+    
     def process_image(
         self,
         image_bytes: bytes,
@@ -750,15 +1465,10 @@ class AssetProcessor:
         logo_url = brand_dna.get("logo_url")
         if logo_url:
             try:
-                import requests
-                logo_response = requests.get(logo_url, timeout=10)
-                logo_response.raise_for_status()  # Explicit 404/403 detection
-                logo_img = Image.open(io.BytesIO(logo_response.content)).convert("RGBA")
-
                 target_logo_width = int(base_img.width * 0.15)
-                aspect_ratio = logo_img.height / logo_img.width
-                target_logo_height = int(target_logo_width * aspect_ratio)
-                logo_img = logo_img.resize((target_logo_width, target_logo_height), Image.Resampling.LANCZOS)
+                logo_img = self._load_logo_image(logo_url, "brand layer", width=target_logo_width)
+                if logo_img is None:
+                    return base_img
 
                 padding = int(base_img.width * 0.05)
                 x_pos = base_img.width - target_logo_width - padding
@@ -806,14 +1516,22 @@ class AssetProcessor:
             return base_image_url
         
         import random
-        import requests
-        import time
+        
+        # Same source image + brand → reuse the stored branded render (and its layout)
+        cache_key = render_cache_key(
+            "branding", base_image_url,
+            logo_url=brand_dna.get('logo_url'),
+            primary=brand_dna.get('color_palette', {}).get('primary', '#000000'),
+            format="jpg"
+        )
+        cached_url = self.get_cached_render(cache_key, ("jpg",))
+        if cached_url:
+            return cached_url
         
         try:
             # 1. Download Base Image (with timeout protection)
-            response = requests.get(base_image_url, timeout=30)
-            response.raise_for_status()
-            base_img = Image.open(io.BytesIO(response.content)).convert("RGBA")
+            base_asset = get_remote_asset_cache().fetch(base_image_url, timeout=30)
+            base_img = Image.open(io.BytesIO(base_asset.content)).convert("RGBA")
             
             # Extract brand data
             logo_url = brand_dna.get('logo_url')
@@ -829,6 +1547,9 @@ class AssetProcessor:
             else:
                 r, g, b = 0, 0, 0
             
+            # A transiently missing logo must not become the cached branded render
+            logo_missing = False
+            
             # 2. Select Random Layout Style
             layout = random.choice(['border', 'split', 'watermark'])
             logger.info(f"🎨 Applying '{layout}' branding layout")
@@ -861,15 +1582,10 @@ class AssetProcessor:
             else:  # watermark
                 # WATERMARK: Repeated logo tiles at 5% opacity
                 if logo_url:
-                    logo_img = self._load_logo_image(logo_url, "watermark")
-                    if logo_img:
+                    logo_small = self._load_logo_image(logo_url, "watermark", width=int(base_img.width * 0.10))
+                    logo_missing = logo_small is None
+                    if logo_small:
                         try:
-                            # Make logo very transparent (5% opacity)
-                            logo_small = logo_img.resize(
-                                (int(base_img.width * 0.10), int(base_img.width * 0.10 * logo_img.height / logo_img.width)),
-                                Image.Resampling.LANCZOS
-                            )
-                            
                             # Reduce opacity to 5%
                             alpha = logo_small.split()[3]
                             alpha = alpha.point(lambda p: int(p * 0.05))
@@ -892,14 +1608,13 @@ class AssetProcessor:
             
             # 3. Apply Main Logo (based on layout)
             if logo_url and layout != 'watermark':  # Watermark already has logos
-                logo_img = self._load_logo_image(logo_url, "logo placement")
+                # Logo at 18% of image width
+                target_logo_width = int(base_img.width * 0.18)
+                logo_img = self._load_logo_image(logo_url, "logo placement", width=target_logo_width)
+                logo_missing = logo_img is None
                 if logo_img:
                     try:
-                        # Resize logo to 18% of image width
-                        target_logo_width = int(base_img.width * 0.18)
-                        aspect_ratio = logo_img.height / logo_img.width
-                        target_logo_height = int(target_logo_width * aspect_ratio)
-                        logo_img = logo_img.resize((target_logo_width, target_logo_height), Image.Resampling.LANCZOS)
+                        target_logo_height = logo_img.height
                         
                         # Position based on layout
                         padding = int(base_img.width * 0.05)
@@ -924,10 +1639,9 @@ class AssetProcessor:
             base_img.save(output, format="JPEG", quality=92)
             processed_bytes = output.getvalue()
             
-            filename = f"advanced_branded_{layout}_{int(time.time())}.jpg"
-            destination_path = f"assets/branded/{filename}"
-            
-            return self.upload_to_gcs(processed_bytes, destination_path, "image/jpeg") or base_image_url
+            return self.store_render(
+                cache_key, "jpg", processed_bytes, "image/jpeg", degraded=logo_missing
+            ) or base_image_url
             
         except Exception as e:
             logger.error(f"❌ Advanced branding failed: {e}")
@@ -997,7 +1711,7 @@ class AssetProcessor:
     ) -> bytes:
         """
         Render Mermaid diagram to raster image.
-        Uses Mermaid.js CDN for client-side rendering.
+        Uses the warm MermaidRenderer page (vendored Mermaid bundle).
         
         Args:
             mermaid_code: Mermaid diagram syntax (without ```mermaid fences)
@@ -1008,56 +1722,33 @@ class AssetProcessor:
         Returns:
             Image bytes of rendered diagram
         """
+        images = await self.render_mermaid_batch([mermaid_code], theme, width, output_format)
+        return images[0]
+    
+    async def render_mermaid_batch(
+        self,
+        mermaid_codes: List[str],
+        theme: str = "default",
+        width: int = 1200,
+        output_format: str = "png"
+    ) -> List[bytes]:
+        """
+        Render several Mermaid diagrams in one page session.
+        
+        Returns:
+            Image bytes per diagram, in order (b"" for diagrams that failed)
+        """
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("⚠️ Playwright not available for Mermaid rendering")
-            return b""
+            return [b""] * len(mermaid_codes)
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page(viewport={"width": width, "height": 800})
-                
-                # HTML page with Mermaid.js CDN
-                html = f"""
-                <!DOCTYPE html>
-                <html>
-                <head>
-                    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-                    <style>
-                        body {{margin:20px;background:#fff;}}
-                        .mermaid {{display:flex;justify-content:center;}}
-                    </style>
-                </head>
-                <body>
-                    <div class="mermaid">
-                    {mermaid_code}
-                    </div>
-                    <script>mermaid.initialize({{startOnLoad:true,theme:'{theme}'}});</script>
-                </body>
-                </html>
-                """
-                
-                await page.set_content(html, wait_until="networkidle")
-                # Wait for Mermaid to render
-                await page.wait_for_selector(".mermaid svg", timeout=10000)
-                
-                # Get the actual SVG element bounds
-                mermaid_div = await page.query_selector(".mermaid")
-                box = await mermaid_div.bounding_box() if mermaid_div else None
-                
-                screenshot = await page.screenshot(
-                    type=output_format,
-                    clip=box if box else None,
-                    omit_background=output_format == "png"
-                )
-                
-                await browser.close()
-                logger.info(f"✅ Rendered Mermaid diagram ({theme} theme) to {output_format.upper()}")
-                return screenshot
-                
+            images = await MermaidRenderer.render_images(mermaid_codes, theme, width, output_format)
+            logger.info(f"✅ Rendered {sum(1 for i in images if i)}/{len(images)} Mermaid diagrams ({theme} theme) to {output_format.upper()}")
+            return images
         except Exception as e:
             logger.error(f"❌ Mermaid render failed: {e}")
-            return b""
+            return [b""] * len(mermaid_codes)
     
     async def render_html_to_image(
         self,
@@ -1072,53 +1763,40 @@ class AssetProcessor:
         Render HTML creative to raster image.
         Used for HTML5 ad banners, landing page previews, and animated GSAP templates.
         
-        V4.1 Animation Rendering Fix:
-        - Added animation_delay for GSAP animation stabilization
-        - Added configurable timeout (use 60000 for vertical 9:16 formats)
-        - Checks for .animation-complete class if present
+        Captures as soon as the page is ready (see wait_for_render_ready):
+        fonts and images loaded, then the template's ready signal or GSAP
+        seeked to its final frame.
         
         Args:
             html_content: Complete HTML document or snippet
             width: Viewport width
             height: Viewport height
             output_format: 'png' or 'jpeg'
-            animation_delay: Seconds to wait for animations to stabilize (default 3.0)
+            animation_delay: Maximum seconds to wait for readiness (default 3.0)
             timeout: Page load timeout in milliseconds (default 30000, use 60000 for heavy animations)
             
         Returns:
             Screenshot bytes
         """
-        import asyncio
-        
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("⚠️ Playwright not available for HTML rendering")
             return b""
         
+        started = time.perf_counter()
         try:
             async with async_playwright() as p:
                 browser = await p.chromium.launch(headless=True)
                 page = await browser.new_page(viewport={"width": width, "height": height})
+                await RenderAssetCache.install(page)
                 
                 # Check if it's a full HTML document or just a snippet
                 if not html_content.strip().lower().startswith("<!doctype") and not html_content.strip().lower().startswith("<html"):
                     html_content = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
                 
-                # V4.1: Use configurable timeout for set_content
-                await page.set_content(html_content, wait_until="networkidle", timeout=timeout)
+                # Fonts and CSS images are awaited explicitly, no need for network idle
+                await page.set_content(html_content, wait_until="load", timeout=timeout)
                 
-                # V4.1 FIX: Wait for GSAP animations to stabilize
-                # First, try to wait for .animation-complete class (if template adds it)
-                try:
-                    await page.wait_for_selector(".animation-complete", timeout=2000)
-                    logger.debug("✓ Animation complete class detected")
-                except Exception:
-                    logger.debug("No .animation-complete class detected")
-                    # Class not present - use fixed animation delay as fallback
-                    pass
-                
-                # Always apply animation delay for GSAP stabilization
-                await asyncio.sleep(animation_delay)
-                logger.debug(f"⏱️ Animation delay complete ({animation_delay}s)")
+                outcome = await wait_for_render_ready(page, animation_delay)
                 
                 screenshot = await page.screenshot(
                     type=output_format,
@@ -1127,7 +1805,11 @@ class AssetProcessor:
                 )
                 
                 await browser.close()
-                logger.info(f"✅ Rendered HTML to {output_format.upper()} ({width}x{height}) [delay={animation_delay}s]")
+                _record_render_latency(started, outcome)
+                logger.info(
+                    f"✅ Rendered HTML to {output_format.upper()} ({width}x{height}) "
+                    f"[{outcome}, {(time.perf_counter() - started) * 1000:.0f}ms]"
+                )
                 return screenshot
                 
 
@@ -1150,6 +1832,8 @@ class AssetProcessor:
         Uses BrowserPool for faster browser acquisition (eliminates ~1-2s cold-start).
         Uses gsap.globalTimeline.progress(1).pause() to instantly snap the animation
         to its final frame, then captures a screenshot.
+        Renders are content-addressed (see render_cache_key): identical HTML and
+        output spec return the stored image without acquiring a browser.
         
         Args:
             html_content: HTML string with GSAP animations
@@ -1164,12 +1848,23 @@ class AssetProcessor:
         """
         import asyncio
         
+        # Normalize HTML
+        if not html_content.strip().lower().startswith("<!doctype") and not html_content.strip().lower().startswith("<html"):
+            html_content = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
+        
+        # Identical resolved HTML + output spec → stored render, no browser needed
+        cache_key = render_cache_key("image", html_content, width=width, height=height, format=output_format)
+        cached_url = await asyncio.to_thread(self.get_cached_render, cache_key, (output_format,))
+        if cached_url:
+            return cached_url
+        
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("⚠️ Playwright not available for image generation")
             return None
         
         browser = None
         context = None
+        started = time.perf_counter()
         try:
             # V6.0: Use BrowserPool for faster acquisition
             browser = await BrowserPool.acquire()
@@ -1179,28 +1874,17 @@ class AssetProcessor:
             
             # Create a new context for isolation
             context = await browser.new_context(viewport={"width": width, "height": height})
+            await RenderAssetCache.install(context)
             page = await context.new_page()
             
-            # Normalize HTML
-            if not html_content.strip().lower().startswith("<!doctype") and not html_content.strip().lower().startswith("<html"):
-                html_content = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
-            
             # Load content
-            await page.set_content(html_content, wait_until="networkidle", timeout=60000)
-            
-            # V5.0 SNAP-TO-FINISH: Skip animation to final frame instantly
-            try:
-                await page.evaluate("""
-                    if (typeof gsap !== 'undefined' && gsap.globalTimeline) {
-                        gsap.globalTimeline.progress(1).pause();
-                    }
-                """)
-                logger.debug("⚡ GSAP snapped to final frame")
-            except Exception:
-                pass
+            await page.set_content(html_content, wait_until="load", timeout=60000)
             
-            # Brief wait for render stabilization
-            await asyncio.sleep(0.3)  # Reduced from 0.5s with warmed browser
+            # V5.0 SNAP-TO-FINISH: fonts/images ready, GSAP seeked to its final frame
+            outcome = await wait_for_render_ready(page, IMAGE_READY_CEILING_SEC)
+            if outcome == "timeout":
+                # Fonts or images still loading: at least don't capture a mid-entrance frame
+                await snap_gsap_to_end(page)
             
             # Capture screenshot
             screenshot = await page.screenshot(
@@ -1208,17 +1892,19 @@ class AssetProcessor:
                 full_page=False,
                 omit_background=output_format == "png"
             )
+            _record_render_latency(started, outcome)
             
             # Clean up context
             await context.close()
             context = None
             
-            # Upload to GCS
-            target_path = f"assets/{user_id}/{asset_id}/static.{output_format}"
-            uploaded_url = self.upload_to_gcs(
+            # Upload to GCS under the render's content address
+            uploaded_url = self.store_render(
+                cache_key,
+                output_format,
                 screenshot,
-                target_path,
-                content_type=f"image/{output_format}"
+                content_type=f"image/{output_format}",
+                degraded=outcome == "timeout"
             )
             
             logger.info(f"📸 Image asset generated & uploaded: {uploaded_url}")
@@ -1317,6 +2003,8 @@ class AssetProcessor:
     ) -> Optional[str]:
         """
         Record HTML/GSAP animation to MP4 video.
+        Content-addressed like generate_image_asset: a stored recording of the
+        same HTML and output spec is returned without recording.
         
         Args:
             html_content: HTML string with animations
@@ -1333,6 +2021,18 @@ class AssetProcessor:
         import asyncio
         import os
         
+        # Normalize HTML
+        if not html_content.strip().lower().startswith("<!doctype") and not html_content.strip().lower().startswith("<html"):
+            html_content = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
+        
+        # Identical resolved HTML + output spec → stored video, no browser or ffmpeg
+        cache_key = render_cache_key(
+            "video", html_content, width=width, height=height, duration=duration, fps=fps
+        )
+        cached_url = await asyncio.to_thread(self.get_cached_render, cache_key, ("mp4",))
+        if cached_url:
+            return cached_url
+        
         if not PLAYWRIGHT_AVAILABLE:
             logger.warning("⚠️ Playwright not available for video recording")
             return None
@@ -1355,13 +2055,10 @@ class AssetProcessor:
                     record_video_dir=temp_dir,
                     record_video_size={"width": width, "height": height}
                 )
+                await RenderAssetCache.install(context)
                 
                 page = await context.new_page()
                 
-                # Normalize HTML
-                if not html_content.strip().lower().startswith("<!doctype") and not html_content.strip().lower().startswith("<html"):
-                    html_content = f"<!DOCTYPE html><html><body>{html_content}</body></html>"
-                
                 # Load content
                 await page.set_content(html_content, wait_until="networkidle", timeout=60000)
                 
@@ -1425,12 +2122,14 @@ class AssetProcessor:
                 
                 # Determine extension
                 ext = "mp4" if content_type == "video/mp4" else "webm"
-                target_path = f"assets/{user_id}/{asset_id}/video.{ext}"
                 
-                uploaded_url = self.upload_to_gcs(
+                # WebM fallback (no ffmpeg / failed conversion) isn't the render we want to keep
+                uploaded_url = self.store_render(
+                    cache_key,
+                    ext,
                     video_bytes,
-                    target_path,
-                    content_type=content_type
+                    content_type=content_type,
+                    degraded=ext != "mp4"
                 )
                 
                 # Cleanup
@@ -9,7 +9,7 @@ This module provides:
 """
 import os
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 
 try:
@@ -590,6 +590,57 @@ class BigQueryService:
     
     # --- MARKET RADAR INSERT METHODS ---
     
+    def insert_mention_logs_batch(self, mentions: List[Dict[str, Any]]) -> int:
+        """Insert multiple mention logs. Returns count of successful inserts."""
+        if not self.client or not mentions:
+            return 0
+            
+        table_ref = self._get_table_ref("brand_mentions_log")
+        
+        for mention in mentions:
+            mention.setdefault("detected_at", datetime.utcnow().isoformat())
+        
+        try:
+            errors = self.client.insert_rows_json(table_ref, mentions)
+            if errors:
+                logger.error(f"❌ Batch insert errors: {errors}")
+                return len(mentions) - len(errors)
+            return len(mentions)
+        except Exception as e:
+            logger.error(f"❌ Failed to batch insert mention logs: {e}")
+            return 0
+    
+    def query_existing_mention_ids(self, user_id: str, mention_ids: List[str]) -> Optional[Set[str]]:
+        """
+        Return which of mention_ids are already logged for user_id.
+        Returns None if the check could not be made.
+        """
+        if not self.client:
+            return None
+        if not mention_ids:
+            return set()
+        
+        query = f"""
+        SELECT DISTINCT mention_id
+        FROM `{self._get_table_ref('brand_mentions_log')}`
+        WHERE user_id = @user_id
+          AND mention_id IN UNNEST(@mention_ids)
+        """
+        
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("user_id", "STRING", user_id),
+                bigquery.ArrayQueryParameter("mention_ids", "STRING", list(mention_ids)),
+            ]
+        )
+        
+        try:
+            results = self.client.query(query, job_config=job_config)
+            return {row["mention_id"] for row in results}
+        except Exception as e:
+            logger.error(f"❌ Mention existence query failed: {e}")
+            return None
+    
     def insert_competitor_event(self, data: Dict[str, Any]) -> bool:
         """Log a competitor event to BigQuery."""
         return self._insert_to_table("competitor_events_log", data, "detected_at")
@@ -5,11 +5,70 @@ Automated hourly scanning for mentions and opportunities.
 import asyncio
 import logging
 import hashlib
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Settings documents live at user_integrations/{uid}_brand_monitoring.
+# `brand_monitoring_enabled` + `next_scan_at` are the scan cursor fields;
+# see firestore.indexes.json for the composite index backing the due query.
+SETTINGS_COLLECTION = "user_integrations"
+SCAN_INTERVAL = timedelta(minutes=55)  # Buffer below the hourly schedule
+
+USER_SCAN_CONCURRENCY = 4
+MAX_COMPETITORS = 5
+
+# Per-provider limits: (max concurrent requests, min seconds between requests)
+PROVIDER_LIMITS = {
+    "news": (2, 0.5),
+    "web": (2, 1.0),
+}
+
+
+class ProviderRateLimiter:
+    """
+    Async limiter combining a concurrency cap with a minimum spacing
+    between request starts. Shared by all user scans in a run so that
+    concurrent scans never exceed a provider's limits.
+    """
+
+    def __init__(self, max_concurrent: int, min_interval: float):
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._lock = asyncio.Lock()
+        self._min_interval = min_interval
+        self._next_slot = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                wait = self._next_slot - now
+                self._next_slot = max(now, self._next_slot) + self._min_interval
+            if wait > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+def scan_schedule_fields(enabled: bool) -> Dict[str, Any]:
+    """
+    Cursor fields to merge into a settings document when monitoring is
+    (re)configured, so the user is picked up by the next hourly scan.
+    """
+    return {
+        "brand_monitoring_enabled": bool(enabled),
+        "next_scan_at": datetime.utcnow(),
+    }
+
 
 class BrandMonitoringScanner:
     """
@@ -22,18 +81,88 @@ class BrandMonitoringScanner:
     """
     
     def __init__(self):
-        self.last_scan: Dict[str, datetime] = {}  # user_id -> last scan time
+        self.last_run_at: Optional[datetime] = None  # Last hourly run on this instance
         self.running = False
+        self.provider_limiters: Dict[str, ProviderRateLimiter] = {
+            provider: ProviderRateLimiter(max_concurrent, min_interval)
+            for provider, (max_concurrent, min_interval) in PROVIDER_LIMITS.items()
+        }
     
     def _generate_mention_id(self, url: str, title: str) -> str:
         """Generate unique ID for a mention to prevent duplicates."""
         content = f"{url}:{title}"
         return hashlib.sha256(content.encode()).hexdigest()[:16]
     
+    async def _search_news(self, news_client, brand_name: str, max_results: int) -> List[Dict[str, Any]]:
+        """News search under the shared news provider limit."""
+        async with self.provider_limiters["news"]:
+            return await news_client.search_brand_mentions(
+                brand_name=brand_name,
+                max_results=max_results
+            ) or []
+    
+    async def _search_web(self, web_client, brand_name: str, max_results: int) -> List[Dict[str, Any]]:
+        """Web search under the shared web provider limit."""
+        async with self.provider_limiters["web"]:
+            return await web_client.search_web_mentions(
+                brand_name=brand_name,
+                max_results=max_results
+            ) or []
+    
+    async def _scan_competitor(
+        self,
+        user_id: str,
+        comp_name: str,
+        search_term: str,
+        news_client,
+        monitoring_agent,
+        competitor_agent,
+        bq
+    ) -> int:
+        """
+        Fetch, analyze and log actions for a single competitor.
+        
+        Returns:
+            Number of analyzed competitor mentions
+        """
+        comp_news = await self._search_news(news_client, comp_name, 10)
+        if not comp_news:
+            return 0
+        
+        comp_analyzed = await monitoring_agent.analyze_mentions(comp_name, comp_news)
+        
+        # Detect competitor actions
+        for comp_mention in comp_analyzed:
+            action = await competitor_agent.analyze_competitor_mention(
+                comp_mention,
+                comp_name,
+                {"brand_name": search_term}
+            )
+            
+            if action.get('opportunity_type'):
+                # Log competitor action
+                bq.insert_competitor_action({
+                    "action_id": self._generate_mention_id(
+                        comp_mention.get('url', ''),
+                        f"{comp_name}:{action.get('opportunity_type')}"
+                    ),
+                    "user_id": user_id,
+                    "competitor_name": comp_name,
+                    "action_type": action.get('opportunity_type'),
+                    "description": action.get('our_angle', ''),
+                    "estimated_impact": action.get('threat_level', 'low'),
+                    "source_urls": [comp_mention.get('url', '')]
+                })
+        
+        return len(comp_analyzed)
+    
     async def scan_user(self, user_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Scan mentions for a single user.
         
+        News, web and competitor fetches are fanned out concurrently; each
+        provider call goes through the scanner's shared rate limiters.
+        
         Args:
             user_id: The user to scan for
             config: User's brand monitoring config (brand_name, competitors, etc.)
@@ -47,6 +176,7 @@ class BrandMonitoringScanner:
         from app.agents.competitor_agent import CompetitorAgent
         from app.agents.pr_agent import PRAgent
         from app.services.bigquery_service import get_bigquery_service
+        from app.services.mention_deduplicator import MentionDeduplicator
         
         logger.info(f"🔍 Starting scan for user: {user_id}")
         
@@ -68,42 +198,52 @@ class BrandMonitoringScanner:
         }
         
         bq = get_bigquery_service()
+        competitor_task = None
         
         try:
-            # 1. Fetch brand mentions
             news_client = NewsClient()
             web_client = WebSearchClient()
+            monitoring_agent = BrandMonitoringAgent()
             
             search_term = brand_name or personal_name
             
-            news_results = await news_client.search_brand_mentions(
-                brand_name=search_term,
-                max_results=20
-            )
+            comp_names = []
+            for competitor in (competitors or [])[:MAX_COMPETITORS]:
+                comp_name = competitor.get('name') if isinstance(competitor, dict) else competitor
+                if comp_name:
+                    comp_names.append(comp_name)
             
-            web_results = await web_client.search_web_mentions(
-                brand_name=search_term,
-                max_results=20
+            # 1. Fetch brand mentions and scan competitors concurrently
+            if comp_names:
+                competitor_agent = CompetitorAgent()
+                competitor_task = asyncio.gather(*[
+                    self._scan_competitor(
+                        user_id, comp_name, search_term,
+                        news_client, monitoring_agent, competitor_agent, bq
+                    )
+                    for comp_name in comp_names
+                ], return_exceptions=True)
+            
+            news_results, web_results = await asyncio.gather(
+                self._search_news(news_client, search_term, 20),
+                self._search_web(web_client, search_term, 20)
             )
             
-            all_mentions = (news_results or []) + (web_results or [])
+            all_mentions = news_results + web_results
             
             # 2. Analyze sentiment
-            monitoring_agent = BrandMonitoringAgent()
             analyzed = await monitoring_agent.analyze_mentions(search_term, all_mentions)
             
             results["brand_mentions"] = len(analyzed)
             
-            # 3. Log to BigQuery (with deduplication)
+            # 3. Log to BigQuery (only mentions not logged before)
+            log_rows = []
             for mention in analyzed:
-                mention_id = self._generate_mention_id(
-                    mention.get('url', ''),
-                    mention.get('title', '')
-                )
-                
-                # Check if already exists (simple approach - could optimize with batch check)
-                log_data = {
-                    "mention_id": mention_id,
+                log_rows.append({
+                    "mention_id": self._generate_mention_id(
+                        mention.get('url', ''),
+                        mention.get('title', '')
+                    ),
                     "user_id": user_id,
                     "entity_name": search_term,
                     "entity_type": "brand",
@@ -119,51 +259,19 @@ class BrandMonitoringScanner:
                     "severity": mention.get('severity'),
                     "key_concerns": mention.get('key_concerns', []),
                     "published_at": mention.get('published_at')
-                }
-                
-                if bq.insert_mention_log(log_data):
-                    results["new_items_logged"] += 1
-                else:
-                    results["duplicates_skipped"] += 1
+                })
             
-            # 4. Scan competitors
-            if competitors:
-                competitor_agent = CompetitorAgent()
-                
-                for competitor in competitors[:5]:  # Limit to 5
-                    comp_name = competitor.get('name') if isinstance(competitor, dict) else competitor
-                    
-                    comp_news = await news_client.search_brand_mentions(
-                        brand_name=comp_name,
-                        max_results=10
-                    )
-                    
-                    if comp_news:
-                        comp_analyzed = await monitoring_agent.analyze_mentions(comp_name, comp_news)
-                        results["competitor_mentions"] += len(comp_analyzed)
-                        
-                        # Detect competitor actions
-                        for comp_mention in comp_analyzed:
-                            action = await competitor_agent.analyze_competitor_mention(
-                                comp_mention,
-                                comp_name,
-                                {"brand_name": search_term}
-                            )
-                            
-                            if action.get('opportunity_type'):
-                                # Log competitor action
-                                bq.insert_competitor_action({
-                                    "action_id": self._generate_mention_id(
-                                        comp_mention.get('url', ''),
-                                        f"{comp_name}:{action.get('opportunity_type')}"
-                                    ),
-                                    "user_id": user_id,
-                                    "competitor_name": comp_name,
-                                    "action_type": action.get('opportunity_type'),
-                                    "description": action.get('our_angle', ''),
-                                    "estimated_impact": action.get('threat_level', 'low'),
-                                    "source_urls": [comp_mention.get('url', '')]
-                                })
+            new_rows = MentionDeduplicator(bq=bq).filter_new(user_id, search_term, log_rows)
+            results["new_items_logged"] = bq.insert_mention_logs_batch(new_rows)
+            results["duplicates_skipped"] = len(log_rows) - len(new_rows)
+            
+            # 4. Collect competitor results
+            if competitor_task is not None:
+                for comp_name, outcome in zip(comp_names, await competitor_task):
+                    if isinstance(outcome, Exception):
+                        logger.warning(f"⚠️ Competitor scan failed for {comp_name}: {outcome}")
+                        continue
+                    results["competitor_mentions"] += outcome
             
             # 5. Detect PR opportunities
             pr_agent = PRAgent()
@@ -179,21 +287,45 @@ class BrandMonitoringScanner:
         except Exception as e:
             logger.error(f"❌ Scan failed for {user_id}: {e}")
             results["error"] = str(e)
+            if competitor_task is not None:
+                competitor_task.cancel()
         
         results["status"] = "success"
         return results
     
+    def _due_settings_query(self, db, now: datetime):
+        """Monitoring-enabled settings documents whose next scan is due."""
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        
+        return (
+            db.collection(SETTINGS_COLLECTION)
+              .where(filter=FieldFilter("brand_monitoring_enabled", "==", True))
+              .where(filter=FieldFilter("next_scan_at", "<=", now))
+        )
+    
+    def _save_scan_cursor(self, doc_ref, started_at: datetime, result: Dict[str, Any]) -> None:
+        """Persist the scan cursor so restarts neither rescan nor skip this user."""
+        try:
+            doc_ref.update({
+                "last_scan_at": started_at,
+                "next_scan_at": started_at + SCAN_INTERVAL,
+                "last_scan_status": "error" if result.get("error") else result.get("status", "success"),
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save scan cursor for {doc_ref.id}: {e}")
+    
     async def run_hourly_scan(self) -> Dict[str, Any]:
         """
-        Run scan for all active users.
+        Run scan for all users whose persisted cursor is due.
         Called by scheduler every hour.
         """
         from app.core.security import db
         
         logger.info("🕐 Starting hourly brand monitoring scan...")
         
+        now = datetime.utcnow()
         scan_summary = {
-            "start_time": datetime.utcnow().isoformat(),
+            "start_time": now.isoformat(),
             "users_scanned": 0,
             "total_mentions": 0,
             "total_logged": 0,
@@ -201,25 +333,18 @@ class BrandMonitoringScanner:
         }
         
         try:
-            # Get all users with brand monitoring configured
-            configs = db.collection('user_integrations').stream()
+            due_docs = list(self._due_settings_query(db, now).stream())
+            semaphore = asyncio.Semaphore(USER_SCAN_CONCURRENCY)
             
-            for doc in configs:
-                if '_brand_monitoring' not in doc.id:
-                    continue
-                
-                user_id = doc.id.replace('_brand_monitoring', '')
-                config = doc.to_dict()
+            async def scan_doc(doc) -> None:
+                config = doc.to_dict() or {}
+                user_id = config.get('user_id') or doc.id.replace('_brand_monitoring', '')
                 
-                # Check if last scan was > 55 minutes ago (buffer for hourly)
-                last_scan = self.last_scan.get(user_id)
-                if last_scan and (datetime.utcnow() - last_scan) < timedelta(minutes=55):
-                    continue
+                async with semaphore:
+                    started_at = datetime.utcnow()
+                    result = await self.scan_user(user_id, config)
                 
-                # Scan this user
-                result = await self.scan_user(user_id, config)
-                
-                self.last_scan[user_id] = datetime.utcnow()
+                self._save_scan_cursor(doc.reference, started_at, result)
                 scan_summary["users_scanned"] += 1
                 scan_summary["total_mentions"] += result.get("brand_mentions", 0)
                 scan_summary["total_logged"] += result.get("new_items_logged", 0)
@@ -229,14 +354,17 @@ class BrandMonitoringScanner:
                         "user_id": user_id,
                         "error": result["error"]
                     })
-                
-                # Small delay between users to avoid rate limits
-                await asyncio.sleep(2)
+            
+            outcomes = await asyncio.gather(*[scan_doc(doc) for doc in due_docs], return_exceptions=True)
+            for doc, outcome in zip(due_docs, outcomes):
+                if isinstance(outcome, Exception):
+                    scan_summary["errors"].append({"user_id": doc.id, "error": str(outcome)})
         
         except Exception as e:
             logger.error(f"❌ Hourly scan failed: {e}")
             scan_summary["errors"].append({"fatal": str(e)})
         
+        self.last_run_at = now
         scan_summary["end_time"] = datetime.utcnow().isoformat()
         logger.info(f"✅ Hourly scan complete: {scan_summary['users_scanned']} users, {scan_summary['total_mentions']} mentions")
         
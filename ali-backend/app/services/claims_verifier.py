@@ -1,5 +1,12 @@
 import re
-from typing import Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Bump when RISKY_PHRASES / SAFE_REPLACEMENTS (or governance CLAIM_PATTERNS) change;
+# compiled matchers are cached per (policy version, brand policy).
+CLAIMS_POLICY_VERSION = "1"
+MATCHER_CACHE_SIZE = 256
 
 RISKY_PHRASES = [
     "guaranteed",
@@ -28,12 +35,119 @@ SAFE_REPLACEMENTS = {
 }
 
 
-def _collect_blocked_terms(claims_policy: Dict) -> List[str]:
+class ClaimsMatcher:
+    """
+    A set of claim rules compiled into one case-insensitive alternation.
+    One scan reports every rule that fired and applies all replacements.
+    Rules are (pattern, replacement); earlier rules win where they overlap.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]]):
+        rules = list(rules)
+        self.replacements = [replacement for _, replacement in rules]
+        alternation = "|".join(f"(?P<r{i}>{pattern})" for i, (pattern, _) in enumerate(rules))
+        self._regex = re.compile(alternation, re.IGNORECASE) if rules else None
+
+    def apply(self, text: str) -> Tuple[str, Set[int]]:
+        """Rewrite `text`; returns the new text and the indices of rules that matched."""
+        if not self._regex or not text:
+            return text, set()
+        hits: Set[int] = set()
+
+        def replace(match):
+            index = int(match.lastgroup[1:])
+            hits.add(index)
+            return self.replacements[index]
+
+        return self._regex.sub(replace, text), hits
+
+
+def _phrase_pattern(phrase: str) -> str:
+    escaped = re.escape(phrase)
+    # Phrases with special characters (like "100%") at the edges don't work with \b
+    if not phrase[0].isalnum() or not phrase[-1].isalnum():
+        return escaped
+    return rf"\b{escaped}\b"
+
+
+def _term_pattern(term: str) -> str:
+    return rf"\b{re.escape(term)}\b"
+
+
+def _ordered_rules(phrases: List[str], pattern, replacement) -> List[Tuple[str, str]]:
+    """
+    Rules for literal phrases that resolve interactions the way a
+    per-phrase loop does (each phrase rewritten in list order), so the
+    single scan gives the same text and flags:
+
+    - A phrase doesn't match where an earlier-listed phrase starts inside
+      it: the loop rewrote that one first ("#100%" -> "#highly", not
+      "top00%").
+    - A \\b-anchored phrase doesn't match against an earlier phrase whose
+      rewrite turns the separating character into a word character
+      ("100%perfect" -> "highlyperfect", so "perfect" no longer matches).
+    """
+    def word(ch: str) -> bool:
+        return bool(ch) and re.match(r"\w", ch) is not None
+
+    rules = []
+    for index, phrase in enumerate(phrases):
+        own = pattern(phrase)
+        lowered = phrase.lower()
+        before, after = [], []
+        # Earlier rules carry their own guards: they only count where the loop would have matched them
+        for earlier, (earlier_pattern, rewritten) in zip(phrases, rules):
+            for offset in range(1, len(phrase)):
+                tail = lowered[offset:]
+                if earlier.lower().startswith(tail) or tail.startswith(earlier.lower()):
+                    before.append(rf"(?![\s\S]{{{offset}}}{earlier_pattern})")
+            if own.startswith(r"\b") and not word(earlier[-1]) and word(rewritten[-1:]):
+                before.append(rf"(?<!{earlier_pattern})")
+            if own.endswith(r"\b") and not word(earlier[0]) and word(rewritten[:1]):
+                after.append(rf"(?!{earlier_pattern})")
+        rules.append(("".join(before) + own + "".join(after), replacement(phrase)))
+    return rules
+
+
+_risky_matcher: Optional[Tuple[str, ClaimsMatcher]] = None
+_matcher_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], ClaimsMatcher]" = OrderedDict()
+_matcher_lock = threading.Lock()
+
+
+def _get_risky_matcher() -> ClaimsMatcher:
+    """RISKY_PHRASES compiled once per policy version."""
+    global _risky_matcher
+    if _risky_matcher is None or _risky_matcher[0] != CLAIMS_POLICY_VERSION:
+        rules = _ordered_rules(RISKY_PHRASES, _phrase_pattern,
+                               lambda phrase: SAFE_REPLACEMENTS.get(phrase, "designed to help"))
+        _risky_matcher = (CLAIMS_POLICY_VERSION, ClaimsMatcher(rules))
+    return _risky_matcher[1]
+
+
+def _get_matcher(blocked_terms: Tuple[str, ...]) -> ClaimsMatcher:
+    """A brand's blocked terms, compiled once per policy version."""
+    key = (CLAIMS_POLICY_VERSION, blocked_terms)
+    with _matcher_lock:
+        matcher = _matcher_cache.get(key)
+        if matcher:
+            _matcher_cache.move_to_end(key)
+            return matcher
+
+    matcher = ClaimsMatcher(_ordered_rules([term for term in blocked_terms if term], _term_pattern, lambda term: ""))
+
+    with _matcher_lock:
+        _matcher_cache[key] = matcher
+        while len(_matcher_cache) > MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
+
+
+def _collect_blocked_terms(claims_policy: Optional[Dict]) -> List[str]:
     if not claims_policy:
         return []
     blocked = claims_policy.get("blocked_terms") or []
     banned = claims_policy.get("banned_phrases") or []
-    return list({*blocked, *banned})
+    return list(dict.fromkeys([*blocked, *banned]))
 
 
 def verify_claims(text: str, claims_policy: Dict = None) -> Tuple[str, Dict]:
@@ -46,27 +160,16 @@ def verify_claims(text: str, claims_policy: Dict = None) -> Tuple[str, Dict]:
             "changes_made": False
         }
 
-    flags = []
-    rewritten = text
-
-    for phrase in RISKY_PHRASES:
-        # Handle phrases with special characters (like "100%") that don't work well with \b
-        escaped = re.escape(phrase)
-        # If phrase contains non-word chars at boundaries, use lookahead/lookbehind or simpler match
-        if not phrase[0].isalnum() or not phrase[-1].isalnum():
-            pattern = escaped
-        else:
-            pattern = rf"\b{escaped}\b"
-        if re.search(pattern, rewritten, flags=re.IGNORECASE):
-            flags.append(phrase)
-            replacement = SAFE_REPLACEMENTS.get(phrase, "designed to help")
-            rewritten = re.sub(pattern, replacement, rewritten, flags=re.IGNORECASE)
-
     blocked_terms = _collect_blocked_terms(claims_policy)
-    for blocked in blocked_terms:
-        if re.search(rf"\b{re.escape(blocked)}\b", rewritten, flags=re.IGNORECASE):
-            flags.append(blocked)
-            rewritten = re.sub(rf"\b{re.escape(blocked)}\b", "", rewritten, flags=re.IGNORECASE).strip()
+    rewritten, risky_hits = _get_risky_matcher().apply(text)
+    # Blocked terms run over the rewritten text so a safe replacement
+    # ("instant" -> "fast") can't reintroduce a term the brand bans
+    rewritten, blocked_hits = _get_matcher(tuple(blocked_terms)).apply(rewritten)
+
+    active_terms = [term for term in blocked_terms if term]
+    flags = [RISKY_PHRASES[i] for i in sorted(risky_hits)] + [active_terms[i] for i in sorted(blocked_hits)]
+    if blocked_hits:
+        rewritten = rewritten.strip()
 
     report = {
         "original_text": text,
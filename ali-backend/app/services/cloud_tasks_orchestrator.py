@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 
+from app.services.progress_reporter import get_progress_reporter
+
 try:
     from google.cloud import tasks_v2
     from google.protobuf import timestamp_pb2, duration_pb2
@@ -54,6 +56,9 @@ class TaskStatus(str, Enum):
     CANCELLED = "CANCELLED"
 
 
+TERMINAL_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+
 @dataclass
 class TaskConfig:
     """Configuration for a task queue."""
@@ -223,6 +228,15 @@ class CloudTasksOrchestrator:
             logger.error(f"❌ Failed to create job record: {e}")
             return False
     
+    def _report(self, task_id: str, data: Dict[str, Any], urgent: bool = False):
+        """Queue a job document update on the shared progress reporter."""
+        get_progress_reporter().report(
+            f"jobs/{task_id}",
+            self.db.collection("jobs").document(task_id).update,
+            data,
+            urgent=urgent
+        )
+    
     def update_job_progress(
         self,
         task_id: str,
@@ -230,7 +244,11 @@ class CloudTasksOrchestrator:
         message: str,
         status: Optional[TaskStatus] = None
     ) -> bool:
-        """Update job progress in Firestore."""
+        """
+        Update job progress in Firestore.
+        Plain progress ticks are coalesced and written in the background;
+        status transitions are written immediately.
+        """
         if not self.db:
             return False
         
@@ -246,7 +264,9 @@ class CloudTasksOrchestrator:
                 if status == TaskStatus.COMPLETED:
                     update_data["completedAt"] = firestore.SERVER_TIMESTAMP
             
-            self.db.collection("jobs").document(task_id).update(update_data)
+            self._report(task_id, update_data, urgent=status is not None)
+            if status in TERMINAL_STATUSES:
+                return get_progress_reporter().flush(f"jobs/{task_id}")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to update job progress: {e}")
@@ -263,7 +283,8 @@ class CloudTasksOrchestrator:
             return False
         
         try:
-            self.db.collection("jobs").document(task_id).update({
+            # Through the reporter so a queued progress tick can't land after this
+            self._report(task_id, {
                 "status": TaskStatus.COMPLETED.value if success else TaskStatus.FAILED.value,
                 "progress": 100 if success else -1,
                 "progressMessage": "Complete" if success else "Failed",
@@ -271,8 +292,8 @@ class CloudTasksOrchestrator:
                 "error": result.get("error") if not success else None,
                 "completedAt": firestore.SERVER_TIMESTAMP,
                 "updatedAt": firestore.SERVER_TIMESTAMP,
-            })
-            return True
+            }, urgent=True)
+            return get_progress_reporter().flush(f"jobs/{task_id}")
         except Exception as e:
             logger.error(f"❌ Failed to complete job: {e}")
             return False
@@ -1,7 +1,9 @@
-﻿import json
+﻿import os
+import json
 import datetime
 import requests
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from app.core.security import db
 from firebase_admin import firestore
 
@@ -11,6 +13,7 @@ try:
     from facebook_business.adobjects.adaccount import AdAccount
 except ImportError:
     FacebookAdsApi = None
+    AdAccount = None
 
 try:
     from google.ads.googleads.client import GoogleAdsClient
@@ -19,35 +22,141 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+LINKEDIN_ANALYTICS_URL = "https://api.linkedin.com/rest/adAnalyticsV2"
+LINKEDIN_PAGE_SIZE = 1000
+REQUEST_TIMEOUT_SEC = 30
+
+# Incremental sync: first sync (and the oldest we ever backfill) covers
+# INITIAL_SYNC_DAYS; later syncs start RESTATEMENT_DAYS before the watermark
+# because platforms keep restating recent spend and conversions.
+INITIAL_SYNC_DAYS = 30
+RESTATEMENT_DAYS = int(os.getenv("AD_SYNC_RESTATEMENT_DAYS", "3"))
+
+# Firestore caps a write batch at 500 operations
+FIRESTORE_BATCH_LIMIT = 400
+METRICS_WRITE_CONCURRENCY = int(os.getenv("METRICS_WRITE_CONCURRENCY", "4"))
+
+
 class DataEngine:
     def __init__(self, user_id):
         self.db = db
         self.user_id = user_id
 
+    # --- Sync watermarks ---
+    def _sync_state_ref(self, platform, account_id):
+        doc_id = f"{platform}_{account_id}".replace("/", "-")
+        return self.db.collection('users').document(self.user_id).collection('ad_sync_state').document(doc_id)
+
+    def _sync_window(self, platform, account_id):
+        """(start, end) dates to fetch: new days plus the restatement window."""
+        end = datetime.date.today()
+        start = end - datetime.timedelta(days=INITIAL_SYNC_DAYS)
+
+        snapshot = self._sync_state_ref(platform, account_id).get()
+        synced_through = (snapshot.to_dict() or {}).get("synced_through") if snapshot.exists else None
+        if synced_through:
+            resume = datetime.date.fromisoformat(synced_through) - datetime.timedelta(days=RESTATEMENT_DAYS)
+            start = max(start, resume)
+
+        logger.info(f"📅 {platform} sync window for {account_id}: {start} → {end}")
+        return start, end
+
+    def _advance_watermark(self, platform, account_id, end):
+        self._sync_state_ref(platform, account_id).set({
+            "platform": platform,
+            "account_id": str(account_id),
+            "synced_through": end.isoformat(),
+            "updated_at": firestore.SERVER_TIMESTAMP
+        }, merge=True)
+
     def save_metrics(self, platform, metrics):
         """
-        Standardizes and saves metrics to Firestore 'campaign_performance'
+        Standardizes and saves metrics to Firestore 'campaign_performance'.
+        `metrics` may be any iterable (e.g. rows streamed from a paginated
+        report); writes go out in chunked batches committed in parallel.
+        The user's summary campaign_stats get Increment deltas for just the
+        rows written. Returns the number of records written.
         """
-        if not metrics:
-            logger.warning(f"⚠️ No data found for {platform}")
-            return
-
-        batch = self.db.batch()
+        from app.services.user_summary_service import get_user_summary_service
+        summary_service = get_user_summary_service()
         collection_ref = self.db.collection('users').document(self.user_id).collection('campaign_performance')
 
-        for item in metrics:
-            doc_id = f"{platform}_{item['date']}_{item.get('campaign_id', 'unknown')}"
-            doc_ref = collection_ref.document(doc_id)
-            
-            item['platform'] = platform
-            item['ingested_at'] = firestore.SERVER_TIMESTAMP
-            
-            batch.set(doc_ref, item, merge=True)
+        def commit_chunk(batch, rows):
+            # Previous values must be read before the chunk overwrites them
+            delta = summary_service.campaign_stats_delta(self.user_id, rows)
+            batch.commit()
+            return delta
 
-        batch.commit()
-        logger.info(f"✅ Saved {len(metrics)} {platform} records to Firestore.")
+        written = 0
+        stats = {}
+        pending = set()
+        batch, rows = self.db.batch(), {}
+        with ThreadPoolExecutor(max_workers=METRICS_WRITE_CONCURRENCY) as pool:
+            def collect(done):
+                for future in done:
+                    for key, value in (future.result() or {}).items():
+                        stats[key] = stats.get(key, 0) + value
+
+            def submit(batch, rows):
+                nonlocal pending
+                pending.add(pool.submit(commit_chunk, batch, rows))
+                # Bound in-flight batches so huge reports don't queue up in memory
+                if len(pending) >= METRICS_WRITE_CONCURRENCY:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            for item in metrics:
+                doc_id = f"{platform}_{item['date']}_{item.get('campaign_id', 'unknown')}"
+                doc_ref = collection_ref.document(doc_id)
+
+                item['platform'] = platform
+                item['ingested_at'] = firestore.SERVER_TIMESTAMP
+
+                batch.set(doc_ref, item, merge=True)
+                rows[doc_id] = item
+                written += 1
+                if len(rows) == FIRESTORE_BATCH_LIMIT:
+                    submit(batch, rows)
+                    batch, rows = self.db.batch(), {}
+
+            if rows:
+                submit(batch, rows)
+            collect(pending)
+
+        if not written:
+            logger.warning(f"⚠️ No data found for {platform}")
+            return 0
+
+        logger.info(f"✅ Saved {written} {platform} records to Firestore.")
+
+        if stats:
+            summary_service.record_campaign_stats(self.user_id, stats)
+        return written
 
     # --- 1. LINKEDIN ADS (REST API) ---
+    def _linkedin_pages(self, session, params):
+        """Yield analytics elements page by page until the result set is exhausted."""
+        start = 0
+        while True:
+            response = session.get(
+                LINKEDIN_ANALYTICS_URL,
+                params={**params, "start": start, "count": LINKEDIN_PAGE_SIZE},
+                timeout=REQUEST_TIMEOUT_SEC
+            )
+            if response.status_code != 200:
+                error_msg = f"LinkedIn Error {response.status_code}: {response.text}"
+                logger.error(f"❌ {error_msg}")
+                raise ValueError(error_msg) # Raise so Router knows it failed
+
+            body = response.json()
+            elements = body.get("elements", [])
+            yield elements
+
+            total = body.get("paging", {}).get("total")
+            start += len(elements)
+            if len(elements) < LINKEDIN_PAGE_SIZE or (total is not None and start >= total):
+                return
+
     def fetch_linkedin(self, credentials_json, dry_run=False):
         """
         Verifies keys and fetches data.
@@ -61,11 +170,12 @@ class DataEngine:
         headers = {"Authorization": f"Bearer {token}", "X-Restli-Protocol-Version": "2.0.0"}
         
         # For Dry Run, just check 1 day to be fast
-        days_back = 1 if dry_run else 30
-        end = datetime.date.today()
-        start = end - datetime.timedelta(days=days_back)
+        if dry_run:
+            end = datetime.date.today()
+            start = end - datetime.timedelta(days=1)
+        else:
+            start, end = self._sync_window("linkedin", account)
         
-        url = "https://api.linkedin.com/rest/adAnalyticsV2"
         params = {
             "q": "analytics",
             "pivot": "CAMPAIGN",
@@ -79,35 +189,33 @@ class DataEngine:
             "accounts[0]": account
         }
 
-        response = requests.get(url, headers=headers, params=params)
-        
-        if response.status_code != 200:
-            error_msg = f"LinkedIn Error {response.status_code}: {response.text}"
-            logger.error(f"❌ {error_msg}")
-            raise ValueError(error_msg) # Raise so Router knows it failed
+        with requests.Session() as session:
+            session.headers.update(headers)
+            pages = self._linkedin_pages(session, params)
 
-        if dry_run:
-            logger.info("✅ LinkedIn Connection Verified.")
-            return True
+            if dry_run:
+                next(pages)
+                logger.info("✅ LinkedIn Connection Verified.")
+                return True
 
-        # Process Data (Only if not dry_run)
-        data = response.json().get("elements", [])
-        clean_data = []
-        
-        for row in data:
-            clean_data.append({
-                "date": f"{row['dateRange']['start']['year']}-{row['dateRange']['start']['month']:02d}-{row['dateRange']['start']['day']:02d}",
-                "campaign_name": "LinkedIn Campaign", 
-                "campaign_id": row['pivotValue'],
-                "impressions": row.get('impressions', 0),
-                "clicks": row.get('clicks', 0),
-                "spend": float(row.get('costInLocalCurrency', 0)),
-                "conversions": row.get('externalWebsiteConversions', 0),
-                "cpc": 0, 
-                "roas": 0
-            })
-            
-        self.save_metrics("linkedin", clean_data)
+            # Process Data (Only if not dry_run)
+            def rows():
+                for page in pages:
+                    for row in page:
+                        yield {
+                            "date": f"{row['dateRange']['start']['year']}-{row['dateRange']['start']['month']:02d}-{row['dateRange']['start']['day']:02d}",
+                            "campaign_name": "LinkedIn Campaign", 
+                            "campaign_id": row['pivotValue'],
+                            "impressions": row.get('impressions', 0),
+                            "clicks": row.get('clicks', 0),
+                            "spend": float(row.get('costInLocalCurrency', 0)),
+                            "conversions": row.get('externalWebsiteConversions', 0),
+                            "cpc": 0, 
+                            "roas": 0
+                        }
+
+            self.save_metrics("linkedin", rows())
+        self._advance_watermark("linkedin", account, end)
 
     # --- 2. META ADS (Facebook SDK) ---
     def fetch_meta(self, credentials_json, dry_run=False):
@@ -132,32 +240,35 @@ class DataEngine:
                 logger.info("✅ Meta Connection Verified.")
                 return True
 
-            # Full Ingestion
+            # Incremental Ingestion
+            start, end = self._sync_window("meta", ad_account_id)
             fields = ['campaign_name', 'campaign_id', 'impressions', 'clicks', 'spend', 'actions']
             params = {
                 'level': 'campaign',
-                'date_preset': 'last_30d',
+                'time_range': {'since': start.isoformat(), 'until': end.isoformat()},
                 'time_increment': 1
             }
+            # The SDK cursor fetches further pages lazily while we iterate
             insights = account.get_insights(fields=fields, params=params)
             
-            clean_data = []
-            for i in insights:
-                spend = float(i.get('spend', 0))
-                clicks = int(i.get('clicks', 0))
-                
-                clean_data.append({
-                    "date": i['date_start'],
-                    "campaign_name": i['campaign_name'],
-                    "campaign_id": i['campaign_id'],
-                    "impressions": int(i.get('impressions', 0)),
-                    "clicks": clicks,
-                    "spend": spend,
-                    "conversions": 0,
-                    "cpc": round(spend / clicks, 2) if clicks > 0 else 0
-                })
+            def rows():
+                for i in insights:
+                    spend = float(i.get('spend', 0))
+                    clicks = int(i.get('clicks', 0))
+                    
+                    yield {
+                        "date": i['date_start'],
+                        "campaign_name": i['campaign_name'],
+                        "campaign_id": i['campaign_id'],
+                        "impressions": int(i.get('impressions', 0)),
+                        "clicks": clicks,
+                        "spend": spend,
+                        "conversions": 0,
+                        "cpc": round(spend / clicks, 2) if clicks > 0 else 0
+                    }
             
-            self.save_metrics("meta", clean_data)
+            self.save_metrics("meta", rows())
+            self._advance_watermark("meta", ad_account_id, end)
 
         except Exception as e:
             logger.error(f"❌ Meta Error: {e}")
@@ -179,62 +290,55 @@ class DataEngine:
             client = GoogleAdsClient.load_from_dict(creds)
             ga_service = client.get_service("GoogleAdsService")
 
-            # Fast query for verification
-            query = """
-                SELECT campaign.id 
-                FROM campaign 
-                LIMIT 1
-            """
-            
-            if not dry_run:
+            if dry_run:
+                # Fast query for verification; throws if auth is bad
                 query = """
-                    SELECT 
-                      segments.date,
-                      campaign.id, 
-                      campaign.name, 
-                      metrics.impressions, 
-                      metrics.clicks, 
-                      metrics.cost_micros,
-                      metrics.conversions
+                    SELECT campaign.id 
                     FROM campaign 
-                    WHERE segments.date DURING LAST_30_DAYS
+                    LIMIT 1
                 """
-
-            # This line will throw exception if auth is bad
-            stream = ga_service.search_stream(customer_id=customer_id, query=query)
-            
-            # Consume one element to ensure stream works
-            for batch in stream:
-                break 
-
-            if dry_run:
+                for batch in ga_service.search_stream(customer_id=customer_id, query=query):
+                    pass
                 logger.info("✅ Google Ads Connection Verified.")
                 return True
 
-            # Process Full Data
-            clean_data = []
-            # We need to re-run or iterate fully if we broke out above, 
-            # but since dry_run branches logic, we re-run stream for full data:
+            start, end = self._sync_window("google", customer_id)
+            query = f"""
+                SELECT 
+                  segments.date,
+                  campaign.id, 
+                  campaign.name, 
+                  metrics.impressions, 
+                  metrics.clicks, 
+                  metrics.cost_micros,
+                  metrics.conversions
+                FROM campaign 
+                WHERE segments.date BETWEEN '{start.isoformat()}' AND '{end.isoformat()}'
+            """
+
+            # Single pass: rows are written while the stream is consumed
             stream = ga_service.search_stream(customer_id=customer_id, query=query)
+
+            def rows():
+                for batch in stream:
+                    for row in batch.results:
+                        spend = row.metrics.cost_micros / 1_000_000
+                        clicks = row.metrics.clicks
+                        
+                        yield {
+                            "date": row.segments.date,
+                            "campaign_name": row.campaign.name,
+                            "campaign_id": str(row.campaign.id),
+                            "impressions": row.metrics.impressions,
+                            "clicks": clicks,
+                            "spend": round(spend, 2),
+                            "conversions": row.metrics.conversions,
+                            "cpc": round(spend / clicks, 2) if clicks > 0 else 0
+                        }
             
-            for batch in stream:
-                for row in batch.results:
-                    spend = row.metrics.cost_micros / 1_000_000
-                    clicks = row.metrics.clicks
-                    
-                    clean_data.append({
-                        "date": row.segments.date,
-                        "campaign_name": row.campaign.name,
-                        "campaign_id": str(row.campaign.id),
-                        "impressions": row.metrics.impressions,
-                        "clicks": clicks,
-                        "spend": round(spend, 2),
-                        "conversions": row.metrics.conversions,
-                        "cpc": round(spend / clicks, 2) if clicks > 0 else 0
-                    })
-            
-            self.save_metrics("google", clean_data)
+            self.save_metrics("google", rows())
+            self._advance_watermark("google", customer_id, end)
 
         except Exception as e:
             logger.error(f"❌ Google Ads Error: {e}")
-            raise ValueError(f"Google Auth Failed: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Google Auth Failed: {str(e)}")
@@ -1,6 +1,6 @@
-import copy
-import re
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.claims_verifier import CLAIMS_POLICY_VERSION, ClaimsMatcher
 
 CLAIM_PATTERNS = [
     {
@@ -28,22 +28,27 @@ CLAIM_PATTERNS = [
 TEXT_FIELDS = ["caption", "body", "headline", "headlines", "video_script"]
 
 
+_claims_matcher: Optional[Tuple[str, ClaimsMatcher]] = None
+
+
+def _get_claims_matcher() -> ClaimsMatcher:
+    """CLAIM_PATTERNS compiled once per policy version."""
+    global _claims_matcher
+    if _claims_matcher is None or _claims_matcher[0] != CLAIMS_POLICY_VERSION:
+        matcher = ClaimsMatcher((rule["pattern"], rule["replacement"]) for rule in CLAIM_PATTERNS)
+        _claims_matcher = (CLAIMS_POLICY_VERSION, matcher)
+    return _claims_matcher[1]
+
+
 def _verify_claims_text(text: str) -> Dict[str, Any]:
-    issues: List[Dict[str, str]] = []
-    adjusted_text = text
-
-    for rule in CLAIM_PATTERNS:
-        if re.search(rule["pattern"], adjusted_text, re.IGNORECASE):
-            issues.append({
-                "pattern": rule["pattern"],
-                "reason": rule["reason"],
-            })
-            adjusted_text = re.sub(
-                rule["pattern"],
-                rule["replacement"],
-                adjusted_text,
-                flags=re.IGNORECASE,
-            )
+    adjusted_text, hits = _get_claims_matcher().apply(text)
+    issues: List[Dict[str, str]] = [
+        {
+            "pattern": CLAIM_PATTERNS[i]["pattern"],
+            "reason": CLAIM_PATTERNS[i]["reason"],
+        }
+        for i in sorted(hits)
+    ]
 
     adjusted_text = adjusted_text.strip()
 
@@ -56,7 +61,11 @@ def _verify_claims_text(text: str) -> Dict[str, Any]:
 
 
 def verify_claims_for_blueprint(blueprint: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    adjusted_blueprint = copy.deepcopy(blueprint)
+    """
+    Returns (adjusted blueprint, claims report). Only channels with adjusted
+    fields are copied; everything else is shared with the input blueprint.
+    """
+    adjusted_blueprint = dict(blueprint)
     channels_report: Dict[str, Any] = {}
     adjusted_fields_total = 0
 
@@ -68,11 +77,13 @@ def verify_claims_for_blueprint(blueprint: Dict[str, Any]) -> Tuple[Dict[str, An
             "fields": {},
             "adjusted_fields": 0,
         }
+        adjusted_payload = None
 
         for field in TEXT_FIELDS:
             if field not in channel_payload:
                 continue
 
+            new_value = None
             if isinstance(channel_payload[field], list):
                 field_results = []
                 adjusted_list = []
@@ -86,15 +97,21 @@ def verify_claims_for_blueprint(blueprint: Dict[str, Any]) -> Tuple[Dict[str, An
                         channel_report["adjusted_fields"] += 1
                         adjusted_fields_total += 1
                 channel_report["fields"][field] = field_results
-                if adjusted_list:
-                    adjusted_blueprint[channel][field] = adjusted_list
+                if adjusted_list and adjusted_list != channel_payload[field]:
+                    new_value = adjusted_list
             elif isinstance(channel_payload[field], str):
                 result = _verify_claims_text(channel_payload[field])
                 channel_report["fields"][field] = result
                 if result["adjusted_flag"]:
                     channel_report["adjusted_fields"] += 1
                     adjusted_fields_total += 1
-                    adjusted_blueprint[channel][field] = result["adjusted"]
+                    new_value = result["adjusted"]
+
+            if new_value is not None:
+                if adjusted_payload is None:
+                    adjusted_payload = dict(channel_payload)
+                    adjusted_blueprint[channel] = adjusted_payload
+                adjusted_payload[field] = new_value
 
         if channel_report["fields"]:
             channels_report[channel] = channel_report
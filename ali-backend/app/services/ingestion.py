@@ -182,8 +182,20 @@ def run_ingestion_pipeline(source_name: str, access_token: str, ad_account_id: s
     else:
         raise ValueError("Unknown source")
 
+    from app.services.user_summary_service import UserSummaryService
+    summary_service = UserSummaryService(db=db)
+    stats = {}
+
+    def commit(batch, rows):
+        # Summary deltas compare against the docs this batch is about to replace
+        delta = summary_service.campaign_stats_delta(user_id, rows, merge=False)
+        batch.commit()
+        for key, value in (delta or {}).items():
+            stats[key] = stats.get(key, 0) + value
+
     record_count = 0
     batch = db.batch()
+    rows = {}
     
     # pick the first dlt resource
     resource = list(data_generator)[0]
@@ -199,14 +211,18 @@ def run_ingestion_pipeline(source_name: str, access_token: str, ad_account_id: s
                         .collection('campaign_performance').document(doc_id)
             
             batch.set(doc_ref, record)
+            rows[doc_id] = record
             record_count += 1
 
             if record_count % 400 == 0: # Safe Firestore batch limit
-                batch.commit()
+                commit(batch, rows)
                 batch = db.batch()
+                rows = {}
 
-    if record_count > 0:
-        batch.commit()
+    if rows:
+        commit(batch, rows)
+    if stats:
+        summary_service.record_campaign_stats(user_id, stats)
         
     logger.info(f"✅ Ingested {record_count} records for {user_id}")
     return {"status": "success", "count": record_count}
\ No newline at end of file
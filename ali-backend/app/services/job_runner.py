@@ -1,13 +1,161 @@
-﻿import time
+﻿import os
+import time
+import threading
+from datetime import datetime, timedelta, timezone
 from app.core.security import db
 from firebase_admin import firestore
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # Configure logger
 logger = logging.getLogger("ali_platform.services.job_runner")
 
-def process_tutorial_job(job_id: str, user_id: str, topic: str, notification_id: str | None = None):
+# --- JOB LEASES ---
+# A worker owns a job while its lease is fresh. Renewing the lease replaces the
+# old logging heartbeat: it keeps the instance busy, and a job whose worker died
+# becomes claimable again once the lease lapses, up to JOB_MAX_ATTEMPTS claims:
+# a job that keeps killing its worker is failed instead of reclaimed forever.
+JOB_LEASE_SEC = int(os.getenv("JOB_LEASE_SEC", "120"))
+LEASE_RENEW_SEC = JOB_LEASE_SEC / 3
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+
+def _lease_expiry(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)) + timedelta(seconds=JOB_LEASE_SEC)
+
+
+def _try_claim(job_ref, owner: str) -> Optional[Dict[str, Any]]:
+    """
+    Atomically take a queued (or lease-expired) job. Returns its data, or None
+    if taken. A lapsed job that already used JOB_MAX_ATTEMPTS claims is marked
+    failed instead.
+    """
+    @firestore.transactional
+    def claim(transaction):
+        snapshot = job_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict() or {}
+        now = datetime.now(timezone.utc)
+        expires_at = data.get("lease_expires_at")
+        lapsed = data.get("status") == "processing" and expires_at is not None and expires_at < now
+        if data.get("status") != "queued" and not lapsed:
+            return None
+        attempts = data.get("attempts", 0)
+        if lapsed and attempts >= JOB_MAX_ATTEMPTS:
+            transaction.update(job_ref, {
+                "status": "failed",
+                "error": f"Lease lapsed on all {attempts} attempts; giving up"
+            })
+            logger.error(f"❌ Job {snapshot.id} failed: lease lapsed on all {attempts} attempts")
+            return None
+        transaction.update(job_ref, {
+            "status": "processing",
+            "lease_owner": owner,
+            "lease_expires_at": _lease_expiry(now),
+            "attempts": attempts + 1,
+            "started_at": firestore.SERVER_TIMESTAMP
+        })
+        return {**data, "id": snapshot.id, "attempts": attempts + 1}
+
+    return claim(db.transaction())
+
+
+def claim_job(job_id: str, owner: str) -> Optional[Dict[str, Any]]:
+    """Claim one specific job for `owner`. Returns its data, or None if another worker holds it."""
+    return _try_claim(db.collection("jobs").document(job_id), owner)
+
+
+def _renew_lease(job_ref, owner: str) -> bool:
+    """Extend the lease only while `owner` still holds it. Returns False once it has been lost."""
+    @firestore.transactional
+    def renew(transaction):
+        snapshot = job_ref.get(transaction=transaction)
+        data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+        if data.get("status") != "processing" or data.get("lease_owner") != owner:
+            return False
+        transaction.update(job_ref, {"lease_expires_at": _lease_expiry()})
+        return True
+
+    return renew(db.transaction())
+
+
+def claim_pending_jobs(owner: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Claim up to `limit` pool-dispatched tutorial jobs, oldest first.
+    Jobs whose previous worker stopped renewing its lease are picked up too.
+    """
+    if limit <= 0 or not db:
+        return []
+
+    pool_jobs = db.collection("jobs").where("dispatch", "==", "pool")
+    candidates = list(pool_jobs.where("status", "==", "queued").order_by("created_at").limit(limit * 2).stream())
+    if len(candidates) < limit:
+        now = datetime.now(timezone.utc)
+        candidates += list(pool_jobs.where("status", "==", "processing").where("lease_expires_at", "<", now).limit(limit).stream())
+
+    claimed = []
+    for snapshot in candidates:
+        if len(claimed) >= limit:
+            break
+        try:
+            job = _try_claim(snapshot.reference, owner)
+        except Exception as e:
+            # Contention with another worker: leave it to them
+            logger.warning(f"⚠️ Could not claim job {snapshot.id}: {e}")
+            continue
+        if job:
+            claimed.append(job)
+    return claimed
+
+
+class JobLease:
+    """
+    Renews a job's lease from a background thread while the job runs.
+
+    If the lease lapsed and another worker claimed the job, renewal stops and
+    `lost` is set; the holder must then leave the job document alone.
+    """
+
+    def __init__(self, job_ref, job_id: str, owner: str):
+        self.job_ref = job_ref
+        self.job_id = job_id
+        self.owner = owner
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew_loop, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        logger.info(f"💓 Lease released for Job {self.job_id}")
+        return False
+
+    def _renew_loop(self):
+        renewals = 0
+        while not self._stop.wait(LEASE_RENEW_SEC):
+            renewals += 1
+            try:
+                if not _renew_lease(self.job_ref, self.owner):
+                    self.lost = True
+                    logger.error(f"❌ Lease lost for Job {self.job_id}: claimed by another worker")
+                    return
+                logger.info(f"💓 Lease renewed #{renewals} - Job {self.job_id} still processing...")
+            except Exception as e:
+                logger.warning(f"⚠️ Lease renewal failed for Job {self.job_id}: {e}")
+
+
+def process_tutorial_job(
+    job_id: str,
+    user_id: str,
+    topic: str,
+    notification_id: str | None = None,
+    lease_owner: str | None = None
+):
     """
     Background task that generates the tutorial and updates status.
     Updates the SAME notification to prevent 'stale loading' UI.
@@ -16,6 +164,9 @@ def process_tutorial_job(job_id: str, user_id: str, topic: str, notification_id:
     - Do NOT create intermediate "Generation Started" notifications
     - Only update the existing notification ONCE at completion ("New Lesson Ready")
     - This reduces notifications from 4+ to 2 per request
+    
+    `lease_owner` identifies the worker holding the job's lease; direct
+    callers (API background tasks, single-job worker) take it implicitly.
     """
     logger.info(f"⚙️ Worker: Starting Job {job_id} for {topic}...")
     
@@ -35,27 +186,21 @@ def process_tutorial_job(job_id: str, user_id: str, topic: str, notification_id:
     # Track the Notification ID so we can update it at completion
     notifications_col = db.collection("users").document(user_id).collection("notifications")
     notification_ref = notifications_col.document(notification_id) if notification_id else None
+    lease = None
 
     try:
         # 1. Update Status -> Processing (no notification spam here)
-        job_ref.update({"status": "processing", "started_at": firestore.SERVER_TIMESTAMP})
+        owner = lease_owner or f"api-{os.getpid()}"
+        if not lease_owner:
+            job_ref.update({
+                "status": "processing",
+                "started_at": firestore.SERVER_TIMESTAMP,
+                "lease_owner": owner,
+                "lease_expires_at": _lease_expiry()
+            })
 
-        # ⚡ CLOUD RUN KEEP-ALIVE: Heartbeat Thread ⚡
-        # This prevents CPU throttling by generating periodic log output
-        import threading
-        heartbeat_active = [True]  # Use list for mutable reference in closure
-        
-        def heartbeat_worker():
-            iteration = 0
-            while heartbeat_active[0]:
-                iteration += 1
-                logger.info(f"💓 Heartbeat #{iteration} - Job {job_id} still processing...")
-                time.sleep(30)  # Log every 30 seconds
-        
-        heartbeat_thread = threading.Thread(target=heartbeat_worker, daemon=True)
-        heartbeat_thread.start()
-        
-        try:
+        # ⚡ CLOUD RUN KEEP-ALIVE: Lease renewal replaces the logging heartbeat ⚡
+        with JobLease(job_ref, job_id, owner) as lease:
             # 2. Run the Heavy AI Generation (Takes 60s+)
             # Note: progress_callback removed to reduce notification spam
             tutorial_data = generate_tutorial(
@@ -64,10 +209,11 @@ def process_tutorial_job(job_id: str, user_id: str, topic: str, notification_id:
                 progress_callback=None,  # No intermediate updates
                 notification_id=notification_id
             )
-        finally:
-            # Stop heartbeat regardless of success/failure
-            heartbeat_active[0] = False
-            logger.info(f"💓 Heartbeat stopped for Job {job_id}")
+
+        if lease.lost:
+            # The job's new owner reports the outcome; don't overwrite its status
+            logger.warning(f"⚠️ Worker: Job {job_id} finished after losing its lease; leaving it to its new owner")
+            return None
 
         # ⚡ CRITICAL: Link the generated tutorial to the original request ⚡
         # This enables the fallback GET /tutorials/by-request/{id} endpoint
@@ -122,6 +268,8 @@ def process_tutorial_job(job_id: str, user_id: str, topic: str, notification_id:
 
     except Exception as e:
         logger.error(f"❌ Worker Error: {e}")
+        if lease is not None and lease.lost:
+            return None
         job_ref.update({"status": "failed", "error": str(e)})
         
         # Update notification to Failure state
@@ -17,6 +17,11 @@ from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Per-user learning summaries, maintained on write and consumed by the
+# nightly gap analysis instead of re-reading each user's full history
+SUMMARY_COLLECTION = "learning_summaries"
+QUIZ_PASS_SCORE = 75   # Quiz scores below this are tracked as open struggles
+
 
 class LearningAnalyticsService:
     """
@@ -79,6 +84,8 @@ class LearningAnalyticsService:
         event_data.setdefault("event_id", str(uuid.uuid4()))
         event_data.setdefault("created_at", datetime.utcnow().isoformat())
 
+        self._update_learning_summary(event_data["user_id"], [event_data])
+
         # Log to BigQuery
         if self.bq:
             return self.bq._insert_to_table("learning_analytics_log", event_data, "created_at")
@@ -88,13 +95,19 @@ class LearningAnalyticsService:
 
     def log_learning_events_batch(self, events: List[Dict[str, Any]]) -> int:
         """Log multiple learning events. Returns count of successful inserts."""
-        if not self.bq or not self.bq.client:
-            return 0
-
         # Prepare events
+        by_user: Dict[str, List[Dict[str, Any]]] = {}
         for event in events:
             event.setdefault("event_id", str(uuid.uuid4()))
             event.setdefault("created_at", datetime.utcnow().isoformat())
+            if event.get("user_id") and event.get("event_type"):
+                by_user.setdefault(event["user_id"], []).append(event)
+
+        for user_id, user_events in by_user.items():
+            self._update_learning_summary(user_id, user_events)
+
+        if not self.bq or not self.bq.client:
+            return 0
 
         try:
             table_ref = self.bq._get_table_ref("learning_analytics_log")
@@ -107,6 +120,159 @@ class LearningAnalyticsService:
             logger.error(f"❌ Failed to batch insert learning events: {e}")
             return 0
 
+    # --- INCREMENTAL SUMMARIES ---
+
+    @staticmethod
+    def _struggle_key(tutorial_id: Optional[str], section: Any) -> str:
+        """Stable map key for one quiz (tutorial + section)."""
+        raw = f"{tutorial_id or 'unknown'}_{section if section is not None else 'final'}"
+        return "".join(c if c.isalnum() or c in "-_" else "_" for c in raw)[:120]
+
+    def _write_summary(self, user_id: str, quiz_scores: List[Dict[str, Any]], event_count: int,
+                       last_event_at: Optional[str]) -> bool:
+        """
+        Merge a delta into learning_summaries/{user_id} and flag the user for
+        the next nightly analysis.
+
+        Args:
+            user_id: Owner of the summary
+            quiz_scores: [{tutorial_id, tutorial, section_key, section, category, score}]
+            event_count: Number of learning events the delta covers
+            last_event_at: ISO timestamp of the newest event
+        """
+        if not self.db:
+            return False
+
+        try:
+            from firebase_admin import firestore
+
+            update: Dict[str, Any] = {
+                "user_id": user_id,
+                "needs_analysis": True,
+                "last_event_at": last_event_at or datetime.utcnow().isoformat(),
+                "events_count": firestore.Increment(event_count),
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            }
+
+            if quiz_scores:
+                categories: Dict[str, Dict[str, float]] = {}
+                struggles: Dict[str, Any] = {}
+                for q in quiz_scores:
+                    cat = categories.setdefault(q.get("category") or "general", {"score_sum": 0, "count": 0})
+                    cat["score_sum"] += q["score"]
+                    cat["count"] += 1
+
+                    key = self._struggle_key(q.get("tutorial_id"), q.get("section_key"))
+                    if q["score"] < QUIZ_PASS_SCORE:
+                        struggles[key] = {
+                            "tutorial_id": q.get("tutorial_id"),
+                            "tutorial": q.get("tutorial"),
+                            "section": q.get("section") or "Unknown",
+                            "score": q["score"],
+                            "at": last_event_at,
+                        }
+                    else:
+                        # Passing a quiz resolves any earlier struggle on it
+                        struggles[key] = firestore.DELETE_FIELD
+
+                update["quiz"] = {
+                    "attempts": firestore.Increment(len(quiz_scores)),
+                    "score_sum": firestore.Increment(sum(q["score"] for q in quiz_scores)),
+                    "passed": firestore.Increment(sum(1 for q in quiz_scores if q["score"] >= QUIZ_PASS_SCORE)),
+                }
+                update["categories"] = {
+                    name: {
+                        "score_sum": firestore.Increment(totals["score_sum"]),
+                        "count": firestore.Increment(totals["count"]),
+                    }
+                    for name, totals in categories.items()
+                }
+                update["struggles"] = struggles
+
+            self.db.collection(SUMMARY_COLLECTION).document(user_id).set(update, merge=True)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update learning summary for {user_id}: {e}")
+            return False
+
+    def _update_learning_summary(self, user_id: str, events: List[Dict[str, Any]]) -> bool:
+        """Fold a user's logged learning events into their summary (one write)."""
+        quiz_scores = [
+            {
+                "tutorial_id": e.get("tutorial_id"),
+                "tutorial": e.get("tutorial_topic"),
+                "section_key": e.get("section_index") if e.get("section_index") is not None else e.get("section_title"),
+                "section": e.get("section_title") or e.get("tutorial_topic"),
+                "category": e.get("tutorial_category"),
+                "score": e["quiz_score"],
+            }
+            for e in events if e.get("quiz_score") is not None
+        ]
+        last_event_at = max((str(e.get("created_at")) for e in events), default=None)
+        return self._write_summary(user_id, quiz_scores, len(events), last_event_at)
+
+    def record_quiz_results(
+        self,
+        user_id: str,
+        tutorial_id: str,
+        tutorial_data: Dict[str, Any],
+        quiz_results: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Fold a completed tutorial's per-section quiz results into the user's
+        summary. Called on completion and by the summary backfill.
+        """
+        quiz_scores = [
+            {
+                "tutorial_id": tutorial_id,
+                "tutorial": tutorial_data.get("title"),
+                "section_key": qr.get("section_index", qr.get("section_title", i)),
+                "section": qr.get("section_title") or tutorial_data.get("title"),
+                "category": tutorial_data.get("category"),
+                "score": qr.get("score", 100),
+            }
+            for i, qr in enumerate(quiz_results or [])
+        ]
+        return self._write_summary(user_id, quiz_scores, 1, datetime.utcnow().isoformat())
+
+    def get_learning_summary(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored learning summary for a user, if any."""
+        if not self.db:
+            return None
+        try:
+            doc = self.db.collection(SUMMARY_COLLECTION).document(user_id).get()
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read learning summary for {user_id}: {e}")
+            return None
+
+    def get_summaries_needing_analysis(self) -> List[Any]:
+        """Summary snapshots of users with learning events since their last analysis."""
+        if not self.db:
+            return []
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        return list(
+            self.db.collection(SUMMARY_COLLECTION)
+            .where(filter=FieldFilter("needs_analysis", "==", True))
+            .stream()
+        )
+
+    def mark_summary_analyzed(self, snapshot) -> bool:
+        """
+        Advance a user's analysis watermark. The write is conditional on the
+        summary being unchanged since `snapshot` was read, so events that
+        arrive mid-analysis keep the user flagged for the next run.
+        """
+        try:
+            snapshot.reference.update(
+                {"needs_analysis": False, "analyzed_at": datetime.utcnow().isoformat()},
+                option=self.db.write_option(last_update_time=snapshot.update_time),
+            )
+            return True
+        except Exception as e:
+            logger.info(f"Learning summary {snapshot.id} changed during analysis; left pending ({e})")
+            return False
+
     # --- PERFORMANCE ANALYSIS ---
 
     def get_user_performance_summary(
@@ -1,5 +1,7 @@
 import os
+import asyncio
 import logging
+import weakref
 import vertexai
 from vertexai.generative_models import GenerativeModel
 from google.api_core import exceptions
@@ -30,6 +32,22 @@ MODEL_ALIASES = {
     "lite": os.getenv("VERTEX_MODEL_ALIAS_LITE", "gemini-2.0-flash-001"),
 }
 
+# Shared budget for concurrent async generations fanned out inside one process
+# (e.g. per-channel editor passes). Acquire via llm_slot().
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "6"))
+_llm_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def llm_slot() -> asyncio.Semaphore:
+    """
+    Semaphore bounding concurrent LLM calls on the running event loop.
+    Usage: `async with llm_slot(): await model.generate_content_async(...)`
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _llm_semaphores[loop] = asyncio.Semaphore(LLM_CONCURRENCY)
+    return semaphore
+
 def get_model(intent: str = "fast") -> GenerativeModel:
     """
     Surgically selects the best Gemini model based on task intent.
@@ -0,0 +1,115 @@
+"""
+Mention Deduplicator
+Filters scanned mentions down to the ones not yet logged to BigQuery.
+
+Stages, keyed on BrandMonitoringScanner._generate_mention_id:
+1. Set-based dedup within the incoming batch
+2. Per-brand Bloom filter persisted in Firestore between runs
+   ("definitely new" ids skip BigQuery entirely)
+3. One batched existence query for the Bloom positives
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.utils.bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+FILTER_COLLECTION = "mention_dedup_filters"
+FILTER_CAPACITY = 10_000     # ids per generation (~12KB of bits at 1%)
+FILTER_ERROR_RATE = 0.01
+
+
+class MentionDeduplicator:
+    """
+    Keeps two filter generations per (user, brand). When the current one
+    fills up it becomes the previous generation and a new one is started,
+    so recently seen ids are still recognised after a rollover.
+    """
+
+    def __init__(self, bq=None, db=None):
+        if bq is None:
+            from app.services.bigquery_service import get_bigquery_service
+            bq = get_bigquery_service()
+        if db is None:
+            from app.core.security import db
+        self.bq = bq
+        self.db = db
+
+    def _filter_doc(self, user_id: str, entity_name: str):
+        entity_key = hashlib.sha256(entity_name.strip().lower().encode()).hexdigest()[:16]
+        return self.db.collection(FILTER_COLLECTION).document(f"{user_id}_{entity_key}")
+
+    def _load_filters(self, doc_ref) -> List[BloomFilter]:
+        """Return [current, previous?] generations, or [] if none stored."""
+        try:
+            doc = doc_ref.get()
+            if not doc.exists:
+                return []
+            data = doc.to_dict() or {}
+            return [BloomFilter.from_dict(state) for state in data.get("generations", [])]
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load mention filter {doc_ref.id}: {e}")
+            return []
+
+    def _save_filters(self, doc_ref, user_id: str, entity_name: str, filters: List[BloomFilter]) -> None:
+        try:
+            doc_ref.set({
+                "user_id": user_id,
+                "entity_name": entity_name,
+                "generations": [bloom.to_dict() for bloom in filters],
+                "updated_at": datetime.utcnow(),
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save mention filter {doc_ref.id}: {e}")
+
+    def filter_new(self, user_id: str, entity_name: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Return the rows whose mention_id has not been logged before.
+
+        Args:
+            user_id: Owner of the mentions
+            entity_name: Brand/entity the filter is kept for
+            rows: Mention log rows, each with a "mention_id"
+
+        Returns:
+            Rows to write, in input order, at most one per mention_id
+        """
+        unique: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            unique.setdefault(row["mention_id"], row)
+        if not unique:
+            return []
+
+        doc_ref = self._filter_doc(user_id, entity_name)
+        filters = self._load_filters(doc_ref)
+
+        # Without a stored filter every id is a "maybe" and gets verified
+        if filters:
+            maybe_seen = [mid for mid in unique if any(mid in bloom for bloom in filters)]
+        else:
+            maybe_seen = list(unique)
+
+        existing: Optional[set] = set()
+        if maybe_seen:
+            existing = self.bq.query_existing_mention_ids(user_id, maybe_seen)
+            if existing is None:
+                # Existence check failed: treat positives as seen rather than risk duplicates
+                existing = set(maybe_seen)
+
+        new_rows = [row for mid, row in unique.items() if mid not in existing]
+
+        if not filters or filters[0].is_full:
+            filters = [BloomFilter(FILTER_CAPACITY, FILTER_ERROR_RATE)] + filters[:1]
+        for mid in unique:
+            if not any(mid in bloom for bloom in filters):
+                filters[0].add(mid)
+        self._save_filters(doc_ref, user_id, entity_name, filters)
+
+        logger.info(
+            f"📦 Mention dedup for {user_id}/{entity_name}: {len(rows)} in, "
+            f"{len(maybe_seen)} checked, {len(new_rows)} new"
+        )
+        return new_rows
@@ -0,0 +1,152 @@
+"""
+Progress Reporter
+Coalesces job progress writes so hot pipeline loops don't pay a Firestore
+round trip (and listener fan-out) on every tick.
+
+- Updates for the same document are merged; at most one write per
+  PROGRESS_FLUSH_INTERVAL_SEC per document
+- Urgent updates (state transitions) skip the interval
+- Writes run on a background thread, in order per document
+- flush() blocks until a document's pending writes have landed and
+  reports whether the last write for it failed
+"""
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FLUSH_INTERVAL_SEC = float(os.getenv("PROGRESS_FLUSH_INTERVAL_SEC", "2.0"))
+PROGRESS_FLUSH_TIMEOUT_SEC = 10.0
+
+
+class _Pending:
+    __slots__ = ("write", "data", "urgent")
+
+    def __init__(self, write: Callable[[Dict[str, Any]], Any], data: Dict[str, Any], urgent: bool):
+        self.write = write
+        self.data = data
+        self.urgent = urgent
+
+
+class ProgressReporter:
+    """
+    Per-document write coalescer. Keys are document paths; `write` is the
+    bound Firestore call (`ref.update` / `ref.set`) applied to the merged data.
+    """
+
+    def __init__(self, interval: float = PROGRESS_FLUSH_INTERVAL_SEC):
+        self.interval = interval
+        self._pending: Dict[str, _Pending] = {}
+        self._in_flight: Set[str] = set()
+        self._last_write: Dict[str, float] = {}
+        self._errors: Dict[str, Exception] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def report(
+        self,
+        key: str,
+        write: Callable[[Dict[str, Any]], Any],
+        data: Dict[str, Any],
+        urgent: bool = False
+    ) -> None:
+        """Queue `data` for `key`, merged over any update not yet written."""
+        with self._cond:
+            pending = self._pending.get(key)
+            if pending:
+                pending.data.update(data)
+                pending.write = write
+                pending.urgent = pending.urgent or urgent
+            else:
+                self._pending[key] = _Pending(write, dict(data), urgent)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def flush(self, key: Optional[str] = None, timeout: float = PROGRESS_FLUSH_TIMEOUT_SEC) -> bool:
+        """
+        Write pending updates for `key` (or every key) now and wait for them.
+        Returns False if they did not land within `timeout`, or if the last
+        write for a flushed key raised (the error is reported once).
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            keys = [key] if key else list(self._pending) + list(self._in_flight) + list(self._errors)
+            for k in keys:
+                if k in self._pending:
+                    self._pending[k].urgent = True
+            self._cond.notify_all()
+
+            while any(k in self._pending or k in self._in_flight for k in keys):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"⚠️ Progress flush timed out for {key or 'all jobs'}")
+                    return False
+                self._cond.wait(remaining)
+
+            failed = {k: self._errors.pop(k) for k in keys if k in self._errors}
+            for k, error in failed.items():
+                logger.warning(f"⚠️ Progress flush for {k} failed: {error}")
+            return not failed
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="progress-reporter", daemon=True)
+            self._thread.start()
+
+    def _due_keys(self, now: float):
+        return [
+            k for k, p in self._pending.items()
+            if k not in self._in_flight
+            and (p.urgent or now - self._last_write.get(k, float("-inf")) >= self.interval)
+        ]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.monotonic()
+                    due = self._due_keys(now)
+                    if due:
+                        break
+                    waits = [self._last_write.get(k, now) + self.interval - now
+                             for k in self._pending if k not in self._in_flight]
+                    self._cond.wait(max(min(waits), 0.01) if waits else None)
+
+                batch = [(k, self._pending.pop(k)) for k in due]
+                self._in_flight.update(due)
+
+                # Forget throttle windows that have already elapsed
+                for k, written_at in list(self._last_write.items()):
+                    if now - written_at >= self.interval:
+                        del self._last_write[k]
+
+            for key, pending in batch:
+                error = None
+                try:
+                    pending.write(pending.data)
+                except Exception as e:
+                    logger.error(f"❌ Failed to write progress for {key}: {e}")
+                    error = e
+                with self._cond:
+                    if error is None:
+                        self._errors.pop(key, None)
+                    else:
+                        self._errors[key] = error
+                    self._last_write[key] = time.monotonic()
+                    self._in_flight.discard(key)
+                    self._cond.notify_all()
+
+
+# Singleton instance
+_reporter: Optional[ProgressReporter] = None
+
+
+def get_progress_reporter() -> ProgressReporter:
+    """Get or create singleton ProgressReporter."""
+    global _reporter
+    if _reporter is None:
+        _reporter = ProgressReporter()
+    return _reporter
@@ -1,10 +1,15 @@
+import codecs
 import json
 import os
 import re
+import threading
 import time
 import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, List
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import quote_plus, urlparse
 from urllib.robotparser import RobotFileParser
 
@@ -16,6 +21,20 @@ logger = logging.getLogger("ali_platform.services.research_service")
 ALLOWLIST_DOMAINS = {d.strip() for d in os.getenv("RESEARCH_ALLOWLIST_DOMAINS", "").split(",") if d.strip()}
 DENYLIST_DOMAINS = {d.strip() for d in os.getenv("RESEARCH_DENYLIST_DOMAINS", "").split(",") if d.strip()}
 REQUEST_DELAY_SEC = float(os.getenv("RESEARCH_REQUEST_DELAY_SEC", "0.5"))
+MAX_CONCURRENT_FETCHES = int(os.getenv("RESEARCH_MAX_CONCURRENT_FETCHES", "6"))
+HOST_CONCURRENCY = int(os.getenv("RESEARCH_HOST_CONCURRENCY", "1"))
+ROBOTS_TTL_SEC = float(os.getenv("RESEARCH_ROBOTS_TTL_SEC", "3600"))
+MAX_PAGE_BYTES = int(os.getenv("RESEARCH_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+PAGE_CACHE_SIZE = int(os.getenv("RESEARCH_PAGE_CACHE_SIZE", "512"))
+USER_AGENT = "ALI Research Bot"
+ROBOTS_USER_AGENT = "ALIResearchBot"
+MAX_FACTS = 3
+SCOUT_SEARCH_URL = os.getenv("RESEARCH_SCOUT_SEARCH_URL", "https://duckduckgo.com/html/")
+SCOUT_CACHE_TTL_SEC = float(os.getenv("RESEARCH_SCOUT_CACHE_TTL_SEC", str(6 * 3600)))
+SCOUT_CACHE_SIZE = int(os.getenv("RESEARCH_SCOUT_CACHE_SIZE", "256"))
+SCOUT_CONCURRENCY = int(os.getenv("RESEARCH_SCOUT_CONCURRENCY", "2"))
+SCOUT_MIN_INTERVAL_SEC = float(os.getenv("RESEARCH_SCOUT_MIN_INTERVAL_SEC", "1.0"))
+SCOUT_QUERY_SUFFIXES = ("", "guide", "statistics")
 
 
 def _is_domain_allowed(url: str) -> bool:
@@ -27,19 +46,6 @@ def _is_domain_allowed(url: str) -> bool:
     return True
 
 
-def _is_allowed_by_robots(url: str) -> bool:
-    try:
-        parsed = urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-        rp = RobotFileParser()
-        rp.set_url(f"{base}/robots.txt")
-        rp.read()
-        return rp.can_fetch("ALIResearchBot", url)
-    except Exception as e:
-        logger.debug(f"robots.txt check failed for {url}: {e}, allowing by default")
-        return True
-
-
 def _credibility_score(url: str) -> int:
     domain = urlparse(url).netloc.lower()
     if domain.endswith(".gov") or domain.endswith(".edu"):
@@ -49,61 +55,399 @@ def _credibility_score(url: str) -> int:
     return 50
 
 
-def scout_sources(topic: str, limit: int = 10) -> List[Dict[str, str]]:
-    query = quote_plus(topic)
-    url = f"https://duckduckgo.com/html/?q={query}"
+class _ArticleTextParser(HTMLParser):
+    """
+    Incremental HTML-to-text extractor for the page title and paragraphs.
+    Fed chunk by chunk so the crawler can stop reading once it has enough.
+    """
+
+    _SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+    def __init__(self, max_facts: int = MAX_FACTS):
+        super().__init__(convert_charrefs=True)
+        self.max_facts = max_facts
+        self.title: Optional[str] = None
+        self.facts: List[str] = []
+        self._title_parts: Optional[List[str]] = None
+        self._paragraph_parts: Optional[List[str]] = None
+        self._skip_depth = 0
+
+    @property
+    def done(self) -> bool:
+        return self.title is not None and len(self.facts) >= self.max_facts
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title" and self.title is None:
+            self._title_parts = []
+        elif tag == "p":
+            self._close_paragraph()
+            self._paragraph_parts = []
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title" and self._title_parts is not None:
+            self.title = re.sub(r"\s+", " ", "".join(self._title_parts)).strip()
+            self._title_parts = None
+        elif tag == "p":
+            self._close_paragraph()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+        if self._paragraph_parts is not None:
+            self._paragraph_parts.append(data)
+
+    def _close_paragraph(self):
+        if self._paragraph_parts is None:
+            return
+        text = re.sub(r"\s+", " ", "".join(self._paragraph_parts)).strip()
+        self._paragraph_parts = None
+        if len(text.split()) > 6 and len(self.facts) < self.max_facts:
+            self.facts.append(text)
+
+
+def _extract_page(chunks, encoding: Optional[str], max_bytes: int = MAX_PAGE_BYTES) -> Tuple[Optional[str], List[str]]:
+    """
+    Stream HTML chunks through the extractor, reading at most max_bytes.
+
+    Returns:
+        (title or None, up to MAX_FACTS paragraphs longer than six words)
+    """
     try:
-        with httpx.Client(timeout=10.0) as client:
-            response = client.get(url, headers={"User-Agent": "ALI Research Bot"})
-            response.raise_for_status()
-    except Exception as e:
-        logger.warning(f"Scout request failed: {e}")
-        return []
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = _ArticleTextParser()
+    remaining = max_bytes
+
+    for chunk in chunks:
+        if remaining <= 0:
+            break
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return parser.title, parser.facts
+
+
+class _HostThrottle:
+    """Per-host concurrency cap plus minimum delay between request starts."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._lock = threading.Lock()
+        self._delay = delay
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._delay
+        if wait > 0:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._slots.release()
+        return False
+
+
+class PoliteCrawler:
+    """
+    Concurrent page fetcher for deep_dive.
+
+    - Different hosts are fetched in parallel; each host gets its own
+      concurrency cap and delay between requests.
+    - robots.txt is parsed once per host and cached for robots_ttl seconds.
+    - Pages seen before are revalidated with If-None-Match/If-Modified-Since
+      and a 304 reuses the cached extraction.
+    - Bodies are streamed through the extractor and capped at max_page_bytes.
+    """
+
+    def __init__(
+        self,
+        user_agent: str = USER_AGENT,
+        request_delay: float = REQUEST_DELAY_SEC,
+        host_concurrency: int = HOST_CONCURRENCY,
+        max_workers: int = MAX_CONCURRENT_FETCHES,
+        robots_ttl: float = ROBOTS_TTL_SEC,
+        max_page_bytes: int = MAX_PAGE_BYTES,
+        page_cache_size: int = PAGE_CACHE_SIZE,
+        timeout: float = 10.0,
+    ):
+        self.user_agent = user_agent
+        self.request_delay = request_delay
+        self.host_concurrency = host_concurrency
+        self.max_workers = max_workers
+        self.robots_ttl = robots_ttl
+        self.max_page_bytes = max_page_bytes
+        self.page_cache_size = page_cache_size
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._throttles: Dict[str, _HostThrottle] = {}
+        self._robots: Dict[str, Tuple[float, Optional[RobotFileParser]]] = {}
+        self._robots_locks: Dict[str, threading.Lock] = {}
+        self._pages: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    def _throttle(self, host: str) -> _HostThrottle:
+        with self._lock:
+            if host not in self._throttles:
+                self._throttles[host] = _HostThrottle(self.host_concurrency, self.request_delay)
+            return self._throttles[host]
+
+    # --- robots.txt ---
+
+    def _load_robots(self, client: httpx.Client, host: str) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt. None means no restrictions."""
+        try:
+            with self._throttle(host):
+                response = client.get(f"{host}/robots.txt", headers={"User-Agent": self.user_agent})
+        except Exception as e:
+            logger.debug(f"robots.txt fetch failed for {host}: {e}, allowing by default")
+            return None
+
+        rp = RobotFileParser()
+        if response.status_code in (401, 403):
+            rp.disallow_all = True
+        elif response.status_code >= 400:
+            return None
+        else:
+            rp.parse(response.text.splitlines())
+        return rp
+
+    def is_allowed(self, client: httpx.Client, url: str) -> bool:
+        host = self._host_key(url)
+        with self._lock:
+            host_lock = self._robots_locks.setdefault(host, threading.Lock())
+
+        # One fetch per host even when several workers ask at once
+        with host_lock:
+            cached = self._robots.get(host)
+            if cached is None or time.monotonic() - cached[0] > self.robots_ttl:
+                cached = (time.monotonic(), self._load_robots(client, host))
+                self._robots[host] = cached
+
+        rp = cached[1]
+        return rp is None or rp.can_fetch(ROBOTS_USER_AGENT, url)
 
-    links = re.findall(r'href="(https?://[^"]+)"', response.text)
-    sources = []
-    for link in links:
+    # --- page cache ---
+
+    def _cached_page(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._pages.get(url)
+            if entry is not None:
+                self._pages.move_to_end(url)
+            return entry
+
+    def _store_page(self, url: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pages[url] = entry
+            self._pages.move_to_end(url)
+            while len(self._pages) > self.page_cache_size:
+                self._pages.popitem(last=False)
+
+    # --- fetching ---
+
+    def fetch(self, client: httpx.Client, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch and extract one page. Returns None if skipped or failed."""
+        try:
+            if not _is_domain_allowed(url):
+                return None
+            if not self.is_allowed(client, url):
+                logger.info(f"Skipping due to robots.txt: {url}")
+                return None
+
+            headers = {"User-Agent": self.user_agent}
+            cached = self._cached_page(url)
+            if cached:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            with self._throttle(self._host_key(url)):
+                with client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached:
+                        title, facts = cached["title"], cached["facts"]
+                    else:
+                        response.raise_for_status()
+                        title, facts = _extract_page(
+                            response.iter_bytes(), response.encoding, self.max_page_bytes
+                        )
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
+                        if etag or last_modified:
+                            self._store_page(url, {
+                                "etag": etag,
+                                "last_modified": last_modified,
+                                "title": title,
+                                "facts": facts,
+                            })
+
+            return {
+                "url": url,
+                "title": title or url,
+                "retrievedAt": datetime.now(timezone.utc).isoformat(),
+                "extractedFacts": facts,
+                "credibilityScore": _credibility_score(url)
+            }
+        except Exception as e:
+            logger.warning(f"Deep dive failed for {url}: {e}")
+            return None
+
+    def crawl(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch urls concurrently; results keep input order, failures are dropped."""
+        if not urls:
+            return []
+        with httpx.Client(timeout=self.timeout, follow_redirects=True) as client:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(urls)))) as pool:
+                pages = list(pool.map(lambda url: self.fetch(client, url), urls))
+        return [page for page in pages if page]
+
+
+_crawler: Optional[PoliteCrawler] = None
+_crawler_lock = threading.Lock()
+
+
+def get_crawler() -> PoliteCrawler:
+    """Shared crawler so robots.txt and page caches survive between calls."""
+    global _crawler
+    with _crawler_lock:
+        if _crawler is None:
+            _crawler = PoliteCrawler()
+        return _crawler
+
+
+def deep_dive(urls: List[str]) -> List[Dict[str, str]]:
+    return get_crawler().crawl(urls)
+
+
+# --- Source discovery ---
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "to", "for", "in", "on", "with", "how", "what", "is", "are"}
+
+
+def _normalise_query(topic: str) -> str:
+    """Cache key for a topic: case, punctuation, stopwords and word order ignored."""
+    tokens = re.findall(r"[a-z0-9]+", topic.lower())
+    meaningful = [t for t in tokens if t not in _STOPWORDS] or tokens
+    return " ".join(sorted(set(meaningful)))
+
+
+def _query_variants(topic: str) -> List[str]:
+    """The topic itself followed by its sub-angle queries."""
+    return [f"{topic} {suffix}".strip() for suffix in SCOUT_QUERY_SUFFIXES]
+
+
+def _parse_search_results(html: str) -> List[str]:
+    """Result links from a search results page, in rank order."""
+    links = []
+    for link in re.findall(r'href="(https?://[^"]+)"', html):
         if "duckduckgo.com" in link:
             continue
         if not _is_domain_allowed(link):
             continue
-        sources.append({"url": link, "credibilityScore": _credibility_score(link)})
-        if len(sources) >= limit:
-            break
+        links.append(link)
+    return links
+
+
+_search_throttle = _HostThrottle(SCOUT_CONCURRENCY, SCOUT_MIN_INTERVAL_SEC)
+
+
+def _search(client: httpx.Client, query: str) -> List[str]:
+    """Run one search query under the global search rate limit."""
+    try:
+        with _search_throttle:
+            response = client.get(
+                f"{SCOUT_SEARCH_URL}?q={quote_plus(query)}",
+                headers={"User-Agent": USER_AGENT}
+            )
+            response.raise_for_status()
+        return _parse_search_results(response.text)
+    except Exception as e:
+        logger.warning(f"Scout request failed for '{query}': {e}")
+        return []
+
+
+def _discover(topic: str) -> List[Dict[str, Any]]:
+    """Search all query variants concurrently and merge them by rank."""
+    variants = _query_variants(topic)
+    with httpx.Client(timeout=10.0) as client:
+        with ThreadPoolExecutor(max_workers=len(variants)) as pool:
+            ranked_lists = list(pool.map(lambda query: _search(client, query), variants))
+
+    # Round-robin by rank so the primary query leads and every angle is represented
+    sources, seen = [], set()
+    for rank in range(max((len(links) for links in ranked_lists), default=0)):
+        for links in ranked_lists:
+            if rank < len(links) and links[rank] not in seen:
+                seen.add(links[rank])
+                sources.append({"url": links[rank], "credibilityScore": _credibility_score(links[rank])})
     return sources
 
 
-def deep_dive(urls: List[str]) -> List[Dict[str, str]]:
-    results = []
-    with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-        for url in urls:
-            try:
-                if not _is_domain_allowed(url):
-                    continue
-                if not _is_allowed_by_robots(url):
-                    logger.info(f"Skipping due to robots.txt: {url}")
-                    continue
-                time.sleep(REQUEST_DELAY_SEC)
-                response = client.get(url, headers={"User-Agent": "ALI Research Bot"})
-                response.raise_for_status()
-                html = response.text
-                title_match = re.search(r"<title>(.*?)</title>", html, re.IGNORECASE | re.DOTALL)
-                title = re.sub(r"\s+", " ", title_match.group(1)).strip() if title_match else url
-                paragraph_matches = re.findall(r"<p[^>]*>(.*?)</p>", html, re.IGNORECASE | re.DOTALL)
-                clean_paragraphs = [
-                    re.sub(r"<[^>]+>", "", p).strip() for p in paragraph_matches
-                ]
-                facts = [p for p in clean_paragraphs if len(p.split()) > 6][:3]
-                results.append({
-                    "url": url,
-                    "title": title,
-                    "retrievedAt": datetime.now(timezone.utc).isoformat(),
-                    "extractedFacts": facts,
-                    "credibilityScore": _credibility_score(url)
-                })
-            except Exception as e:
-                logger.warning(f"Deep dive failed for {url}: {e}")
-    return results
+_scout_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_scout_in_flight: Dict[str, Future] = {}
+_scout_lock = threading.Lock()
+
+
+def scout_sources(topic: str, limit: int = 10) -> List[Dict[str, str]]:
+    """
+    Discover candidate sources for a topic.
+
+    Results are cached per normalised query for SCOUT_CACHE_TTL_SEC, and
+    concurrent callers for the same query share a single discovery.
+    """
+    key = _normalise_query(topic)
+    with _scout_lock:
+        cached = _scout_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            _scout_cache.move_to_end(key)
+            return [dict(source) for source in cached[1][:limit]]
+
+        future = _scout_in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _scout_in_flight[key] = future
+
+    if owner:
+        try:
+            sources = _discover(topic)
+            future.set_result(sources)
+        except Exception as e:
+            logger.warning(f"Scout discovery failed for '{topic}': {e}")
+            sources = []
+            future.set_result(sources)
+        finally:
+            with _scout_lock:
+                _scout_in_flight.pop(key, None)
+                if future.result():
+                    _scout_cache[key] = (time.monotonic() + SCOUT_CACHE_TTL_SEC, future.result())
+                    _scout_cache.move_to_end(key)
+                    while len(_scout_cache) > SCOUT_CACHE_SIZE:
+                        _scout_cache.popitem(last=False)
+    else:
+        sources = future.result()
+
+    return [dict(source) for source in sources[:limit]]
 
 
 def store_evidence_bundle(bundle: Dict[str, any], bucket_name: str | None = None) -> str | None:
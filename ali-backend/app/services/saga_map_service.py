@@ -9,12 +9,171 @@ Provides:
 4. Default Course/Module management for migration
 """
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+# --- COMPILED COURSE HELPERS ---
+
+COMPILED_COURSE_TTL_SEC = 300
+SNAPSHOT_MEMO_SIZE = 2048
+
+
+@dataclass
+class CompiledCourse:
+    """In-memory prerequisite DAG for one version of a course."""
+    course_id: str
+    version: str
+    modules: Dict[str, Dict[str, Any]]  # Course modules plus external prerequisites
+    sequence_order: List[str]           # Course modules by sequence (display order)
+    progress_order: List[str]           # course.moduleIds that exist (aggregation order)
+    topo_order: List[str]               # Prerequisites before dependants
+    tutorial_ids: frozenset = field(init=False)
+    
+    def __post_init__(self):
+        self.tutorial_ids = frozenset(
+            tid for module in self.modules.values() for tid in module.get("tutorialIds") or []
+        )
+
+
+def _prerequisite_ids(module: Dict[str, Any]) -> List[str]:
+    return [
+        prereq_id
+        for cond in module.get("unlockConditions") or []
+        for prereq_id in cond.get("prerequisiteModuleIds") or []
+    ]
+
+
+def _topological_order(modules: Dict[str, Dict[str, Any]], sequence_order: List[str]) -> List[str]:
+    """
+    Kahn's algorithm over prerequisite edges, breaking ties by sequence.
+    Modules caught in a cycle are appended in sequence order.
+    """
+    rank = {mid: i for i, mid in enumerate(sequence_order)}
+    ordered_ids = sorted(modules, key=lambda mid: (rank.get(mid, len(rank)), mid))
+    
+    indegree = {mid: 0 for mid in modules}
+    dependants: Dict[str, List[str]] = {mid: [] for mid in modules}
+    for mid in ordered_ids:
+        for prereq_id in set(_prerequisite_ids(modules[mid])):
+            if prereq_id in modules and prereq_id != mid:
+                indegree[mid] += 1
+                dependants[prereq_id].append(mid)
+    
+    ready = deque(mid for mid in ordered_ids if indegree[mid] == 0)
+    order = []
+    while ready:
+        mid = ready.popleft()
+        order.append(mid)
+        for dependant in dependants[mid]:
+            indegree[dependant] -= 1
+            if indegree[dependant] == 0:
+                ready.append(dependant)
+    
+    if len(order) < len(modules):
+        placed = set(order)
+        cyclic = [mid for mid in ordered_ids if mid not in placed]
+        logger.warning(f"⚠️ Prerequisite cycle among modules: {cyclic}")
+        order.extend(cyclic)
+    return order
+
+
+def _module_progress(user_id: str, module: Dict[str, Any], completed, now: str) -> Dict[str, Any]:
+    """ProgressRecord for one module given the user's completed tutorial IDs."""
+    tutorial_ids = module.get("tutorialIds", [])
+    if not tutorial_ids:
+        return {
+            "userId": user_id,
+            "moduleId": module.get("id"),
+            "courseId": module.get("courseId"),
+            "completedTutorialIds": [],
+            "totalTutorials": 0,
+            "percentComplete": 100.0,  # Empty module = complete
+        }
+    
+    completed_in_module = [tid for tid in tutorial_ids if tid in completed]
+    percent = (len(completed_in_module) / len(tutorial_ids)) * 100
+    
+    return {
+        "userId": user_id,
+        "moduleId": module.get("id"),
+        "courseId": module.get("courseId"),
+        "completedTutorialIds": completed_in_module,
+        "totalTutorials": len(tutorial_ids),
+        "percentComplete": round(percent, 1),
+        "lastActivityAt": now,
+    }
+
+
+def _unlock_status(
+    module: Dict[str, Any],
+    modules: Dict[str, Dict[str, Any]],
+    progress: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """UnlockStatus for a module from already-computed prerequisite progress."""
+    from app.types.course_manifest import UnlockConditionType
+    
+    module_id = module.get("id")
+    conditions = module.get("unlockConditions", [])
+    
+    # If no conditions, it's unlocked
+    if not conditions:
+        return {
+            "moduleId": module_id,
+            "isUnlocked": True,
+            "reason": "No unlock conditions",
+            "unmetConditions": [],
+        }
+    
+    unmet = []
+    
+    for cond in conditions:
+        cond_type = cond.get("type", "")
+        
+        if cond_type == UnlockConditionType.ALWAYS_UNLOCKED.value:
+            # Always passes
+            continue
+        
+        elif cond_type == UnlockConditionType.PREREQUISITE_COMPLETE.value:
+            for prereq_id in cond.get("prerequisiteModuleIds") or []:
+                if progress.get(prereq_id, {}).get("percentComplete", 0) < 100:
+                    prereq_title = modules.get(prereq_id, {}).get("title", prereq_id)
+                    unmet.append(f"Complete module '{prereq_title}' first")
+        
+        elif cond_type == UnlockConditionType.SCORE_THRESHOLD.value:
+            min_score = cond.get("minimumScore", 0)
+            # Passes if the user has achieved the score on any prerequisite module
+            prereq_ids = cond.get("prerequisiteModuleIds") or []
+            passed = False
+            for prereq_id in prereq_ids:
+                avg_score = progress.get(prereq_id, {}).get("averageScore")
+                if avg_score and avg_score >= min_score:
+                    passed = True
+                    break
+            if not passed and prereq_ids:
+                unmet.append(f"Achieve {min_score}% average score on prerequisites")
+        
+        elif cond_type == UnlockConditionType.MANUAL_UNLOCK.value:
+            # Check if admin has unlocked for this user
+            if not cond.get("unlockedBy"):
+                unmet.append("Awaiting admin unlock")
+    
+    is_unlocked = len(unmet) == 0
+    reason = "All conditions met" if is_unlocked else "; ".join(unmet)
+    
+    return {
+        "moduleId": module_id,
+        "isUnlocked": is_unlocked,
+        "reason": reason,
+        "unmetConditions": unmet,
+    }
+
+
 class SagaMapService:
     """
     Service for managing Course/Module hierarchy (Saga Map).
@@ -29,6 +188,8 @@ class SagaMapService:
             db: Firestore client instance. If None, will be imported at runtime.
         """
         self._db = db
+        self._compiled_courses: Dict[str, Tuple[CompiledCourse, float]] = {}
+        self._snapshots: "OrderedDict[tuple, tuple]" = OrderedDict()
     
     @property
     def db(self):
@@ -190,8 +351,10 @@ class SagaMapService:
         # Add module to course's moduleIds array
         self.db.collection("courses").document(course_id).update({
             "moduleIds": firestore_array_union([doc_ref.id]),
+            "graphVersion": firestore_increment(1),
             "updatedAt": datetime.utcnow().isoformat(),
         })
+        self._compiled_courses.pop(course_id, None)
         
         logger.info(f"📦 Created module: {module.id} - '{title}' in course {course_id}")
         
@@ -216,10 +379,16 @@ class SagaMapService:
     
     def add_tutorial_to_module(self, module_id: str, tutorial_id: str) -> bool:
         """Add a tutorial to a module's tutorialIds array."""
-        self.db.collection("modules").document(module_id).update({
+        module_ref = self.db.collection("modules").document(module_id)
+        module_ref.update({
             "tutorialIds": firestore_array_union([tutorial_id]),
             "updatedAt": datetime.utcnow().isoformat(),
         })
+        
+        module = module_ref.get()
+        course_id = (module.to_dict() or {}).get("courseId") if module.exists else None
+        if course_id:
+            self._bump_course_version(course_id)
         logger.info(f"📝 Added tutorial {tutorial_id} to module {module_id}")
         return True
     
@@ -239,94 +408,216 @@ class SagaMapService:
         
         # Update course's moduleIds to match
         course_ref = self.db.collection("courses").document(course_id)
-        batch.update(course_ref, {"moduleIds": module_ids, "updatedAt": datetime.utcnow().isoformat()})
+        batch.update(course_ref, {
+            "moduleIds": module_ids,
+            "graphVersion": firestore_increment(1),
+            "updatedAt": datetime.utcnow().isoformat(),
+        })
+        self._compiled_courses.pop(course_id, None)
         
         batch.commit()
         logger.info(f"🔄 Reordered {len(module_ids)} modules in course {course_id}")
         return True
     
-    # --- PROGRESS TRACKING ---
+    # --- COMPILED COURSE GRAPH ---
     
-    def calculate_module_progress(self, user_id: str, module_id: str) -> Dict[str, Any]:
+    def _course_version(self, course: Dict[str, Any]) -> str:
+        """Version key for a course's structure; bumped by every structural edit."""
+        return f"{course.get('graphVersion', 0)}:{course.get('updatedAt', '')}"
+    
+    def _bump_course_version(self, course_id: str) -> None:
+        """Invalidate compiled graphs of a course (on every instance)."""
+        self.db.collection("courses").document(course_id).update({
+            "graphVersion": firestore_increment(1),
+            "updatedAt": datetime.utcnow().isoformat(),
+        })
+        self._compiled_courses.pop(course_id, None)
+    
+    def compile_course(self, course: Dict[str, Any]) -> CompiledCourse:
         """
-        Calculate a user's progress through a module.
+        Compile a course's modules into a prerequisite DAG.
         
+        Cached per course and reused while the course version is unchanged
+        (and for at most COMPILED_COURSE_TTL_SEC as a safety net against
+        edits made outside this service).
+        
+        Args:
+            course: Course document dict (must include "id")
+            
         Returns:
-            ProgressRecord dict with completion percentage
+            CompiledCourse for the course's current version
         """
-        module = self.get_module(module_id)
-        if not module:
-            return {"error": "Module not found"}
+        course_id = course.get("id")
+        version = self._course_version(course)
+        
+        cached = self._compiled_courses.get(course_id)
+        if cached and cached[0].version == version and time.monotonic() - cached[1] < COMPILED_COURSE_TTL_SEC:
+            return cached[0]
+        
+        modules = {m["id"]: m for m in self.list_modules_for_course(course_id)}
+        sequence_order = list(modules)
+        
+        # Prerequisites may point at modules outside this course: fetch them in one call
+        external_ids = {
+            prereq_id
+            for module in list(modules.values())
+            for cond in module.get("unlockConditions") or []
+            for prereq_id in cond.get("prerequisiteModuleIds") or []
+            if prereq_id not in modules
+        }
+        if external_ids:
+            refs = [self.db.collection("modules").document(mid) for mid in sorted(external_ids)]
+            for doc in self.db.get_all(refs):
+                if doc.exists:
+                    data = doc.to_dict() or {}
+                    data.setdefault("id", doc.id)
+                    modules[doc.id] = data
         
-        tutorial_ids = module.get("tutorialIds", [])
-        if not tutorial_ids:
-            return {
-                "userId": user_id,
-                "moduleId": module_id,
-                "courseId": module.get("courseId"),
-                "completedTutorialIds": [],
-                "totalTutorials": 0,
-                "percentComplete": 100.0,  # Empty module = complete
-            }
+        progress_order = [mid for mid in course.get("moduleIds", []) if mid in modules]
         
-        # Get user's completed tutorials
+        compiled = CompiledCourse(
+            course_id=course_id,
+            version=version,
+            modules=modules,
+            sequence_order=sequence_order,
+            progress_order=progress_order,
+            topo_order=_topological_order(modules, sequence_order),
+        )
+        self._compiled_courses[course_id] = (compiled, time.monotonic())
+        logger.info(f"🗺️ Compiled course {course_id} v{version}: {len(modules)} modules")
+        return compiled
+    
+    def get_completed_tutorials(self, user_id: str) -> set:
+        """Load a user's completed tutorial IDs (single read)."""
         user_doc = self.db.collection("users").document(user_id).get()
-        completed_all = user_doc.to_dict().get("completed_tutorials", []) if user_doc.exists else []
-        
-        # Find which module tutorials are completed
-        completed_in_module = [tid for tid in tutorial_ids if tid in completed_all]
-        
-        percent = (len(completed_in_module) / len(tutorial_ids)) * 100 if tutorial_ids else 100.0
-        
-        return {
-            "userId": user_id,
-            "moduleId": module_id,
-            "courseId": module.get("courseId"),
-            "completedTutorialIds": completed_in_module,
-            "totalTutorials": len(tutorial_ids),
-            "percentComplete": round(percent, 1),
-            "lastActivityAt": datetime.utcnow().isoformat(),
-        }
+        return set(user_doc.to_dict().get("completed_tutorials", []) if user_doc.exists else [])
     
-    def calculate_course_progress(self, user_id: str, course_id: str) -> Dict[str, Any]:
-        """
-        Calculate a user's overall progress through a course.
+    def get_course_snapshot(
+        self,
+        user_id: str,
+        course_id: Optional[str] = None,
+        course: Optional[Dict[str, Any]] = None,
+        completed: Optional[set] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        course = self.get_course(course_id)
-        if not course:
-            return {"error": "Course not found"}
+        Progress and unlock state for every module of a course in one pass.
         
-        module_ids = course.get("moduleIds", [])
-        if not module_ids:
-            return {
-                "userId": user_id,
-                "courseId": course_id,
-                "moduleId": None,
-                "completedTutorialIds": [],
-                "totalTutorials": 0,
-                "percentComplete": 100.0,
-            }
+        Reads the course document (unless given), the compiled graph (cached)
+        and the user's completion state (unless given). Results are memoised
+        per (user, course version) until the user's completions change.
         
-        # Aggregate progress across all modules
+        Returns:
+            {"course", "version", "modules" (by sequence), "moduleProgress",
+             "moduleUnlock", "courseProgress"} or None if the course is missing
+        """
+        if course is None:
+            course = self.get_course(course_id)
+            if not course:
+                return None
+        course = {**course, "id": course.get("id") or course_id}
+        course_id = course["id"]
+        
+        compiled = self.compile_course(course)
+        if completed is None:
+            completed = self.get_completed_tutorials(user_id)
+        
+        completed_in_course = frozenset(completed & compiled.tutorial_ids)
+        memo_key = (user_id, course_id, compiled.version)
+        memo = self._snapshots.get(memo_key)
+        if memo and memo[0] == completed_in_course:
+            self._snapshots.move_to_end(memo_key)
+            return {**memo[1], "course": course}
+        
+        snapshot = self._evaluate_course(user_id, course, compiled, completed_in_course)
+        self._snapshots[memo_key] = (completed_in_course, snapshot)
+        self._snapshots.move_to_end(memo_key)
+        while len(self._snapshots) > SNAPSHOT_MEMO_SIZE:
+            self._snapshots.popitem(last=False)
+        return snapshot
+    
+    def _evaluate_course(
+        self,
+        user_id: str,
+        course: Dict[str, Any],
+        compiled: CompiledCourse,
+        completed: frozenset
+    ) -> Dict[str, Any]:
+        """Single linear pass over the topological order."""
+        now = datetime.utcnow().isoformat()
+        module_progress: Dict[str, Dict[str, Any]] = {}
+        module_unlock: Dict[str, Dict[str, Any]] = {}
+        
+        for module_id in compiled.topo_order:
+            module = compiled.modules[module_id]
+            module_progress[module_id] = _module_progress(user_id, module, completed, now)
+            if module_id in compiled.sequence_order:
+                module_unlock[module_id] = _unlock_status(module, compiled.modules, module_progress)
+        
+        # Course-level aggregate over the course's declared module list
         all_completed = []
         total_tutorials = 0
-        
-        for mid in module_ids:
-            module_progress = self.calculate_module_progress(user_id, mid)
-            all_completed.extend(module_progress.get("completedTutorialIds", []))
-            total_tutorials += module_progress.get("totalTutorials", 0)
+        for module_id in compiled.progress_order:
+            progress = module_progress[module_id]
+            all_completed.extend(progress["completedTutorialIds"])
+            total_tutorials += progress["totalTutorials"]
         
         percent = (len(all_completed) / total_tutorials) * 100 if total_tutorials else 100.0
         
         return {
-            "userId": user_id,
-            "courseId": course_id,
-            "moduleId": None,
-            "completedTutorialIds": all_completed,
-            "totalTutorials": total_tutorials,
-            "percentComplete": round(percent, 1),
+            "course": course,
+            "version": compiled.version,
+            "modules": [compiled.modules[mid] for mid in compiled.sequence_order],
+            "moduleProgress": module_progress,
+            "moduleUnlock": module_unlock,
+            "courseProgress": {
+                "userId": user_id,
+                "courseId": compiled.course_id,
+                "moduleId": None,
+                "completedTutorialIds": all_completed,
+                "totalTutorials": total_tutorials,
+                "percentComplete": round(percent, 1),
+            },
         }
     
+    def _snapshot_for_module(self, user_id: str, module_id: str):
+        """Resolve a module to its course snapshot. Returns (module, snapshot)."""
+        module = self.get_module(module_id)
+        if not module:
+            return None, None
+        module.setdefault("id", module_id)
+        snapshot = self.get_course_snapshot(user_id, module.get("courseId"))
+        if snapshot is None or module_id not in snapshot["moduleProgress"]:
+            return module, None
+        return module, snapshot
+    
+    # --- PROGRESS TRACKING ---
+    
+    def calculate_module_progress(self, user_id: str, module_id: str) -> Dict[str, Any]:
+        """
+        Calculate a user's progress through a module.
+        
+        Returns:
+            ProgressRecord dict with completion percentage
+        """
+        module, snapshot = self._snapshot_for_module(user_id, module_id)
+        if not module:
+            return {"error": "Module not found"}
+        if snapshot is None:
+            # Module not (yet) listed under its course: evaluate it on its own
+            return _module_progress(
+                user_id, module, self.get_completed_tutorials(user_id), datetime.utcnow().isoformat()
+            )
+        return snapshot["moduleProgress"][module_id]
+    
+    def calculate_course_progress(self, user_id: str, course_id: str) -> Dict[str, Any]:
+        """
+        Calculate a user's overall progress through a course.
+        """
+        snapshot = self.get_course_snapshot(user_id, course_id)
+        if snapshot is None:
+            return {"error": "Course not found"}
+        return snapshot["courseProgress"]
+    
     # --- UNLOCK CONDITION EVALUATION ---
     
     def check_unlock_conditions(self, user_id: str, module_id: str) -> Dict[str, Any]:
@@ -336,9 +627,7 @@ class SagaMapService:
         Returns:
             UnlockStatus dict with isUnlocked and reason
         """
-        from app.types.course_manifest import UnlockConditionType
-        
-        module = self.get_module(module_id)
+        module, snapshot = self._snapshot_for_module(user_id, module_id)
         if not module:
             return {
                 "moduleId": module_id,
@@ -346,66 +635,18 @@ class SagaMapService:
                 "reason": "Module not found",
                 "unmetConditions": [],
             }
-        
-        conditions = module.get("unlockConditions", [])
-        
-        # If no conditions, it's unlocked
-        if not conditions:
-            return {
-                "moduleId": module_id,
-                "isUnlocked": True,
-                "reason": "No unlock conditions",
-                "unmetConditions": [],
-            }
-        
-        unmet = []
-        
-        for cond in conditions:
-            cond_type = cond.get("type", "")
-            
-            if cond_type == UnlockConditionType.ALWAYS_UNLOCKED.value:
-                # Always passes
-                continue
-            
-            elif cond_type == UnlockConditionType.PREREQUISITE_COMPLETE.value:
-                prereq_ids = cond.get("prerequisiteModuleIds", [])
-                for prereq_id in prereq_ids:
-                    progress = self.calculate_module_progress(user_id, prereq_id)
-                    if progress.get("percentComplete", 0) < 100:
-                        prereq_module = self.get_module(prereq_id)
-                        prereq_title = prereq_module.get("title", prereq_id) if prereq_module else prereq_id
-                        unmet.append(f"Complete module '{prereq_title}' first")
-            
-            elif cond_type == UnlockConditionType.SCORE_THRESHOLD.value:
-                min_score = cond.get("minimumScore", 0)
-                # Get user's average score across prerequisite modules
-                # For now, check if user has achieved the score on any related module
-                prereq_ids = cond.get("prerequisiteModuleIds", [])
-                passed = False
-                for prereq_id in prereq_ids:
-                    progress = self.calculate_module_progress(user_id, prereq_id)
-                    avg_score = progress.get("averageScore")
-                    if avg_score and avg_score >= min_score:
-                        passed = True
-                        break
-                if not passed and prereq_ids:
-                    unmet.append(f"Achieve {min_score}% average score on prerequisites")
-            
-            elif cond_type == UnlockConditionType.MANUAL_UNLOCK.value:
-                # Check if admin has unlocked for this user
-                unlocked_by = cond.get("unlockedBy")
-                if not unlocked_by:
-                    unmet.append("Awaiting admin unlock")
-        
-        is_unlocked = len(unmet) == 0
-        reason = "All conditions met" if is_unlocked else "; ".join(unmet)
-        
-        return {
-            "moduleId": module_id,
-            "isUnlocked": is_unlocked,
-            "reason": reason,
-            "unmetConditions": unmet,
-        }
+        if snapshot is None or module_id not in snapshot["moduleUnlock"]:
+            modules = {module_id: module}
+            for cond in module.get("unlockConditions") or []:
+                for prereq_id in cond.get("prerequisiteModuleIds") or []:
+                    prereq = self.get_module(prereq_id)
+                    if prereq:
+                        modules[prereq_id] = prereq
+            completed = self.get_completed_tutorials(user_id)
+            now = datetime.utcnow().isoformat()
+            progress = {mid: _module_progress(user_id, m, completed, now) for mid, m in modules.items()}
+            return _unlock_status(module, modules, progress)
+        return snapshot["moduleUnlock"][module_id]
     
     def is_module_unlocked(self, user_id: str, module_id: str) -> bool:
         """Simple boolean check for module unlock status."""
@@ -478,6 +719,16 @@ def firestore_array_union(values: List[Any]):
         return values
 
 
+def firestore_increment(value: int):
+    """Wrapper for Firestore Increment."""
+    try:
+        from firebase_admin import firestore
+        return firestore.Increment(value)
+    except ImportError:
+        # Fallback for testing
+        return value
+
+
 # --- SINGLETON INSTANCE ---
 _saga_map_service: Optional[SagaMapService] = None
 
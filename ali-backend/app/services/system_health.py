@@ -0,0 +1,143 @@
+"""
+System Health Counters
+Queue depths and failure counts for /admin/system-health and the
+TroubleshootingAgent watchdog, computed with Firestore count() aggregations
+(one aggregation read per counter regardless of collection size). The full
+set is cached briefly for the admin endpoint; the watchdog computes only
+the counts it gates on, fresh each sweep.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CACHE_TTL_SEC = int(os.getenv("HEALTH_CACHE_TTL_SEC", "30"))
+
+# admin_tasks types raised by tutorial generation failures
+FAILURE_TASK_TYPES = ("system_failure", "generation_blocked", "content_alert")
+
+_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+
+def _count(query) -> Optional[int]:
+    """Run a count() aggregation; None if it failed."""
+    try:
+        result = query.count(alias="count").get()
+        return int(result[0][0].value)
+    except Exception as e:
+        logger.warning(f"⚠️ Health count failed: {e}")
+        return None
+
+
+def _last_successful_scan(db) -> Optional[str]:
+    try:
+        from google.cloud import firestore
+        from google.cloud.firestore_v1.base_query import FieldFilter
+        docs = list(
+            db.collection('scheduled_scans')
+              .where(filter=FieldFilter('status', '==', 'completed'))
+              .order_by('completed_at', direction=firestore.Query.DESCENDING)
+              .limit(1)
+              .stream()
+        )
+        if docs:
+            completed = docs[0].to_dict().get('completed_at')
+            if completed:
+                return completed.isoformat() if hasattr(completed, 'isoformat') else str(completed)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not query scan history: {e}")
+    return None
+
+
+def _pending_failure_tasks(db) -> Dict[str, Optional[int]]:
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    tasks = db.collection('admin_tasks')
+    return {
+        task_type: _count(
+            tasks.where(filter=FieldFilter('type', '==', task_type))
+                 .where(filter=FieldFilter('status', '==', 'pending'))
+        )
+        for task_type in FAILURE_TASK_TYPES
+    }
+
+
+def _frontend_errors_since(db, since: datetime) -> Optional[int]:
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    return _count(
+        db.collection('client_logs')
+          .where(filter=FieldFilter('timestamp', '>=', since.isoformat()))
+          .where(filter=FieldFilter('level', '==', 'error'))
+    )
+
+
+def compute_health_counters(db) -> Dict[str, Any]:
+    """
+    Compute all health counters. Costs one aggregation per counter plus
+    one document read for the last successful scan.
+    """
+    from google.cloud.firestore_v1.base_query import FieldFilter
+
+    now = datetime.now(timezone.utc)
+    hour_ago = now - timedelta(hours=1)
+    day_ago = datetime.utcnow() - timedelta(hours=24)
+
+    scans = db.collection('scheduled_scans')
+
+    return {
+        "queued_deepfake_jobs": _count(
+            db.collection_group('deepfake_jobs').where(filter=FieldFilter('status', '==', 'queued'))
+        ),
+        "pending_scan_jobs": _count(scans.where(filter=FieldFilter('status', '==', 'pending'))),
+        "scan_failures_24h": _count(
+            scans.where(filter=FieldFilter('status', '==', 'failed'))
+                 .where(filter=FieldFilter('created_at', '>=', day_ago))
+        ),
+        "last_successful_scan": _last_successful_scan(db),
+        "pending_failure_tasks": _pending_failure_tasks(db),
+        "frontend_errors_1h": _frontend_errors_since(db, hour_ago),
+        "computed_at": now.isoformat(),
+    }
+
+
+def compute_watchdog_counters(db) -> Dict[str, Any]:
+    """
+    Fresh counts for just the sources the watchdog sweep reads: one
+    aggregation for client_logs errors and one per failure task type.
+    Not cached, a stale zero would hide errors logged since.
+    """
+    hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+    return {
+        "pending_failure_tasks": _pending_failure_tasks(db),
+        "frontend_errors_1h": _frontend_errors_since(db, hour_ago),
+    }
+
+
+def get_health_counters(db=None, max_age: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Cached health counters for the admin endpoint.
+
+    Args:
+        db: Firestore client (defaults to app.core.security.db)
+        max_age: Oldest acceptable cached result in seconds
+                 (defaults to HEALTH_CACHE_TTL_SEC; 0 forces a refresh)
+    """
+    if db is None:
+        from app.core.security import db
+    max_age = HEALTH_CACHE_TTL_SEC if max_age is None else max_age
+
+    with _cache_lock:
+        cached = _cache.get("counters")
+        if cached and time.monotonic() - _cache["at"] < max_age:
+            return cached
+
+        counters = compute_health_counters(db)
+        _cache["counters"] = counters
+        _cache["at"] = time.monotonic()
+        return counters
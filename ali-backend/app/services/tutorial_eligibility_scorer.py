@@ -11,7 +11,8 @@ Factors considered:
 6. Campaign performance correlation
 """
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Set
 from datetime import datetime, timedelta
 from enum import Enum
 
@@ -27,6 +28,23 @@ class EligibilityScore(float, Enum):
     SKIP = 20          # Don't generate
 
 
+@dataclass
+class ScoringContext:
+    """
+    Everything scoring needs about one user, loaded once.
+    
+    A field left as None means it could not be loaded; the matching
+    component then falls back to its default score.
+    """
+    user_id: str
+    completed_topics: Optional[Set[str]] = None      # Lower-cased topics of completed tutorials
+    has_dated_completion: bool = False               # Any completed tutorial with a completedAt field
+    last_completed_at: Optional[Any] = None          # Most recent non-null completedAt
+    campaigns: Optional[List[Dict[str, Any]]] = None # Recent campaign performance docs
+    performance_data: Optional[Dict[str, Any]] = None
+    complexity: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # topic -> analysis (prerequisites graph)
+
+
 class TutorialEligibilityScorer:
     """
     Scores tutorial generation eligibility based on multiple factors.
@@ -99,12 +117,77 @@ class TutorialEligibilityScorer:
                 pass
         return self._gap_analyzer
 
+    def build_scoring_context(
+        self,
+        user_id: str,
+        performance_data: Optional[Dict] = None
+    ) -> ScoringContext:
+        """
+        Load a user's scoring inputs with a constant number of reads:
+        one stream of completed tutorials (prerequisites and recency),
+        one of recent campaign performance, and one performance analysis.
+        """
+        context = ScoringContext(user_id=user_id, performance_data=performance_data)
+        
+        if context.performance_data is None and self.performance_analyzer:
+            try:
+                context.performance_data = self.performance_analyzer.analyze_user_performance(user_id)
+            except Exception as e:
+                logger.warning(f"⚠️ Performance analysis failed for {user_id}: {e}")
+        
+        if not self.db:
+            return context
+        
+        user_ref = self.db.collection('users').document(user_id)
+        
+        try:
+            completed_topics = set()
+            for t in user_ref.collection('tutorials').where('is_completed', '==', True).stream():
+                t_data = t.to_dict() or {}
+                completed_topics.add(t_data.get('topic', '').lower())
+                if 'completedAt' in t_data:
+                    context.has_dated_completion = True
+                    completed_at = t_data['completedAt']
+                    if completed_at and (
+                        context.last_completed_at is None
+                        or self._to_datetime(completed_at) > self._to_datetime(context.last_completed_at)
+                    ):
+                        context.last_completed_at = completed_at
+            context.completed_topics = completed_topics
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load completed tutorials for {user_id}: {e}")
+        
+        try:
+            context.campaigns = [
+                c.to_dict() or {}
+                for c in user_ref.collection('campaign_performance').limit(5).stream()
+            ]
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load campaign performance for {user_id}: {e}")
+        
+        return context
+
+    @staticmethod
+    def _to_datetime(value) -> datetime:
+        if hasattr(value, 'timestamp'):
+            return datetime.fromtimestamp(value.timestamp())
+        return datetime.fromisoformat(str(value))
+
+    def _analyze_complexity(self, topic: str, context: ScoringContext) -> Optional[Dict[str, Any]]:
+        """Complexity analysis for a topic, computed once per context."""
+        if not self.complexity_analyzer:
+            return None
+        if topic not in context.complexity:
+            context.complexity[topic] = self.complexity_analyzer.analyze_topic_complexity(topic)
+        return context.complexity[topic]
+
     def score_recommendation(
         self,
         user_id: str,
         topic: str,
         gap_data: Optional[Dict] = None,
-        performance_data: Optional[Dict] = None
+        performance_data: Optional[Dict] = None,
+        context: Optional[ScoringContext] = None
     ) -> Dict[str, Any]:
         """
         Calculate eligibility score for a tutorial recommendation.
@@ -114,6 +197,8 @@ class TutorialEligibilityScorer:
             topic: Topic of the proposed tutorial
             gap_data: Pre-computed gap data (optional)
             performance_data: Pre-computed performance data (optional)
+            context: Pre-loaded ScoringContext for this user (optional);
+                     built on demand when omitted
             
         Returns:
             {
@@ -125,6 +210,9 @@ class TutorialEligibilityScorer:
             }
         """
         try:
+            if context is None:
+                context = self.build_scoring_context(user_id, performance_data)
+            
             component_scores = {}
             reasoning = []
 
@@ -135,27 +223,27 @@ class TutorialEligibilityScorer:
                 reasoning.append(f"Critical knowledge gap detected (score: {gap_score})")
 
             # 2. Performance Level Score
-            perf_score = self._score_performance_level(user_id, performance_data)
+            perf_score = self._score_performance_level(user_id, performance_data or context.performance_data)
             component_scores["performance_level"] = perf_score
             if perf_score >= 80:
                 reasoning.append("User is struggling and needs intervention")
 
             # 3. Topic Complexity Score
-            complexity_score = self._score_topic_complexity(topic)
+            complexity_score = self._score_topic_complexity(topic, context)
             component_scores["topic_complexity"] = complexity_score
 
             # 4. Prerequisite Completion Score
-            prereq_score = self._score_prerequisites(user_id, topic)
+            prereq_score = self._score_prerequisites(topic, context)
             component_scores["prerequisite_status"] = prereq_score
             if prereq_score < 50:
                 reasoning.append("Prerequisites not yet completed")
 
             # 5. Recency Score
-            recency_score = self._score_recency(user_id)
+            recency_score = self._score_recency(context)
             component_scores["recency"] = recency_score
 
             # 6. Campaign Correlation Score
-            campaign_score = self._score_campaign_correlation(user_id, topic)
+            campaign_score = self._score_campaign_correlation(topic, context)
             component_scores["campaign_correlation"] = campaign_score
             if campaign_score >= 70:
                 reasoning.append("Topic directly relates to campaign performance issues")
@@ -232,140 +320,88 @@ class TutorialEligibilityScorer:
         
         return self.PERFORMANCE_SCORES.get(level, 50)
 
-    def _score_topic_complexity(self, topic: str) -> float:
+    def _score_topic_complexity(self, topic: str, context: ScoringContext) -> float:
         """Score based on topic complexity - higher complexity = higher priority."""
-        if self.complexity_analyzer:
-            analysis = self.complexity_analyzer.analyze_topic_complexity(topic)
+        analysis = self._analyze_complexity(topic, context)
+        if analysis:
             complexity = analysis.get("complexity_score", 5)
             # Higher complexity means higher need for structured learning
             return min(complexity * 10, 100)
         return 50
 
-    def _score_prerequisites(self, user_id: str, topic: str) -> float:
+    def _score_prerequisites(self, topic: str, context: ScoringContext) -> float:
         """Score based on prerequisite completion status."""
-        if not self.complexity_analyzer:
+        analysis = self._analyze_complexity(topic, context)
+        if analysis is None:
             return 80  # Default: assume prerequisites are mostly met
         
-        # Get prerequisites for topic
-        analysis = self.complexity_analyzer.analyze_topic_complexity(topic)
         prerequisites = analysis.get("prerequisites", [])
         
         if not prerequisites:
             return 100  # No prerequisites needed
         
-        if not self.db:
+        if context.completed_topics is None:
             return 60
         
-        try:
-            # Check how many prerequisites are in completed tutorials
-            tutorials = list(
-                self.db.collection('users').document(user_id)
-                .collection('tutorials')
-                .where('is_completed', '==', True)
-                .stream()
-            )
-            
-            completed_topics = set()
-            for t in tutorials:
-                t_data = t.to_dict()
-                topic_lower = t_data.get('topic', '').lower()
-                completed_topics.add(topic_lower)
-            
-            # Count completed prerequisites
-            completed_prereqs = sum(
-                1 for p in prerequisites 
-                if any(p.lower() in ct or ct in p.lower() for ct in completed_topics)
-            )
-            
-            return (completed_prereqs / len(prerequisites)) * 100
-            
-        except Exception:
-            return 60
+        # Count completed prerequisites
+        completed_prereqs = sum(
+            1 for p in prerequisites 
+            if any(p.lower() in ct or ct in p.lower() for ct in context.completed_topics)
+        )
+        
+        return (completed_prereqs / len(prerequisites)) * 100
 
-    def _score_recency(self, user_id: str) -> float:
+    def _score_recency(self, context: ScoringContext) -> float:
         """Score based on time since last tutorial completion."""
-        if not self.db:
+        if context.completed_topics is None:
             return 50
         
+        if not context.has_dated_completion:
+            return 80  # No tutorials = high priority to start learning
+        
+        if not context.last_completed_at:
+            return 60
+        
         try:
-            # Get most recent completed tutorial
-            tutorials = list(
-                self.db.collection('users').document(user_id)
-                .collection('tutorials')
-                .where('is_completed', '==', True)
-                .order_by('completedAt', direction='DESCENDING')
-                .limit(1)
-                .stream()
-            )
-            
-            if not tutorials:
-                return 80  # No tutorials = high priority to start learning
-            
-            last_tutorial = tutorials[0].to_dict()
-            completed_at = last_tutorial.get('completedAt')
-            
-            if not completed_at:
-                return 60
-            
-            # Calculate days since completion
-            if hasattr(completed_at, 'timestamp'):
-                completed_datetime = datetime.fromtimestamp(completed_at.timestamp())
-            else:
-                completed_datetime = datetime.fromisoformat(str(completed_at))
-            
-            days_since = (datetime.utcnow() - completed_datetime).days
-            
-            # More days = higher priority (user hasn't learned recently)
-            if days_since >= 14:
-                return 90
-            elif days_since >= 7:
-                return 70
-            elif days_since >= 3:
-                return 50
-            else:
-                return 30  # Low priority - recently active
-                
+            days_since = (datetime.utcnow() - self._to_datetime(context.last_completed_at)).days
         except Exception:
             return 50
+        
+        # More days = higher priority (user hasn't learned recently)
+        if days_since >= 14:
+            return 90
+        elif days_since >= 7:
+            return 70
+        elif days_since >= 3:
+            return 50
+        else:
+            return 30  # Low priority - recently active
 
-    def _score_campaign_correlation(self, user_id: str, topic: str) -> float:
+    def _score_campaign_correlation(self, topic: str, context: ScoringContext) -> float:
         """Score based on campaign performance correlation to topic."""
-        if not self.db:
+        if context.campaigns is None:
             return 50
         
-        try:
-            # Get recent campaign performance
-            campaigns = list(
-                self.db.collection('users').document(user_id)
-                .collection('campaign_performance')
-                .limit(5)
-                .stream()
-            )
-            
-            if not campaigns:
-                return 40  # No campaigns = lower priority for campaign-related tutorials
-            
-            # Check for performance issues
-            low_performance = False
-            topic_lower = topic.lower()
-            
-            for c in campaigns:
-                c_data = c.to_dict()
-                ctr = c_data.get('ctr', 0)
-                
-                # If CTR is low and topic is related to optimization/creative
-                if ctr < 1.0:
-                    if any(t in topic_lower for t in ['optimization', 'creative', 'ctr', 'engagement']):
-                        return 90  # High correlation
-                    low_performance = True
-            
-            if low_performance:
-                return 70  # General performance issues
-            
-            return 50  # Normal
+        if not context.campaigns:
+            return 40  # No campaigns = lower priority for campaign-related tutorials
+        
+        # Check for performance issues
+        low_performance = False
+        topic_lower = topic.lower()
+        
+        for c_data in context.campaigns:
+            ctr = c_data.get('ctr', 0)
             
-        except Exception:
-            return 50
+            # If CTR is low and topic is related to optimization/creative
+            if ctr < 1.0:
+                if any(t in topic_lower for t in ['optimization', 'creative', 'ctr', 'engagement']):
+                    return 90  # High correlation
+                low_performance = True
+        
+        if low_performance:
+            return 70  # General performance issues
+        
+        return 50  # Normal
 
     def batch_score_recommendations(
         self, 
@@ -374,11 +410,10 @@ class TutorialEligibilityScorer:
     ) -> List[Dict]:
         """
         Score multiple recommendations and return sorted by priority.
+        Costs a constant number of reads regardless of how many there are.
         """
-        # Pre-fetch performance data once
-        performance_data = None
-        if self.performance_analyzer:
-            performance_data = self.performance_analyzer.analyze_user_performance(user_id)
+        # Load the user's scoring inputs once; candidates are scored in memory
+        context = self.build_scoring_context(user_id)
         
         scored = []
         for rec in recommendations:
@@ -386,7 +421,7 @@ class TutorialEligibilityScorer:
                 user_id=user_id,
                 topic=rec.get("topic", ""),
                 gap_data=rec,
-                performance_data=performance_data
+                context=context
             )
             rec["eligibility_score"] = score_result
             scored.append(rec)
@@ -0,0 +1,256 @@
+"""
+User Summary Service
+Per-user aggregate documents (user_summaries/{uid}) maintained on write so
+admin listings don't fan out into each user's subcollections.
+
+Fields:
+- tutorials_completed / tutorials_in_progress / completion_score_sum
+  (Increment counters, updated on tutorial save, completion and hard delete)
+- connected_platforms / active_channels (refreshed when integrations change)
+- campaign_stats {total_spend, total_clicks, data_points}
+  (all-time totals over campaign_performance; ingestion applies Increment
+  deltas for the rows it writes, old vs new values per doc id)
+- last_activity_at
+
+Admin listings page over `users` with one query and join these docs with a
+single get_all per page.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLLECTION = "user_summaries"
+MAX_PAGE_SIZE = 500
+
+
+class UserSummaryService:
+    """Maintains and serves per-user admin summaries."""
+
+    def __init__(self, db=None):
+        self._db = db
+
+    @property
+    def db(self):
+        if self._db is None:
+            try:
+                from app.core.security import db
+                self._db = db
+            except Exception as e:
+                logger.error(f"❌ Failed to load Firestore: {e}")
+        return self._db
+
+    def _ref(self, user_id: str):
+        return self.db.collection(SUMMARY_COLLECTION).document(user_id)
+
+    def _merge(self, user_id: str, fields: Dict[str, Any]) -> bool:
+        """Best-effort merge into a user's summary; never fails the caller's write."""
+        if not self.db:
+            return False
+        try:
+            self._ref(user_id).set({
+                "user_id": user_id,
+                "last_activity_at": datetime.utcnow().isoformat(),
+                **fields,
+            }, merge=True)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update user summary for {user_id}: {e}")
+            return False
+
+    # --- WRITE HOOKS ---
+
+    def record_tutorial_created(self, user_id: str) -> bool:
+        """A new tutorial was saved to the user's private collection."""
+        from firebase_admin import firestore
+        return self._merge(user_id, {"tutorials_in_progress": firestore.Increment(1)})
+
+    def record_tutorial_completed(self, user_id: str, score: float, was_in_progress: bool = True) -> bool:
+        """
+        A tutorial was completed for the first time.
+
+        Args:
+            user_id: Learner
+            score: Completion score
+            was_in_progress: False when the tutorial had no private copy
+                             (completed straight from the global library)
+        """
+        from firebase_admin import firestore
+        fields = {
+            "tutorials_completed": firestore.Increment(1),
+            "completion_score_sum": firestore.Increment(score or 0),
+        }
+        if was_in_progress:
+            fields["tutorials_in_progress"] = firestore.Increment(-1)
+        return self._merge(user_id, fields)
+
+    def record_tutorial_deleted(self, user_id: str, was_completed: bool, score: float = 0) -> bool:
+        """
+        A private tutorial copy was hard-deleted.
+
+        Args:
+            user_id: Owner of the deleted copy
+            was_completed: Whether the copy was completed
+            score: Its completion score (only used when completed)
+        """
+        from firebase_admin import firestore
+        if was_completed:
+            fields = {
+                "tutorials_completed": firestore.Increment(-1),
+                "completion_score_sum": firestore.Increment(-(score or 0)),
+            }
+        else:
+            fields = {"tutorials_in_progress": firestore.Increment(-1)}
+        return self._merge(user_id, fields)
+
+    def refresh_integrations(self, user_id: str) -> bool:
+        """Recompute integration flags after a user_integrations write."""
+        if not self.db:
+            return False
+        try:
+            platforms, channels = [], set()
+            for doc in self.db.collection("users").document(user_id).collection("user_integrations").stream():
+                data = doc.to_dict() or {}
+                if data.get("status") == "active" or data.get("metricool_blog_id"):
+                    platforms.append(data.get("platform", "unknown"))
+                if doc.id == "metricool" and data.get("status") == "active":
+                    channels.update(data.get("connected_providers", []))
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read integrations for {user_id}: {e}")
+            return False
+        return self._merge(user_id, {
+            "connected_platforms": platforms,
+            "active_channels": sorted(channels),
+        })
+
+    def campaign_stats_delta(
+        self, user_id: str, rows: Dict[str, Dict[str, Any]], merge: bool = True
+    ) -> Optional[Dict[str, float]]:
+        """
+        Change to campaign_stats from writing `rows` over the user's current
+        campaign_performance docs. Reads only those docs (one get_all), so
+        call it before the rows are committed.
+
+        Args:
+            user_id: Owner of the campaign_performance collection
+            rows: {doc_id: row about to be written}
+            merge: Whether the write merges into existing docs (fields the
+                   row omits keep their old values) or replaces them
+
+        Returns:
+            {total_spend, total_clicks, data_points} deltas, or None if the
+            previous values could not be read
+        """
+        if not self.db or not rows:
+            return None
+        try:
+            collection = self.db.collection("users").document(user_id).collection("campaign_performance")
+            previous = {
+                doc.id: doc.to_dict() or {}
+                for doc in self.db.get_all([collection.document(doc_id) for doc_id in rows])
+                if doc.exists
+            }
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read previous campaign rows for {user_id}: {e}")
+            return None
+
+        delta = {"total_spend": 0.0, "total_clicks": 0, "data_points": 0}
+        for doc_id, row in rows.items():
+            old = previous.get(doc_id)
+            if old is None:
+                delta["data_points"] += 1
+                old = {}
+            new_spend = row.get("spend", old.get("spend") if merge else 0)
+            new_clicks = row.get("clicks", old.get("clicks") if merge else 0)
+            delta["total_spend"] += float(new_spend or 0) - float(old.get("spend", 0) or 0)
+            delta["total_clicks"] += int(new_clicks or 0) - int(old.get("clicks", 0) or 0)
+        return delta
+
+    def record_campaign_stats(self, user_id: str, delta: Dict[str, float]) -> bool:
+        """Apply deltas from campaign_stats_delta once their rows are committed."""
+        from firebase_admin import firestore
+        return self._merge(user_id, {"campaign_stats": {
+            key: firestore.Increment(value) for key, value in delta.items()
+        }})
+
+    def refresh_campaign_stats(self, user_id: str) -> bool:
+        """Recompute campaign totals from the whole collection (backfill / repair only)."""
+        if not self.db:
+            return False
+        try:
+            total_spend, total_clicks, count = 0.0, 0, 0
+            for doc in self.db.collection("users").document(user_id).collection("campaign_performance").stream():
+                data = doc.to_dict() or {}
+                total_spend += float(data.get("spend", 0) or 0)
+                total_clicks += int(data.get("clicks", 0) or 0)
+                count += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read campaign performance for {user_id}: {e}")
+            return False
+        return self._merge(user_id, {"campaign_stats": {
+            "total_spend": total_spend,
+            "total_clicks": total_clicks,
+            "data_points": count,
+        }})
+
+    def rebuild(self, user_id: str) -> bool:
+        """Recompute a whole summary from source collections (backfill / repair)."""
+        if not self.db:
+            return False
+        try:
+            completed, in_progress, score_sum = 0, 0, 0.0
+            for doc in self.db.collection("users").document(user_id).collection("tutorials").stream():
+                data = doc.to_dict() or {}
+                if data.get("is_completed"):
+                    completed += 1
+                    score_sum += data.get("completion_score", 0) or 0
+                else:
+                    in_progress += 1
+            self._ref(user_id).set({
+                "user_id": user_id,
+                "tutorials_completed": completed,
+                "tutorials_in_progress": in_progress,
+                "completion_score_sum": score_sum,
+            }, merge=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not rebuild user summary for {user_id}: {e}")
+            return False
+        return self.refresh_integrations(user_id) and self.refresh_campaign_stats(user_id)
+
+    # --- READS ---
+
+    def list_users_page(self, limit: int, cursor: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+        """
+        One page of `users` ordered by document id.
+
+        Returns:
+            (user snapshots, cursor for the next page or None)
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = self.db.collection("users").order_by("__name__").limit(limit)
+        if cursor:
+            query = query.start_after({"__name__": cursor})
+        users = list(query.stream())
+        next_cursor = users[-1].id if len(users) == limit else None
+        return users, next_cursor
+
+    def get_summaries(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summaries for the given users in one batched read (missing users omitted)."""
+        if not user_ids or not self.db:
+            return {}
+        refs = [self._ref(uid) for uid in dict.fromkeys(user_ids)]
+        return {doc.id: doc.to_dict() or {} for doc in self.db.get_all(refs) if doc.exists}
+
+
+# --- SINGLETON INSTANCE ---
+
+_user_summary_service: Optional[UserSummaryService] = None
+
+
+def get_user_summary_service() -> UserSummaryService:
+    """Get or create singleton UserSummaryService instance."""
+    global _user_summary_service
+    if _user_summary_service is None:
+        _user_summary_service = UserSummaryService()
+    return _user_summary_service
@@ -1,16 +1,108 @@
 """
 YouTube Client Service
 Uses YouTube Data API v3 (free tier: 10,000 quota units/day) for video and comment monitoring.
+
+Repeated monitoring scans are kept cheap on quota:
+- video metadata is cached per video ID, comment pages per (video ID, page token)
+- comments are synced incrementally against a per-video watermark
+- a local quota ledger skips low-value videos before the daily budget runs out
 """
 import os
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
 # YouTube Data API key (free with Google Cloud project)
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
+YOUTUBE_BASE_URL = "https://www.googleapis.com/youtube/v3"
+
+# Quota ledger: units/day, and units held back for high-value videos
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "500"))
+QUOTA_COST = {"search": 100, "videos": 1, "commentThreads": 1}
+
+YOUTUBE_COMMENT_CONCURRENCY = int(os.getenv("YOUTUBE_COMMENT_CONCURRENCY", "3"))
+YOUTUBE_METADATA_TTL_SEC = float(os.getenv("YOUTUBE_METADATA_TTL_SEC", str(6 * 3600)))
+YOUTUBE_STATS_TTL_SEC = float(os.getenv("YOUTUBE_STATS_TTL_SEC", "900"))
+YOUTUBE_COMMENT_PAGE_TTL_SEC = float(os.getenv("YOUTUBE_COMMENT_PAGE_TTL_SEC", "900"))
+YOUTUBE_CACHE_SIZE = 2048
+MAX_COMMENT_VIDEOS = 5       # Videos per scan whose comments are synced
+HIGH_VALUE_VIDEOS = 2        # Top-ranked videos may dip into the quota reserve
+
+# Quota resets at midnight Pacific. A fixed PST offset resets an hour late
+# during daylight time, which errs on the side of under-spending.
+_QUOTA_TZ = timezone(timedelta(hours=-8))
+
+
+class QuotaLedger:
+    """
+    Process-local count of YouTube Data API units spent today.
+    Low-priority spends must leave `reserve` units untouched so the
+    highest-value work still runs as the budget runs low.
+    """
+
+    def __init__(self, daily_budget: int = YOUTUBE_DAILY_QUOTA, reserve: int = YOUTUBE_QUOTA_RESERVE):
+        self.daily_budget = daily_budget
+        self.reserve = reserve
+        self._day = None
+        self._spent = 0
+        self._lock = threading.Lock()
+
+    def _today(self):
+        return datetime.now(_QUOTA_TZ).date()
+
+    def _roll(self):
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._spent = 0
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll()
+            return self.daily_budget - self._spent
+
+    def try_spend(self, units: int, low_priority: bool = False) -> bool:
+        """Reserve `units` if the budget allows; False means skip the request."""
+        with self._lock:
+            self._roll()
+            floor = self.reserve if low_priority else 0
+            if self.daily_budget - self._spent - units < floor:
+                return False
+            self._spent += units
+            return True
+
+
+class _TTLCache:
+    """Small LRU with per-entry expiry."""
+
+    def __init__(self, ttl: float, size: int = YOUTUBE_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
 
 
 class YouTubeClient:
@@ -20,24 +112,65 @@ class YouTubeClient:
     
     Quota costs:
     - Search: 100 units per request
-    - Video details: 1 unit per video
+    - Video details: 1 unit per request (up to 50 videos)
     - Comments: 1 unit per request
     
-    With 10k daily quota, you can do ~100 searches/day.
+    With 10k daily quota, you can do ~100 searches/day. Every request is
+    charged to the local QuotaLedger first, so the client backs off (cached
+    search results, fewer videos synced) instead of hitting quotaExceeded.
     """
     
-    def __init__(self):
-        self.api_key = YOUTUBE_API_KEY
-        self.base_url = "https://www.googleapis.com/youtube/v3"
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 ledger: Optional[QuotaLedger] = None):
+        self.api_key = api_key or YOUTUBE_API_KEY
+        self.base_url = base_url or YOUTUBE_BASE_URL
+        self.quota = ledger or QuotaLedger()
+        
+        self._videos = _TTLCache(YOUTUBE_METADATA_TTL_SEC)          # video_id -> video dict
+        self._video_stats = _TTLCache(YOUTUBE_STATS_TTL_SEC)       # video_id -> statistics
+        self._comment_pages = _TTLCache(YOUTUBE_COMMENT_PAGE_TTL_SEC)  # (video_id, page_token, size, count) -> page
+        self._brand_videos: Dict[str, List[str]] = {}              # brand -> video ids of last search
+        # Per (brand, video): one client serves every brand and the brand filter runs after the fetch
+        self._comment_watermarks: Dict[Tuple[str, str], str] = {}  # (brand, video_id) -> newest comment publishedAt
+        self._comment_counts: Dict[Tuple[str, str], int] = {}      # (brand, video_id) -> commentCount at last sync
         
         if not self.api_key:
             logger.warning("⚠️ YOUTUBE_API_KEY not set - YouTube monitoring disabled")
     
+    @staticmethod
+    def _new_session():
+        import aiohttp
+        return aiohttp.ClientSession()
+    
+    async def _get(
+        self,
+        session,
+        endpoint: str,
+        params: Dict[str, Any],
+        low_priority: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """GET an API endpoint after charging the ledger. None if skipped or failed."""
+        if not self.quota.try_spend(QUOTA_COST[endpoint], low_priority=low_priority):
+            logger.warning(f"⚠️ YouTube quota low ({self.quota.remaining} left) - skipping {endpoint}")
+            return None
+        
+        async with session.get(f"{self.base_url}/{endpoint}", params={**params, "key": self.api_key}) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"YouTube API error ({endpoint}): {error_text}")
+                return None
+            return await response.json()
+    
+    # =========================================================================
+    # VIDEOS
+    # =========================================================================
+    
     async def search_videos(
         self,
         brand_name: str,
         max_results: int = 10,
-        published_after_days: int = 7
+        published_after_days: int = 7,
+        session=None
     ) -> List[Dict[str, Any]]:
         """
         Search for YouTube videos mentioning a brand.
@@ -46,6 +179,7 @@ class YouTubeClient:
             brand_name: Brand/keyword to search for
             max_results: Maximum videos to return (max 50)
             published_after_days: Only videos from last N days
+            session: Optional aiohttp session to reuse
             
         Returns:
             List of video objects with metadata
@@ -54,8 +188,11 @@ class YouTubeClient:
             logger.warning("YouTube API key not configured")
             return []
         
-        import aiohttp
+        if session is None:
+            async with self._new_session() as own_session:
+                return await self.search_videos(brand_name, max_results, published_after_days, own_session)
         
+        brand_key = brand_name.lower()
         try:
             # Calculate date filter
             published_after = (datetime.utcnow() - timedelta(days=published_after_days)).isoformat() + "Z"
@@ -67,26 +204,24 @@ class YouTubeClient:
                 "maxResults": min(max_results, 50),
                 "publishedAfter": published_after,
                 "order": "date",
-                "key": self.api_key
             }
             
             logger.info(f"🎬 Searching YouTube for: {brand_name}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/search", params=params) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"YouTube API error: {error_text}")
-                        return []
-                    
-                    data = await response.json()
+            data = await self._get(session, "search", params)
+            if data is None:
+                # Search is the expensive call; fall back to the last result set we still hold
+                cached = [v for v in (self._videos.get(vid) for vid in self._brand_videos.get(brand_key, [])) if v]
+                if cached:
+                    logger.info(f"♻️ Serving {len(cached)} cached YouTube videos for {brand_name}")
+                return cached[:max_results]
             
             results = []
             for item in data.get("items", []):
                 snippet = item.get("snippet", {})
                 video_id = item.get("id", {}).get("videoId")
                 
-                results.append({
+                video = {
                     "id": video_id,
                     "title": snippet.get("title", ""),
                     "description": snippet.get("description", ""),
@@ -102,8 +237,11 @@ class YouTubeClient:
                     "published_at": snippet.get("publishedAt", datetime.utcnow().isoformat()),
                     "is_video": True,
                     "platform": "youtube"
-                })
+                }
+                self._videos.put(video_id, video)
+                results.append(video)
             
+            self._brand_videos[brand_key] = [v["id"] for v in results]
             logger.info(f"✅ Found {len(results)} YouTube videos for {brand_name}")
             return results
             
@@ -111,63 +249,219 @@ class YouTubeClient:
             logger.error(f"❌ YouTube search failed: {e}")
             return []
     
+    async def get_video_statistics(
+        self,
+        video_ids: List[str],
+        session=None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Get view/like/comment counts for videos, 50 ids per videos.list call.
+        Counts are cached briefly; they decide which videos need a comment sync.
+        """
+        if not self.api_key or not video_ids:
+            return {}
+        
+        if session is None:
+            async with self._new_session() as own_session:
+                return await self.get_video_statistics(video_ids, own_session)
+        
+        stats: Dict[str, Dict[str, int]] = {}
+        missing = []
+        for video_id in dict.fromkeys(video_ids):
+            cached = self._video_stats.get(video_id)
+            if cached is not None:
+                stats[video_id] = cached
+            else:
+                missing.append(video_id)
+        
+        for i in range(0, len(missing), 50):
+            chunk = missing[i:i + 50]
+            try:
+                data = await self._get(session, "videos", {"part": "statistics", "id": ",".join(chunk)})
+            except Exception as e:
+                logger.error(f"❌ Failed to get video statistics: {e}")
+                data = None
+            if data is None:
+                continue
+            for item in data.get("items", []):
+                counts = {k: int(v) for k, v in item.get("statistics", {}).items() if str(v).isdigit()}
+                self._video_stats.put(item.get("id"), counts)
+                stats[item.get("id")] = counts
+        
+        return stats
+    
+    # =========================================================================
+    # COMMENTS
+    # =========================================================================
+    
+    async def _comment_page(
+        self,
+        session,
+        video_id: str,
+        page_token: Optional[str],
+        page_size: int,
+        low_priority: bool = False,
+        comment_count: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        key = (video_id, page_token, page_size, comment_count)
+        page = self._comment_pages.get(key)
+        if page is not None:
+            return page
+        
+        params = {
+            "part": "snippet",
+            "videoId": video_id,
+            "maxResults": page_size,
+            "order": "time",
+        }
+        if page_token:
+            params["pageToken"] = page_token
+        
+        # Non-200 here usually means comments are disabled
+        page = await self._get(session, "commentThreads", params, low_priority=low_priority)
+        if page is not None:
+            self._comment_pages.put(key, page)
+        return page
+    
     async def get_video_comments(
         self,
         video_id: str,
-        max_results: int = 20
-    ) -> List[Dict[str, Any]]:
+        max_results: int = 20,
+        since: Optional[str] = None,
+        session=None,
+        low_priority: bool = False,
+        comment_count: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
         """
-        Get comments from a specific video.
+        Get comments from a specific video, newest first.
         
         Args:
             video_id: YouTube video ID
             max_results: Maximum comments to return
+            since: Only return comments published after this timestamp
+            session: Optional aiohttp session to reuse
+            low_priority: Skip rather than eat into the quota reserve
+            comment_count: Known commentCount; a new count bypasses cached pages
             
         Returns:
-            List of comment objects
+            List of comment objects, or None if the first page was
+            skipped for quota or failed
         """
         if not self.api_key:
             return []
         
-        import aiohttp
+        if session is None:
+            async with self._new_session() as own_session:
+                return await self.get_video_comments(
+                    video_id, max_results, since, own_session, low_priority, comment_count
+                )
         
+        results: List[Dict[str, Any]] = []
+        page_token = None
+        page_size = min(max_results, 100)
         try:
-            params = {
-                "part": "snippet",
-                "videoId": video_id,
-                "maxResults": min(max_results, 100),
-                "order": "time",
-                "key": self.api_key
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/commentThreads", params=params) as response:
-                    if response.status != 200:
-                        # Comments might be disabled
-                        return []
+            while len(results) < max_results:
+                data = await self._comment_page(
+                    session, video_id, page_token, page_size, low_priority, comment_count
+                )
+                if data is None:
+                    return results if page_token else None
+                
+                for item in data.get("items", []):
+                    comment = item.get("snippet", {}).get("topLevelComment", {}).get("snippet", {})
+                    published_at = comment.get("publishedAt")
+                    # order=time: everything from here on was seen in an earlier scan
+                    if since and published_at and published_at <= since:
+                        return results
                     
-                    data = await response.json()
-            
-            results = []
-            for item in data.get("items", []):
-                comment = item.get("snippet", {}).get("topLevelComment", {}).get("snippet", {})
+                    results.append({
+                        "id": item.get("id"),
+                        "video_id": video_id,
+                        "text": comment.get("textDisplay", ""),
+                        "author": comment.get("authorDisplayName", ""),
+                        "author_channel": comment.get("authorChannelUrl"),
+                        "likes": comment.get("likeCount", 0),
+                        "published_at": published_at,
+                        "source": "youtube_comment"
+                    })
+                    if len(results) >= max_results:
+                        break
                 
-                results.append({
-                    "id": item.get("id"),
-                    "video_id": video_id,
-                    "text": comment.get("textDisplay", ""),
-                    "author": comment.get("authorDisplayName", ""),
-                    "author_channel": comment.get("authorChannelUrl"),
-                    "likes": comment.get("likeCount", 0),
-                    "published_at": comment.get("publishedAt"),
-                    "source": "youtube_comment"
-                })
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    break
             
             return results
             
         except Exception as e:
             logger.error(f"❌ Failed to get comments for {video_id}: {e}")
-            return []
+            return results if page_token else None
+    
+    async def _sync_comments(
+        self,
+        session,
+        brand_name: str,
+        videos: List[Dict[str, Any]],
+        max_comments: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch comments newer than each video's watermark, highest-value videos
+        first, with at most YOUTUBE_COMMENT_CONCURRENCY requests in flight.
+        """
+        stats = await self.get_video_statistics([v["id"] for v in videos], session)
+        
+        def value(video):
+            counts = stats.get(video["id"], {})
+            return (counts.get("viewCount", 0), counts.get("commentCount", 0))
+        
+        brand_key = brand_name.lower()
+        todo = []
+        for rank, video in enumerate(sorted(videos, key=value, reverse=True)):
+            video_id = video["id"]
+            comment_count = stats.get(video_id, {}).get("commentCount")
+            if comment_count == 0:
+                continue
+            key = (brand_key, video_id)
+            if (comment_count is not None and key in self._comment_watermarks
+                    and self._comment_counts.get(key) == comment_count):
+                continue  # Nothing new since the last sync
+            todo.append((rank, video, comment_count))
+        
+        semaphore = asyncio.Semaphore(YOUTUBE_COMMENT_CONCURRENCY)
+        
+        async def sync(rank, video, comment_count):
+            video_id = video["id"]
+            key = (brand_key, video_id)
+            async with semaphore:
+                comments = await self.get_video_comments(
+                    video_id, max_results=max_comments,
+                    since=self._comment_watermarks.get(key),
+                    session=session, low_priority=rank >= HIGH_VALUE_VIDEOS,
+                    comment_count=comment_count
+                )
+            if comments is None:
+                return []
+            
+            newest = max((c["published_at"] for c in comments if c.get("published_at")), default=None)
+            if newest:
+                self._comment_watermarks[key] = newest
+            else:
+                self._comment_watermarks.setdefault(key, "")
+            if comment_count is not None:
+                self._comment_counts[key] = comment_count
+            
+            # Filter comments that mention the brand
+            mentions = []
+            for comment in comments:
+                if brand_name.lower() in comment.get("text", "").lower():
+                    comment["source"] = "youtube_comment"
+                    comment["source_name"] = "YouTube Comment"
+                    comment["url"] = f"https://www.youtube.com/watch?v={video_id}"
+                    mentions.append(comment)
+            return mentions
+        
+        batches = await asyncio.gather(*(sync(*job) for job in todo))
+        return [comment for batch in batches for comment in batch]
     
     async def search_mentions(
         self,
@@ -177,6 +471,8 @@ class YouTubeClient:
     ) -> List[Dict[str, Any]]:
         """
         Search for brand mentions in videos and optionally comments.
+        Comments are synced incrementally: repeat scans only return
+        comments posted since the previous scan.
         
         Args:
             brand_name: Brand to search for
@@ -186,23 +482,18 @@ class YouTubeClient:
         Returns:
             Combined list of video and comment mentions
         """
-        results = []
+        if not self.api_key:
+            return []
         
-        # Search videos
-        videos = await self.search_videos(brand_name, max_results=max_results)
-        results.extend(videos)
-        
-        # Optionally get comments (expensive on quota)
-        if include_comments and videos:
-            for video in videos[:5]:  # Limit to first 5 videos
-                comments = await self.get_video_comments(video["id"], max_results=10)
-                # Filter comments that mention the brand
-                for comment in comments:
-                    if brand_name.lower() in comment.get("text", "").lower():
-                        comment["source"] = "youtube_comment"
-                        comment["source_name"] = "YouTube Comment"
-                        comment["url"] = f"https://www.youtube.com/watch?v={video['id']}"
-                        results.append(comment)
+        results = []
+        async with self._new_session() as session:
+            # Search videos
+            videos = await self.search_videos(brand_name, max_results=max_results, session=session)
+            results.extend(videos)
+            
+            # Optionally get comments (expensive on quota)
+            if include_comments and videos:
+                results.extend(await self._sync_comments(session, brand_name, videos[:MAX_COMMENT_VIDEOS]))
         
         return results
 
@@ -6,6 +6,7 @@ Provides schemas for:
 - EvidenceSource: Atomic unit of proof with collection metadata
 - EvidenceItem: A claim/violation with linked sources
 - EvidenceReport: Complete report with hash chain integrity
+- MerkleTree: Incremental report-level hash with O(log n) inclusion proofs
 - EvidenceExportBundle: Manifest for exported evidence packages
 """
 from pydantic import BaseModel, Field
@@ -138,59 +139,319 @@ def compute_report_hash(item_hashes: List[str]) -> str:
     return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
 
+# =============================================================================
+# MERKLE TREE (report-level hash structure)
+# =============================================================================
+
+LEGACY_HASH_ALGORITHM = "SHA-256"          # Flat SHA-256 over sorted item hashes
+MERKLE_HASH_ALGORITHM = "SHA-256-MERKLE"   # RFC 6962-style Merkle tree over item hashes
+
+# Domain separation prefixes so a leaf can never be passed off as an inner node
+_MERKLE_LEAF_PREFIX = b"\x00"
+_MERKLE_NODE_PREFIX = b"\x01"
+
+
+def merkle_leaf_hash(item_hash: str) -> str:
+    """
+    Hash an item hash into a Merkle leaf.
+
+    Leaf = SHA-256(0x00 | item_hash)
+    """
+    return hashlib.sha256(_MERKLE_LEAF_PREFIX + item_hash.encode('utf-8')).hexdigest()
+
+
+def merkle_node_hash(left: str, right: str) -> str:
+    """
+    Hash two child nodes into their parent.
+
+    Node = SHA-256(0x01 | left_bytes | right_bytes)
+    """
+    return hashlib.sha256(
+        _MERKLE_NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)
+    ).hexdigest()
+
+
+class MerkleTree:
+    """
+    Append-only Merkle tree over evidence item hashes.
+
+    Leaves keep insertion order (items are never re-sorted), so appending an
+    item only touches the O(log n) "frontier" of perfect subtree roots. The
+    frontier plus the leaf count is all that needs to be persisted to keep
+    appending later; inclusion proofs additionally need the item hashes,
+    which the report already carries.
+
+    Tree shape and proofs follow RFC 6962 (Certificate Transparency).
+    """
+
+    def __init__(self, item_hashes: Optional[List[str]] = None):
+        self._leaves: List[str] = []
+        self._frontier: List[str] = []  # Largest subtree first
+        self._size = 0
+        for item_hash in item_hashes or []:
+            self.append(item_hash)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def append(self, item_hash: str) -> int:
+        """Append an item hash and return its leaf index. O(log n)."""
+        index = self._size
+        node = merkle_leaf_hash(item_hash)
+        self._leaves.append(node)
+
+        # Carry like a binary counter: merge equal-height subtrees
+        carry = index
+        while carry & 1:
+            node = merkle_node_hash(self._frontier.pop(), node)
+            carry >>= 1
+        self._frontier.append(node)
+
+        self._size += 1
+        return index
+
+    def root(self) -> str:
+        """Current Merkle root (SHA-256 of empty string for an empty tree)."""
+        if not self._frontier:
+            return hashlib.sha256(b"").hexdigest()
+
+        root = self._frontier[-1]
+        for subtree in reversed(self._frontier[:-1]):
+            root = merkle_node_hash(subtree, root)
+        return root
+
+    def inclusion_proof(self, index: int) -> List[str]:
+        """
+        Audit path for the leaf at `index` (RFC 6962 PATH), ordered leaf to root.
+
+        Requires the tree to have been built from (or restored with) its leaves.
+        """
+        if not 0 <= index < self._size:
+            raise ValueError(f"Leaf index {index} out of range for tree of size {self._size}")
+        if len(self._leaves) != self._size:
+            raise ValueError("Inclusion proofs require the tree's item hashes")
+        return self._path(index, 0, self._size)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state for persisting alongside the report."""
+        return {"size": self._size, "frontier": list(self._frontier)}
+
+    @classmethod
+    def from_state(
+        cls,
+        state: Dict[str, Any],
+        item_hashes: Optional[List[str]] = None
+    ) -> "MerkleTree":
+        """
+        Restore a tree from persisted state.
+
+        Without item_hashes the tree can still append and report its root;
+        with them it can also produce inclusion proofs.
+        """
+        size = int(state.get('size', 0))
+        frontier = list(state.get('frontier', []))
+        if len(frontier) != bin(size).count('1'):
+            raise ValueError("Merkle state frontier does not match tree size")
+        if item_hashes is not None and len(item_hashes) != size:
+            raise ValueError("Merkle state size does not match item count")
+
+        tree = cls()
+        tree._size = size
+        tree._frontier = frontier
+        if item_hashes is not None:
+            tree._leaves = [merkle_leaf_hash(h) for h in item_hashes]
+        return tree
+
+    def _subtree_root(self, start: int, end: int) -> str:
+        if end - start == 1:
+            return self._leaves[start]
+        split = _largest_power_of_two_below(end - start)
+        return merkle_node_hash(
+            self._subtree_root(start, start + split),
+            self._subtree_root(start + split, end)
+        )
+
+    def _path(self, index: int, start: int, end: int) -> List[str]:
+        if end - start == 1:
+            return []
+        split = _largest_power_of_two_below(end - start)
+        if index < start + split:
+            return self._path(index, start, start + split) + [self._subtree_root(start + split, end)]
+        return self._path(index, start + split, end) + [self._subtree_root(start, start + split)]
+
+
+def _largest_power_of_two_below(n: int) -> int:
+    """Largest power of two strictly less than n (n >= 2)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+
+def compute_merkle_root(item_hashes: List[str]) -> str:
+    """
+    Compute the Merkle root over item hashes in report order.
+
+    Args:
+        item_hashes: List of item hashes (order is significant)
+
+    Returns:
+        64-character hex string (SHA-256)
+    """
+    return MerkleTree(item_hashes).root()
+
+
+def verify_inclusion_proof(
+    item_hash: str,
+    leaf_index: int,
+    tree_size: int,
+    proof: List[str],
+    root: str
+) -> bool:
+    """
+    Verify that an item hash is included in a Merkle root. O(log n).
+
+    Implements the RFC 9162 inclusion proof verification algorithm.
+    """
+    if not 0 <= leaf_index < tree_size:
+        return False
+
+    fn, sn = leaf_index, tree_size - 1
+    node = merkle_leaf_hash(item_hash)
+
+    for sibling in proof:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            node = merkle_node_hash(sibling, node)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            node = merkle_node_hash(node, sibling)
+        fn >>= 1
+        sn >>= 1
+
+    return sn == 0 and node == root
+
+
+def build_inclusion_proof(report: Dict[str, Any], item_id: str) -> Dict[str, Any]:
+    """
+    Build a standalone inclusion proof for one item of a Merkle report.
+
+    The proof can be checked offline against the report hash without
+    shipping any other item.
+
+    Raises:
+        ValueError: If the report is not Merkle-hashed or the item is missing
+    """
+    if report.get('hash_algorithm') != MERKLE_HASH_ALGORITHM:
+        raise ValueError("Inclusion proofs are only available for Merkle-hashed reports")
+
+    items = report.get('items', [])
+    item_hashes = [item.get('item_hash', '') for item in items]
+    leaf_index = next((i for i, item in enumerate(items) if item.get('id') == item_id), None)
+    if leaf_index is None:
+        raise ValueError(f"Item {item_id} not found in report")
+
+    tree = MerkleTree(item_hashes)
+    return {
+        "report_id": report.get('id', ''),
+        "item_id": item_id,
+        "item_hash": item_hashes[leaf_index],
+        "leaf_index": leaf_index,
+        "tree_size": tree.size,
+        "proof": tree.inclusion_proof(leaf_index),
+        "root": tree.root(),
+        "algorithm": MERKLE_HASH_ALGORITHM
+    }
+
+
+def verify_item_integrity(item: Dict[str, Any]) -> List[str]:
+    """
+    Verify the source -> item part of the chain for a single item.
+
+    Args:
+        item: Dictionary containing one EvidenceItem
+
+    Returns:
+        List of error strings (empty if the item is intact)
+    """
+    errors = []
+
+    # Verify each source hash
+    source_hashes = []
+    for source in item.get('sources', []):
+        collected_at = source.get('collected_at', '')
+        if isinstance(collected_at, datetime):
+            collected_at = collected_at.isoformat()
+
+        # Include deepfake analysis in hash computation if present
+        deepfake_summary = source.get('deepfake_analysis')
+
+        expected = compute_source_hash(
+            source.get('raw_snippet', ''),
+            source.get('url', ''),
+            collected_at,
+            deepfake_summary=deepfake_summary
+        )
+        actual = source.get('source_hash', '')
+        if expected != actual:
+            errors.append(f"Source {source.get('id', 'unknown')}: hash mismatch")
+        source_hashes.append(actual)
+
+    # Verify item hash
+    expected_item = compute_item_hash(
+        item.get('claim_text', ''),
+        source_hashes
+    )
+    actual_item = item.get('item_hash', '')
+    if expected_item != actual_item:
+        errors.append(f"Item {item.get('id', 'unknown')}: hash mismatch")
+
+    return errors
+
+
 def verify_chain_integrity(report: Dict[str, Any]) -> Dict[str, Any]:
     """
     Verify the hash chain from sources -> items -> report.
-    
+
     Traverses bottom-up, recomputes each hash, and compares against stored values.
-    Any mismatch indicates potential tampering.
-    
+    Any mismatch indicates potential tampering. Reports hashed with
+    MERKLE_HASH_ALGORITHM are checked against their Merkle root (and persisted
+    tree state); older reports use the legacy flat hash.
+
     Args:
         report: Dictionary containing the full EvidenceReport
-    
+
     Returns:
         {"valid": bool, "errors": [...], "verified_at": str}
     """
     errors = []
-    
+
     for item in report.get('items', []):
-        # Verify each source hash
-        source_hashes = []
-        for source in item.get('sources', []):
-            collected_at = source.get('collected_at', '')
-            if isinstance(collected_at, datetime):
-                collected_at = collected_at.isoformat()
-            
-            # Include deepfake analysis in hash computation if present
-            deepfake_summary = source.get('deepfake_analysis')
-            
-            expected = compute_source_hash(
-                source.get('raw_snippet', ''),
-                source.get('url', ''),
-                collected_at,
-                deepfake_summary=deepfake_summary
-            )
-            actual = source.get('source_hash', '')
-            if expected != actual:
-                errors.append(f"Source {source.get('id', 'unknown')}: hash mismatch")
-            source_hashes.append(actual)
-        
-        # Verify item hash
-        expected_item = compute_item_hash(
-            item.get('claim_text', ''),
-            source_hashes
-        )
-        actual_item = item.get('item_hash', '')
-        if expected_item != actual_item:
-            errors.append(f"Item {item.get('id', 'unknown')}: hash mismatch")
-    
+        errors.extend(verify_item_integrity(item))
+
     # Verify report hash
     item_hashes = [item.get('item_hash', '') for item in report.get('items', [])]
-    expected_report = compute_report_hash(item_hashes)
     actual_report = report.get('report_hash', '')
+
+    if report.get('hash_algorithm') == MERKLE_HASH_ALGORITHM:
+        expected_report = compute_merkle_root(item_hashes)
+
+        # Persisted state must describe the same tree, or later appends would diverge
+        state = report.get('merkle_state')
+        if state:
+            try:
+                restored = MerkleTree.from_state(state, item_hashes)
+                if restored.root() != expected_report:
+                    errors.append("Merkle state: root mismatch")
+            except ValueError as e:
+                errors.append(f"Merkle state: {e}")
+    else:
+        expected_report = compute_report_hash(item_hashes)
+
     if expected_report != actual_report:
         errors.append("Report: hash mismatch")
-    
+
     return {
         "valid": len(errors) == 0,
         "errors": errors,
@@ -319,8 +580,12 @@ class EvidenceReport(BaseModel):
     items: List[EvidenceItem] = Field(default_factory=list)
     
     # Integrity
-    report_hash: str = Field(..., description="SHA-256(sorted(item_hashes))")
-    hash_algorithm: str = Field(default="SHA-256")
+    report_hash: str = Field(..., description="Merkle root of item_hashes (legacy: SHA-256(sorted(item_hashes)))")
+    hash_algorithm: str = Field(default=MERKLE_HASH_ALGORITHM, description="SHA-256-MERKLE or legacy SHA-256")
+    merkle_state: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Persisted tree frontier {'size': int, 'frontier': [...]} for incremental appends"
+    )
     
     # Metadata
     legal_disclaimer: str = Field(default="")
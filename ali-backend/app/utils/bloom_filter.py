@@ -0,0 +1,87 @@
+"""
+Bloom Filter
+
+Compact probabilistic set for "have we seen this id before?" checks.
+Membership answers are either "definitely not seen" or "maybe seen"
+(false-positive rate bounded by `error_rate` up to `capacity` items),
+so callers must confirm positives against the system of record.
+
+The bit array serialises to bytes, which Firestore stores natively.
+"""
+import hashlib
+import math
+from typing import Any, Dict
+
+
+class BloomFilter:
+    """
+    Bloom filter using double hashing over a SHA-256 digest.
+
+    Usage:
+        seen = BloomFilter(capacity=10_000, error_rate=0.01)
+        seen.add("abc123")
+        "abc123" in seen  # True
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        """Add a key. Re-adding a key that is already present is a no-op."""
+        added = False
+        for pos in self._positions(key):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def is_full(self) -> bool:
+        """True once the filter holds `capacity` items (error rate no longer guaranteed)."""
+        return self.count >= self.capacity
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise for storage."""
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "num_bits": self.num_bits,
+            "num_hashes": self.num_hashes,
+            "count": self.count,
+            "bits": bytes(self._bits),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        """Restore a filter produced by to_dict()."""
+        bloom = cls(data["capacity"], data.get("error_rate", 0.01))
+        if bloom.num_bits != data["num_bits"] or bloom.num_hashes != data["num_hashes"]:
+            raise ValueError("Bloom filter parameters do not match stored state")
+        bits = bytes(data["bits"])
+        if len(bits) != len(bloom._bits):
+            raise ValueError("Bloom filter bit array has unexpected length")
+        bloom._bits = bytearray(bits)
+        bloom.count = data.get("count", 0)
+        return bloom
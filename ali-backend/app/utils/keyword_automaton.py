@@ -0,0 +1,92 @@
+"""
+Keyword Automaton
+
+Aho-Corasick multi-pattern matcher for keyword tables such as
+THEME_KEYWORDS. All keywords are compiled once into a single automaton,
+and a text is scanned in one pass that reports every (possibly
+overlapping) keyword occurrence, with the same semantics as a plain
+`keyword in text` substring check per keyword.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton mapping keywords to labels.
+
+    Usage:
+        automaton = KeywordAutomaton({"Pricing": ["price", "discount"]})
+        automaton.find_labels("big discount on price")  # {"Pricing"}
+    """
+
+    def __init__(self, keywords_by_label: Dict[str, Iterable[str]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                if keyword:
+                    self._add(self._normalize(keyword), label)
+
+        self._build_failure_links()
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    def _add(self, keyword: str, label: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((keyword, label))
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+
+                # Inherit matches that end at the failure state (suffix keywords)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, str, str]]:
+        """
+        Yield (end_index, keyword, label) for every keyword occurrence in text.
+        """
+        state = 0
+        for index, char in enumerate(self._normalize(text)):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword, label in self._output[state]:
+                yield index, keyword, label
+
+    def find_labels(self, text: str) -> Set[str]:
+        """Return the set of labels with at least one keyword in text."""
+        return {label for _, _, label in self.iter_matches(text)}
+
+    def find_keywords(self, text: str) -> Dict[str, List[str]]:
+        """Return {label: [distinct keywords found]} for text."""
+        hits: Dict[str, List[str]] = {}
+        for _, keyword, label in self.iter_matches(text):
+            found = hits.setdefault(label, [])
+            if keyword not in found:
+                found.append(keyword)
+        return hits
@@ -7,15 +7,15 @@ Features:
 - Deterministic JSON serialization (sorted keys, consistent formatting)
 - SHA-256 hash computation for each file
 - Manifest generation with file checksums
-- In-memory ZIP assembly (streaming can be added later for large packages)
+- Streaming ZIP assembly: members are serialized, hashed and compressed
+  chunk by chunk, so memory stays bounded regardless of package size
 """
 import json
 import hashlib
-import io
 import os
 import zipfile
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -53,6 +53,33 @@ def serialize_deterministic(data: Any) -> str:
     return json.dumps(normalized, indent=2, ensure_ascii=False, sort_keys=True)
 
 
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def iter_serialize_deterministic(data: Any) -> Iterator[bytes]:
+    """
+    Streaming counterpart of serialize_deterministic.
+    
+    Yields UTF-8 encoded chunks whose concatenation is byte-identical to
+    serialize_deterministic(data).encode('utf-8'), without ever holding the
+    whole document as one string.
+    
+    Args:
+        data: Any JSON-serializable object (datetimes allowed)
+        
+    Yields:
+        UTF-8 byte chunks
+    """
+    encoder = json.JSONEncoder(
+        indent=2, ensure_ascii=False, sort_keys=True, default=_json_default
+    )
+    for chunk in encoder.iterencode(data):
+        yield chunk.encode('utf-8')
+
+
 def compute_file_hash(content: bytes) -> str:
     """
     Compute SHA-256 hash of file content.
@@ -66,6 +93,87 @@ def compute_file_hash(content: bytes) -> str:
     return hashlib.sha256(content).hexdigest()
 
 
+def compute_stream_hash(chunks: Iterable[bytes]) -> Tuple[str, int]:
+    """
+    Compute SHA-256 and total size of streamed content.
+    
+    Args:
+        chunks: Iterable of byte chunks
+        
+    Returns:
+        (64-character hex string, size in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+# =============================================================================
+# STREAMING ZIP WRITER
+# =============================================================================
+
+class _ChunkSink:
+    """
+    Write-only, non-seekable file object that buffers ZIP output until drained.
+    
+    zipfile falls back to data descriptors for unseekable outputs, so entries
+    can be emitted without knowing their sizes up front.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+    
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self._offset += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._offset
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def stream_zip(members: Iterable[Tuple[str, Iterable[bytes]]]) -> Iterator[bytes]:
+    """
+    Stream a DEFLATE ZIP archive.
+    
+    Members are written in the order given, and each member's content is
+    consumed lazily, so only the current chunk (plus compressor state) is
+    held in memory.
+    
+    Args:
+        members: Iterable of (filename, iterable of byte chunks)
+        
+    Yields:
+        ZIP archive byte chunks
+    """
+    sink = _ChunkSink()
+    
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for filename, chunks in members:
+            info = zipfile.ZipInfo(filename, date_time=datetime.utcnow().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with zf.open(info, 'w', force_zip64=True) as member:
+                for chunk in chunks:
+                    member.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    
+    # Central directory is written on close
+    yield from sink.drain()
+
+
 # =============================================================================
 # SOURCE FLATTENING
 # =============================================================================
@@ -189,22 +297,38 @@ def build_manifest(files: Dict[str, bytes]) -> Dict[str, Any]:
     Args:
         files: Dictionary mapping filename to content bytes
         
+    Returns:
+        Manifest document with file list and checksums
+    """
+    return build_manifest_from_digests({
+        filename: (compute_file_hash(content), len(content))
+        for filename, content in files.items()
+    })
+
+
+def build_manifest_from_digests(digests: Dict[str, Tuple[str, int]]) -> Dict[str, Any]:
+    """
+    Build the manifest document from precomputed (sha256, size) pairs.
+    
+    Args:
+        digests: Dictionary mapping filename to (sha256 hex, size in bytes)
+        
     Returns:
         Manifest document with file list and checksums
     """
     file_entries = []
     
-    for filename, content in sorted(files.items()):
+    for filename, (sha256, size) in sorted(digests.items()):
         file_entries.append({
             "path": filename,
-            "sizeBytes": len(content),
-            "sha256": compute_file_hash(content)
+            "sizeBytes": size,
+            "sha256": sha256
         })
     
     return {
         "version": "1.0",
         "createdAt": datetime.utcnow().isoformat(),
-        "totalFiles": len(files),
+        "totalFiles": len(digests),
         "files": file_entries
     }
 
@@ -213,22 +337,27 @@ def build_manifest(files: Dict[str, bytes]) -> Dict[str, Any]:
 # ZIP PACKAGE BUILDER
 # =============================================================================
 
-def build_evidence_package_zip(
+def stream_evidence_package_zip(
     report: Dict[str, Any],
     user_id: str,
     request_id: Optional[str] = None,
     environment: Optional[str] = None,
     app_version: Optional[str] = None
-) -> bytes:
+) -> Iterator[bytes]:
     """
-    Build a complete Evidence Package as a ZIP file.
+    Stream a complete Evidence Package as ZIP chunks.
     
-    ZIP Contents:
-    - report.json: Full EvidenceReport object
-    - sources.json: Flattened list of all EvidenceSource objects
-    - provenance.json: Export metadata (who, when, environment)
+    ZIP Contents (written in sorted order):
     - integrity.json: Chain verification status and package hash
     - manifest.json: File list with SHA-256 checksums
+    - provenance.json: Export metadata (who, when, environment)
+    - report.json: Full EvidenceReport object
+    - sources.json: Flattened list of all EvidenceSource objects
+    
+    integrity.json is written first but depends on the hashes of the content
+    files, so report.json and sources.json are serialized twice: once to hash
+    them on the fly, once to write them. Neither pass materializes the full
+    document, keeping memory bounded for large reports.
     
     Args:
         report: Full EvidenceReport dictionary
@@ -237,39 +366,36 @@ def build_evidence_package_zip(
         environment: Environment (staging/prod), defaults to ENVIRONMENT env var
         app_version: Optional app version or git commit
         
-    Returns:
-        In-memory ZIP file as bytes
+    Yields:
+        ZIP archive byte chunks
     """
-    logger.info(f"📦 Building evidence package for report {report.get('id', 'unknown')}")
-    
-    # Step 1: Serialize deterministic content files
-    report_json = serialize_deterministic(report).encode('utf-8')
+    logger.info(f"📦 Streaming evidence package for report {report.get('id', 'unknown')}")
     
+    # Step 1: Content files as re-iterable chunk producers
     sources = flatten_sources(report)
-    sources_json = serialize_deterministic(sources).encode('utf-8')
-    
-    # Step 2: Build provenance document
     provenance_doc = build_provenance_document(
         user_id=user_id,
         request_id=request_id,
         environment=environment,
         app_version=app_version
     )
-    provenance_json = serialize_deterministic(provenance_doc).encode('utf-8')
-    
-    # Step 3: Build manifest from content files (excluding integrity which depends on manifest)
     content_files = {
-        "report.json": report_json,
-        "sources.json": sources_json,
-        "provenance.json": provenance_json,
+        "report.json": lambda: iter_serialize_deterministic(report),
+        "sources.json": lambda: iter_serialize_deterministic(sources),
+        "provenance.json": lambda: iter_serialize_deterministic(provenance_doc),
     }
-    manifest_doc = build_manifest(content_files)
-    manifest_json = serialize_deterministic(manifest_doc).encode('utf-8')
     
-    # Step 4: Compute package_hash = SHA256(manifest.json bytes)
+    # Step 2: Hash content files on the fly (excluding integrity which depends on manifest)
+    digests = {
+        filename: compute_stream_hash(produce())
+        for filename, produce in content_files.items()
+    }
+    manifest_json = serialize_deterministic(build_manifest_from_digests(digests)).encode('utf-8')
+    
+    # Step 3: Compute package_hash = SHA256(manifest.json bytes)
     package_hash = compute_file_hash(manifest_json)
     
-    # Step 5: Build integrity document WITH package_hash
+    # Step 4: Build integrity document WITH package_hash
     integrity_doc = build_integrity_document(
         report=report,
         request_id=request_id,
@@ -277,30 +403,47 @@ def build_evidence_package_zip(
     )
     integrity_json = serialize_deterministic(integrity_doc).encode('utf-8')
     
-    # Step 6: Assemble all files for ZIP
+    # Step 5: Stream all files in sorted order
     all_files = {
-        "integrity.json": integrity_json,
-        "manifest.json": manifest_json,
-        "provenance.json": provenance_json,
-        "report.json": report_json,
-        "sources.json": sources_json,
+        "integrity.json": lambda: iter([integrity_json]),
+        "manifest.json": lambda: iter([manifest_json]),
+        **content_files,
     }
     
-    # Step 7: Create ZIP in memory
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-        for filename, content in sorted(all_files.items()):
-            zf.writestr(filename, content)
-    
-    zip_bytes = zip_buffer.getvalue()
+    total_bytes = 0
+    for chunk in stream_zip((filename, all_files[filename]()) for filename in sorted(all_files)):
+        total_bytes += len(chunk)
+        yield chunk
     
     logger.info(
-        f"✅ Evidence package built: {len(zip_bytes)} bytes, "
+        f"✅ Evidence package streamed: {total_bytes} bytes, "
         f"{len(all_files)} files, package_hash={package_hash[:16]}..., request_id={request_id}"
     )
+
+
+def build_evidence_package_zip(
+    report: Dict[str, Any],
+    user_id: str,
+    request_id: Optional[str] = None,
+    environment: Optional[str] = None,
+    app_version: Optional[str] = None
+) -> bytes:
+    """
+    Build a complete Evidence Package as a ZIP file in memory.
+    
+    Convenience wrapper around stream_evidence_package_zip for callers that
+    need the whole archive (tests, small reports). Endpoints should stream.
     
-    return zip_bytes
+    Returns:
+        ZIP file as bytes
+    """
+    return b"".join(stream_evidence_package_zip(
+        report=report,
+        user_id=user_id,
+        request_id=request_id,
+        environment=environment,
+        app_version=app_version
+    ))
 
 
 def get_export_filename(report: Dict[str, Any]) -> str:
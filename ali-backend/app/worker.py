@@ -1,22 +1,82 @@
 
 import os
 import sys
+import time
+import uuid
 import logging
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from firebase_admin import firestore
-from app.core.config import settings
 from app.core.security import db
 
 # Initialize Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ali_platform.worker")
 
+# --- POOL MODE ---
+# Without JOB_ID the worker drains pool-dispatched jobs from Firestore, running
+# up to WORKER_CONCURRENCY at once, so one cold start serves many tutorials.
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "3"))
+WORKER_POLL_SEC = float(os.getenv("WORKER_POLL_SEC", "5"))
+WORKER_IDLE_POLLS = int(os.getenv("WORKER_IDLE_POLLS", "3"))  # Empty polls before exiting
+
+
+def run_pool() -> int:
+    """
+    Claim and run queued tutorial jobs until the queue stays empty.
+    Returns the number of jobs processed.
+    """
+    from app.services.job_runner import claim_pending_jobs, process_tutorial_job
+
+    owner = f"{os.getenv('CLOUD_RUN_EXECUTION', 'worker')}-{uuid.uuid4().hex[:8]}"
+    logger.info(f"🚀 Worker {owner} draining job queue (concurrency {WORKER_CONCURRENCY})")
+
+    processed = 0
+    idle_polls = 0
+    running = set()
+    with ThreadPoolExecutor(max_workers=WORKER_CONCURRENCY) as pool:
+        while True:
+            free = WORKER_CONCURRENCY - len(running)
+            claimed = claim_pending_jobs(owner, free) if free else []
+            for job in claimed:
+                logger.info(f"📥 Claimed job {job['id']}: {job.get('topic')}")
+                running.add(pool.submit(
+                    process_tutorial_job,
+                    job["id"], job.get("user_id"), job.get("topic"),
+                    job.get("notification_id"), lease_owner=owner
+                ))
+
+            if not running:
+                idle_polls += 1
+                if idle_polls >= WORKER_IDLE_POLLS:
+                    break
+                # Poll again shortly - more work may arrive while we are warm
+                time.sleep(WORKER_POLL_SEC)
+                continue
+
+            idle_polls = 0
+            done, running = wait(running, timeout=WORKER_POLL_SEC, return_when=FIRST_COMPLETED)
+            running = set(running)
+            processed += len(done)
+
+    logger.info(f"✅ Job queue drained - {processed} jobs processed by {owner}")
+    return processed
+
+
 def main():
     """
     Entry point for the Cloud Run Job.
-    Expects environment variables or arguments for the job context.
-    Cloud Run Jobs allow passing arguments via the execution command.
+    With JOB_ID/USER_ID/TOPIC set, runs that single job (direct dispatch).
+    Otherwise runs in pool mode and drains the job queue.
     """
+    if not os.environ.get("JOB_ID"):
+        try:
+            run_pool()
+            sys.exit(0)
+        except Exception as e:
+            logger.critical(f"❌ Cloud Run Worker Failed: {e}")
+            sys.exit(1)
+
     try:
         # 1. Parse Arguments (passed via CLOUD_RUN_TASK_INDEX or custom env vars/args)
         # We expect the job to be triggered with overrides that set specific environment variables
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Brand Monitoring Schedule Backfill
+Adds the scan cursor fields (`brand_monitoring_enabled`, `next_scan_at`) to
+existing user_integrations/{uid}_brand_monitoring documents so the hourly
+scanner's indexed due-query picks them up.
+
+Usage:
+    python scripts/backfill_brand_monitoring_schedule.py [--dry-run]
+
+Options:
+    --dry-run    Show what would be updated without making changes
+"""
+import os
+import sys
+import argparse
+import logging
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+SETTINGS_SUFFIX = "_brand_monitoring"
+
+
+def get_firestore_client():
+    """Initialize Firestore client."""
+    try:
+        from google.cloud import firestore
+        return firestore.Client()
+    except Exception as e:
+        logger.error(f"Failed to initialize Firestore: {e}")
+        logger.info("Make sure GOOGLE_APPLICATION_CREDENTIALS is set or running with ADC")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill brand monitoring scan cursor fields")
+    parser.add_argument("--dry-run", action="store_true", help="Show changes without applying them")
+    args = parser.parse_args()
+
+    db = get_firestore_client()
+    now = datetime.utcnow()
+    updated = 0
+    skipped = 0
+
+    for doc in db.collection("user_integrations").stream():
+        if not doc.id.endswith(SETTINGS_SUFFIX):
+            continue
+
+        data = doc.to_dict() or {}
+        if "brand_monitoring_enabled" in data and data.get("next_scan_at"):
+            skipped += 1
+            continue
+
+        fields = {
+            "brand_monitoring_enabled": data.get("auto_monitor", True) is not False,
+            "next_scan_at": data.get("next_scan_at") or now,
+        }
+        if not data.get("user_id"):
+            fields["user_id"] = doc.id[:-len(SETTINGS_SUFFIX)]
+
+        logger.info(f"{'[DRY RUN] ' if args.dry_run else ''}{doc.id}: {fields}")
+        if not args.dry_run:
+            doc.reference.update(fields)
+        updated += 1
+
+    logger.info(f"✅ Updated: {updated}")
+    logger.info(f"⏭️  Skipped: {skipped}")
+    if args.dry_run:
+        logger.info("🔍 This was a DRY RUN. Run without --dry-run to apply changes.")
+
+
+if __name__ == "__main__":
+    main()
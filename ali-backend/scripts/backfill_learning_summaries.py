@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Learning Summary Backfill
+Seeds learning_summaries/{uid} from each user's completed tutorials so the
+nightly gap analysis (which only visits users flagged `needs_analysis`)
+picks up users who have not logged a learning event since the switch to
+incremental summaries.
+
+Usage:
+    python scripts/backfill_learning_summaries.py [--dry-run]
+
+Options:
+    --dry-run    Show what would be written without making changes
+"""
+import os
+import sys
+import argparse
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLLECTION = "learning_summaries"
+
+
+def get_firestore_client():
+    """Initialize Firestore client."""
+    try:
+        from google.cloud import firestore
+        return firestore.Client()
+    except Exception as e:
+        logger.error(f"Failed to initialize Firestore: {e}")
+        logger.info("Make sure GOOGLE_APPLICATION_CREDENTIALS is set or running with ADC")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill incremental learning summaries")
+    parser.add_argument("--dry-run", action="store_true", help="Show changes without applying them")
+    args = parser.parse_args()
+
+    from app.services.learning_analytics_service import LearningAnalyticsService
+
+    db = get_firestore_client()
+    service = LearningAnalyticsService(db=db)
+    seeded = 0
+    skipped = 0
+
+    for user in db.collection("users").stream():
+        if db.collection(SUMMARY_COLLECTION).document(user.id).get().exists:
+            skipped += 1
+            continue
+
+        completed = [
+            t for t in user.reference.collection("tutorials").stream()
+            if (t.to_dict() or {}).get("is_completed")
+        ]
+        if not completed:
+            skipped += 1
+            continue
+
+        logger.info(f"{'[DRY RUN] ' if args.dry_run else ''}{user.id}: {len(completed)} completed tutorials")
+        if not args.dry_run:
+            for t in completed:
+                t_data = t.to_dict() or {}
+                service.record_quiz_results(user.id, t.id, t_data, t_data.get("quiz_results", []))
+        seeded += 1
+
+    logger.info(f"✅ Seeded: {seeded}")
+    logger.info(f"⏭️  Skipped: {skipped}")
+    if args.dry_run:
+        logger.info("🔍 This was a DRY RUN. Run without --dry-run to apply changes.")
+
+
+if __name__ == "__main__":
+    main()
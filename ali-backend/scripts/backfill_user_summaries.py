@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+User Summary Backfill
+Builds user_summaries/{uid} (tutorial counts, integration flags, campaign
+totals) from source collections. Admin listings read these docs instead of
+each user's subcollections; after this one-off run they are kept current on
+write. Safe to re-run to repair drift.
+
+Usage:
+    python scripts/backfill_user_summaries.py [--dry-run]
+
+Options:
+    --dry-run    List the users that would be rebuilt without writing
+"""
+import os
+import sys
+import argparse
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def get_firestore_client():
+    """Initialize Firestore client."""
+    try:
+        from google.cloud import firestore
+        return firestore.Client()
+    except Exception as e:
+        logger.error(f"Failed to initialize Firestore: {e}")
+        logger.info("Make sure GOOGLE_APPLICATION_CREDENTIALS is set or running with ADC")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill per-user admin summaries")
+    parser.add_argument("--dry-run", action="store_true", help="Show users without writing")
+    args = parser.parse_args()
+
+    from app.services.user_summary_service import UserSummaryService
+
+    db = get_firestore_client()
+    service = UserSummaryService(db=db)
+    rebuilt = 0
+    failed = 0
+
+    for user in db.collection("users").stream():
+        logger.info(f"{'[DRY RUN] ' if args.dry_run else ''}{user.id}")
+        if args.dry_run:
+            continue
+        if service.rebuild(user.id):
+            rebuilt += 1
+        else:
+            failed += 1
+
+    logger.info(f"✅ Rebuilt: {rebuilt}")
+    logger.info(f"❌ Failed: {failed}")
+    if args.dry_run:
+        logger.info("🔍 This was a DRY RUN. Run without --dry-run to apply changes.")
+
+
+if __name__ == "__main__":
+    main()
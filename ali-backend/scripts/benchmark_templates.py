@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Motion Template Benchmark
+Times each motion template: HTML generation (full build vs compiled
+renderer) and, with --browser, a full render to PNG through the render
+browser with its CDN assets served by RenderAssetCache.
+
+Usage:
+    python scripts/benchmark_templates.py [--iterations N] [--browser] [--renders N]
+
+Options:
+    --iterations N   HTML generations per template (default 2000)
+    --browser        Also render each template to PNG (needs Playwright browsers)
+    --renders N      Browser renders per template (default 3)
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import logging
+import statistics
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+SAMPLE_ARGS = {
+    "image_url": "https://example.com/hero.jpg",
+    "logo_url": "https://example.com/logo.png",
+    "color": "#D4AF37",
+    "text": "Launch week is here",
+}
+
+
+def time_generation(iterations: int):
+    from app.core.templates import MOTION_TEMPLATES, get_motion_template, _build_motion_template
+
+    print(f"{'template':<12}{'build µs':>12}{'compiled µs':>14}")
+    for name in MOTION_TEMPLATES:
+        timings = []
+        for fn in (_build_motion_template, get_motion_template):
+            fn(name, **SAMPLE_ARGS)  # Warm the compile cache
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn(name, **SAMPLE_ARGS)
+            timings.append((time.perf_counter() - started) / iterations * 1e6)
+        print(f"{name:<12}{timings[0]:>12.1f}{timings[1]:>14.1f}")
+
+
+async def time_renders(renders: int):
+    from app.core.templates import MOTION_TEMPLATES, get_motion_template
+    from app.services.asset_processor import AssetProcessor
+
+    processor = AssetProcessor.__new__(AssetProcessor)
+    print(f"\n{'template':<12}{'first ms':>10}{'median ms':>11}")
+    for name in MOTION_TEMPLATES:
+        html = get_motion_template(name, **SAMPLE_ARGS)
+        timings = []
+        for _ in range(renders):
+            started = time.perf_counter()
+            await processor.render_html_to_image(html, width=1080, height=1080)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{name:<12}{timings[0]:>10.0f}{statistics.median(timings):>11.0f}")
+
+    from app.middleware.observability import render_latency_histogram
+    snapshot = render_latency_histogram.snapshot()
+    print(f"\nrender latency histogram (ms buckets {snapshot['buckets_ms']} + overflow)")
+    for outcome, series in snapshot["series"].items():
+        print(f"{outcome:<10}{series['counts']}  mean {series['mean_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark motion template generation and rendering")
+    parser.add_argument("--iterations", type=int, default=2000, help="HTML generations per template")
+    parser.add_argument("--browser", action="store_true", help="Also render each template to PNG")
+    parser.add_argument("--renders", type=int, default=3, help="Browser renders per template")
+    args = parser.parse_args()
+
+    time_generation(args.iterations)
+    if args.browser:
+        asyncio.run(time_renders(args.renders))
+
+
+if __name__ == "__main__":
+    main()
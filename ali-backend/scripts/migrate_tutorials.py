@@ -135,6 +135,11 @@ def add_tutorial_to_default_module(db, tutorial_id: str, dry_run: bool = False):
             "tutorialIds": fs.ArrayUnion([tutorial_id]),
             "updatedAt": datetime.utcnow().isoformat(),
         })
+        # Invalidate compiled Saga Map graphs for the course
+        db.collection("courses").document(DEFAULT_COURSE_ID).update({
+            "graphVersion": fs.Increment(1),
+            "updatedAt": datetime.utcnow().isoformat(),
+        })
     except Exception as e:
         logger.warning(f"⚠️ Could not add {tutorial_id} to module: {e}")
 
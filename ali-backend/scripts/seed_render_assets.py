@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Render Asset Seeder
+Downloads the CDN assets the motion templates load (GSAP, Google Fonts CSS
+and the font files it references) into a directory the render browser's
+RenderAssetCache can load at startup, so renders never hit the network.
+
+Usage:
+    python scripts/seed_render_assets.py OUTPUT_DIR
+
+Then run the service with RENDER_ASSET_DIR=OUTPUT_DIR (e.g. bake the
+directory into the container image).
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import logging
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Google Fonts serves CSS per user agent; match the headless Chromium renderer
+CHROME_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) HeadlessChrome/130.0.0.0 Safari/537.36"
+)
+FONT_FILE_RE = re.compile(r"url\((https://fonts\.gstatic\.com/[^)]+)\)")
+
+
+def template_asset_urls():
+    """Every CDN URL referenced by any template variant."""
+    from app.core.templates import MOTION_TEMPLATES, _build_motion_template
+    from app.services.asset_processor import RENDER_ASSET_URL_RE
+
+    urls = set()
+    for name in MOTION_TEMPLATES:
+        for luminance_mode in ("dark", "light"):
+            html = _build_motion_template(name, "", "", "#888888", "Seed", luminance_mode)
+            for url in re.findall(r"""https://[^\s"'<>)]+""", html):
+                if RENDER_ASSET_URL_RE.match(url):
+                    urls.add(url.replace("&amp;", "&"))
+    return sorted(urls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download motion template CDN assets for offline rendering")
+    parser.add_argument("output_dir", help="Directory to write assets and manifest.json into")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    session = requests.Session()
+    session.headers["User-Agent"] = CHROME_USER_AGENT
+    manifest = {}
+
+    def fetch(url):
+        if url in manifest:
+            return None
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        filename = hashlib.sha256(url.encode("utf-8")).hexdigest()[:24]
+        with open(os.path.join(args.output_dir, filename), "wb") as f:
+            f.write(response.content)
+        manifest[url] = {
+            "file": filename,
+            "content_type": response.headers.get("content-type", "application/octet-stream"),
+        }
+        logger.info(f"✅ {url} ({len(response.content)} bytes)")
+        return response
+
+    for url in template_asset_urls():
+        response = fetch(url)
+        if response is not None and url.startswith("https://fonts.googleapis.com/"):
+            for font_url in FONT_FILE_RE.findall(response.text):
+                fetch(font_url)
+
+    with open(os.path.join(args.output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    logger.info(f"📦 Seeded {len(manifest)} assets into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
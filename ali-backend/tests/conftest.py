@@ -28,6 +28,28 @@ os.environ["FIREBASE_CREDENTIALS_PATH"] = "dummy/path/service-account.json"
 os.environ["VERTEX_LOCATION"] = "us-central1"
 
 import pytest
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+
+@contextmanager
+def _real_google_modules():
+    with patch.dict(sys.modules):
+        for name in [n for n, m in sys.modules.items()
+                     if (n == "google" or n.startswith("google.")) and isinstance(m, Mock)]:
+            del sys.modules[name]
+        yield
+
+
+@pytest.fixture
+def real_google_modules():
+    """
+    tests/chaos_test.py replaces google.* with Mocks at collection time;
+    `with real_google_modules():` hides those for the block so modules
+    importing google.cloud load normally.
+    """
+    return _real_google_modules
+
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_global_mocks():
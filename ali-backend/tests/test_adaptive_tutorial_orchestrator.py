@@ -0,0 +1,211 @@
+"""
+Tests for incremental learning summaries and the nightly ATE analysis.
+Uses a small in-memory Firestore stand-in with merge/Increment semantics.
+"""
+import sys
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from app.agents.gap_analyzer_agent import GapAnalyzerAgent
+from app.services.adaptive_tutorial_orchestrator import AdaptiveTutorialOrchestrator
+from app.services.learning_analytics_service import LearningAnalyticsService
+
+
+class Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+DELETE_FIELD = object()
+SERVER_TIMESTAMP = object()
+
+
+def _merge(target, update):
+    for key, value in update.items():
+        if value is DELETE_FIELD:
+            target.pop(key, None)
+        elif isinstance(value, Increment):
+            target[key] = target.get(key, 0) + value.value
+        elif isinstance(value, dict):
+            _merge(target.setdefault(key, {}), value)
+        else:
+            target[key] = value
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.data = {}  # {collection: {doc_id: dict}}
+        self.versions = {}
+        self.added = []
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def write_option(self, last_update_time):
+        return last_update_time
+
+
+class FakeCollection:
+    def __init__(self, db, name, filters=None):
+        self.db = db
+        self.name = name
+        self.filters = filters or []
+
+    def document(self, doc_id):
+        return FakeDocRef(self.db, self.name, doc_id)
+
+    def where(self, filter):
+        return FakeCollection(self.db, self.name, self.filters + [(filter.field_path, filter.value)])
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        return self
+
+    def add(self, data):
+        self.db.added.append((self.name, data))
+
+    def stream(self):
+        docs = self.db.data.get(self.name, {})
+        return iter([
+            FakeDocRef(self.db, self.name, doc_id).get()
+            for doc_id, data in list(docs.items())
+            if all(data.get(f) == v for f, v in self.filters)
+        ])
+
+
+class FakeDocRef:
+    def __init__(self, db, collection, doc_id):
+        self.db = db
+        self.collection = collection
+        self.id = doc_id
+
+    @property
+    def _key(self):
+        return (self.collection, self.id)
+
+    def get(self):
+        data = self.db.data.get(self.collection, {}).get(self.id)
+        return SimpleNamespace(
+            id=self.id,
+            exists=data is not None,
+            reference=self,
+            update_time=self.db.versions.get(self._key),
+            to_dict=lambda: dict(data) if data is not None else None,
+        )
+
+    def set(self, update, merge=False):
+        docs = self.db.data.setdefault(self.collection, {})
+        _merge(docs.setdefault(self.id, {}), update)
+        self.db.versions[self._key] = self.db.versions.get(self._key, 0) + 1
+
+    def update(self, update, option=None):
+        if option is not None and option != self.db.versions.get(self._key):
+            raise RuntimeError("FailedPrecondition")
+        self.set(update)
+
+
+@pytest.fixture
+def db(monkeypatch, real_google_modules):
+    monkeypatch.setattr(
+        sys.modules["firebase_admin"], "firestore",
+        SimpleNamespace(Increment=Increment, DELETE_FIELD=DELETE_FIELD, SERVER_TIMESTAMP=SERVER_TIMESTAMP),
+    )
+    with real_google_modules():
+        yield FakeFirestore()
+
+
+def _quiz(user_id, score, section, tutorial_id="t1"):
+    return {
+        "user_id": user_id,
+        "event_type": "quiz_attempt",
+        "tutorial_id": tutorial_id,
+        "tutorial_topic": "Paid Ads",
+        "tutorial_category": "paid_ads",
+        "section_index": section,
+        "section_title": f"Section {section}",
+        "quiz_score": score,
+    }
+
+
+def _orchestrator(db, analytics, gap_analyzer=None):
+    orchestrator = AdaptiveTutorialOrchestrator(db=db)
+    orchestrator._analytics_service = analytics
+    orchestrator._gap_analyzer = gap_analyzer or GapAnalyzerAgent(db=db)
+    orchestrator._eligibility_scorer = Mock()
+    orchestrator._eligibility_scorer.score_recommendation.return_value = {"total_score": 40}
+    orchestrator._generation_queue = Mock()
+    return orchestrator
+
+
+def test_summary_maintained_from_events(db):
+    service = LearningAnalyticsService(db=db, bq_service=Mock(client=None))
+
+    service.log_learning_event(_quiz("u1", 45, 0))
+    service.log_learning_events_batch([
+        _quiz("u1", 90, 1),
+        _quiz("u1", 70, 2),
+        {"user_id": "u2", "event_type": "section_start"},
+    ])
+    service.log_learning_event(_quiz("u1", 80, 0))  # retake resolves the struggle
+
+    summary = service.get_learning_summary("u1")
+    assert summary["events_count"] == 4
+    assert summary["quiz"] == {"attempts": 4, "score_sum": 285, "passed": 2}
+    assert summary["categories"]["paid_ads"] == {"score_sum": 285, "count": 4}
+    assert list(summary["struggles"]) == ["t1_2"]
+    assert summary["struggles"]["t1_2"]["score"] == 70
+    assert service.get_learning_summary("u2")["needs_analysis"] is True
+
+
+def test_nightly_analysis_only_visits_flagged_users(db):
+    service = LearningAnalyticsService(db=db, bq_service=Mock(client=None))
+    for i in range(250):
+        service.log_learning_event({"user_id": f"u{i}", "event_type": "section_start"})
+    service.log_learning_event(_quiz("u1", 30, 0))
+
+    orchestrator = _orchestrator(db, service)
+    first = orchestrator.run_nightly_analysis()
+
+    assert first["users_analyzed"] == 250  # no per-run cap
+    assert first["gaps_detected"] == 1
+    assert not any(d["needs_analysis"] for d in db.data["learning_summaries"].values())
+
+    assert orchestrator.run_nightly_analysis()["users_analyzed"] == 0
+
+    service.log_learning_event({"user_id": "u7", "event_type": "section_start"})
+    assert orchestrator.run_nightly_analysis()["users_analyzed"] == 1
+
+
+def test_events_during_analysis_keep_user_flagged(db):
+    service = LearningAnalyticsService(db=db, bq_service=Mock(client=None))
+    service.log_learning_event(_quiz("u1", 50, 0))
+
+    gap_analyzer = GapAnalyzerAgent(db=db)
+    real_analyze = gap_analyzer.analyze_user_gaps
+
+    def analyze_with_new_event(user_id, summary=None):
+        service.log_learning_event(_quiz(user_id, 55, 1))
+        return real_analyze(user_id, summary=summary)
+
+    gap_analyzer.analyze_user_gaps = analyze_with_new_event
+    orchestrator = _orchestrator(db, service, gap_analyzer)
+
+    assert orchestrator.run_nightly_analysis()["users_analyzed"] == 1
+    assert db.data["learning_summaries"]["u1"]["needs_analysis"] is True
+
+
+def test_failed_analysis_leaves_user_pending(db):
+    service = LearningAnalyticsService(db=db, bq_service=Mock(client=None))
+    service.log_learning_event(_quiz("u1", 50, 0))
+
+    gap_analyzer = Mock()
+    gap_analyzer.analyze_user_gaps.return_value = {"error": "boom", "user_id": "u1"}
+    result = _orchestrator(db, service, gap_analyzer).run_nightly_analysis()
+
+    assert result["users_analyzed"] == 0
+    assert result["errors"] == [{"user_id": "u1", "error": "boom"}]
+    assert db.data["learning_summaries"]["u1"]["needs_analysis"] is True
@@ -0,0 +1,155 @@
+"""
+Tests for ApifyClient against a local fake Apify API (aiohttp.web):
+long-polled run completion, one shared session per scan, and dataset
+items streamed through _normalize_results page by page.
+"""
+import asyncio
+import time
+from unittest.mock import patch
+
+from aiohttp import web
+
+from app.services import apify_client
+from app.services.apify_client import ApifyClient
+
+
+class FakeApify:
+    """
+    Minimal Apify API: runs finish `durations[actor]` seconds after start.
+    `max_hold` caps how long a waitForFinish request is held (None = honour it).
+    """
+
+    def __init__(self, durations, items=3, max_hold=None, stored_while_running=0):
+        self.durations = durations
+        self.items = items
+        self.max_hold = max_hold
+        self.stored_while_running = stored_while_running
+        self.runs = {}
+        self.requests = []
+
+    def _status(self, run):
+        done = time.monotonic() - run["started"] >= run["duration"]
+        return "SUCCEEDED" if done else "RUNNING"
+
+    def _data(self, run):
+        return {"data": {"id": run["id"], "status": self._status(run), "defaultDatasetId": f"ds-{run['id']}"}}
+
+    async def _hold(self, run, request):
+        wait = float(request.query.get("waitForFinish", 0))
+        if self.max_hold is not None:
+            wait = min(wait, self.max_hold)
+        deadline = time.monotonic() + wait
+        while self._status(run) != "SUCCEEDED" and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def start_run(self, request):
+        actor = request.match_info["actor"]
+        self.requests.append(("start", actor))
+        run = {"id": f"run-{len(self.runs)}", "actor": actor, "started": time.monotonic(),
+               "duration": self.durations.get(actor, 0)}
+        self.runs[run["id"]] = run
+        await self._hold(run, request)
+        return web.json_response(self._data(run), status=201)
+
+    async def get_run(self, request):
+        run = self.runs[request.match_info["run_id"]]
+        self.requests.append(("status", run["actor"], time.monotonic()))
+        await self._hold(run, request)
+        return web.json_response(self._data(run))
+
+    async def get_items(self, request):
+        run = self.runs[request.match_info["dataset_id"][len("ds-"):]]
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        self.requests.append(("items", run["actor"], offset, limit))
+        stored = self.items if self._status(run) == "SUCCEEDED" else self.stored_while_running
+        items = [{"id": f"{run['actor']}-{i}", "text": f"post {i}", "url": f"https://x/{i}"}
+                 for i in range(stored)]
+        return web.json_response(items[offset:offset + limit])
+
+    async def serve(self, scenario):
+        app = web.Application()
+        app.router.add_post("/v2/acts/{actor}/runs", self.start_run)
+        app.router.add_get("/v2/actor-runs/{run_id}", self.get_run)
+        app.router.add_get("/v2/datasets/{dataset_id}/items", self.get_items)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(ApifyClient(api_token="t", base_url=f"http://127.0.0.1:{port}/v2"))
+        finally:
+            await runner.cleanup()
+
+    def count(self, kind):
+        return sum(1 for r in self.requests if r[0] == kind)
+
+
+def test_long_poll_one_session_and_early_platforms_stream_first():
+    server = FakeApify({"apify~facebook-posts-scraper": 0.4, "apify~instagram-scraper": 0.02,
+                        "clockworks~tiktok-scraper": 0.05})
+    sessions = []
+    real_new_session = ApifyClient._new_session
+
+    def counting_session():
+        sessions.append(1)
+        return real_new_session()
+
+    async def scenario(client):
+        arrivals = []
+        started = time.monotonic()
+        async for platform, batch in client.stream_all_platforms("acme", ["facebook", "instagram", "tiktok"]):
+            arrivals.append((platform, len(batch), time.monotonic() - started))
+        return arrivals
+
+    with patch.object(ApifyClient, "_new_session", staticmethod(counting_session)):
+        arrivals = asyncio.run(server.serve(scenario))
+
+    assert sessions == [1]
+    assert {p for p, _, _ in arrivals} == {"facebook", "instagram", "tiktok"}
+    assert sum(n for _, n, _ in arrivals) == 9
+    # Fast platforms are yielded well before the slow actor finishes
+    assert arrivals[0][0] != "facebook" and arrivals[0][2] < 0.3
+    assert arrivals[-1][0] == "facebook"
+    # Runs finished inside the held start request: no status polling at all
+    assert server.count("status") == 0
+
+
+def test_dataset_streamed_in_pages_and_normalized():
+    server = FakeApify({}, items=120)
+
+    async def scenario(client):
+        return [batch async for batch in client.stream_platform("instagram", "acme", max_results=110)]
+
+    batches = asyncio.run(server.serve(scenario))
+
+    assert [len(b) for b in batches] == [50, 50, 10]
+    pages = [r[2:] for r in server.requests if r[0] == "items"]
+    assert pages == [(0, 50), (50, 50), (100, 10)]
+    first = batches[0][0]
+    assert first["source"] == "apify" and first["platform"] == "instagram" and first["content"] == "post 0"
+
+
+def test_backoff_when_server_returns_early(monkeypatch):
+    monkeypatch.setattr(apify_client, "APIFY_POLL_BACKOFF_SEC", (0.05, 0.4))
+    server = FakeApify({"apify~instagram-scraper": 0.6}, max_hold=0)
+
+    results = asyncio.run(server.serve(lambda c: c.search_platform("instagram", "acme")))
+
+    assert len(results) == 3
+    polls = [r[2] for r in server.requests if r[0] == "status"]
+    gaps = [b - a for a, b in zip(polls, polls[1:])]
+    # Roughly 0.05, 0.1, 0.2, 0.4 ... instead of a fixed one-second loop
+    assert 3 <= len(polls) <= 7
+    assert gaps[-1] > gaps[0] and max(gaps) >= 0.15
+
+
+def test_deadline_returns_partial_results(monkeypatch):
+    monkeypatch.setattr(apify_client, "APIFY_RUN_TIMEOUT_SEC", 1)
+    server = FakeApify({"apify~instagram-scraper": 60}, stored_while_running=2)
+
+    started = time.monotonic()
+    results = asyncio.run(server.serve(lambda c: c.search_platform("instagram", "acme")))
+
+    assert time.monotonic() - started < 2.5
+    assert [r["id"] for r in results] == ["apify~instagram-scraper-0", "apify~instagram-scraper-1"]
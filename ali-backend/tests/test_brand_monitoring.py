@@ -422,6 +422,366 @@ class TestEvidencePackageExport:
                 f"packageHash mismatch: {actual_hash} != {expected_hash}"
 
 
+    def test_streamed_json_matches_deterministic_serialization(self):
+        """Chunked serialization is byte-identical, so manifest hashes are unchanged."""
+        from app.utils.zip_builder import serialize_deterministic, iter_serialize_deterministic
+        from datetime import datetime
+
+        data = {"z": [1, 2.5, None], "a": {"when": datetime(2026, 1, 18, 3, 0), "name": "Café"}, "m": {}}
+
+        streamed = b"".join(iter_serialize_deterministic(data))
+
+        assert streamed == serialize_deterministic(data).encode('utf-8')
+
+    def test_stream_zip_preserves_member_order(self):
+        """Streamed archives are valid ZIPs with members in the given order."""
+        from app.utils.zip_builder import stream_zip
+        import zipfile
+        import io
+
+        members = [("b.txt", [b"hello ", b"world"]), ("a.bin", iter([b"\x00" * 70000]))]
+
+        archive = b"".join(stream_zip(members))
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            assert zf.namelist() == ["b.txt", "a.bin"]
+            assert zf.read("b.txt") == b"hello world"
+            assert len(zf.read("a.bin")) == 70000
+            assert zf.testzip() is None
+
+
+class TestMerkleEvidenceChain:
+    """Tests for the Merkle-tree evidence report hash."""
+
+    @staticmethod
+    def _item_hashes(count):
+        import hashlib
+        return [hashlib.sha256(f"item-{i}".encode()).hexdigest() for i in range(count)]
+
+    def test_incremental_append_matches_full_build(self):
+        """Appending to a restored tree gives the same root as building from scratch."""
+        from app.types.evidence_models import MerkleTree, compute_merkle_root
+
+        hashes = self._item_hashes(11)
+        tree = MerkleTree(hashes[:6])
+
+        restored = MerkleTree.from_state(tree.to_state())
+        for item_hash in hashes[6:]:
+            restored.append(item_hash)
+
+        assert restored.root() == compute_merkle_root(hashes)
+        assert len(restored.to_state()["frontier"]) == bin(11).count("1")
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 8, 9, 33])
+    def test_inclusion_proofs_verify(self, size):
+        """Every leaf has an O(log n) proof that verifies only for its own hash."""
+        from app.types.evidence_models import MerkleTree, verify_inclusion_proof
+
+        hashes = self._item_hashes(size)
+        tree = MerkleTree(hashes)
+        root = tree.root()
+
+        for index, item_hash in enumerate(hashes):
+            proof = tree.inclusion_proof(index)
+            assert len(proof) <= size.bit_length()
+            assert verify_inclusion_proof(item_hash, index, size, proof, root)
+            assert not verify_inclusion_proof("0" * 64, index, size, proof, root)
+
+    def test_legacy_flat_hash_report_still_verifies(self):
+        """Reports without the Merkle algorithm marker use the flat hash."""
+        from app.types.evidence_models import (
+            compute_source_hash, compute_item_hash, compute_report_hash, verify_chain_integrity
+        )
+
+        source_hash = compute_source_hash("snippet", "https://a.com", "2026-01-18T00:00:00")
+        item_hash = compute_item_hash("claim", [source_hash])
+        report = {
+            "hash_algorithm": "SHA-256",
+            "report_hash": compute_report_hash([item_hash]),
+            "items": [{
+                "id": "item-1",
+                "claim_text": "claim",
+                "item_hash": item_hash,
+                "sources": [{
+                    "id": "src-1",
+                    "raw_snippet": "snippet",
+                    "url": "https://a.com",
+                    "collected_at": "2026-01-18T00:00:00",
+                    "source_hash": source_hash
+                }]
+            }]
+        }
+
+        assert verify_chain_integrity(report)["valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_generate_and_append_evidence_report(self):
+        """Generated reports are Merkle-hashed and appends keep the chain valid."""
+        from app.agents.protection_agent import ProtectionAgent
+        from app.types.evidence_models import (
+            MERKLE_HASH_ALGORITHM, build_inclusion_proof, verify_chain_integrity, verify_inclusion_proof
+        )
+
+        mentions = [
+            {"title": f"Post {i}", "url": f"https://x.com/{i}", "content_snippet": f"text {i}"}
+            for i in range(4)
+        ]
+
+        with patch('app.agents.protection_agent.get_model') as mock_get_model:
+            mock_model = Mock()
+            mock_model.generate_content_async = AsyncMock(side_effect=Exception("offline"))
+            mock_get_model.return_value = mock_model
+            agent = ProtectionAgent()
+
+            report = await agent.generate_evidence_report(mentions[:3], "Acme")
+            assert report["hash_algorithm"] == MERKLE_HASH_ALGORITHM
+            assert report["chain_valid"] is True
+
+            original_hash = report["report_hash"]
+            report = await agent.append_evidence_items(report, mentions[3:])
+
+        assert report["report_hash"] != original_hash
+        assert report["merkle_state"]["size"] == 4
+        assert report["version"] == 2
+        assert verify_chain_integrity(report)["valid"] is True
+
+        proof = build_inclusion_proof(report, report["items"][1]["id"])
+        assert verify_inclusion_proof(
+            proof["item_hash"], proof["leaf_index"], proof["tree_size"], proof["proof"], report["report_hash"]
+        )
+
+
+class TestHourlyScanner:
+    """Tests for cursor-driven, concurrent hourly scanning."""
+
+    @staticmethod
+    def _settings_doc(user_id, config):
+        doc = Mock()
+        doc.id = f"{user_id}_brand_monitoring"
+        doc.to_dict.return_value = {"user_id": user_id, **config}
+        doc.reference = Mock()
+        doc.reference.id = doc.id
+        return doc
+
+    @pytest.mark.asyncio
+    async def test_run_hourly_scan_uses_due_query_and_persists_cursors(self, real_google_modules):
+        from app.services import brand_monitoring_scanner as scanner_module
+        from app.services.brand_monitoring_scanner import BrandMonitoringScanner, SCAN_INTERVAL
+
+        docs = [self._settings_doc(f"user{i}", {"brand_name": f"Brand{i}"}) for i in range(6)]
+        mock_db = Mock()
+        query = mock_db.collection.return_value.where.return_value.where.return_value
+        query.stream.return_value = iter(docs)
+
+        active = 0
+        peak = 0
+
+        async def fake_scan(user_id, config):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"status": "success", "brand_mentions": 2, "new_items_logged": 1}
+
+        scanner = BrandMonitoringScanner()
+        with real_google_modules(), \
+             patch("app.core.security.db", mock_db), \
+             patch.object(scanner, "scan_user", side_effect=fake_scan):
+            summary = await scanner.run_hourly_scan()
+
+        mock_db.collection.assert_called_with("user_integrations")
+        assert mock_db.collection.return_value.stream.call_count == 0
+        assert summary["users_scanned"] == 6
+        assert summary["total_mentions"] == 12
+        assert 1 < peak <= scanner_module.USER_SCAN_CONCURRENCY
+
+        for doc in docs:
+            update = doc.reference.update.call_args[0][0]
+            assert update["next_scan_at"] - update["last_scan_at"] == SCAN_INTERVAL
+            assert update["last_scan_status"] == "success"
+        assert scanner.last_run_at is not None
+
+    @pytest.mark.asyncio
+    async def test_scan_user_fans_out_fetches(self):
+        from app.services.brand_monitoring_scanner import BrandMonitoringScanner
+
+        active = 0
+        peak = 0
+
+        async def slow_search(brand_name, max_results):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return [{"url": f"https://example.com/{brand_name}", "title": brand_name}]
+
+        news_client = Mock()
+        news_client.search_brand_mentions = AsyncMock(side_effect=slow_search)
+        web_client = Mock()
+        web_client.search_web_mentions = AsyncMock(side_effect=slow_search)
+        monitoring_agent = Mock()
+        monitoring_agent.analyze_mentions = AsyncMock(side_effect=lambda name, mentions: mentions)
+        competitor_agent = Mock()
+        competitor_agent.analyze_competitor_mention = AsyncMock(return_value={})
+        pr_agent = Mock()
+        pr_agent.detect_opportunities = AsyncMock(return_value=[])
+        bq = Mock()
+        bq.insert_mention_logs_batch.side_effect = len
+        dedup = Mock()
+        dedup.filter_new.side_effect = lambda user_id, entity, rows: rows
+
+        config = {
+            "brand_name": "Acme",
+            "competitors": ["C1", {"name": "C2"}, "C3", "C4", "C5", "C6"],
+        }
+
+        scanner = BrandMonitoringScanner()
+        for limiter in scanner.provider_limiters.values():
+            limiter._min_interval = 0
+        with patch("app.services.news_client.NewsClient", return_value=news_client), \
+             patch("app.services.web_search_client.WebSearchClient", return_value=web_client), \
+             patch("app.agents.brand_monitoring_agent.BrandMonitoringAgent", return_value=monitoring_agent), \
+             patch("app.agents.competitor_agent.CompetitorAgent", return_value=competitor_agent), \
+             patch("app.agents.pr_agent.PRAgent", return_value=pr_agent), \
+             patch("app.services.bigquery_service.get_bigquery_service", return_value=bq), \
+             patch("app.services.mention_deduplicator.MentionDeduplicator", return_value=dedup):
+            result = await scanner.scan_user("user1", config)
+
+        assert "error" not in result
+        assert result["brand_mentions"] == 2
+        assert result["new_items_logged"] == 2
+        assert result["competitor_mentions"] == 5  # Capped at five competitors
+        assert news_client.search_brand_mentions.await_count == 6
+        assert peak > 1
+
+    @pytest.mark.asyncio
+    async def test_provider_rate_limiter_spaces_requests(self):
+        import time
+        from app.services.brand_monitoring_scanner import ProviderRateLimiter
+
+        limiter = ProviderRateLimiter(max_concurrent=5, min_interval=0.02)
+        starts = []
+
+        async def call():
+            async with limiter:
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*[call() for _ in range(4)])
+        starts.sort()
+        # Slots are reserved 20ms apart; a late wake-up can shorten one
+        # gap, so check the overall span rather than each gap
+        assert starts[-1] - starts[0] >= 3 * 0.02 * 0.9
+
+
+class _FakeDocStore:
+    """Minimal in-memory stand-in for a Firestore collection of documents."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        store = self
+        ref = Mock()
+        ref.id = doc_id
+
+        def get():
+            snapshot = Mock()
+            snapshot.exists = doc_id in store.docs
+            snapshot.to_dict.return_value = store.docs.get(doc_id)
+            return snapshot
+
+        ref.get.side_effect = get
+        ref.set.side_effect = lambda data: store.docs.__setitem__(doc_id, data)
+        return ref
+
+
+class TestMentionDeduplication:
+    """Tests for Bloom-filter backed mention deduplication."""
+
+    @staticmethod
+    def _rows(ids):
+        return [{"mention_id": mid, "title": mid} for mid in ids]
+
+    def test_bloom_filter_round_trip_and_error_rate(self):
+        from app.utils.bloom_filter import BloomFilter
+
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f"seen-{i}")
+
+        restored = BloomFilter.from_dict(bloom.to_dict())
+        assert all(f"seen-{i}" in restored for i in range(2000))
+        assert restored.count == 2000 and restored.is_full
+
+        false_positives = sum(f"other-{i}" in restored for i in range(10000))
+        assert false_positives < 300  # ~1% expected
+
+    def test_only_bloom_positives_are_checked_against_bigquery(self):
+        from app.services.mention_deduplicator import MentionDeduplicator
+
+        bq = Mock()
+        bq.query_existing_mention_ids.return_value = set()
+        dedup = MentionDeduplicator(bq=bq, db=_FakeDocStore())
+
+        # First run: no stored filter, so every id is verified
+        first = dedup.filter_new("u1", "Acme", self._rows(["a", "b", "b"]))
+        assert [row["mention_id"] for row in first] == ["a", "b"]
+        assert sorted(bq.query_existing_mention_ids.call_args[0][1]) == ["a", "b"]
+
+        # Second run: "c" is definitely new and never reaches BigQuery
+        bq.query_existing_mention_ids.reset_mock()
+        bq.query_existing_mention_ids.return_value = {"a"}
+        second = dedup.filter_new("u1", "Acme", self._rows(["a", "c"]))
+        assert [row["mention_id"] for row in second] == ["c"]
+        assert bq.query_existing_mention_ids.call_args[0][1] == ["a"]
+
+        # Filters are per brand
+        bq.query_existing_mention_ids.reset_mock()
+        bq.query_existing_mention_ids.return_value = set()
+        other = dedup.filter_new("u1", "Globex", self._rows(["a"]))
+        assert [row["mention_id"] for row in other] == ["a"]
+
+    def test_failed_existence_check_skips_positives(self):
+        from app.services.mention_deduplicator import MentionDeduplicator
+
+        bq = Mock()
+        bq.query_existing_mention_ids.return_value = set()
+        dedup = MentionDeduplicator(bq=bq, db=_FakeDocStore())
+        dedup.filter_new("u1", "Acme", self._rows(["a"]))
+
+        bq.query_existing_mention_ids.return_value = None
+        rows = dedup.filter_new("u1", "Acme", self._rows(["a", "z"]))
+        assert [row["mention_id"] for row in rows] == ["z"]
+
+    def test_full_generation_rolls_over_and_keeps_previous(self):
+        from app.services import mention_deduplicator as module
+        from app.services.mention_deduplicator import MentionDeduplicator
+
+        bq = Mock()
+        bq.query_existing_mention_ids.return_value = set()
+        store = _FakeDocStore()
+        dedup = MentionDeduplicator(bq=bq, db=store)
+
+        with patch.object(module, "FILTER_CAPACITY", 4):
+            dedup.filter_new("u1", "Acme", self._rows(["a", "b", "c", "d"]))
+            dedup.filter_new("u1", "Acme", self._rows(["e"]))
+
+        generations = next(iter(store.docs.values()))["generations"]
+        assert len(generations) == 2
+        assert generations[0]["count"] == 1 and generations[1]["count"] == 4
+
+        bq.query_existing_mention_ids.reset_mock()
+        bq.query_existing_mention_ids.return_value = {"a"}
+        rows = dedup.filter_new("u1", "Acme", self._rows(["a"]))
+        assert rows == []
+        assert bq.query_existing_mention_ids.call_args[0][1] == ["a"]
+
+
 def run_sync_test():
     """Run a synchronous test to verify imports work."""
     try:
@@ -0,0 +1,113 @@
+"""
+Tests for the streaming asset pipeline in OrchestratorAgent.run_full_campaign_flow:
+assets move through generate → brand → render → save independently, the
+checkpoint is read once, and progress advances as stages complete.
+"""
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from app.agents.orchestrator_agent import OrchestratorAgent
+
+BLUEPRINT = {
+    "theme": "Launch",
+    "facebook": {"caption": "Meet the new range", "visual_prompt": "slow"},
+    "threads": {"caption": "New range out now", "visual_prompt": "fast"},
+    "pinterest": {"caption": "Pin the new range", "visual_prompt": "fast"},
+    "email": {"body": "The new range is here", "visual_prompt": "fast"},
+}
+
+
+class FakePlanner:
+    async def generate_creative_intent(self, *args, **kwargs):
+        return {"objective": "launch"}
+
+    async def create_campaign_blueprint(self, *args, **kwargs):
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in BLUEPRINT.items()}
+
+
+class FakeImageAgent:
+    def __init__(self, events):
+        self.events = events
+
+    def generate_image(self, prompt, brand_dna=None, folder="general"):
+        time.sleep(0.3 if prompt.startswith("slow") else 0.02)
+        self.events.append(("generated", folder.split("/")[1]))
+        return {"url": f"https://img/{folder}.png"}
+
+
+class FakeAssetProcessor:
+    def __init__(self):
+        self.branded = []
+
+    def apply_advanced_branding(self, url, brand_dna):
+        self.branded.append(url)
+        return url + "?branded"
+
+
+def _run(checkpoint):
+    events = []
+    progress = []
+    drafts = []
+    lock = threading.Lock()
+    processor = FakeAssetProcessor()
+
+    agent = OrchestratorAgent.__new__(OrchestratorAgent)
+    agent.db = MagicMock()
+    agent.name = "Orchestrator"
+    agent._load_checkpoint = MagicMock(return_value=checkpoint)
+    agent._update_progress = lambda uid, cid, message, percent, failed=False: progress.append(percent)
+    agent._save_ai_image_cache = MagicMock()
+    agent._mark_channel_complete = MagicMock()
+    agent._clear_checkpoint = MagicMock()
+    agent._save_creative_memory = MagicMock()
+    agent._load_creative_memory = MagicMock(return_value=[])
+    agent._load_competitor_insights = MagicMock(return_value={})
+
+    def save_draft(uid, campaign_id, goal, channel, payload, meta, *args):
+        with lock:
+            events.append(("saved", channel))
+            drafts.append((channel, payload))
+        return True
+
+    agent._save_draft_immediately = save_draft
+
+    with patch("app.agents.orchestrator_agent.CampaignAgent", FakePlanner), \
+         patch("app.agents.orchestrator_agent.ImageAgent", lambda: FakeImageAgent(events)), \
+         patch("app.services.asset_processor.get_asset_processor", return_value=processor):
+        asyncio.run(agent.run_full_campaign_flow(
+            "u1", "c1", "Launch the range", {"color_palette": {}}, {},
+            ["facebook", "threads", "pinterest", "email"]
+        ))
+    return agent, events, progress, dict(drafts), processor
+
+
+def test_fast_assets_saved_before_slow_image_finishes():
+    agent, events, progress, drafts, processor = _run({})
+
+    slow_done = events.index(("generated", "facebook"))
+    saved_early = {c for kind, c in events[:slow_done] if kind == "saved"}
+    # Old fixed batches held every save until the whole first batch finished
+    assert {"threads", "pinterest", "email"} <= saved_early
+
+    assert drafts["threads"] == "https://img/campaigns/threads.png?branded"
+    assert drafts["email"] == "https://img/campaigns/email.png"  # email skips branding
+    assert agent._mark_channel_complete.call_count == 4
+
+    # Progress advances per stage, monotonically, and finishes at 100
+    staged = progress[progress.index(40) + 1:-1]
+    assert len(staged) >= 8
+    assert staged == sorted(staged) and staged[0] > 40 and staged[-1] <= 85
+    assert progress[-1] == 100
+
+
+def test_checkpoint_loaded_once_and_cached_image_reused():
+    checkpoint = {"aiImageCache": {"pinterest_primary": "https://img/cached.png"}}
+    agent, events, progress, drafts, processor = _run(checkpoint)
+
+    agent._load_checkpoint.assert_called_once_with("c1")
+    assert ("generated", "pinterest") not in events
+    assert drafts["pinterest"] == "https://img/cached.png?branded"
+    # Only freshly generated images are written back to the cache
+    assert agent._save_ai_image_cache.call_count == 3
@@ -0,0 +1,39 @@
+"""
+Tests for the creatives router's campaign export: asset downloads run
+concurrently but are streamed into the archive in input order.
+"""
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def fetch_in_order(real_google_modules):
+    with real_google_modules():
+        from app.routers.creatives import _fetch_in_order
+    return _fetch_in_order
+
+
+def test_campaign_export_fetches_concurrently_in_order(fetch_in_order):
+    """Slow early downloads don't reorder output, and parallelism stays bounded."""
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fetch(item):
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05 if item["id"] == 0 else 0.01)
+        with lock:
+            active["now"] -= 1
+        if item["id"] == 3:
+            raise RuntimeError("404")
+        return (str(item["id"]).encode(), "text/plain", "txt")
+
+    results = list(fetch_in_order([{"id": i} for i in range(8)], fetch, max_workers=3))
+
+    assert [item["id"] for item, _ in results] == list(range(8))
+    assert results[3][1] is None
+    assert results[5][1][0] == b"5"
+    assert 1 < active["peak"] <= 3
@@ -0,0 +1,295 @@
+"""
+Tests for DataEngine ad-platform ingestion against local fake platform
+responses: incremental sync windows from per-account watermarks, one
+report pass per platform, LinkedIn pagination and chunked parallel
+Firestore batches.
+"""
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.services import data_engine
+from app.services.data_engine import DataEngine
+
+TODAY = datetime.date.today()
+
+
+# --- In-memory Firestore ---
+
+class FakeDoc:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def collection(self, name):
+        return FakeCollection(self.db, f"{self.path}/{name}")
+
+    def get(self):
+        data = self.db.docs.get(self.path)
+        return SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data or {}))
+
+    def set(self, data, merge=False):
+        self.db.docs.setdefault(self.path, {}).update(data)
+
+
+class FakeCollection:
+    def __init__(self, db, path):
+        self.db, self.path = db, path
+
+    def document(self, doc_id):
+        return FakeDoc(self.db, f"{self.path}/{doc_id}")
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db, self.ops = db, []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append((ref.path, dict(data)))
+
+    def commit(self):
+        assert len(self.ops) <= 500, "Firestore rejects batches over 500 operations"
+        with self.db.lock:
+            self.db.in_flight += 1
+            self.db.peak_in_flight = max(self.db.peak_in_flight, self.db.in_flight)
+        time.sleep(self.db.commit_delay)
+        with self.db.lock:
+            for path, data in self.ops:
+                self.db.docs.setdefault(path, {}).update(data)
+            self.db.commits.append(len(self.ops))
+            self.db.in_flight -= 1
+
+
+class FakeDB:
+    def __init__(self, commit_delay=0.0):
+        self.docs, self.commits = {}, []
+        self.commit_delay = commit_delay
+        self.in_flight = self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def metrics(self, platform):
+        return {p: d for p, d in self.docs.items() if "/campaign_performance/" in p and d["platform"] == platform}
+
+    def watermark(self, platform, account):
+        return self.docs.get(f"users/u1/ad_sync_state/{platform}_{account}", {}).get("synced_through")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    from app.services import user_summary_service
+    summary = SimpleNamespace(
+        deltas=[],
+        campaign_stats_delta=lambda uid, rows: {"data_points": len(rows)},
+        record_campaign_stats=lambda uid, delta: summary.deltas.append(delta) or True,
+    )
+    monkeypatch.setattr(user_summary_service, "get_user_summary_service", lambda: summary)
+    engine = DataEngine.__new__(DataEngine)
+    engine.db = FakeDB()
+    engine.user_id = "u1"
+    engine.summary = summary
+    return engine
+
+
+def _set_watermark(engine, platform, account, day):
+    engine._advance_watermark(platform, account, day)
+
+
+# --- LinkedIn: local fake REST API ---
+
+class FakeLinkedIn:
+    """adAnalyticsV2 with `days` x `campaigns` rows, paged by start/count."""
+
+    def __init__(self, campaigns=3):
+        self.campaigns = campaigns
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                server.requests.append(q)
+                start = datetime.date(int(q["dateRange.start.year"]), int(q["dateRange.start.month"]), int(q["dateRange.start.day"]))
+                end = datetime.date(int(q["dateRange.end.year"]), int(q["dateRange.end.month"]), int(q["dateRange.end.day"]))
+                rows = []
+                day = start
+                while day <= end:
+                    for c in range(server.campaigns):
+                        rows.append({"dateRange": {"start": {"year": day.year, "month": day.month, "day": day.day}},
+                                     "pivotValue": f"urn:li:sponsoredCampaign:{c}", "impressions": 10,
+                                     "clicks": 1, "costInLocalCurrency": "2.5"})
+                    day += datetime.timedelta(days=1)
+                offset, count = int(q["start"]), int(q["count"])
+                body = json.dumps({"elements": rows[offset:offset + count],
+                                   "paging": {"start": offset, "count": count, "total": len(rows)}}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/rest/adAnalyticsV2"
+
+
+@pytest.fixture
+def linkedin(monkeypatch):
+    server = FakeLinkedIn()
+    monkeypatch.setattr(data_engine, "LINKEDIN_ANALYTICS_URL", server.url)
+    monkeypatch.setattr(data_engine, "LINKEDIN_PAGE_SIZE", 20)
+    yield server
+    server.httpd.shutdown()
+
+
+LINKEDIN_CREDS = json.dumps({"access_token": "t", "ad_account_id": "urn:li:sponsoredAccount:9"})
+
+
+def test_linkedin_paginates_and_syncs_incrementally(engine, linkedin):
+    engine.fetch_linkedin(LINKEDIN_CREDS)
+
+    # 31 days x 3 campaigns = 93 rows over 5 pages of 20
+    assert len(engine.db.metrics("linkedin")) == 93
+    assert [int(r["start"]) for r in linkedin.requests] == [0, 20, 40, 60, 80]
+    assert engine.db.watermark("linkedin", "urn:li:sponsoredAccount:9") == TODAY.isoformat()
+
+    linkedin.requests.clear()
+    engine.fetch_linkedin(LINKEDIN_CREDS)
+
+    # Next sync only re-reads the restatement window
+    first = linkedin.requests[0]
+    resumed = datetime.date(int(first["dateRange.start.year"]), int(first["dateRange.start.month"]),
+                            int(first["dateRange.start.day"]))
+    assert resumed == TODAY - datetime.timedelta(days=data_engine.RESTATEMENT_DAYS)
+    assert len(linkedin.requests) == 1
+
+
+def test_linkedin_dry_run_reads_one_page_and_keeps_watermark(engine, linkedin):
+    assert engine.fetch_linkedin(LINKEDIN_CREDS, dry_run=True) is True
+
+    assert len(linkedin.requests) == 1
+    assert engine.db.metrics("linkedin") == {}
+    assert engine.db.watermark("linkedin", "urn:li:sponsoredAccount:9") is None
+
+
+# --- Google Ads: fake SDK client ---
+
+class FakeGoogleAds:
+    def __init__(self, rows_per_batch=2, batches=3):
+        self.queries = []
+        self.rows_per_batch, self.batches = rows_per_batch, batches
+
+    def load_from_dict(self, creds):
+        return self
+
+    def get_service(self, name):
+        return self
+
+    def search_stream(self, customer_id, query):
+        self.queries.append(query)
+
+        def stream():
+            for b in range(self.batches):
+                yield SimpleNamespace(results=[
+                    SimpleNamespace(segments=SimpleNamespace(date=f"2026-10-{b + 1:02d}"),
+                                    campaign=SimpleNamespace(id=r, name=f"Campaign {r}"),
+                                    metrics=SimpleNamespace(impressions=100, clicks=4, cost_micros=2_000_000,
+                                                            conversions=1.0))
+                    for r in range(self.rows_per_batch)
+                ])
+        return stream()
+
+
+def test_google_ads_single_stream_over_watermark_window(engine, monkeypatch):
+    fake = FakeGoogleAds()
+    monkeypatch.setattr(data_engine, "GoogleAdsClient", fake)
+    _set_watermark(engine, "google", "123", TODAY - datetime.timedelta(days=1))
+
+    engine.fetch_google_ads(json.dumps({"customer_id": "123", "developer_token": "x"}))
+
+    assert len(fake.queries) == 1
+    since = (TODAY - datetime.timedelta(days=1 + data_engine.RESTATEMENT_DAYS)).isoformat()
+    assert f"BETWEEN '{since}' AND '{TODAY.isoformat()}'" in fake.queries[0]
+    saved = engine.db.metrics("google")
+    assert len(saved) == 6
+    assert saved["users/u1/campaign_performance/google_2026-10-01_0"]["cpc"] == 0.5
+    assert engine.db.watermark("google", "123") == TODAY.isoformat()
+
+
+def test_first_sync_capped_at_initial_window(engine, monkeypatch):
+    fake = FakeGoogleAds()
+    monkeypatch.setattr(data_engine, "GoogleAdsClient", fake)
+    _set_watermark(engine, "google", "123", TODAY - datetime.timedelta(days=200))
+
+    engine.fetch_google_ads(json.dumps({"customer_id": "123"}))
+
+    since = (TODAY - datetime.timedelta(days=data_engine.INITIAL_SYNC_DAYS)).isoformat()
+    assert f"BETWEEN '{since}'" in fake.queries[0]
+
+
+# --- Meta: fake SDK ---
+
+def test_meta_uses_time_range_from_watermark(engine, monkeypatch):
+    calls = []
+
+    class FakeAccount:
+        def __init__(self, account_id):
+            self.account_id = account_id
+
+        def get_insights(self, fields, params):
+            calls.append(params)
+            return iter([{"date_start": "2026-10-17", "campaign_name": "A", "campaign_id": "1",
+                          "impressions": "50", "clicks": "5", "spend": "10"}])
+
+    monkeypatch.setattr(data_engine, "FacebookAdsApi", SimpleNamespace(init=lambda access_token: None))
+    monkeypatch.setattr(data_engine, "AdAccount", FakeAccount)
+    _set_watermark(engine, "meta", "act_1", TODAY)
+
+    engine.fetch_meta(json.dumps({"access_token": "t", "ad_account_id": "act_1"}))
+
+    since = (TODAY - datetime.timedelta(days=data_engine.RESTATEMENT_DAYS)).isoformat()
+    assert calls == [{"level": "campaign", "time_range": {"since": since, "until": TODAY.isoformat()},
+                      "time_increment": 1}]
+    assert engine.db.metrics("meta")["users/u1/campaign_performance/meta_2026-10-17_1"]["cpc"] == 2.0
+
+
+# --- Writes ---
+
+def test_large_save_chunked_into_parallel_batches(engine, monkeypatch):
+    monkeypatch.setattr(data_engine, "METRICS_WRITE_CONCURRENCY", 3)
+    engine.db.commit_delay = 0.05
+    rows = ({"date": f"day{n // 100}", "campaign_id": str(n % 100), "clicks": 1} for n in range(2100))
+
+    written = engine.save_metrics("meta", rows)
+
+    assert written == 2100
+    assert len(engine.db.metrics("meta")) == 2100
+    assert sorted(engine.db.commits) == [100] + [data_engine.FIRESTORE_BATCH_LIMIT] * 5
+    assert engine.db.peak_in_flight == 3  # Commits overlap, bounded by the concurrency
+    # One summary update folding every chunk's delta
+    assert engine.summary.deltas == [{"data_points": 2100}]
+
+
+def test_failed_write_leaves_watermark(engine, monkeypatch):
+    fake = FakeGoogleAds()
+    monkeypatch.setattr(data_engine, "GoogleAdsClient", fake)
+
+    def failing_commit(self):
+        raise RuntimeError("deadline exceeded")
+    monkeypatch.setattr(FakeBatch, "commit", failing_commit)
+
+    with pytest.raises(ValueError):
+        engine.fetch_google_ads(json.dumps({"customer_id": "123"}))
+    assert engine.db.watermark("google", "123") is None
@@ -0,0 +1,121 @@
+"""
+Tests for the Phase 1 editor pass: one structured critic call per channel,
+channels polished concurrently, and a polish cache per (brand voice, text).
+"""
+import asyncio
+import importlib
+import json
+import re
+import sys
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from app.agents import critic_agent
+from app.agents.critic_agent import CriticAgent
+from app.agents.orchestrator_agent import OrchestratorAgent
+
+BRAND_VOICE = {"personality": "Bold", "do": ["Be direct"], "dont": ["Hype"]}
+
+
+class FakeEditorModel:
+    """Uppercases every field it is sent and scores it 50; tracks overlap."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate_content_async(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            block = re.search(r"\{\n.*?\n\s*\}", prompt, re.S).group(0)
+            fields = json.loads(block)
+            self.calls.append(fields)
+            reply = {k: {"corrected_text": v.upper(), "score": 50} for k, v in fields.items()}
+            return MagicMock(text=f"```json\n{json.dumps(reply)}\n```")
+        finally:
+            self.in_flight -= 1
+
+
+def _blueprint():
+    return {
+        "theme": "Launch",
+        "instagram": {"caption": "new drop", "headline": "hello"},
+        "linkedin": {"body": "we ship", "headlines": ["one", 7, "two"]},
+        "google_ads": {"headlines": ["hello"], "descriptions": ["kept"]},
+    }
+
+
+@pytest.fixture
+def model(real_google_modules):
+    critic_agent._polish_cache.clear()
+    fake = FakeEditorModel()
+    with real_google_modules():
+        # chaos_test swaps llm_factory for a Mock; load the real one for llm_slot()
+        if isinstance(sys.modules.get("app.services.llm_factory"), Mock):
+            del sys.modules["app.services.llm_factory"]
+        llm_factory = importlib.import_module("app.services.llm_factory")
+        with patch.object(llm_factory, "get_model", return_value=fake):
+            yield fake
+    critic_agent._polish_cache.clear()
+
+
+def _run_editor(blueprint):
+    agent = OrchestratorAgent.__new__(OrchestratorAgent)
+    return asyncio.run(agent._run_editor_loop(blueprint, BRAND_VOICE, ["instagram", "linkedin", "google_ads"]))
+
+
+def test_one_call_per_channel_run_concurrently(model):
+    result = _run_editor(_blueprint())
+
+    assert len(model.calls) == 3
+    assert model.max_in_flight == 3
+    assert result["instagram"] == {"caption": "NEW DROP", "headline": "HELLO"}
+    assert result["linkedin"]["body"] == "WE SHIP"
+    assert result["linkedin"]["headlines"] == ["ONE", 7, "TWO"]
+    assert result["google_ads"] == {"headlines": ["HELLO"], "descriptions": ["kept"]}
+
+
+def test_unchanged_copy_skips_the_model(model):
+    _run_editor(_blueprint())
+    model.calls.clear()
+
+    blueprint = _blueprint()
+    blueprint["instagram"]["caption"] = "fresh caption"
+    result = _run_editor(blueprint)
+
+    # Only the edited field is sent again
+    assert model.calls == [{"f0": "fresh caption"}]
+    assert result["instagram"]["caption"] == "FRESH CAPTION"
+    assert result["linkedin"]["body"] == "WE SHIP"
+
+
+def test_refinalising_polished_copy_skips_the_model(model):
+    polished = _run_editor(_blueprint())
+    model.calls.clear()
+
+    result = _run_editor(polished)
+
+    # Corrected copy is cached as final, so nothing is sent again
+    assert model.calls == []
+    assert result["instagram"] == {"caption": "NEW DROP", "headline": "HELLO"}
+    assert result["linkedin"]["headlines"] == ["ONE", 7, "TWO"]
+
+
+def test_failed_call_keeps_text_and_is_not_cached(model):
+    async def _broken(prompt):
+        return MagicMock(text="not json")
+
+    with patch.object(model, "generate_content_async", _broken):
+        results = asyncio.run(CriticAgent().polish_fields({"a": "text", "b": "  "}, BRAND_VOICE))
+
+    assert results == {"a": ("text", 100), "b": ("  ", 100)}
+    assert not critic_agent._polish_cache
+
+    results = asyncio.run(CriticAgent().polish_fields({"a": "text"}, {"personality": "Calm"}))
+    assert results == {"a": ("TEXT", 50)}
+    assert sorted(text for _, text in critic_agent._polish_cache) == ["TEXT", "text"]
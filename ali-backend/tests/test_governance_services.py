@@ -55,3 +55,73 @@ def test_evaluate_copy_banned_phrases():
     assert report["checks"]["banned_phrases"]["hits"] == ["free trial"]
     assert report["checks"]["banned_phrases"]["passes"] is False
     assert report["requires_review"] is True
+
+
+def _sequential_verify(text, blocked_terms):
+    """The original per-phrase search/sub loop, as a reference."""
+    import re
+    from app.services.claims_verifier import RISKY_PHRASES, SAFE_REPLACEMENTS
+
+    flags, rewritten = [], text
+    for phrase in RISKY_PHRASES:
+        escaped = re.escape(phrase)
+        pattern = escaped if not phrase[0].isalnum() or not phrase[-1].isalnum() else rf"\b{escaped}\b"
+        if re.search(pattern, rewritten, flags=re.IGNORECASE):
+            flags.append(phrase)
+            rewritten = re.sub(pattern, SAFE_REPLACEMENTS[phrase], rewritten, flags=re.IGNORECASE)
+    for blocked in blocked_terms:
+        if re.search(rf"\b{re.escape(blocked)}\b", rewritten, flags=re.IGNORECASE):
+            flags.append(blocked)
+            rewritten = re.sub(rf"\b{re.escape(blocked)}\b", "", rewritten, flags=re.IGNORECASE).strip()
+    return rewritten, flags
+
+
+@pytest.mark.parametrize(
+    "text,blocked",
+    [
+        ("Guaranteed 100% results, the best in class", ["results"]),
+        ("Our #1 cure works INSTANTLY, never fails, always perfect", []),
+        ("Number one in town. BEST deals, best prices", ["deals", "town"]),
+        ("Results may vary; results are results", ["results", "vary"]),
+        ("Nothing risky here", ["absent"]),
+        ("Instant deals, perfect timing", ["fast", "polished"]),
+        ("We are #100% sure", []),
+        ("always #100%", []),
+        ("perfect#100% and 100%perfect", []),
+        ("Start your free trial today", ["trial", "free trial"]),
+    ],
+)
+def test_single_pass_matches_sequential_rewrite(text, blocked):
+    rewritten, report = verify_claims(text, {"blocked_terms": blocked})
+
+    assert (rewritten, report["flags"]) == _sequential_verify(text, blocked)
+
+
+def test_matcher_compiled_once_per_brand_policy():
+    from app.services import claims_verifier
+
+    claims_verifier._matcher_cache.clear()
+    policy = {"blocked_terms": ["cheap"], "banned_phrases": ["hack"]}
+    verify_claims("cheap hack", policy)
+    verify_claims("another cheap line", dict(policy))
+    verify_claims("best", {"blocked_terms": ["other"]})
+
+    assert len(claims_verifier._matcher_cache) == 2
+
+
+def test_blueprint_claims_copy_only_adjusted_channels():
+    from app.services.governance import verify_claims_for_blueprint
+
+    blueprint = {
+        "theme": "Launch",
+        "linkedin": {"body": "The best launch", "headlines": ["Rated 1 choice", "Plain"]},
+        "email": {"body": "Nothing to change", "meta": {"nested": True}},
+    }
+
+    adjusted, report = verify_claims_for_blueprint(blueprint)
+
+    assert adjusted["linkedin"] == {"body": "The top launch", "headlines": ["Rated leading choice", "Plain"]}
+    assert blueprint["linkedin"]["body"] == "The best launch"  # Input untouched
+    assert adjusted["email"] is blueprint["email"]
+    assert report["summary"] == {"adjusted_fields_total": 2, "channels_with_adjustments": 1}
+    assert [i["pattern"] for i in report["channels"]["linkedin"]["fields"]["headlines"][0]["issues"]] == [r"\b#?1\b"]
@@ -0,0 +1,138 @@
+"""
+Tests for the warm-page Mermaid renderer: one page session for many
+diagrams, the vendored bundle, and the (source, theme) output cache.
+Uses a fake browser whose page "renders" diagrams in evaluate().
+"""
+import asyncio
+
+import pytest
+
+from app.services import asset_processor as ap
+from app.services.asset_processor import AssetProcessor, MermaidRenderer
+
+
+class FakeStage:
+    def __init__(self, page):
+        self.page = page
+
+    async def screenshot(self, type="png", **kwargs):
+        self.page.screenshots += 1
+        return f"{type}:{self.page.stage}".encode()
+
+
+class FakePage:
+    def __init__(self):
+        self.scripts = []
+        self.render_calls = []
+        self.screenshots = 0
+        self.stage = ""
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def set_content(self, html, **kwargs):
+        pass
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def add_script_tag(self, **kwargs):
+        self.scripts.append(kwargs)
+
+    async def set_viewport_size(self, size):
+        pass
+
+    async def evaluate(self, script, arg=None):
+        if isinstance(arg, dict):
+            self.render_calls.append(list(arg["sources"]))
+            return [{"error": "Parse error"} if "bad" in code else {"svg": f"<svg>{arg['theme']}|{code}</svg>"}
+                    for code in arg["sources"]]
+        self.stage = arg
+
+    async def query_selector(self, selector):
+        return FakeStage(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages = []
+
+    def is_connected(self):
+        return True
+
+    async def new_page(self, **kwargs):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+@pytest.fixture
+def browser(monkeypatch, tmp_path):
+    browser = FakeBrowser()
+    acquired = []
+
+    async def _acquire():
+        acquired.append(browser)
+        return browser
+
+    bundle = tmp_path / "mermaid.min.js"
+    bundle.write_text("window.mermaid = {};")
+    monkeypatch.setattr(ap, "PLAYWRIGHT_AVAILABLE", True)
+    monkeypatch.setattr(ap, "MERMAID_BUNDLE_PATH", str(bundle))
+    monkeypatch.setattr(ap.BrowserPool, "acquire", _acquire)
+    monkeypatch.setattr(MermaidRenderer, "_svgs", ap.OrderedDict())
+    monkeypatch.setattr(MermaidRenderer, "_images", ap.OrderedDict())
+    for attr in ("_loop", "_lock", "_browser", "_page"):
+        monkeypatch.setattr(MermaidRenderer, attr, None)
+    browser.acquired = acquired
+    return browser
+
+
+def test_batch_renders_in_one_warm_page_with_vendored_bundle(browser):
+    processor = AssetProcessor.__new__(AssetProcessor)
+    diagrams = ["graph TD; A-->B", "graph TD; bad", "graph LR; C-->D"]
+
+    async def scenario():
+        first = await processor.render_mermaid_batch(diagrams)
+        single = await processor.render_mermaid_to_image("graph TD; E-->F")
+        return first, single
+
+    first, single = asyncio.run(scenario())
+
+    assert first[0] == b"png:<svg>default|graph TD; A-->B</svg>"
+    assert first[1] == b"" and first[2]
+    assert single == b"png:<svg>default|graph TD; E-->F</svg>"
+    # One browser, one page, bundle loaded from disk, one evaluate per batch
+    assert len(browser.acquired) == 1 and len(browser.pages) == 1
+    page = browser.pages[0]
+    assert page.scripts == [{"path": ap.MERMAID_BUNDLE_PATH}]
+    assert page.render_calls == [diagrams, ["graph TD; E-->F"]]
+
+
+def test_outputs_cached_by_source_and_theme(browser):
+    async def scenario():
+        await MermaidRenderer.render_images(["graph TD; A-->B"], theme="dark")
+        svgs = await MermaidRenderer.render_svgs(["graph TD; A-->B", "graph TD; A-->B"], theme="dark")
+        again = await MermaidRenderer.render_images(["  graph TD; A-->B\n"], theme="dark")
+        other_theme = await MermaidRenderer.render_images(["graph TD; A-->B"], theme="forest")
+        return svgs, again, other_theme
+
+    svgs, again, other_theme = asyncio.run(scenario())
+    page = browser.pages[0]
+
+    assert svgs == ["<svg>dark|graph TD; A-->B</svg>"] * 2
+    assert again == [b"png:<svg>dark|graph TD; A-->B</svg>"]
+    assert other_theme == [b"png:<svg>forest|graph TD; A-->B</svg>"]
+    assert page.render_calls == [["graph TD; A-->B"], ["graph TD; A-->B"]]
+    assert page.screenshots == 2
+
+
+def test_missing_bundle_falls_back_to_cdn(browser, monkeypatch, tmp_path):
+    monkeypatch.setattr(ap, "MERMAID_BUNDLE_PATH", str(tmp_path / "missing.js"))
+
+    asyncio.run(MermaidRenderer.render_svgs(["graph TD; A-->B"]))
+
+    assert browser.pages[0].scripts == [{"url": ap.MERMAID_CDN}]
@@ -0,0 +1,98 @@
+"""
+Tests for the coalescing progress reporter and the job progress paths
+that write through it.
+"""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from app.services import cloud_tasks_orchestrator as cto
+from app.services.progress_reporter import ProgressReporter
+
+
+class RecordingDoc:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def update(self, data):
+        time.sleep(self.delay)
+        with self.lock:
+            self.writes.append((time.monotonic(), dict(data)))
+
+
+def test_rapid_ticks_coalesced_and_flushed():
+    reporter = ProgressReporter(interval=0.2)
+    doc = RecordingDoc(delay=0.01)
+
+    started = time.monotonic()
+    for percent in range(1, 51):
+        reporter.report("jobs/a", doc.update, {"progress": percent})
+        time.sleep(0.004)
+    reporting_took = time.monotonic() - started
+    assert reporter.flush("jobs/a")
+
+    # Callers never waited on Firestore
+    assert reporting_took < 0.5
+    assert 2 <= len(doc.writes) <= 4
+    assert doc.writes[0][1] == {"progress": 1}
+    assert doc.writes[-1][1] == {"progress": 50}
+    gaps = [b[0] - a[0] for a, b in zip(doc.writes, doc.writes[1:-1])]
+    assert all(gap >= 0.19 for gap in gaps)
+
+
+def test_urgent_update_skips_interval_and_keeps_merged_fields():
+    reporter = ProgressReporter(interval=5)
+    doc = RecordingDoc()
+
+    reporter.report("jobs/a", doc.update, {"progress": 10, "progressMessage": "Started"})
+    assert reporter.flush("jobs/a")
+    reporter.report("jobs/a", doc.update, {"progress": 40, "progressMessage": "Working"})
+    reporter.report("jobs/a", doc.update, {"progress": 50})
+    time.sleep(0.05)
+    assert len(doc.writes) == 1  # Still inside the throttle window
+
+    urgent_at = time.monotonic()
+    reporter.report("jobs/a", doc.update, {"status": "FAILED"}, urgent=True)
+    deadline = time.monotonic() + 1
+    while len(doc.writes) < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    assert doc.writes[1][0] - urgent_at < 0.5
+    assert doc.writes[1][1] == {"progress": 50, "progressMessage": "Working", "status": "FAILED"}
+
+
+def test_job_progress_throttled_and_completion_written(monkeypatch):
+    reporter = ProgressReporter(interval=60)
+    monkeypatch.setattr(cto, "get_progress_reporter", lambda: reporter)
+    doc = RecordingDoc()
+    orchestrator = cto.CloudTasksOrchestrator.__new__(cto.CloudTasksOrchestrator)
+    orchestrator.db = MagicMock()
+    orchestrator.db.collection.return_value.document.return_value = doc
+
+    for percent in range(10, 100, 10):
+        assert orchestrator.update_job_progress("t1", percent, f"{percent}%")
+    assert orchestrator.complete_job("t1", {"ok": True})
+
+    # Ticks coalesced behind the first write; completion written at once
+    assert len(doc.writes) <= 2
+    final = doc.writes[-1][1]
+    assert final["status"] == cto.TaskStatus.COMPLETED.value
+    assert final["progress"] == 100 and final["result"] == {"ok": True}
+
+
+def test_failed_completion_write_reported(monkeypatch):
+    reporter = ProgressReporter(interval=60)
+    monkeypatch.setattr(cto, "get_progress_reporter", lambda: reporter)
+    doc = MagicMock()
+    doc.update.side_effect = RuntimeError("404 No document to update")
+    orchestrator = cto.CloudTasksOrchestrator.__new__(cto.CloudTasksOrchestrator)
+    orchestrator.db = MagicMock()
+    orchestrator.db.collection.return_value.document.return_value = doc
+
+    assert orchestrator.complete_job("missing", {"ok": True}) is False
+
+    # Reported once; a later successful write clears it
+    doc.update.side_effect = None
+    assert orchestrator.update_job_progress("missing", 100, "Done", status=cto.TaskStatus.COMPLETED)
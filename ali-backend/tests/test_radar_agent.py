@@ -0,0 +1,115 @@
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.radar_agent import RadarAgent, THEME_MATCHER
+from app.types.competitor_models import Competitor, CompetitorEvent, THEME_KEYWORDS
+
+
+def _competitor():
+    return Competitor(id="comp-1", user_id="user-1", name="Acme")
+
+
+def _event(title, themes=None):
+    return CompetitorEvent(
+        id="evt-1",
+        competitor_id="comp-1",
+        competitor_name="Acme",
+        user_id="user-1",
+        type="product",
+        themes=themes or [],
+        source_url="https://example.com",
+        title=title,
+        event_hash="hash",
+    )
+
+
+def _mentions(count):
+    return [
+        {"title": f"Acme news {i}", "content": f"body {i}", "url": f"https://example.com/{i}"}
+        for i in range(count)
+    ]
+
+
+def test_theme_matcher_matches_substring_semantics():
+    text = "acme unveils new pricing tier after series b funding"
+
+    expected = {theme for theme, keywords in THEME_KEYWORDS.items() if any(kw in text for kw in keywords)}
+
+    assert THEME_MATCHER.find_labels(text) == expected
+
+
+def test_match_event_themes_returns_all_hits_in_table_order():
+    agent = RadarAgent()
+    event = _event("Acme announces discount", themes=["Security audit"])
+
+    themes = agent.match_event_themes(event)
+
+    assert themes == ["Pricing Moves", "Product Launches", "Security & Compliance"]
+    assert agent.match_event_to_theme(event) == "Pricing Moves"
+    assert agent.match_event_to_theme(_event("Quarterly update")) == "Other"
+
+
+@pytest.mark.asyncio
+async def test_classify_events_batch_uses_one_call_per_batch():
+    agent = RadarAgent()
+    agent.model = MagicMock()
+
+    async def fake_generate(prompt):
+        count = prompt.count("**Item ")
+        response = MagicMock()
+        response.text = json.dumps([
+            {"mention_index": i, "type": "pricing", "themes": ["price"], "impact_score": 6, "confidence": 0.8, "summary": "s"}
+            for i in range(count)
+        ])
+        return response
+
+    agent.model.generate_content_async = AsyncMock(side_effect=fake_generate)
+
+    events = await agent.classify_events_batch(_mentions(25), _competitor(), batch_size=10)
+
+    assert len(events) == 25
+    assert agent.model.generate_content_async.await_count == 3
+    assert [e.title for e in events] == [f"Acme news {i}" for i in range(25)]
+    agent.model.generate_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_classify_events_batch_falls_back_for_missing_items():
+    agent = RadarAgent()
+    agent.model = MagicMock()
+
+    response = MagicMock()
+    response.text = '```json\n[{"mention_index": 0, "type": "funding", "impact_score": 9}]\n```'
+    agent.model.generate_content_async = AsyncMock(return_value=response)
+
+    single = MagicMock()
+    single.text = '{"type": "legal", "impact_score": 4}'
+    agent.model.generate_content.return_value = single
+
+    events = await agent.classify_events_batch(_mentions(2), _competitor())
+
+    assert [e.type for e in events] == ["funding", "legal"]
+    assert agent.model.generate_content.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_process_raw_mentions_writes_in_batches():
+    agent = RadarAgent()
+    agent.model = MagicMock()
+    response = MagicMock()
+    response.text = json.dumps([{"mention_index": i, "type": "product"} for i in range(10)])
+    agent.model.generate_content_async = AsyncMock(return_value=response)
+
+    with patch("app.agents.radar_agent.db") as mock_db, \
+         patch("app.agents.radar_agent.get_bigquery_service") as mock_bq:
+        summary = await agent.process_raw_mentions(_mentions(10), _competitor())
+
+    assert summary["events_created"] == 10
+    assert mock_db.batch.return_value.set.call_count == 10
+    assert mock_db.batch.return_value.commit.call_count == 1
+    mock_bq.return_value.insert_competitor_events_batch.assert_called_once()
+    rows = mock_bq.return_value.insert_competitor_events_batch.call_args[0][0]
+    assert len(rows) == 10
+    assert rows[0]["event_type"] == "product"
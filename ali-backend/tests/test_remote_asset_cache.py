@@ -0,0 +1,171 @@
+"""
+Tests for the two-tier remote asset cache used by the branding paths:
+logos fetched once and revalidated by ETag, decoded images reused per
+target width, and pipeline renders read back without a download.
+Uses a local HTTP server that honours If-None-Match.
+"""
+import hashlib
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from app.services import asset_processor as ap
+from app.services.asset_processor import AssetProcessor, RemoteAssetCache
+
+try:
+    import cairosvg  # noqa: F401
+    CAIROSVG_USABLE = True
+except (ImportError, OSError):
+    CAIROSVG_USABLE = False
+
+
+def _png(color, size=(200, 100)):
+    out = io.BytesIO()
+    Image.new("RGBA", size, color).save(out, format="PNG")
+    return out.getvalue()
+
+
+class AssetServer:
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body, content_type = server.files[self.path]
+                etag = '"%s"' % hashlib.md5(body).hexdigest()
+                server.requests.append((self.path, self.headers.get("If-None-Match")))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+
+@pytest.fixture
+def server():
+    srv = AssetServer()
+    yield srv
+    srv.httpd.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = RemoteAssetCache(directory=str(tmp_path / "assets"), revalidate_sec=600)
+    monkeypatch.setattr(ap, "_remote_asset_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def processor():
+    proc = AssetProcessor.__new__(AssetProcessor)
+    proc.storage_client = None
+    proc._render_urls = {}
+    return proc
+
+
+def test_logo_fetched_and_decoded_once_per_width(server, cache, processor, monkeypatch):
+    server.files["/logo.png"] = (_png((255, 0, 0, 255)), "image/png")
+    url = server.url("/logo.png")
+    decodes = []
+    real_open = Image.open
+    monkeypatch.setattr(ap.Image, "open", lambda *a, **k: decodes.append(1) or real_open(*a, **k))
+
+    first = processor._load_logo_image(url, "test", width=100)
+    for _ in range(5):
+        again = processor._load_logo_image(url, "test", width=100)
+    other_width = processor._load_logo_image(url, "test", width=40)
+
+    assert first.size == (100, 50) and other_width.size == (40, 20)
+    assert len(server.requests) == 1
+    assert len(decodes) == 4  # verify + decode, for each of the two widths
+    # Callers get their own copy of the shared cached image
+    again.putpixel((0, 0), (0, 0, 0, 0))
+    assert processor._load_logo_image(url, "test", width=100).getpixel((0, 0)) == (255, 0, 0, 255)
+
+
+def test_stale_entry_revalidated_with_etag(server, cache, processor):
+    server.files["/logo.png"] = (_png((255, 0, 0, 255)), "image/png")
+    url = server.url("/logo.png")
+    cache.revalidate_sec = 0
+
+    processor._load_logo_image(url, "test", width=50)
+    unchanged = processor._load_logo_image(url, "test", width=50)
+    server.files["/logo.png"] = (_png((0, 0, 255, 255)), "image/png")
+    changed = processor._load_logo_image(url, "test", width=50)
+
+    assert server.requests[0][1] is None
+    assert server.requests[1][1] is not None  # Conditional request answered with 304
+    assert unchanged.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert changed.getpixel((0, 0)) == (0, 0, 255, 255)
+
+
+def test_disk_tier_shared_across_processes(server, cache, processor, monkeypatch, tmp_path):
+    server.files["/logo.png"] = (_png((0, 255, 0, 255)), "image/png")
+    url = server.url("/logo.png")
+    processor._load_logo_image(url, "test")
+
+    # A fresh process (empty memory tier) over the same directory
+    monkeypatch.setattr(ap, "_remote_asset_cache", RemoteAssetCache(directory=cache.directory))
+    logo = processor._load_logo_image(url, "test")
+
+    assert logo.getpixel((0, 0)) == (0, 255, 0, 255)
+    assert len(server.requests) == 1
+
+
+def test_stored_render_read_back_without_download(cache, processor, monkeypatch):
+    monkeypatch.setattr(processor, "upload_to_gcs", lambda data, path, content_type: f"https://storage.test/{path}",
+                        raising=False)
+    white = io.BytesIO()
+    Image.new("RGB", (64, 64), (250, 250, 250)).save(white, format="JPEG")
+
+    url = processor.store_render("abc", "jpg", white.getvalue(), "image/jpeg")
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("unexpected download")
+    monkeypatch.setattr("requests.get", no_network)
+    assert processor.analyze_luminance_from_url(url) == "light"
+
+
+def test_invalid_logo_content_type_rejected(server, cache, processor):
+    server.files["/logo"] = (b"<html></html>", "text/html")
+
+    assert processor._load_logo_image(server.url("/logo"), "test") is None
+
+
+@pytest.mark.skipif(not CAIROSVG_USABLE, reason="cairosvg / libcairo not available")
+def test_svg_rasterised_once_per_width(server, cache, processor, monkeypatch):
+    import cairosvg
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="20" height="10"><rect width="20" height="10" fill="red"/></svg>'
+    server.files["/logo.svg"] = (svg, "image/svg+xml")
+    url = server.url("/logo.svg")
+    calls = []
+    real_svg2png = cairosvg.svg2png
+    monkeypatch.setattr(cairosvg, "svg2png", lambda **kw: calls.append(kw.get("output_width")) or real_svg2png(**kw))
+
+    big = processor._load_logo_image(url, "test", width=200)
+    processor._load_logo_image(url, "test", width=200)
+    monkeypatch.setattr(ap, "_remote_asset_cache", RemoteAssetCache(directory=cache.directory))
+    processor._load_logo_image(url, "test", width=200)
+    small = processor._load_logo_image(url, "test", width=40)
+
+    assert big.size == (200, 100) and small.size == (40, 20)
+    assert calls == [200, 40]
@@ -0,0 +1,265 @@
+"""
+Tests for the content-addressed render cache in AssetProcessor and the
+render browser's CDN asset cache.
+Uses an in-memory GCS stand-in and a fake browser pool.
+"""
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import asset_processor as ap
+from app.services.asset_processor import AssetProcessor, render_cache_key
+
+HTML = "<!DOCTYPE html><html><body><div id='text'>Launch</div></body></html>"
+
+
+class FakeBlob:
+    def __init__(self, store, path):
+        self.store = store
+        self.path = path
+        self.public_url = f"https://storage.test/{path}"
+
+    def exists(self):
+        self.store.exists_calls += 1
+        return self.path in self.store.objects
+
+    def upload_from_string(self, data, content_type=None):
+        self.store.objects[self.path] = data
+
+    def make_public(self):
+        pass
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects = {}
+        self.exists_calls = 0
+
+    def bucket(self, name):
+        return MagicMock(blob=lambda path: FakeBlob(self, path))
+
+
+class FakePage:
+    async def set_content(self, html, **kwargs):
+        pass
+
+    async def evaluate(self, script):
+        pass
+
+    async def screenshot(self, **kwargs):
+        return b"png-bytes"
+
+
+class FakeContext:
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return FakePage()
+
+    async def close(self):
+        pass
+
+
+class FakeBrowser:
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+
+@pytest.fixture(autouse=True)
+def remote_assets(tmp_path, monkeypatch):
+    monkeypatch.setattr(ap, "_remote_asset_cache", ap.RemoteAssetCache(directory=str(tmp_path / "assets")))
+
+
+@pytest.fixture
+def processor():
+    proc = AssetProcessor.__new__(AssetProcessor)
+    proc.bucket_name = "test-bucket"
+    proc.storage_client = FakeStorage()
+    proc.vision_client = None
+    proc._render_urls = {}
+    return proc
+
+
+@pytest.fixture
+def browser_pool(monkeypatch):
+    acquire = MagicMock()
+
+    async def _acquire():
+        acquire()
+        return FakeBrowser()
+
+    async def _release(browser):
+        pass
+
+    monkeypatch.setattr(ap, "PLAYWRIGHT_AVAILABLE", True)
+    monkeypatch.setattr(ap.BrowserPool, "acquire", _acquire)
+    monkeypatch.setattr(ap.BrowserPool, "release", _release)
+    return acquire
+
+
+def test_key_covers_html_dims_format_and_renderer(monkeypatch):
+    base = render_cache_key("image", HTML, width=1080, height=1920, format="png")
+    assert base == render_cache_key("image", HTML, format="png", height=1920, width=1080)
+    assert base != render_cache_key("image", HTML + " ", width=1080, height=1920, format="png")
+    assert base != render_cache_key("image", HTML, width=1080, height=1080, format="png")
+    assert base != render_cache_key("image", HTML, width=1080, height=1920, format="jpeg")
+    monkeypatch.setattr(ap, "RENDERER_VERSION", str(int(ap.RENDERER_VERSION) + 1))
+    assert base != render_cache_key("image", HTML, width=1080, height=1920, format="png")
+
+
+def test_identical_render_skips_browser(processor, browser_pool):
+    first = asyncio.run(processor.generate_image_asset(HTML, "u1", "c1_instagram"))
+    assert browser_pool.call_count == 1
+    assert first.startswith("https://storage.test/render-cache/") and first.endswith(".png")
+
+    # Another asset id/user with the same resolved HTML reuses the stored render
+    second = asyncio.run(processor.generate_image_asset(HTML, "u2", "c9_facebook"))
+    assert second == first and browser_pool.call_count == 1
+
+    # A fresh process (empty memo) finds it in GCS, still without a browser
+    processor._render_urls.clear()
+    third = asyncio.run(processor.generate_image_asset(HTML, "u1", "c1_instagram"))
+    assert third == first and browser_pool.call_count == 1
+
+    asyncio.run(processor.generate_image_asset(HTML, "u1", "c1_instagram", width=1080, height=1080))
+    assert browser_pool.call_count == 2
+
+
+def test_timed_out_render_kept_out_of_cache(processor, browser_pool, monkeypatch):
+    async def timeout(page, ceiling):
+        return "timeout"
+
+    monkeypatch.setattr(ap, "wait_for_render_ready", timeout)
+
+    first = asyncio.run(processor.generate_image_asset(HTML, "u1", "c1_instagram"))
+    second = asyncio.run(processor.generate_image_asset(HTML, "u1", "c1_instagram"))
+
+    # Both requests render; neither upload lands under render-cache/
+    assert browser_pool.call_count == 2
+    assert first.startswith("https://storage.test/renders/degraded/")
+    assert processor._render_urls == {}
+    assert not any(path.startswith("render-cache/") for path in processor.storage_client.objects)
+
+
+def test_stored_video_returned_without_recording(processor, monkeypatch):
+    key = render_cache_key("video", HTML, width=1080, height=1920, duration=6.0, fps=30)
+    processor.storage_client.objects[f"render-cache/{key}.mp4"] = b"mp4"
+    monkeypatch.setattr(ap, "async_playwright", MagicMock(side_effect=AssertionError("browser launched")))
+
+    url = asyncio.run(processor.record_html_animation(HTML, "u1", "c1_tiktok"))
+    assert url == f"https://storage.test/render-cache/{key}.mp4"
+
+
+@pytest.mark.skipif(not ap.PIL_AVAILABLE, reason="PIL not installed")
+def test_branding_reuses_render_for_same_source_and_brand(processor):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 40), "white").save(buf, format="PNG")
+    response = MagicMock(content=buf.getvalue(), status_code=200, headers={"Content-Type": "image/png"})
+    brand = {"color_palette": {"primary": "#112233"}}
+
+    with patch("requests.get", return_value=response) as get:
+        first = processor.apply_advanced_branding("https://img/source.png", brand)
+        second = processor.apply_advanced_branding("https://img/source.png", brand)
+        other = processor.apply_advanced_branding("https://img/source.png", {"color_palette": {"primary": "#ffffff"}})
+
+    assert first == second != other
+    # Source fetched once; the re-brand reads it back from the remote asset cache
+    assert get.call_count == 1
+
+
+@pytest.mark.skipif(not ap.PIL_AVAILABLE, reason="PIL not installed")
+def test_branding_without_logo_not_cached(processor, monkeypatch):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 40), "white").save(buf, format="PNG")
+    response = MagicMock(content=buf.getvalue(), status_code=200, headers={"Content-Type": "image/png"})
+    brand = {"logo_url": "https://img/logo.png", "color_palette": {"primary": "#112233"}}
+    monkeypatch.setattr(processor, "_load_logo_image", lambda url, context, width=None: None)
+
+    with patch("requests.get", return_value=response):
+        url = processor.apply_advanced_branding("https://img/source.png", brand)
+
+    assert url.startswith("https://storage.test/renders/degraded/")
+    key = render_cache_key("branding", "https://img/source.png", logo_url="https://img/logo.png",
+                           primary="#112233", format="jpg")
+    assert processor.get_cached_render(key, ("jpg",)) is None
+
+
+class FakeRoute:
+    """Playwright Route stand-in; `upstream` maps URL -> (status, content_type, body)."""
+
+    def __init__(self, url, upstream):
+        self.request = SimpleNamespace(url=url)
+        self.upstream = upstream
+        self.fetches = 0
+        self.fulfilled = None
+        self.aborted = False
+
+    async def fetch(self):
+        self.fetches += 1
+        if self.request.url not in self.upstream:
+            raise ConnectionError("offline")
+        status, content_type, body = self.upstream[self.request.url]
+
+        async def read():
+            return body
+        return SimpleNamespace(status=status, headers={"content-type": content_type}, body=read)
+
+    async def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    async def abort(self):
+        self.aborted = True
+
+
+@pytest.fixture
+def asset_cache():
+    ap.RenderAssetCache.clear()
+    yield ap.RenderAssetCache
+    ap.RenderAssetCache.clear()
+
+
+def test_cdn_assets_fetched_once_and_served_from_memory(asset_cache):
+    font_url = "https://fonts.gstatic.com/s/inter/v1/inter.woff2"
+    upstream = {font_url: (200, "font/woff2", b"WOFF2")}
+
+    first, second = FakeRoute(font_url, upstream), FakeRoute(font_url, {})
+    asyncio.run(asset_cache._handle(first))
+    asyncio.run(asset_cache._handle(second))
+
+    assert (first.fetches, second.fetches) == (1, 0)
+    assert second.fulfilled["body"] == b"WOFF2"
+    assert second.fulfilled["content_type"] == "font/woff2"
+    assert second.fulfilled["headers"]["Access-Control-Allow-Origin"] == "*"
+
+    missing = FakeRoute("https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/gsap.min.js", {})
+    asyncio.run(asset_cache._handle(missing))
+    assert missing.aborted  # Template's CDN fallback takes over
+
+
+def test_seeded_assets_never_touch_network(asset_cache, tmp_path, monkeypatch):
+    from app.core.templates import GSAP_CDN
+    (tmp_path / "gsap").write_bytes(b"window.gsap={};")
+    (tmp_path / "manifest.json").write_text(json.dumps(
+        {GSAP_CDN: {"file": "gsap", "content_type": "application/javascript"}}))
+    monkeypatch.setattr(ap, "RENDER_ASSET_DIR", str(tmp_path))
+
+    routes = []
+    target = SimpleNamespace(route=lambda pattern, handler: routes.append((pattern, handler)) or asyncio.sleep(0))
+    asyncio.run(asset_cache.install(target))
+
+    pattern, handler = routes[0]
+    assert pattern.match(GSAP_CDN) and pattern.match("https://fonts.googleapis.com/css2?family=Inter")
+    assert not pattern.match("https://storage.googleapis.com/bucket/logo.png")
+
+    route = FakeRoute(GSAP_CDN, {})
+    asyncio.run(handler(route))
+    assert route.fetches == 0 and route.fulfilled["body"] == b"window.gsap={};"
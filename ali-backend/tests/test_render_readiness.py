@@ -0,0 +1,157 @@
+"""
+Tests for event-driven render readiness: screenshots are taken once the
+page reports ready, the caller's delay is only a ceiling, and every
+render lands in the latency histogram.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.middleware.observability import LatencyHistogram
+from app.services import asset_processor as ap
+from app.services.asset_processor import AssetProcessor, wait_for_render_ready
+
+
+class FakePage:
+    def __init__(self, ready_after=0.0, outcome="gsap"):
+        self.ready_after = ready_after
+        self.outcome = outcome
+        self.loaded_with = None
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def set_content(self, html, wait_until=None, timeout=None):
+        self.loaded_with = wait_until
+
+    async def evaluate(self, script):
+        if script == ap._GSAP_SNAP_JS:
+            self.snapped = True
+            return None
+        await asyncio.sleep(self.ready_after)
+        return self.outcome
+
+    async def screenshot(self, **kwargs):
+        self.captured_snapped = getattr(self, "snapped", False)
+        return b"png-bytes"
+
+
+class FakePlaywright:
+    def __init__(self, page):
+        self.page = page
+        self.chromium = self
+
+    async def launch(self, **kwargs):
+        return self
+
+    async def new_page(self, **kwargs):
+        return self.page
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def histogram(monkeypatch):
+    from app.middleware import observability
+    fresh = LatencyHistogram()
+    monkeypatch.setattr(observability, "render_latency_histogram", fresh)
+    return fresh
+
+
+def _render(page, monkeypatch, **kwargs):
+    monkeypatch.setattr(ap, "PLAYWRIGHT_AVAILABLE", True)
+    monkeypatch.setattr(ap, "async_playwright", lambda: FakePlaywright(page))
+    processor = AssetProcessor.__new__(AssetProcessor)
+    started = time.monotonic()
+    result = asyncio.run(processor.render_html_to_image("<div id='text'>Hi</div>", **kwargs))
+    return result, time.monotonic() - started
+
+
+def test_ready_page_captured_without_fixed_delay(monkeypatch, histogram):
+    page = FakePage(ready_after=0.05)
+
+    result, took = _render(page, monkeypatch, animation_delay=3.0)
+
+    assert result == b"png-bytes"
+    assert took < 1.0  # Was animation_delay (3s) plus a 2s selector wait
+    assert page.loaded_with == "load"
+    series = histogram.snapshot()["series"]
+    assert list(series) == ["gsap"] and series["gsap"]["count"] == 1
+
+
+def test_delay_is_only_a_ceiling(monkeypatch, histogram):
+    page = FakePage(ready_after=10)
+
+    result, took = _render(page, monkeypatch, animation_delay=0.2)
+
+    assert result == b"png-bytes"
+    assert 0.2 <= took < 1.0
+    assert histogram.snapshot()["series"]["timeout"]["count"] == 1
+
+
+class FakePoolBrowser:
+    def __init__(self, page):
+        self.page = page
+
+    async def new_context(self, **kwargs):
+        return self
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def new_page(self):
+        return self.page
+
+    async def close(self):
+        pass
+
+
+def test_image_asset_snaps_gsap_when_readiness_times_out(monkeypatch, histogram):
+    page = FakePage(ready_after=10)
+
+    async def acquire():
+        return FakePoolBrowser(page)
+
+    monkeypatch.setattr(ap, "PLAYWRIGHT_AVAILABLE", True)
+    monkeypatch.setattr(ap, "IMAGE_READY_CEILING_SEC", 0.1)
+    async def release(browser):
+        pass
+
+    monkeypatch.setattr(ap.BrowserPool, "acquire", acquire)
+    monkeypatch.setattr(ap.BrowserPool, "release", release)
+    processor = AssetProcessor.__new__(AssetProcessor)
+    monkeypatch.setattr(processor, "get_cached_render", lambda key, formats: None, raising=False)
+    monkeypatch.setattr(processor, "store_render", lambda key, fmt, data, content_type, degraded=False: f"https://cdn.test/{key}",
+                        raising=False)
+
+    url = asyncio.run(processor.generate_image_asset("<div>Hi</div>", "u1", "a1"))
+
+    assert url.startswith("https://cdn.test/")
+    assert page.captured_snapped  # Seeked to the final frame before the screenshot
+    assert histogram.snapshot()["series"]["timeout"]["count"] == 1
+
+
+def test_readiness_outcomes():
+    assert asyncio.run(wait_for_render_ready(FakePage(outcome="signal"), 1)) == "signal"
+    assert asyncio.run(wait_for_render_ready(FakePage(outcome=None), 1)) == "static"
+    assert asyncio.run(wait_for_render_ready(FakePage(), 0)) == "timeout"
+
+
+def test_histogram_buckets():
+    histogram = LatencyHistogram(buckets_ms=(100, 1000))
+    for latency in (20, 100, 400, 5000):
+        histogram.observe(latency, "gsap")
+    histogram.observe(50, "static")
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets_ms"] == [100, 1000]
+    assert snapshot["series"]["gsap"] == {"counts": [2, 1, 1], "count": 4, "mean_ms": 1380.0}
+    assert snapshot["series"]["static"]["counts"] == [1, 0, 0]
@@ -0,0 +1,273 @@
+"""
+Tests for ResearchService source discovery and deep_dive crawling.
+Runs against local HTTP fixture servers; no network access needed.
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from app.services import research_service
+from app.services.research_service import PoliteCrawler, _extract_page
+
+SEARCH_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "search_results.html")
+
+FACT = "This paragraph has comfortably more than six words in it."
+
+PAGES = {
+    "/article": f"<html><head><title>Article</title></head><body><p>{FACT}</p></body></html>",
+    "/private/page": f"<html><title>Private</title><p>{FACT}</p></html>",
+    "/slow": f"<html><title>Slow</title><p>{FACT}</p></html>",
+}
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, time.monotonic(), dict(self.headers)))
+
+        if self.path.startswith("/html/"):
+            time.sleep(server.search_delay)
+            with open(SEARCH_FIXTURE, "rb") as f:
+                self._send(200, f.read(), "text/html; charset=utf-8")
+            return
+
+        if self.path == "/robots.txt":
+            body = b"User-agent: *\nDisallow: /private/\n"
+            self._send(200, body, "text/plain")
+            return
+
+        if self.path == "/slow":
+            time.sleep(0.2)
+
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = f"<html><title>Tagged</title><p>{FACT}</p></html>".encode()
+            self._send(200, body, "text/html; charset=utf-8", {"ETag": '"v1"'})
+            return
+
+        if self.path == "/huge":
+            # Title and first fact inside the cap, second fact far beyond it
+            body = (
+                f"<html><title>Huge</title><p>{FACT}</p>".encode()
+                + b"<div>" + b"x" * 200_000 + b"</div>"
+                + b"<p>Hidden paragraph well past the byte cap for this page.</p></html>"
+            )
+            self._send(200, body, "text/html")
+            return
+
+        page = PAGES.get(self.path)
+        if page is None:
+            self._send(404, b"not found", "text/plain")
+        else:
+            self._send(200, page.encode(), "text/html; charset=utf-8")
+
+    def _send(self, status, body, content_type, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.search_delay = 0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def fixture_servers():
+    servers = [_start_server(), _start_server()]
+    yield servers
+    for server, _ in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _paths(server):
+    return [path for path, _, _ in server.requests]
+
+
+def test_robots_cached_per_host_and_respected(fixture_servers):
+    (server, base), _ = fixture_servers
+    crawler = PoliteCrawler(request_delay=0)
+
+    results = crawler.crawl([f"{base}/article", f"{base}/private/page", f"{base}/missing"])
+    crawler.crawl([f"{base}/article"])
+
+    assert [r["title"] for r in results] == ["Article"]
+    assert results[0]["extractedFacts"] == [FACT]
+    assert _paths(server).count("/robots.txt") == 1
+    assert "/private/page" not in _paths(server)
+
+
+def test_robots_cache_expires(fixture_servers):
+    (server, base), _ = fixture_servers
+    crawler = PoliteCrawler(request_delay=0, robots_ttl=0)
+
+    crawler.crawl([f"{base}/article"])
+    time.sleep(0.01)
+    crawler.crawl([f"{base}/article"])
+
+    assert _paths(server).count("/robots.txt") == 2
+
+
+def test_conditional_request_reuses_cached_page(fixture_servers):
+    (server, base), _ = fixture_servers
+    crawler = PoliteCrawler(request_delay=0)
+
+    first = crawler.crawl([f"{base}/etag"])
+    second = crawler.crawl([f"{base}/etag"])
+
+    etag_requests = [headers for path, _, headers in server.requests if path == "/etag"]
+    assert "If-None-Match" not in etag_requests[0]
+    assert etag_requests[1]["If-None-Match"] == '"v1"'
+    assert second[0]["title"] == first[0]["title"] == "Tagged"
+    assert second[0]["extractedFacts"] == [FACT]
+
+
+def test_page_read_is_capped(fixture_servers):
+    (_, base), _ = fixture_servers
+    crawler = PoliteCrawler(request_delay=0, max_page_bytes=4096)
+
+    result = crawler.crawl([f"{base}/huge"])[0]
+
+    assert result["title"] == "Huge"
+    assert result["extractedFacts"] == [FACT]
+
+
+def test_per_host_delay_and_cross_host_concurrency(fixture_servers, monkeypatch):
+    (server_a, base_a), (server_b, base_b) = fixture_servers
+    crawler = PoliteCrawler(request_delay=0.15, max_workers=4)
+
+    # Record when each request is sent, per host, from an httpx request hook
+    starts = {}
+
+    class RecordingClient(httpx.Client):
+        def __init__(self, **kwargs):
+            record = lambda request: starts.setdefault(request.url.port, []).append(time.monotonic())
+            super().__init__(event_hooks={"request": [record]}, **kwargs)
+
+    monkeypatch.setattr(research_service.httpx, "Client", RecordingClient)
+
+    results = crawler.crawl([f"{base_a}/article", f"{base_a}/slow", f"{base_b}/slow", f"{base_b}/article"])
+
+    assert [r["title"] for r in results] == ["Article", "Slow", "Slow", "Article"]
+    assert len(starts) == 2
+    for host_starts in starts.values():
+        # robots.txt + two pages, reserved 0.15s apart
+        assert len(host_starts) == 3
+        assert max(host_starts) - min(host_starts) >= 2 * 0.15 * 0.9
+
+    # Hosts run side by side: each host's first request precedes the other's last
+    host_a, host_b = starts.values()
+    assert min(host_a) < max(host_b) and min(host_b) < max(host_a)
+
+
+def test_extract_page_handles_split_chunks():
+    html = f"<title>Split</title><p>{FACT}</p><script><p>not text</p></script>".encode()
+    chunks = [html[i:i + 7] for i in range(0, len(html), 7)]
+
+    title, facts = _extract_page(chunks, "utf-8")
+
+    assert title == "Split"
+    assert facts == [FACT]
+
+
+@pytest.fixture
+def search_server(monkeypatch):
+    server, base = _start_server()
+    monkeypatch.setattr(research_service, "SCOUT_SEARCH_URL", f"{base}/html/")
+    monkeypatch.setattr(research_service, "_search_throttle", research_service._HostThrottle(4, 0))
+    monkeypatch.setattr(research_service, "_scout_cache", research_service.OrderedDict())
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _queries(server):
+    return sorted(
+        parse_qs(urlparse(path).query)["q"][0]
+        for path, _, _ in server.requests if path.startswith("/html/")
+    )
+
+
+def test_scout_merges_query_variants(search_server):
+    sources = research_service.scout_sources("Content marketing", limit=10)
+
+    assert _queries(search_server) == sorted(research_service._query_variants("Content marketing"))
+    urls = [source["url"] for source in sources]
+    assert urls[0] == "https://en.wikipedia.org/wiki/Content_marketing"
+    assert len(urls) == len(set(urls)) == 4
+    assert not any("duckduckgo.com" in url for url in urls)
+    assert {s["url"]: s["credibilityScore"] for s in sources}["https://www.example.gov/small-business/marketing"] == 90
+
+
+def test_scout_cache_per_normalised_query(search_server, monkeypatch):
+    first = research_service.scout_sources("Content Marketing", limit=2)
+    second = research_service.scout_sources("content marketing!", limit=3)
+
+    assert len(_queries(search_server)) == 3
+    assert [s["url"] for s in second[:2]] == [s["url"] for s in first]
+    assert len(second) == 3
+
+    monkeypatch.setattr(research_service, "SCOUT_CACHE_TTL_SEC", 0)
+    research_service._scout_cache.clear()
+    research_service.scout_sources("content marketing")
+    research_service.scout_sources("content marketing")
+    assert len(_queries(search_server)) == 9
+
+
+def test_scout_shares_in_flight_discovery(search_server):
+    search_server.search_delay = 0.2
+    results = []
+
+    def worker():
+        results.append(research_service.scout_sources("content marketing"))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(_queries(search_server)) == 3
+    assert all(r == results[0] for r in results) and results[0]
+
+
+def test_scout_global_rate_limit(search_server, monkeypatch):
+    monkeypatch.setattr(research_service, "_search_throttle", research_service._HostThrottle(1, 0.1))
+
+    research_service.scout_sources("content marketing")
+
+    starts = sorted(t for path, t, _ in search_server.requests)
+    assert len(starts) == 3
+    assert all(b - a >= 0.07 for a, b in zip(starts, starts[1:]))
+
+
+def test_ai_service_scout_falls_back_to_local_discovery(search_server, monkeypatch):
+    from app.services import ai_service_client
+
+    monkeypatch.setattr(ai_service_client, "AI_SERVICE_URL", "http://127.0.0.1:9")
+
+    result = ai_service_client.scout_sources("content marketing")
+
+    assert result["sources"][0]["url"] == "https://en.wikipedia.org/wiki/Content_marketing"
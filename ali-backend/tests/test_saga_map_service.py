@@ -0,0 +1,186 @@
+"""
+Tests for SagaMapService compiled course graphs.
+Uses a small in-memory Firestore stand-in that counts reads.
+"""
+from unittest.mock import Mock, patch
+
+from app.services.saga_map_service import SagaMapService, _topological_order
+
+
+class FakeFirestore:
+    """Just enough of the Firestore client for SagaMapService."""
+
+    def __init__(self, data):
+        self.data = data  # {collection: {doc_id: dict}}
+        self.reads = 0
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def get_all(self, refs):
+        return [ref.get() for ref in refs]
+
+
+class FakeCollection:
+    def __init__(self, db, name, filters=None):
+        self.db = db
+        self.name = name
+        self.filters = filters or []
+        self.order = None
+
+    def document(self, doc_id):
+        return FakeDocRef(self.db, self.name, doc_id)
+
+    def where(self, field, op, value):
+        assert op == "=="
+        return FakeCollection(self.db, self.name, self.filters + [(field, value)])
+
+    def order_by(self, field):
+        self.order = field
+        return self
+
+    def stream(self):
+        docs = [
+            FakeDocRef(self.db, self.name, doc_id).get()
+            for doc_id, data in self.db.data.get(self.name, {}).items()
+            if all(data.get(f) == v for f, v in self.filters)
+        ]
+        if self.order:
+            docs.sort(key=lambda d: d.to_dict().get(self.order))
+        return iter(docs)
+
+
+class FakeDocRef:
+    def __init__(self, db, collection, doc_id):
+        self.db = db
+        self.collection = collection
+        self.id = doc_id
+
+    def get(self):
+        self.db.reads += 1
+        data = self.db.data.get(self.collection, {}).get(self.id)
+        snapshot = Mock()
+        snapshot.id = self.id
+        snapshot.exists = data is not None
+        snapshot.to_dict.return_value = dict(data) if data is not None else None
+        return snapshot
+
+    def update(self, updates):
+        doc = self.db.data[self.collection][self.id]
+        for key, value in updates.items():
+            if key == "graphVersion":
+                doc[key] = doc.get(key, 0) + value
+            elif key == "tutorialIds":
+                doc[key] = doc.get(key, []) + [v for v in value if v not in doc.get(key, [])]
+            else:
+                doc[key] = value
+
+
+def _module(module_id, sequence, tutorials, prereqs=None, course_id="c1"):
+    conditions = [{"type": "ALWAYS_UNLOCKED"}]
+    if prereqs:
+        conditions = [{"type": "PREREQUISITE_COMPLETE", "prerequisiteModuleIds": prereqs}]
+    return {
+        "id": module_id,
+        "courseId": course_id,
+        "title": module_id.upper(),
+        "sequence": sequence,
+        "tutorialIds": tutorials,
+        "unlockConditions": conditions,
+    }
+
+
+def _fixture_data():
+    return {
+        "courses": {
+            "c1": {"id": "c1", "title": "Course", "moduleIds": ["m1", "m2", "m3", "m4"], "updatedAt": "t0"},
+        },
+        "modules": {
+            "m1": _module("m1", 1, ["t1", "t2"]),
+            "m2": _module("m2", 2, ["t3"], prereqs=["m1"]),
+            "m3": _module("m3", 3, ["t4"], prereqs=["m1", "m2"]),
+            "m4": _module("m4", 4, [], prereqs=["x1"]),
+            "x1": _module("x1", 1, ["t9"], course_id="other"),
+        },
+        "users": {
+            "u1": {"completed_tutorials": ["t1", "t2", "t3"]},
+        },
+    }
+
+
+def test_snapshot_progress_and_unlocks_in_one_pass():
+    db = FakeFirestore(_fixture_data())
+    service = SagaMapService(db=db)
+
+    snapshot = service.get_course_snapshot("u1", "c1")
+
+    assert [m["id"] for m in snapshot["modules"]] == ["m1", "m2", "m3", "m4"]
+    assert snapshot["moduleProgress"]["m1"]["percentComplete"] == 100.0
+    assert snapshot["moduleProgress"]["m3"]["percentComplete"] == 0.0
+    assert snapshot["moduleUnlock"]["m2"]["isUnlocked"] is True
+    assert snapshot["moduleUnlock"]["m3"]["isUnlocked"] is True
+    assert snapshot["moduleUnlock"]["m4"]["reason"] == "Complete module 'X1' first"
+    assert snapshot["courseProgress"]["completedTutorialIds"] == ["t1", "t2", "t3"]
+    assert snapshot["courseProgress"]["percentComplete"] == 75.0
+
+    # course + module query (4) + external prerequisite + user
+    assert db.reads == 1 + 4 + 1 + 1
+
+
+def test_compiled_graph_reused_until_course_edit():
+    db = FakeFirestore(_fixture_data())
+    service = SagaMapService(db=db)
+
+    service.get_course_snapshot("u1", "c1")
+    db.reads = 0
+    service.get_course_snapshot("u1", "c1")
+    assert db.reads == 2  # course + user only
+
+    with patch("app.services.saga_map_service.firestore_increment", side_effect=lambda v: v), \
+         patch("app.services.saga_map_service.firestore_array_union", side_effect=lambda v: v):
+        service.add_tutorial_to_module("m3", "t5")
+    assert db.data["courses"]["c1"]["graphVersion"] == 1
+
+    db.reads = 0
+    snapshot = service.get_course_snapshot("u1", "c1")
+    assert db.reads > 2  # recompiled
+    assert snapshot["moduleProgress"]["m3"]["totalTutorials"] == 2
+
+
+def test_memoised_snapshot_tracks_completion_changes():
+    db = FakeFirestore(_fixture_data())
+    service = SagaMapService(db=db)
+
+    first = service.get_course_snapshot("u1", "c1")
+    db.data["users"]["u1"]["completed_tutorials"].append("t4")
+    second = service.get_course_snapshot("u1", "c1")
+
+    assert first["moduleProgress"]["m3"]["percentComplete"] == 0.0
+    assert second["moduleProgress"]["m3"]["percentComplete"] == 100.0
+
+
+def test_module_level_api_matches_snapshot():
+    db = FakeFirestore(_fixture_data())
+    service = SagaMapService(db=db)
+
+    assert service.calculate_module_progress("u1", "m2")["completedTutorialIds"] == ["t3"]
+    assert service.calculate_course_progress("u1", "c1")["totalTutorials"] == 4
+    assert service.check_unlock_conditions("u1", "m4")["isUnlocked"] is False
+    assert service.is_module_unlocked("u1", "m3") is True
+    assert service.calculate_module_progress("u1", "missing") == {"error": "Module not found"}
+    assert service.calculate_course_progress("u1", "missing") == {"error": "Course not found"}
+
+
+def test_topological_order_handles_cycles():
+    modules = {
+        "a": _module("a", 1, [], prereqs=["c"]),
+        "b": _module("b", 2, [], prereqs=["a"]),
+        "c": _module("c", 3, []),
+        "d": _module("d", 4, [], prereqs=["e"]),
+        "e": _module("e", 5, [], prereqs=["d"]),
+    }
+
+    order = _topological_order(modules, ["a", "b", "c", "d", "e"])
+
+    assert order[:3] == ["c", "a", "b"]
+    assert order[3:] == ["d", "e"]
@@ -0,0 +1,133 @@
+"""
+Tests for shared system-health counters (count() aggregations + short cache).
+Uses a small in-memory Firestore stand-in that counts aggregation queries.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services import system_health
+
+OPS = {
+    "==": lambda a, b: a == b,
+    ">=": lambda a, b: a is not None and a >= b,
+}
+
+
+class FakeQuery:
+    def __init__(self, db, name, filters=()):
+        self.db = db
+        self.name = name
+        self.filters = filters
+
+    def where(self, filter):
+        return FakeQuery(self.db, self.name, self.filters + ((filter.field_path, filter.op_string, filter.value),))
+
+    def _matches(self):
+        return [d for d in self.db.data.get(self.name, [])
+                if all(OPS[op](d.get(f), v) for f, op, v in self.filters)]
+
+    def count(self, alias=None):
+        self.db.aggregations += 1
+        return SimpleNamespace(get=lambda: [[SimpleNamespace(alias=alias, value=len(self._matches()))]])
+
+    def order_by(self, *args, **kwargs):
+        return self
+
+    def limit(self, count):
+        return self
+
+    def stream(self):
+        self.db.streams.append(self.name)
+        return iter([SimpleNamespace(id=str(i), to_dict=lambda d=d: d) for i, d in enumerate(self._matches())])
+
+
+class FakeFirestore:
+    def __init__(self, data):
+        self.data = data
+        self.aggregations = 0
+        self.streams = []
+
+    def collection(self, name):
+        return FakeQuery(self, name)
+
+    def collection_group(self, name):
+        return FakeQuery(self, name)
+
+
+@pytest.fixture
+def db(real_google_modules):
+    now = datetime.utcnow()
+    data = {
+        "deepfake_jobs": [{"status": "queued"}] * 250 + [{"status": "done"}] * 5,
+        "scheduled_scans": (
+            [{"status": "pending"}] * 3
+            + [{"status": "failed", "created_at": now}] * 2
+            + [{"status": "failed", "created_at": now - timedelta(days=3)}]
+            + [{"status": "completed", "completed_at": now}]
+        ),
+        "admin_tasks": [{"type": "system_failure", "status": "pending", "context": {}, "error": "x"}],
+        "client_logs": [],
+    }
+    system_health._cache.clear()
+    with real_google_modules():
+        yield FakeFirestore(data)
+    system_health._cache.clear()
+
+
+def test_counters_use_aggregations_and_exceed_old_cap(db):
+    counters = system_health.get_health_counters(db)
+
+    assert counters["queued_deepfake_jobs"] == 250
+    assert counters["pending_scan_jobs"] == 3
+    assert counters["scan_failures_24h"] == 2
+    assert counters["pending_failure_tasks"] == {"system_failure": 1, "generation_blocked": 0, "content_alert": 0}
+    assert counters["frontend_errors_1h"] == 0
+    assert counters["last_successful_scan"] is not None
+    assert db.aggregations == 7
+    assert db.streams == ["scheduled_scans"]  # only the last-scan lookup reads documents
+
+
+def test_counters_cached_between_consumers(db):
+    first = system_health.get_health_counters(db)
+    second = system_health.get_health_counters(db)
+    assert second is first and db.aggregations == 7
+
+    system_health.get_health_counters(db, max_age=0)
+    assert db.aggregations == 14
+
+
+def test_watchdog_skips_sources_with_zero_counts(db):
+    from app.agents.troubleshooting_agent import TroubleshootingAgent
+
+    agent = TroubleshootingAgent.__new__(TroubleshootingAgent)
+    agent.logging_client = None
+
+    with patch("app.agents.troubleshooting_agent.db", db):
+        events = agent.fetch_combined_telemetry(hours=1)
+
+    assert [e["source"] for e in events] == ["admin_task"]
+    # No client_logs stream and only the one non-empty task type was read
+    assert db.streams.count("client_logs") == 0
+    assert db.streams.count("admin_tasks") == 1
+    # Only the counts it gates on: client_logs + three task types, no scan lookup
+    assert db.aggregations == 4
+    assert "scheduled_scans" not in db.streams
+
+
+def test_watchdog_does_not_skip_on_stale_cached_counts(db):
+    from app.agents.troubleshooting_agent import TroubleshootingAgent
+
+    agent = TroubleshootingAgent.__new__(TroubleshootingAgent)
+    agent.logging_client = None
+    assert system_health.get_health_counters(db)["frontend_errors_1h"] == 0
+
+    # Logged after the cached zero count was taken
+    db.data["client_logs"].append({"timestamp": datetime.utcnow().isoformat(), "level": "error",
+                                   "message": "boom", "component": "App", "stack_trace": ""})
+    with patch("app.agents.troubleshooting_agent.db", db):
+        events = agent.fetch_combined_telemetry(hours=1)
+
+    assert "frontend" in [e["source"] for e in events]
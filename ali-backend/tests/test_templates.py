@@ -62,5 +62,31 @@ class TestTemplates(unittest.TestCase):
         self.assertIn("pattern-overlay", html)
         self.assertIn("data:image/svg+xml", html)
 
+    def test_compiled_render_matches_full_build(self):
+        """Compiled renderers substitute slots into exactly the full template output."""
+        texts = ["Short", "x" * 29, "y" * 30, "A {braced} headline with <b>markup</b> & $1 __aliSlotText__"]
+        pattern = '<svg><rect width="10" height="10"/></svg>'
+        for name in templates.MOTION_TEMPLATES + ["unknown"]:
+            for text in texts:
+                for luminance_mode in ("dark", "light"):
+                    for pattern_svg in (None, pattern):
+                        for color in ("#D4AF37", "#abc"):
+                            args = (name, "https://img/x.png?a=1&b=2", "logo.png", color, text,
+                                    luminance_mode, "editorial-left", pattern_svg)
+                            self.assertEqual(templates.get_motion_template(*args),
+                                             templates._build_motion_template(*args), args)
+
+    def test_template_compiled_once_per_variant(self):
+        """Only text class / luminance / pattern (and aurora colour) trigger a compile."""
+        templates.compile_motion_template.cache_clear()
+        for i in range(20):
+            templates.get_motion_template("luxury", f"img{i}.jpg", "logo.png", f"#00000{i % 10}", f"Headline {i}")
+        self.assertEqual(templates.compile_motion_template.cache_info().misses, 1)
+
+        templates.get_motion_template("luxury", "img.jpg", "logo.png", "#000", "A headline well over thirty characters")
+        templates.get_motion_template("aurora", "img.jpg", "logo.png", "#112233", "Text")
+        templates.get_motion_template("aurora", "img.jpg", "logo.png", "#445566", "Text")
+        self.assertEqual(templates.compile_motion_template.cache_info().misses, 4)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for TutorialEligibilityScorer scoring context.
+Uses a small in-memory Firestore stand-in that counts streamed queries.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from app.services.tutorial_eligibility_scorer import TutorialEligibilityScorer
+
+
+class FakeQuery:
+    def __init__(self, db, path, filters=None, max_docs=None):
+        self.db = db
+        self.path = path
+        self.filters = filters or []
+        self.max_docs = max_docs
+
+    def document(self, doc_id):
+        return FakeQuery(self.db, self.path + (doc_id,))
+
+    def collection(self, name):
+        return FakeQuery(self.db, self.path + (name,))
+
+    def where(self, field, op, value):
+        assert op == "=="
+        return FakeQuery(self.db, self.path, self.filters + [(field, value)], self.max_docs)
+
+    def limit(self, count):
+        return FakeQuery(self.db, self.path, self.filters, count)
+
+    def stream(self):
+        self.db.streams += 1
+        docs = [d for d in self.db.data.get(self.path, []) if all(d.get(f) == v for f, v in self.filters)]
+        for data in docs[:self.max_docs]:
+            snapshot = Mock()
+            snapshot.to_dict.return_value = dict(data)
+            yield snapshot
+
+
+class FakeFirestore:
+    def __init__(self, data):
+        self.data = data  # {(collection, doc, subcollection): [dict]}
+        self.streams = 0
+
+    def collection(self, name):
+        return FakeQuery(self, (name,))
+
+
+def _scorer(data, prerequisites=None):
+    scorer = TutorialEligibilityScorer()
+    scorer._db = FakeFirestore(data)
+    scorer._complexity_analyzer = Mock()
+    scorer._complexity_analyzer.analyze_topic_complexity.side_effect = lambda topic: {
+        "complexity_score": 7,
+        "prerequisites": (prerequisites or {}).get(topic, []),
+    }
+    scorer._performance_analyzer = Mock()
+    scorer._performance_analyzer.analyze_user_performance.return_value = {"performance_level": "struggling"}
+    return scorer
+
+
+def _user_data(days_ago=10):
+    return {
+        ("users", "u1", "tutorials"): [
+            {"topic": "Email Basics", "is_completed": True, "completedAt": datetime.utcnow() - timedelta(days=30)},
+            {"topic": "Audience Targeting", "is_completed": True,
+             "completedAt": (datetime.utcnow() - timedelta(days=days_ago)).isoformat()},
+            {"topic": "Unfinished", "is_completed": False},
+        ],
+        ("users", "u1", "campaign_performance"): [{"ctr": 0.4}, {"ctr": 2.1}],
+    }
+
+
+def test_batch_scoring_reads_are_constant():
+    scorer = _scorer(_user_data())
+    recs = [{"topic": f"Topic {i}", "severity": 6} for i in range(20)]
+
+    scored = scorer.batch_score_recommendations("u1", recs)
+
+    assert len(scored) == 20
+    assert not any("error" in rec["eligibility_score"] for rec in scored)
+    assert scorer._db.streams == 2  # completed tutorials + campaign performance
+    assert scorer._performance_analyzer.analyze_user_performance.call_count == 1
+    # Complexity + prerequisite components share one analysis per topic
+    assert scorer._complexity_analyzer.analyze_topic_complexity.call_count == 20
+
+
+def test_context_components_match_inputs():
+    scorer = _scorer(_user_data(days_ago=10), prerequisites={
+        "Creative Optimization": ["email basics", "Landing Pages"],
+    })
+
+    result = scorer.score_recommendation("u1", "Creative Optimization")
+    components = result["component_scores"]
+
+    assert components["prerequisite_status"] == 50.0
+    assert components["recency"] == 70       # latest completion 10 days ago
+    assert components["campaign_correlation"] == 90
+    assert components["topic_complexity"] == 70
+
+
+def test_recency_defaults():
+    scorer = _scorer({})
+    context = scorer.build_scoring_context("u1")
+    assert scorer._score_recency(context) == 80
+    assert scorer._score_campaign_correlation("ctr tuning", context) == 40
+
+    undated = {("users", "u1", "tutorials"): [{"topic": "x", "is_completed": True, "completedAt": None}]}
+    scorer = _scorer(undated)
+    assert scorer._score_recency(scorer.build_scoring_context("u1")) == 60
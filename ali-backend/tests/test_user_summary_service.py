@@ -0,0 +1,212 @@
+"""
+Tests for write-maintained user summaries and the admin listings they serve.
+Uses a small in-memory Firestore stand-in that counts reads.
+"""
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from app.agents.performance_analyzer_agent import PerformanceAnalyzerAgent
+from app.services.user_summary_service import UserSummaryService
+
+
+class Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeFirestore:
+    def __init__(self, data):
+        self.data = data  # {path tuple of collection: {doc_id: dict}}
+        self.streams = 0
+        self.get_all_calls = 0
+
+    def collection(self, name):
+        return FakeCollection(self, (name,))
+
+    def get_all(self, refs):
+        self.get_all_calls += 1
+        return [ref.get() for ref in refs]
+
+
+class FakeCollection:
+    def __init__(self, db, path, count=None, after=None):
+        self.db = db
+        self.path = path
+        self.count = count
+        self.after = after
+
+    def document(self, doc_id):
+        return FakeDocRef(self.db, self.path, doc_id)
+
+    def order_by(self, field):
+        assert field == "__name__"
+        return self
+
+    def limit(self, count):
+        return FakeCollection(self.db, self.path, count, self.after)
+
+    def start_after(self, values):
+        return FakeCollection(self.db, self.path, self.count, values["__name__"])
+
+    def stream(self):
+        self.db.streams += 1
+        ids = sorted(i for i in self.db.data.get(self.path, {}) if self.after is None or i > self.after)
+        return iter([FakeDocRef(self.db, self.path, i).get() for i in ids[:self.count]])
+
+
+class FakeDocRef:
+    def __init__(self, db, path, doc_id):
+        self.db = db
+        self.path = path
+        self.id = doc_id
+
+    def collection(self, name):
+        return FakeCollection(self.db, self.path + (self.id, name))
+
+    def get(self):
+        data = self.db.data.get(self.path, {}).get(self.id)
+        return SimpleNamespace(id=self.id, exists=data is not None,
+                               to_dict=lambda: dict(data) if data is not None else None)
+
+    def set(self, update, merge=False):
+        _merge(self.db.data.setdefault(self.path, {}).setdefault(self.id, {}), update)
+
+
+def _merge(doc, update):
+    for key, value in update.items():
+        if isinstance(value, Increment):
+            doc[key] = doc.get(key, 0) + value.value
+        elif isinstance(value, dict):
+            _merge(doc.setdefault(key, {}), value)
+        else:
+            doc[key] = value
+
+
+@pytest.fixture(autouse=True)
+def fake_increment(monkeypatch):
+    monkeypatch.setattr(sys.modules["firebase_admin"], "firestore", SimpleNamespace(Increment=Increment))
+
+
+def _data(users=5):
+    data = {("users",): {f"u{i}": {"email": f"u{i}@x.io", "profile": {}} for i in range(users)}}
+    data[("users", "u1", "user_integrations")] = {
+        "metricool": {"platform": "metricool", "status": "active", "connected_providers": ["facebook"]},
+        "linkedin": {"platform": "linkedin", "status": "disconnected"},
+    }
+    data[("users", "u1", "campaign_performance")] = {
+        "a": {"spend": "10.5", "clicks": 3},
+        "b": {"spend": 4, "clicks": 1},
+    }
+    return data
+
+
+def test_write_hooks_maintain_counts():
+    db = FakeFirestore(_data())
+    service = UserSummaryService(db=db)
+
+    service.record_tutorial_created("u1")
+    service.record_tutorial_created("u1")
+    service.record_tutorial_completed("u1", 90)
+    service.record_tutorial_completed("u1", 80, was_in_progress=False)
+    service.refresh_integrations("u1")
+    service.refresh_campaign_stats("u1")
+
+    summary = db.data[("user_summaries",)]["u1"]
+    assert summary["tutorials_in_progress"] == 1
+    assert summary["tutorials_completed"] == 2
+    assert summary["completion_score_sum"] == 170
+    assert summary["connected_platforms"] == ["metricool"]
+    assert summary["active_channels"] == ["facebook"]
+    assert summary["campaign_stats"] == {"total_spend": 14.5, "total_clicks": 4, "data_points": 2}
+
+
+def test_tutorial_delete_reverses_counts():
+    db = FakeFirestore(_data())
+    service = UserSummaryService(db=db)
+
+    service.record_tutorial_created("u1")
+    service.record_tutorial_created("u1")
+    service.record_tutorial_completed("u1", 90)
+    service.record_tutorial_deleted("u1", was_completed=True, score=90)
+    service.record_tutorial_deleted("u1", was_completed=False)
+
+    summary = db.data[("user_summaries",)]["u1"]
+    assert (summary["tutorials_completed"], summary["tutorials_in_progress"]) == (0, 0)
+    assert summary["completion_score_sum"] == 0
+
+
+def test_campaign_stats_apply_deltas_for_written_rows_only():
+    db = FakeFirestore(_data())
+    service = UserSummaryService(db=db)
+    service.refresh_campaign_stats("u1")
+    db.streams = 0
+
+    # "a" is restated (10.5 -> 12, clicks unchanged by merge), "c" is new
+    rows = {"a": {"spend": 12}, "c": {"spend": 1.5, "clicks": 2}}
+    delta = service.campaign_stats_delta("u1", rows)
+    db.data[("users", "u1", "campaign_performance")]["a"]["spend"] = 12
+    db.data[("users", "u1", "campaign_performance")]["c"] = rows["c"]
+    service.record_campaign_stats("u1", delta)
+
+    assert db.streams == 0  # No scan of the campaign_performance history
+    stats = db.data[("user_summaries",)]["u1"]["campaign_stats"]
+    assert stats == {"total_spend": 17.5, "total_clicks": 6, "data_points": 3}
+
+    # A replacing write drops fields the new row omits
+    replaced = service.campaign_stats_delta("u1", {"b": {"spend": 4}}, merge=False)
+    assert replaced == {"total_spend": 0.0, "total_clicks": -1, "data_points": 0}
+
+
+def test_rebuild_matches_source_collections():
+    data = _data()
+    data[("users", "u1", "tutorials")] = {
+        "t1": {"is_completed": True, "completion_score": 88},
+        "t2": {"is_completed": False},
+    }
+    db = FakeFirestore(data)
+
+    assert UserSummaryService(db=db).rebuild("u1")
+
+    summary = db.data[("user_summaries",)]["u1"]
+    assert (summary["tutorials_completed"], summary["tutorials_in_progress"]) == (1, 1)
+    assert summary["campaign_stats"]["data_points"] == 2
+
+
+def test_all_users_summary_is_one_query_and_one_batch_read():
+    db = FakeFirestore(_data(users=7))
+    UserSummaryService(db=db).record_tutorial_created("u3")
+    analyzer = PerformanceAnalyzerAgent(db=db)
+
+    first = analyzer.get_all_users_summary(limit=4)
+    assert (db.streams, db.get_all_calls) == (1, 1)
+    assert [s["user_id"] for s in first] == ["u0", "u1", "u2", "u3"]
+    assert first[3]["tutorials_in_progress"] == 1
+
+    second = analyzer.get_all_users_summary(limit=4, cursor=first[-1]["user_id"])
+    assert [s["user_id"] for s in second] == ["u4", "u5", "u6"]
+    assert second[0]["tutorials_completed"] == 0
+
+
+def test_list_users_page_cursor():
+    service = UserSummaryService(db=FakeFirestore(_data(users=3)))
+
+    users, cursor = service.list_users_page(2)
+    assert [u.id for u in users] == ["u0", "u1"] and cursor == "u1"
+
+    users, cursor = service.list_users_page(2, cursor)
+    assert [u.id for u in users] == ["u2"] and cursor is None
+
+
+def test_users_summary_page_returns_service_cursor(monkeypatch):
+    from app.services import user_summary_service
+    monkeypatch.setattr(user_summary_service, "MAX_PAGE_SIZE", 3)
+    analyzer = PerformanceAnalyzerAgent(db=FakeFirestore(_data(users=5)))
+
+    # limit above the clamp still hands back a cursor while users remain
+    page, cursor = analyzer.get_users_summary_page(limit=10)
+    assert [s["user_id"] for s in page] == ["u0", "u1", "u2"] and cursor == "u2"
+
+    page, cursor = analyzer.get_users_summary_page(limit=10, cursor=cursor)
+    assert [s["user_id"] for s in page] == ["u3", "u4"] and cursor is None
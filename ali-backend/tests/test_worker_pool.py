@@ -0,0 +1,204 @@
+"""
+Tests for the pool-mode worker: leased job claims against an in-memory
+Firestore stand-in, the concurrency budget, lease renewal and draining.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app import worker
+from app.services import job_runner
+
+
+class FakeDoc:
+    def __init__(self, store, doc_id):
+        self.store = store
+        self.id = doc_id
+
+    def get(self, transaction=None):
+        data = self.store.docs.get(self.id)
+        return SimpleNamespace(exists=data is not None, id=self.id, reference=self,
+                               to_dict=lambda: dict(data) if data is not None else None)
+
+    def update(self, data):
+        with self.store.lock:
+            self.store.docs[self.id].update(data)
+            self.store.updates.append((self.id, dict(data)))
+
+
+class FakeQuery:
+    OPS = {"==": lambda a, b: a == b, "<": lambda a, b: a is not None and a < b}
+
+    def __init__(self, store, filters=(), order=None, count=None):
+        self.store, self.filters, self.order, self.count = store, filters, order, count
+
+    def where(self, field, op, value):
+        return FakeQuery(self.store, self.filters + ((field, op, value),), self.order, self.count)
+
+    def order_by(self, field):
+        return FakeQuery(self.store, self.filters, field, self.count)
+
+    def limit(self, count):
+        return FakeQuery(self.store, self.filters, self.order, count)
+
+    def stream(self):
+        with self.store.lock:
+            rows = [(doc_id, data) for doc_id, data in self.store.docs.items()
+                    if all(self.OPS[op](data.get(f), v) for f, op, v in self.filters)]
+        if self.order:
+            rows.sort(key=lambda row: row[1][self.order])
+        return [FakeDoc(self.store, doc_id).get() for doc_id, _ in rows[:self.count]]
+
+
+class FakeTransaction:
+    def __init__(self, store):
+        self.store = store
+
+    def update(self, ref, data):
+        self.store.docs[ref.id].update(data)
+        self.store.updates.append((ref.id, dict(data)))
+
+
+class FakeJobsDB:
+    def __init__(self, jobs):
+        self.docs = {job["id"]: dict(job) for job in jobs}
+        self.updates = []
+        self.lock = threading.RLock()
+
+    def collection(self, name):
+        query = FakeQuery(self)
+        query.document = lambda doc_id: FakeDoc(self, doc_id)
+        return query
+
+    def transaction(self):
+        return FakeTransaction(self)
+
+
+def _transactional(fn):
+    def run(transaction):
+        with transaction.store.lock:
+            return fn(transaction)
+    return run
+
+
+def _job(n, **extra):
+    return {"id": f"j{n}", "user_id": "u1", "topic": f"topic {n}", "status": "queued",
+            "dispatch": "pool", "created_at": n, "notification_id": f"j{n}", **extra}
+
+
+@pytest.fixture
+def jobs_db(monkeypatch):
+    def install(jobs):
+        store = FakeJobsDB(jobs)
+        monkeypatch.setattr(job_runner, "db", store)
+        monkeypatch.setattr(job_runner.firestore, "transactional", _transactional)
+        return store
+    return install
+
+
+def test_claims_respect_status_dispatch_and_lapsed_leases(jobs_db):
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+    store = jobs_db([
+        _job(3), _job(1), _job(2, dispatch="local"),
+        _job(4, status="processing", lease_expires_at=past),
+        _job(5, status="processing", lease_expires_at=future),
+        _job(6, status="completed"),
+    ])
+
+    first = job_runner.claim_pending_jobs("w1", limit=1)
+    rest = job_runner.claim_pending_jobs("w1", limit=5)
+
+    assert [j["id"] for j in first] == ["j1"]  # Oldest queued job first
+    assert [j["id"] for j in rest] == ["j3", "j4"]
+    assert store.docs["j4"]["lease_owner"] == "w1"
+    assert store.docs["j4"]["lease_expires_at"] > datetime.now(timezone.utc)
+    assert store.docs["j5"]["status"] == "processing" and "lease_owner" not in store.docs["j5"]
+    assert job_runner.claim_pending_jobs("w2", limit=5) == []
+
+
+def test_job_failed_after_max_attempts(jobs_db, monkeypatch):
+    monkeypatch.setattr(job_runner, "JOB_MAX_ATTEMPTS", 2)
+    store = jobs_db([_job(1)])
+
+    def lapse():
+        store.docs["j1"]["lease_expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    assert [j["attempts"] for j in job_runner.claim_pending_jobs("w1", limit=1)] == [1]
+    lapse()
+    assert [j["attempts"] for j in job_runner.claim_pending_jobs("w2", limit=1)] == [2]
+    lapse()
+
+    # Third lapse: failed rather than handed to another worker
+    assert job_runner.claim_pending_jobs("w3", limit=1) == []
+    assert store.docs["j1"]["status"] == "failed"
+    assert store.docs["j1"]["lease_owner"] == "w2"
+    assert job_runner.claim_pending_jobs("w3", limit=1) == []
+
+
+def test_pool_runs_within_budget_and_exits_when_drained(jobs_db, monkeypatch):
+    store = jobs_db([_job(n) for n in range(7)])
+    monkeypatch.setattr(worker, "WORKER_CONCURRENCY", 3)
+    monkeypatch.setattr(worker, "WORKER_POLL_SEC", 0.01)
+    monkeypatch.setattr(worker, "WORKER_IDLE_POLLS", 2)
+
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "done": []}
+
+    def fake_process(job_id, user_id, topic, notification_id=None, lease_owner=None):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+            state["done"].append((job_id, notification_id, lease_owner))
+        store.docs[job_id]["status"] = "completed"
+
+    monkeypatch.setattr(job_runner, "process_tutorial_job", fake_process)
+
+    started = time.monotonic()
+    processed = worker.run_pool()
+
+    assert processed == 7
+    assert sorted(job_id for job_id, _, _ in state["done"]) == [f"j{n}" for n in range(7)]
+    assert state["peak"] == 3
+    assert all(notification == job_id for job_id, notification, _ in state["done"])
+    assert len({owner for _, _, owner in state["done"]}) == 1
+    # 7 jobs / 3 slots ≈ 3 rounds of 50ms, not one container per job
+    assert time.monotonic() - started < 1
+
+
+def test_lease_renewed_while_job_runs(jobs_db, monkeypatch):
+    store = jobs_db([_job(1, status="processing", lease_owner="w1")])
+    monkeypatch.setattr(job_runner, "LEASE_RENEW_SEC", 0.02)
+    ref = store.collection("jobs").document("j1")
+
+    with job_runner.JobLease(ref, "j1", "w1"):
+        time.sleep(0.15)
+    renewals = len(store.updates)
+    time.sleep(0.06)
+
+    assert renewals >= 4
+    assert len(store.updates) == renewals  # Stopped with the job
+    assert all(set(update) == {"lease_expires_at"} for _, update in store.updates)
+    assert store.docs["j1"]["lease_owner"] == "w1"
+
+
+def test_lease_lost_to_another_worker_is_not_taken_back(jobs_db, monkeypatch):
+    past = datetime.now(timezone.utc) - timedelta(minutes=5)
+    store = jobs_db([_job(1, status="processing", lease_owner="w1", lease_expires_at=past)])
+    monkeypatch.setattr(job_runner, "LEASE_RENEW_SEC", 0.02)
+    ref = store.collection("jobs").document("j1")
+
+    # w1 stalled past its lease and w2 picked the job up
+    assert [j["id"] for j in job_runner.claim_pending_jobs("w2", limit=1)] == ["j1"]
+    with job_runner.JobLease(ref, "j1", "w1") as lease:
+        time.sleep(0.1)
+
+    assert lease.lost
+    assert store.docs["j1"]["lease_owner"] == "w2"
+    assert job_runner.claim_job("j1", "w3") is None
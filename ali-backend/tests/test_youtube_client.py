@@ -0,0 +1,193 @@
+"""
+Tests for YouTubeClient against a local fake Data API (aiohttp.web):
+incremental comment sync, cached comment pages, bounded per-video
+concurrency and the local quota ledger.
+"""
+import asyncio
+
+from aiohttp import web
+
+from app.services import youtube_client
+from app.services.youtube_client import QuotaLedger, YouTubeClient
+
+
+class FakeYouTube:
+    """Videos v0..vN with `views[i]` views; comments newest first, 2 per page."""
+
+    def __init__(self, views, comments_per_video=3, delay=0.0, page_size_cap=2, text="love acme"):
+        self.views = views
+        self.text = text
+        self.delay = delay
+        self.page_size_cap = page_size_cap
+        self.comments = {
+            f"v{i}": [f"2026-10-0{n + 1}T00:00:00Z" for n in reversed(range(comments_per_video))]
+            for i in range(len(views))
+        }
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def add_comment(self, video_id, published_at):
+        self.comments[video_id].insert(0, published_at)
+
+    async def search(self, request):
+        self.requests.append(("search",))
+        items = [{"id": {"videoId": f"v{i}"}, "snippet": {"title": f"acme video {i}"}}
+                 for i in range(len(self.views))]
+        return web.json_response({"items": items})
+
+    async def videos(self, request):
+        ids = request.query["id"].split(",")
+        self.requests.append(("videos", tuple(ids)))
+        items = [{"id": vid, "statistics": {"viewCount": str(self.views[int(vid[1:])]),
+                                            "commentCount": str(len(self.comments[vid]))}}
+                 for vid in ids]
+        return web.json_response({"items": items})
+
+    async def comment_threads(self, request):
+        video_id = request.query["videoId"]
+        offset = int(request.query.get("pageToken", 0))
+        size = min(int(request.query["maxResults"]), self.page_size_cap)
+        self.requests.append(("commentThreads", video_id, offset))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        stamps = self.comments[video_id]
+        items = [{"id": f"{video_id}-{ts}", "snippet": {"topLevelComment": {"snippet": {
+            "textDisplay": f"{self.text} ({ts})", "publishedAt": ts}}}}
+            for ts in stamps[offset:offset + size]]
+        body = {"items": items}
+        if offset + size < len(stamps):
+            body["nextPageToken"] = str(offset + size)
+        return web.json_response(body)
+
+    async def serve(self, scenario, ledger=None):
+        app = web.Application()
+        app.router.add_get("/search", self.search)
+        app.router.add_get("/videos", self.videos)
+        app.router.add_get("/commentThreads", self.comment_threads)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            client = YouTubeClient(api_key="k", base_url=f"http://127.0.0.1:{port}", ledger=ledger)
+            return await scenario(client)
+        finally:
+            await runner.cleanup()
+
+    def count(self, kind):
+        return sum(1 for r in self.requests if r[0] == kind)
+
+    def comment_videos(self):
+        return {r[1] for r in self.requests if r[0] == "commentThreads"}
+
+
+def _comments(results):
+    return sorted(r["published_at"] for r in results if r["source"] == "youtube_comment")
+
+
+def test_repeat_scans_only_fetch_new_comments():
+    server = FakeYouTube([100, 50])
+
+    async def scenario(client):
+        client._video_stats = youtube_client._TTLCache(0)  # Fresh counts every scan
+        first = await client.search_mentions("acme", include_comments=True)
+        requests_after_first = server.count("commentThreads")
+        second = await client.search_mentions("acme", include_comments=True)
+        requests_after_second = server.count("commentThreads")
+        server.add_comment("v1", "2026-10-09T00:00:00Z")
+        third = await client.search_mentions("acme", include_comments=True)
+        return first, requests_after_first, second, requests_after_second, third
+
+    first, n_first, second, n_second, third = asyncio.run(server.serve(scenario))
+
+    # Three comments per video across two pages
+    assert len(_comments(first)) == 6 and n_first == 4
+    # Unchanged comment counts: no comment requests at all
+    assert _comments(second) == [] and n_second == n_first
+    # Only the new comment is fetched, from the first page of that video only
+    assert _comments(third) == ["2026-10-09T00:00:00Z"]
+    assert server.requests[-1] == ("commentThreads", "v1", 0)
+    assert server.count("commentThreads") == n_second + 1
+
+
+def test_comment_sync_state_kept_per_brand():
+    server = FakeYouTube([100, 50], text="acme vs globex")
+
+    async def scenario(client):
+        client._video_stats = youtube_client._TTLCache(0)
+        acme = await client.search_mentions("acme", include_comments=True)
+        globex = await client.search_mentions("Globex", include_comments=True)
+        server.add_comment("v0", "2026-10-09T00:00:00Z")
+        acme_again = await client.search_mentions("acme", include_comments=True)
+        return acme, globex, acme_again
+
+    acme, globex, acme_again = asyncio.run(server.serve(scenario))
+
+    # Another brand's sync of the same videos doesn't hide earlier comments
+    assert len(_comments(acme)) == 6
+    assert _comments(globex) == _comments(acme)
+    assert _comments(acme_again) == ["2026-10-09T00:00:00Z"]
+
+
+def test_comment_pages_cached_by_video_and_token():
+    server = FakeYouTube([10], comments_per_video=5)
+
+    async def scenario(client):
+        first = await client.get_video_comments("v0", max_results=5)
+        second = await client.get_video_comments("v0", max_results=5)
+        return first, second
+
+    first, second = asyncio.run(server.serve(scenario))
+
+    assert len(first) == 5 and second == first
+    assert [r[2] for r in server.requests] == [0, 2, 4]
+
+
+def test_comment_requests_bounded(monkeypatch):
+    monkeypatch.setattr(youtube_client, "YOUTUBE_COMMENT_CONCURRENCY", 2)
+    server = FakeYouTube([5, 4, 3, 2, 1], comments_per_video=1, delay=0.05)
+
+    results = asyncio.run(server.serve(lambda c: c.search_mentions("acme", include_comments=True)))
+
+    assert len(_comments(results)) == 5
+    assert server.max_in_flight == 2
+
+
+def test_low_quota_skips_low_value_videos_then_serves_cached_search():
+    # search 100 + statistics 1 + two comment pages leaves exactly the reserve
+    ledger = QuotaLedger(daily_budget=105, reserve=2)
+    server = FakeYouTube([10, 500, 30, 900], comments_per_video=1)
+
+    async def scenario(client):
+        first = await client.search_mentions("acme", include_comments=True)
+        second = await client.search_mentions("acme", include_comments=True)
+        return first, second
+
+    first, second = asyncio.run(server.serve(scenario, ledger=ledger))
+
+    assert server.comment_videos() == {"v3", "v1"}
+    assert ledger.remaining == 2
+    # Search no longer affordable: last results served from cache, no new request
+    assert server.count("search") == 1
+    assert [v["id"] for v in second if v["source"] == "youtube"] == ["v0", "v1", "v2", "v3"]
+    assert len(_comments(first)) == 2 and _comments(second) == []
+
+
+def test_ledger_resets_each_day(monkeypatch):
+    ledger = QuotaLedger(daily_budget=150, reserve=20)
+    day = ["2026-10-18"]
+    monkeypatch.setattr(ledger, "_today", lambda: day[0])
+
+    assert ledger.try_spend(100)
+    assert not ledger.try_spend(40, low_priority=True)
+    assert ledger.try_spend(40)
+    assert not ledger.try_spend(20)
+
+    day[0] = "2026-10-19"
+    assert ledger.remaining == 150